@@ -41,6 +41,7 @@ __license__ = 'MIT'
 ###
 
 
+import os
 import sys
 
 PYTHON_VERSION = sys.version_info[:3]
@@ -51,20 +52,101 @@ if PY2:
 elif PYTHON_VERSION < (3, 4):
     raise Exception('Must use Python 3.4 or later, detected version: %s' % '.'.join(map(str, PYTHON_VERSION)))
 
-from hpOneView.common import *
-from hpOneView.connection import *
-from hpOneView.servers import *
-from hpOneView.activity import *
-from hpOneView.networking import *
-from hpOneView.security import *
-from hpOneView.settings import *
-from hpOneView.exceptions import *
-from hpOneView.search import *
-from hpOneView.metrics import *
-from hpOneView.storage import *
-from hpOneView.fcsans import *
-from hpOneView.facilities import *
-from hpOneView.uncategorized import *
+# Modules whose names are exported by the package. The names of the last ones take precedence.
+LEGACY_MODULES = ('common', 'connection', 'servers', 'activity', 'networking', 'security', 'settings', 'exceptions',
+                  'search', 'metrics', 'storage', 'fcsans', 'facilities', 'uncategorized')
+
+# Names defined by each legacy module. With the lazy import, the package exports these names only: the names the legacy
+# modules import from other modules, like json or os, are exported by the eager import only. The names are checked
+# against the modules by tests/unit/test_import_time.py.
+LEGACY_NAMES = {
+    'common': ('deprecated', 'extract_id_from_uri', 'get_iobay_entry', 'get_member', 'get_members', 'logger',
+               'make_Bandwidth', 'make_BiosSettings', 'make_BootModeSetting', 'make_BootSettings', 'make_BootTarget',
+               'make_ConnectionBoot', 'make_EnclosureGroupV200', 'make_EthernetSettingsV2', 'make_EthernetSettingsV3',
+               'make_FirmwareSettingsV3', 'make_LocalStorageEmbeddedController', 'make_LocalStorageSettingsV3',
+               'make_LogicalDriveV3', 'make_LogicalInterconnectGroupV2', 'make_LogicalInterconnectGroupV3',
+               'make_ProfileConnectionV4', 'make_SanStorageV3', 'make_ServerProfileTemplateV1', 'make_ServerProfileV5',
+               'make_StoragePathV2', 'make_UplinkSetGroupV2', 'make_VolumeAttachmentV2', 'make_alertMap_dict',
+               'make_appliance_network_config_dict', 'make_audit_log_dict', 'make_connectionInfo_dict',
+               'make_datacenter_dict', 'make_enclosure_dict', 'make_enet_settings', 'make_ephemeral_volume_dict',
+               'make_ethernet_networkV3', 'make_eula_dict', 'make_event_detail_dict', 'make_event_dict',
+               'make_fc_networkV2', 'make_initial_password_change_dict', 'make_interconnect_map_template',
+               'make_ls_firmware_dict', 'make_monitored_enclosure_dict', 'make_network_set', 'make_port_config_info',
+               'make_powerdevice_dict', 'make_powerstate_dict', 'make_rack_dict', 'make_server_dict',
+               'make_server_type_dict', 'make_snmpconfiguration_dict', 'make_storage_system_dict',
+               'make_storage_vol_templateV3', 'make_storage_volume', 'make_trapdestinations_dict',
+               'make_update_alert_dict', 'make_user_dict', 'make_user_modify_dict', 'pages', 'print_entity',
+               'print_task_tuple', 'set_iobay_occupancy', 'transform_list_to_dict', 'uri'),
+    'connection': ('ConnectionPool', 'DEFAULT_CONNECT_TIMEOUT', 'DEFAULT_DOWNLOAD_MAX_RETRIES',
+                   'DEFAULT_DOWNLOAD_SEGMENT_SIZE', 'DEFAULT_POOL_IDLE_TIMEOUT', 'DEFAULT_POOL_MAX_CONNECTIONS',
+                   'DEFAULT_READ_TIMEOUT', 'DOWNLOAD_CHUNK_SIZE', 'MSG_FILE_CHANGED_DURING_UPLOAD',
+                   'MSG_RANGE_NOT_HONORED', 'MULTIPART_BOUNDARY', 'RESUMABLE_DOWNLOAD_ERRORS',
+                   'STALE_CONNECTION_ERRORS', 'STALE_CONNECTION_ERROR_NUMBERS', 'UPLOAD_CHUNK_SIZE', 'connection',
+                   'logger'),
+    'servers': ('deprecated', 'servers'),
+    'activity': ('TaskCompletedStates', 'TaskErrorStates', 'TaskPendingStates', 'activity', 'deprecated'),
+    'networking': ('deprecated', 'networking'),
+    'security': ('deprecated', 'security'),
+    'settings': ('deprecated', 'settings'),
+    'exceptions': ('HPOneViewCancelledError', 'HPOneViewCircuitOpen', 'HPOneViewException', 'HPOneViewInvalidResource',
+                   'HPOneViewResourceNotFound', 'HPOneViewTaskError', 'HPOneViewTimeout', 'HPOneViewUnknownType',
+                   'HPOneViewValueError', 'handle_exceptions', 'logger'),
+    'search': ('deprecated', 'search'),
+    'metrics': ('deprecated', 'metrics'),
+    'storage': ('deprecated', 'storage'),
+    'fcsans': ('deprecated', 'fcsans'),
+    'facilities': ('deprecated', 'facilities'),
+    'uncategorized': ('deprecated', 'uncategorized'),
+}
+
+LAZY_IMPORT = os.environ.get('ONEVIEWSDK_LAZY_IMPORT', '').lower() in ('1', 'true', 'yes') and \
+    PYTHON_VERSION >= (3, 7)
+
+if LAZY_IMPORT:
+    # The legacy modules are imported on the first access of one of their names, e.g. hpOneView.make_server_dict
+    import importlib
+    import logging
+    import types
+
+    from hpOneView.exceptions import handle_exceptions
+
+    # Name of the legacy module of each name, following the precedence of the star imports
+    LAZY_NAMES = dict((name, module_name) for module_name in LEGACY_MODULES for name in LEGACY_NAMES[module_name])
+
+    # The star import of the package imports all the legacy modules
+    __all__ = sorted(LAZY_NAMES)
+
+    class _LazyPackage(types.ModuleType):
+        def __setattr__(self, name, value):
+            # The import system binds a submodule to its package when it is loaded, which would hide the class of the
+            # same name exported by the legacy module, like hpOneView.activity.
+            if LAZY_NAMES.get(name) == name and isinstance(value, types.ModuleType):
+                return
+            super().__setattr__(name, value)
+
+    sys.modules[__name__].__class__ = _LazyPackage
+
+    def __getattr__(name):
+        module_name = LAZY_NAMES.get(name)
+        if module_name is None:
+            raise AttributeError("module 'hpOneView' has no attribute '%s'" % name)
+        value = globals()[name] = getattr(importlib.import_module('hpOneView.' + module_name), name)
+        return value
+else:
+    from hpOneView.common import *
+    from hpOneView.connection import *
+    from hpOneView.servers import *
+    from hpOneView.activity import *
+    from hpOneView.networking import *
+    from hpOneView.security import *
+    from hpOneView.settings import *
+    from hpOneView.exceptions import *
+    from hpOneView.search import *
+    from hpOneView.metrics import *
+    from hpOneView.storage import *
+    from hpOneView.fcsans import *
+    from hpOneView.facilities import *
+    from hpOneView.uncategorized import *
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
@@ -72,6 +154,8 @@ sys.excepthook = handle_exceptions
 
 
 def main():
+    from hpOneView.connection import connection
+
     parser = argparse.ArgumentParser(add_help=True, description='Usage')
     parser.add_argument('-a', '--appliance', dest='host', required=True,
                         help='HPE OneView Appliance hostname or IP')
@@ -0,0 +1,630 @@
+# -*- coding: utf-8 -*
+
+"""
+connection.py
+~~~~~~~~~~~~~~
+
+This module maintains the asyncio communication with the appliance. It requires Python 3.7 or later.
+"""
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import asyncio
+import http.client
+import inspect
+import logging
+import socket
+import ssl
+import time
+
+from hpOneView.common import uri
+from hpOneView.connection import ConnectionPool, DEFAULT_CONNECT_TIMEOUT, DEFAULT_POOL_MAX_CONNECTIONS, \
+    DEFAULT_POOL_IDLE_TIMEOUT, DEFAULT_READ_TIMEOUT
+from hpOneView.deadline import get_current_deadline
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_codec import create_json_codec
+from hpOneView.retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+HTTPS_PORT = 443
+
+CHUNK_SIZE = 4096
+
+MSG_PROXY_TUNNEL_FAILED = 'Tunnel connection failed: %d %s'
+MSG_PROXY_NOT_SUPPORTED = 'Connections through a proxy require Python 3.11 or later'
+
+# Errors raised when a reused connection was closed by the appliance while idle
+STALE_CONNECTION_ERRORS = (http.client.BadStatusLine, asyncio.IncompleteReadError, ConnectionError)
+
+
+class AsyncResponse(object):
+    """
+    Status and headers of an HTTP response, with the same attributes used from http.client.HTTPResponse.
+
+    Args:
+        version: HTTP version of the response, e.g. 'HTTP/1.1'.
+        status: Status code.
+        reason: Reason phrase.
+        headers: Dict with the headers, whose names are lowercase.
+    """
+
+    def __init__(self, version, status, reason, headers):
+        self.version = version
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.will_close = version == 'HTTP/1.0' or headers.get('connection', '').lower() == 'close'
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class StreamConnection(object):
+    """
+    A keep-alive connection to the appliance over asyncio streams, which can be kept in a ConnectionPool.
+
+    Args:
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def sock(self):
+        # Like in HTTPSConnection, sock is None once the connection is closed
+        if self.writer.is_closing() or self.reader.at_eof():
+            return None
+        return self.writer.get_extra_info('socket')
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncConnection(object):
+    """
+    asyncio counterpart of hpOneView.connection.connection.
+
+    Requests are sent through non-blocking sockets, reusing the keep-alive connections to the appliance. The REST
+    verbs return the same (task, body) tuples as the blocking connection. The Deadline active when a request starts
+    limits its timeouts and retries, like in the blocking connection.
+
+    Args:
+        applianceIp: Appliance hostname or IP address.
+        api_version: OneView API version.
+    """
+
+    def __init__(self, applianceIp, api_version=300):
+        self._session = None
+        self._host = applianceIp
+        self._cred = None
+        self._apiVersion = int(api_version)
+        self._headers = {
+            'X-API-Version': self._apiVersion,
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'}
+        self._proxyHost = None
+        self._proxyPort = None
+        self._doProxy = False
+        self._sslTrustedBundle = None
+        self._sslTrustAll = True
+        self._validateVersion = False
+        self._ssl_context = None
+        self._connection_pool = ConnectionPool()
+        self._retry_policy = RetryPolicy()
+        self._json_codec = create_json_codec()
+        self._connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self._read_timeout = DEFAULT_READ_TIMEOUT
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def validateVersion(self):
+        version = await self.get(uri['version'])
+        if 'minimumVersion' in version:
+            if self._apiVersion < version['minimumVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        if 'currentVersion' in version:
+            if self._apiVersion > version['currentVersion']:
+                raise HPOneViewException('Unsupported API Version')
+        self._validateVersion = True
+
+    def set_proxy(self, proxyHost, proxyPort):
+        self._proxyHost = proxyHost
+        self._proxyPort = proxyPort
+        self._doProxy = True
+        self._connection_pool.clear()
+
+    def set_trusted_ssl_bundle(self, sslBundle):
+        self._sslTrustAll = False
+        self._sslTrustedBundle = sslBundle
+        self._ssl_context = None
+        self._connection_pool.clear()
+
+    def set_connection_pool(self, max_connections=DEFAULT_POOL_MAX_CONNECTIONS, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        """
+        Configures the pool of keep-alive connections to the appliance. Idle connections are closed.
+
+        Args:
+            max_connections: Maximum number of idle connections kept. Use 0 to open a new connection for each request.
+            idle_timeout: Seconds an idle connection is kept before being discarded.
+        """
+        self._connection_pool.clear()
+        self._connection_pool = ConnectionPool(max_connections, idle_timeout)
+
+    def set_timeouts(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT):
+        """
+        Sets the timeouts of the requests. When a Deadline is active, the timeouts are limited to its remaining time.
+
+        Args:
+            connect_timeout: Seconds to wait for the connection to be established. Use None to wait forever.
+            read_timeout: Seconds to wait for each read of a response. Use None to wait forever.
+        """
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+
+    def set_retry_policy(self, retry_policy):
+        """
+        Sets the policy that decides when a failed request is sent again.
+
+        Args:
+            retry_policy (RetryPolicy): The policy. Use RetryPolicy(max_attempts=1) to disable the retries.
+        """
+        self._retry_policy = retry_policy
+
+    def get_retry_policy(self):
+        return self._retry_policy
+
+    def set_json_codec(self, json_codec):
+        """
+        Sets the codec of the JSON request and response bodies.
+
+        Args:
+            json_codec (JsonCodec): The codec. See hpOneView.json_codec.create_json_codec.
+        """
+        self._json_codec = json_codec
+
+    def get_json_codec(self):
+        return self._json_codec
+
+    def get_session(self):
+        return self._session
+
+    def get_session_id(self):
+        return self._headers.get('auth')
+
+    def set_session_id(self, session_id):
+        self._headers['auth'] = session_id
+        self._session = True
+
+    def get_host(self):
+        return self._host
+
+    def make_url(self, path):
+        return 'https://%s%s' % (self._host, path)
+
+    def close(self):
+        """
+        Closes the idle connections to the appliance.
+        """
+        self._connection_pool.clear()
+
+    async def do_http(self, method, path, body, custom_headers=None):
+        http_headers = self._headers.copy()
+        if custom_headers:
+            http_headers.update(custom_headers)
+
+        deadline = get_current_deadline()
+        return await self.__execute(method, path, lambda: self.__do_http_attempt(method, path, body, http_headers,
+                                                                                 deadline), deadline=deadline)
+
+    async def __do_http_attempt(self, method, path, body, http_headers, deadline):
+        conn, resp = await self.__open_response(method, path, body, http_headers, deadline)
+        try:
+            tempbytes = b''.join([chunk async for chunk in self.__iter_body(conn, method, resp, deadline)])
+        except Exception:
+            conn.close()
+            raise
+        self.__release_connection(conn, resp)
+
+        if tempbytes:
+            body = self.__decode_body(tempbytes)
+        return resp, body
+
+    def __decode_body(self, data):
+        try:
+            return self._json_codec.loads(data)
+        except ValueError:
+            pass
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:  # Might be binary data
+            return data
+
+    async def download_to_stream(self, stream_writer, url, body='', method='GET', custom_headers=None):
+        """
+        Writes the content of the response to the stream as it is received.
+
+        Args:
+            stream_writer: Object with a write method, either a regular function or a coroutine function.
+            url: URI of the content.
+
+        Returns:
+            bool: Indicates if the content was successfully downloaded.
+        """
+        http_headers = self._headers.copy()
+        if custom_headers:
+            http_headers.update(custom_headers)
+
+        deadline = get_current_deadline()
+
+        async def send():
+            conn, resp = await self.__open_response(method, url, body, http_headers, deadline)
+            return resp, conn
+
+        resp, conn = await self.__execute(method, url, send, release=lambda resp, conn: conn.close(),
+                                          deadline=deadline)
+        try:
+            if resp.status >= 400:
+                await self.__handle_download_error(conn, method, resp, deadline)
+
+            async for chunk in self.__iter_body(conn, method, resp, deadline):
+                written = stream_writer.write(chunk)
+                if inspect.isawaitable(written):
+                    await written
+        except Exception:
+            conn.close()
+            raise
+        self.__release_connection(conn, resp)
+
+        return True
+
+    async def __execute(self, method, path, send, release=None, deadline=None):
+        """
+        Awaits the attempts of a request until the retry policy gives up, like RetryPolicy.execute.
+        """
+        start = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            failure = None
+            try:
+                result = await send()
+            except Exception as error:
+                delay = self._retry_policy.get_retry_delay(method, attempt, time.time() - start, error=error)
+                if delay is None:
+                    raise
+                failure = error
+                reason = repr(error)
+            else:
+                response = result[0]
+                delay = self._retry_policy.get_retry_delay(method, attempt, time.time() - start, response=response)
+                if delay is None or (deadline is not None and deadline.clip(delay) < delay):
+                    return result
+                if release is not None:
+                    release(*result)
+                reason = 'status %s' % response.status
+
+            if failure is not None and deadline is not None and deadline.clip(delay) < delay:
+                # The deadline would be exceeded by the wait
+                raise failure
+
+            self._retry_policy.log_retry(method, path, attempt, reason, delay)
+            await asyncio.sleep(delay)
+
+    async def __handle_download_error(self, conn, method, resp, deadline):
+        tempbytes = b''.join([chunk async for chunk in self.__iter_body(conn, method, resp, deadline)])
+        body = self.__decode_body(tempbytes)
+        if not body:
+            body = "Error " + str(resp.status)
+
+        raise HPOneViewException(body)
+
+    async def __open_response(self, method, path, body, http_headers, deadline):
+        """
+        Sends the request using a pooled connection when one is available. A pooled connection closed by the
+        appliance while idle is transparently replaced by a new one.
+
+        Returns:
+            tuple: The connection and the response, whose body was not read yet.
+        """
+        if deadline is not None:
+            deadline.check()
+
+        conn = self._connection_pool.acquire()
+        if conn is not None:
+            try:
+                return conn, await self.__send_request(conn, method, path, body, http_headers, deadline)
+            except Exception as error:
+                conn.close()
+                if not isinstance(error, STALE_CONNECTION_ERRORS):
+                    raise
+                logger.debug('Pooled connection was closed by the appliance. Reconnecting...')
+
+        conn = await self.get_connection(deadline)
+        try:
+            return conn, await self.__send_request(conn, method, path, body, http_headers, deadline)
+        except Exception:
+            conn.close()
+            raise
+
+    def __release_connection(self, conn, resp):
+        if resp.will_close:
+            conn.close()
+        else:
+            self._connection_pool.release(conn)
+
+    async def __send_request(self, conn, method, path, body, http_headers, deadline):
+        if body is None:
+            body = b''
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+
+        lines = ['%s %s HTTP/1.1' % (method, path), 'Host: %s' % self._host, 'Accept-Encoding: identity']
+        lines.extend('%s: %s' % (name, value) for name, value in http_headers.items())
+        lines.append('Content-Length: %d' % len(body))
+
+        conn.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.__wait_for(conn.writer.drain(), self._read_timeout, deadline)
+
+        resp = await self.__wait_for(self.__read_response_head(conn.reader), self._read_timeout, deadline)
+        while 100 <= resp.status < 200:
+            # Interim responses, like 100 Continue, are followed by the actual response
+            resp = await self.__wait_for(self.__read_response_head(conn.reader), self._read_timeout, deadline)
+        return resp
+
+    async def __wait_for(self, awaitable, timeout, deadline):
+        """
+        Awaits a step of a request, like the connection or a read, for at most the timeout, limited to the remaining
+        time of the deadline.
+
+        Raises:
+            socket.timeout: When the timeout expires, like in the blocking connection.
+        """
+        try:
+            if deadline is not None:
+                deadline.check()
+                timeout = deadline.clip(timeout)
+        except Exception:
+            awaitable.close()
+            raise
+        if timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise socket.timeout('timed out')
+
+    async def __read_response_head(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected('Remote end closed connection without response')
+
+        try:
+            version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+            status = int(status)
+        except ValueError:
+            raise http.client.BadStatusLine(status_line)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        return AsyncResponse(version, status, reason, headers)
+
+    async def __iter_body(self, conn, method, resp, deadline):
+        reader = conn.reader
+
+        def read(awaitable):
+            return self.__wait_for(awaitable, self._read_timeout, deadline)
+
+        if method == 'HEAD' or resp.status in (204, 304):
+            return
+
+        if 'chunked' in resp.getheader('Transfer-Encoding', '').lower():
+            while True:
+                size_line = await read(reader.readline())
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+                if size == 0:
+                    # Skips the trailer headers
+                    while (await read(reader.readline())) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                while size > 0:
+                    chunk = await read(reader.readexactly(min(size, CHUNK_SIZE)))
+                    size -= len(chunk)
+                    yield chunk
+                await read(reader.readexactly(2))
+
+        elif resp.getheader('Content-Length') is not None:
+            remaining = int(resp.getheader('Content-Length'))
+            while remaining > 0:
+                chunk = await read(reader.read(min(remaining, CHUNK_SIZE)))
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+                remaining -= len(chunk)
+                yield chunk
+
+        else:
+            # The body ends when the appliance closes the connection
+            resp.will_close = True
+            while True:
+                chunk = await read(reader.read(CHUNK_SIZE))
+                if not chunk:
+                    return
+                yield chunk
+
+    def __get_ssl_context(self):
+        if self._ssl_context is None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+            if self._sslTrustAll is False:
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.load_verify_locations(self._sslTrustedBundle)
+            else:
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    async def get_connection(self, deadline=None):
+        context = self.__get_ssl_context()
+        if self._doProxy is False:
+            reader, writer = await self.__wait_for(asyncio.open_connection(self._host, HTTPS_PORT, ssl=context),
+                                                   self._connect_timeout, deadline)
+            return StreamConnection(reader, writer)
+
+        reader, writer = await self.__wait_for(asyncio.open_connection(self._proxyHost, self._proxyPort),
+                                               self._connect_timeout, deadline)
+        conn = StreamConnection(reader, writer)
+        try:
+            if not hasattr(writer, 'start_tls'):
+                raise HPOneViewException(MSG_PROXY_NOT_SUPPORTED)
+
+            target = '%s:%d' % (self._host, HTTPS_PORT)
+            writer.write(('CONNECT %s HTTP/1.1\r\nHost: %s\r\n\r\n' % (target, target)).encode('latin-1'))
+            await self.__wait_for(writer.drain(), self._connect_timeout, deadline)
+            resp = await self.__wait_for(self.__read_response_head(reader), self._connect_timeout, deadline)
+            if resp.status != 200:
+                raise OSError(MSG_PROXY_TUNNEL_FAILED % (resp.status, resp.reason))
+
+            await self.__wait_for(writer.start_tls(context, server_hostname=self._host), self._connect_timeout,
+                                  deadline)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    async def get(self, uri):
+        resp, body = await self.do_http('GET', uri, '')
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 302:
+            body = await self.get(resp.getheader('Location'))
+        return body
+
+    async def delete(self, uri, custom_headers=None):
+        return await self.__do_rest_call('DELETE', uri, {}, custom_headers=custom_headers)
+
+    async def put(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PUT', uri, body, custom_headers=custom_headers)
+
+    async def post(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('POST', uri, body, custom_headers=custom_headers)
+
+    async def patch(self, uri, body, custom_headers=None):
+        return await self.__do_rest_call('PATCH', uri, body, custom_headers=custom_headers)
+
+    def __body_content_is_task(self, body):
+        return isinstance(body, dict) and 'category' in body and body['category'] == 'tasks'
+
+    async def __get_task_from_response(self, response, body):
+        location = response.getheader('Location')
+        if location:
+            task = await self.get(location)
+        elif 'taskState' in body:
+            # This check is needed to handle a status response 202 without the location header,
+            # as is for PowerDevices. We are not sure if there are more resources with the same behavior.
+            task = body
+        else:
+            # For the resource Label the status is 202 but the response not contains a task.
+            task = None
+        return task
+
+    async def __do_rest_call(self, http_method, uri, body, custom_headers):
+        resp, body = await self.do_http(method=http_method,
+                                        path=uri,
+                                        body=self._json_codec.dumps(body),
+                                        custom_headers=custom_headers)
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+
+        if resp.status == 304:
+            if body and not isinstance(body, dict):
+                try:
+                    body = self._json_codec.loads(body)
+                except Exception:
+                    pass
+        elif resp.status == 202:
+            task = await self.__get_task_from_response(resp, body)
+            return task, body
+
+        if self.__body_content_is_task(body):
+            return body, body
+
+        return None, body
+
+    async def login(self, cred, verbose=False):
+        if self._validateVersion is False:
+            await self.validateVersion()
+
+        self._cred = cred
+        try:
+            task, body = await self.post(uri['loginSessions'], self._cred)
+        except HPOneViewException:
+            logger.exception('Login failed')
+            raise
+        auth = body['sessionID']
+        # Add the auth ID to the headers dictionary
+        self._headers['auth'] = auth
+        self._session = True
+        if verbose is True:
+            print(('Session Key: ' + auth))
+        logger.info('Logged in successfully')
+
+    async def logout(self, verbose=False):
+        try:
+            await self.delete(uri['loginSessions'])
+        except HPOneViewException:
+            logger.exception('Logout failed')
+            raise
+        if verbose is True:
+            print('Logged Out')
+        del self._headers['auth']
+        self._session = False
+        logger.info('Logged out successfully')
+        return None
+
+    def enable_etag_validation(self):
+        """
+        Enable the concurrency control for the PUT and DELETE requests, in which the requests are conditionally
+        processed only if the provided entity tag in the body matches the latest entity tag stored for the resource.
+
+        The eTag validation is enabled by default.
+        """
+        self._headers.pop('If-Match', None)
+
+    def disable_etag_validation(self):
+        """
+        Disable the concurrency control for the PUT and DELETE requests. The requests will be forced without specifying
+        an explicit ETag. This method sets an If-Match header of "*".
+        """
+        self._headers['If-Match'] = '*'
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import logging
+
+from hpOneView.aio.task_monitor import AsyncTaskMonitor
+from hpOneView.exceptions import HPOneViewUnknownType
+from hpOneView.resources.resource import ResourceClient
+from hpOneView.resources.resource import RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED, RESOURCE_CLIENT_INVALID_FIELD
+from hpOneView.resources.resource import RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResourceClient(object):
+    """
+    asyncio counterpart of hpOneView.resources.resource.ResourceClient, for use with an AsyncConnection.
+
+    The URIs are built by a ResourceClient, so both clients accept the same arguments.
+
+    Args:
+        con: AsyncConnection
+        uri: Resource collection URI
+    """
+
+    def __init__(self, con, uri):
+        self._connection = con
+        self._uri = uri
+        self._task_monitor = AsyncTaskMonitor(con)
+        self._uri_builder = ResourceClient(con, uri)
+
+    async def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Gets all items according with the given arguments, following the pages of the collection.
+
+        See ResourceClient.get_all for the description of the arguments.
+
+        Returns:
+            list: A list of items matching the specified filter.
+        """
+        items = []
+        async for members in self.iter_pages(start, count, filter, query, sort, view, fields, uri):
+            items += members
+
+        logger.debug('Total # of members found = {0}'.format(str(len(items))))
+        return items
+
+    async def iter_pages(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Asynchronously iterates over the pages of the collection, requesting each page only when it is needed.
+
+        See ResourceClient.get_all for the description of the arguments.
+
+        Returns:
+            Async iterator over the lists of members of each page.
+        """
+        uri = self._uri_builder.build_query_uri(start, count, filter, query, sort, view, fields, uri)
+        items_count = 0
+
+        while uri:
+            logger.debug('Making HTTP request to get all resources. Uri: {0}'.format(uri))
+            response = await self._connection.get(uri)
+            members = response.get('members', []) if response else []
+            items_count += len(members)
+
+            uri = self.__get_next_page(response, items_count, count)
+            if members:
+                yield members
+
+    async def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Asynchronously iterates over the items of the collection, one page at a time.
+
+        See ResourceClient.get_all for the description of the arguments.
+
+        Returns:
+            Async iterator over the items matching the specified filter.
+        """
+        async for members in self.iter_pages(start, count, filter, query, sort, view, fields, uri):
+            for member in members:
+                yield member
+
+    async def get(self, id_or_uri):
+        """
+        Args:
+            id_or_uri: Can be either the resource ID or the resource URI.
+
+        Returns:
+             The requested resource.
+        """
+        uri = self.build_uri(id_or_uri)
+        logger.debug('Get resource (uri = %s, ID = %s)' %
+                     (uri, str(id_or_uri)))
+        return await self._connection.get(uri)
+
+    async def get_by(self, field, value, uri=None):
+        """
+        This function uses get_all passing a filter.
+
+        The search is case-insensitive.
+
+        Args:
+            field: Field name to filter.
+            value: Value to filter.
+            uri: Resource uri.
+
+        Returns:
+            dict
+        """
+        if not field:
+            logger.exception(RESOURCE_CLIENT_INVALID_FIELD)
+            raise ValueError(RESOURCE_CLIENT_INVALID_FIELD)
+
+        logger.debug('Get by (uri = %s, field = %s, value = %s)' %
+                     (uri or self._uri, field, str(value)))
+
+        filter = "\"{0}='{1}'\"".format(field, value)
+        results = await self.get_all(filter=filter, uri=uri)
+
+        # Workaround when the OneView filter does not work, it will filter again
+        if "." not in field:
+            # This filter only work for the first level
+            results = [item for item in results if str(item.get(field, '')).lower() == value.lower()]
+
+        return results
+
+    async def get_by_name(self, name):
+        """
+        Retrieve a resource by its name.
+
+        Args:
+            name: Resource name.
+
+        Returns:
+            dict
+        """
+        result = await self.get_by('name', name)
+        if not result:
+            return None
+        else:
+            return result[0]
+
+    async def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}):
+        """
+        Makes a POST request to create a resource when a request body is required.
+
+        See ResourceClient.create for the description of the arguments.
+
+        Returns:
+            Created resource.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if not uri:
+            uri = self._uri
+
+        logger.debug('Create (uri = %s, resource = %s)' %
+                     (uri, str(resource)))
+
+        resource = self.merge_default_values(resource, default_values)
+
+        task, entity = await self._connection.post(uri, resource, custom_headers=custom_headers)
+
+        if not task:
+            return entity
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    async def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}):
+        """
+        Makes a PUT request to update a resource when a request body is required.
+
+        See ResourceClient.update for the description of the arguments.
+
+        Returns:
+            Updated resource.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        logger.debug('Update async (uri = %s, resource = %s)' %
+                     (self._uri, str(resource)))
+
+        if not uri:
+            uri = resource['uri']
+
+        if force:
+            uri += '?force=True'
+
+        resource = self.merge_default_values(resource, default_values)
+
+        task, body = await self._connection.put(uri, resource, custom_headers=custom_headers)
+
+        if not task:
+            return body
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    async def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+        """
+        Makes a DELETE request to remove a resource.
+
+        Args:
+            resource: Resource dict with the 'uri' key, or the resource ID or URI.
+            force: If set to true, the operation completes despite any problems with the resource.
+            timeout: Timeout in seconds. The timeout does not abort the operation in OneView.
+            custom_headers: Allows set specific HTTP headers.
+
+        Returns:
+            bool: Indicates whether the resource was successfully deleted.
+        """
+        if not resource:
+            logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+            raise ValueError(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
+
+        if isinstance(resource, dict):
+            if 'uri' in resource and resource['uri']:
+                uri = resource['uri']
+            else:
+                logger.exception(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+                raise HPOneViewUnknownType(RESOURCE_CLIENT_UNKNOWN_OBJECT_TYPE)
+        else:
+            uri = self.build_uri(resource)
+
+        if force:
+            uri += '?force=True'
+
+        logger.debug("Delete resource (uri = %s, resource = %s)" %
+                     (self._uri, str(resource)))
+
+        task, body = await self._connection.delete(uri, custom_headers=custom_headers)
+
+        if not task:
+            # 204 NO CONTENT
+            # Successful return from a synchronous delete operation.
+            return True
+
+        return await self._task_monitor.wait_for_task(task, timeout=timeout)
+
+    async def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
+        """
+        Uses the PATCH to update a resource.
+
+        See ResourceClient.patch for the description of the arguments.
+
+        Returns:
+            Updated resource.
+        """
+        patch_request_body = [{'op': operation, 'path': path, 'value': value}]
+
+        return await self.patch_request(id_or_uri=id_or_uri,
+                                        body=patch_request_body,
+                                        timeout=timeout,
+                                        custom_headers=custom_headers)
+
+    async def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None):
+        """
+        Uses the PATCH to update a resource.
+
+        See ResourceClient.patch_request for the description of the arguments.
+
+        Returns:
+            Updated resource.
+        """
+        uri = self.build_uri(id_or_uri)
+
+        logger.debug('Patch resource (uri = %s, data = %s)' % (uri, body))
+
+        custom_headers_copy = custom_headers.copy() if custom_headers else {}
+        if self._connection._apiVersion >= 300 and 'Content-Type' not in custom_headers_copy:
+            custom_headers_copy['Content-Type'] = 'application/json-patch+json'
+
+        task, entity = await self._connection.patch(uri, body, custom_headers=custom_headers_copy)
+
+        if not task:
+            return entity
+
+        return await self._task_monitor.wait_for_task(task, timeout)
+
+    async def download(self, uri, file_path):
+        """
+        Downloads the contents of the requested URI to a file.
+
+        Args:
+            uri: URI
+            file_path: File path destination
+
+        Returns:
+            bool: Indicates if the file was successfully downloaded.
+        """
+        with open(file_path, 'wb') as file:
+            return await self._connection.download_to_stream(file, uri)
+
+    def build_uri(self, id_or_uri):
+        return self._uri_builder.build_uri(id_or_uri)
+
+    def build_subresource_uri(self, resource_id_or_uri=None, subresource_id_or_uri=None, subresource_path=''):
+        return self._uri_builder.build_subresource_uri(resource_id_or_uri, subresource_id_or_uri, subresource_path)
+
+    def merge_default_values(self, resource, default_values):
+        return self._uri_builder.merge_default_values(resource, default_values)
+
+    def __get_next_page(self, response, items_count, requested_count):
+        next_page_is_empty = response.get('nextPageUri') is None
+        has_different_next_page = not response.get('uri') == response.get('nextPageUri')
+        has_next_page = not next_page_is_empty and has_different_next_page
+
+        if items_count >= requested_count and requested_count != -1:
+            return None
+
+        return response.get('nextPageUri') if has_next_page else None
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import asyncio
+import logging
+
+from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewUnknownType
+from hpOneView.resources.task_monitor import TaskMonitor, check_task_errors
+from hpOneView.resources.task_monitor import TASK_PENDING_STATES, TASK_DELETED_NAMES, UNLIMITED_TIMEOUT
+from hpOneView.resources.task_monitor import MSG_INVALID_TASK, MSG_TIMEOUT, MSG_UNKNOWN_OBJECT_TYPE
+from hpOneView.resources.task_monitor import MSG_TASK_TYPE_UNRECONIZED
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTaskMonitor(object):
+    """
+    asyncio counterpart of hpOneView.resources.task_monitor.TaskMonitor, which waits for the tasks without blocking
+    the event loop.
+
+    The polling intervals are estimated by the same TaskPollingScheduler used by the TaskMonitor, which also shares
+    the history of task durations.
+
+    Args:
+        con: AsyncConnection
+    """
+
+    # Seconds to wait when a connection failure occurs
+    CONNECTION_FAILURE_TIMEOUT = TaskMonitor.CONNECTION_FAILURE_TIMEOUT
+
+    # Decides which errors of the task requests are tolerated as network instability, up to the timeout
+    connection_failure_policy = TaskMonitor.connection_failure_policy
+
+    polling_scheduler = TaskMonitor.polling_scheduler
+
+    def __init__(self, con):
+        self._connection = con
+
+    @staticmethod
+    def get_current_seconds():
+        return TaskMonitor.get_current_seconds()
+
+    async def wait_for_task(self, task, timeout=-1):
+        """
+        Wait for task execution and return associated resource.
+
+        Args:
+            task: task dict
+            timeout: timeout in seconds
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        await self.__wait_task_completion(task, timeout)
+
+        task = await self.get(task)
+
+        logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
+        logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+
+        task_response = await self.get_task_response(task)
+        logger.debug('Task completed')
+        return task_response
+
+    async def get_completed_task(self, task, timeout=-1):
+        """
+        Waits until the task is completed and returns the task resource.
+
+        Args:
+            task: TaskResource
+            timeout: Timeout in seconds
+
+        Returns:
+            dict: TaskResource
+        """
+        await self.__wait_task_completion(task, timeout)
+
+        return await self.get(task)
+
+    async def __wait_task_completion(self, task, timeout):
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        logger.debug('Waiting for task completion...')
+
+        start_time = self.get_current_seconds()
+        connection_failure_control = dict(last_success=self.get_current_seconds())
+        polling_state = self.polling_scheduler.start()
+
+        while await self.is_task_running(task, connection_failure_control):
+            current_task = connection_failure_control.get('last_task', task)
+
+            interval = self.polling_scheduler.next_interval(current_task, polling_state)
+
+            logger.debug("Waiting for task. Percentage complete: " + str(current_task.get('computedPercentComplete')))
+            logger.debug("Waiting for task. Task state: " + str(current_task.get('taskState')))
+
+            await asyncio.sleep(interval)
+            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+
+        if 'last_task' in connection_failure_control:
+            self.polling_scheduler.record(connection_failure_control['last_task'], polling_state)
+
+    async def get_task_response(self, task):
+        """
+        Get the response of a completed task.
+
+        Args:
+            task: task dict of a completed task
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        check_task_errors(task)
+
+        if 'name' in task and task['name'] in TASK_DELETED_NAMES:
+            return True
+
+        if 'type' in task and task['type'].startswith('Task'):
+            # get associated resource when is not a delete task
+            task, entity = await self.get_associated_resource(task)
+            return entity
+
+        logger.warning('Task completed, unknown response: ' + str(task))
+        return task
+
+    async def is_task_running(self, task, connection_failure_control=None):
+        """
+        Check if a task is running according to: TASK_PENDING_STATES ['New', 'Starting',
+        'Pending', 'Running', 'Suspended', 'Stopping']
+
+        Args:
+            task (dict): OneView Task resource.
+            connection_failure_control (dict):
+                A dictionary instance that contains last_success for error tolerance control.
+
+        Returns:
+            True when in TASK_PENDING_STATES; False when not.
+        """
+        if 'uri' in task:
+            try:
+                task = await self.get(task)
+                if connection_failure_control:
+                    # Updates last success
+                    connection_failure_control['last_success'] = self.get_current_seconds()
+                    connection_failure_control['last_task'] = task
+                if 'taskState' in task and task['taskState'] in TASK_PENDING_STATES:
+                    return True
+
+            except Exception as error:
+                logger.error('; '.join(str(e) for e in error.args) + ' when waiting for the task: ' + str(task))
+
+                if not connection_failure_control:
+                    raise error
+
+                elapsed = self.get_current_seconds() - connection_failure_control['last_success']
+                if self.connection_failure_policy.get_retry_delay('GET', 1, elapsed, error=error) is not None:
+                    # Return task is running when network instability occurs
+                    return True
+                raise error
+
+        return False
+
+    async def get(self, task):
+        """
+        Retrieve a task by its uri.
+
+        Args:
+            task: task dict, must have 'uri' key.
+
+        Returns:
+            task dict
+        """
+        return await self._connection.get(task['uri'])
+
+    async def get_associated_resource(self, task):
+        """
+        Retrieve a resource associated with a task.
+
+        Args:
+            task: task dict
+
+        Returns:
+            tuple: task (updated), the entity found (dict)
+        """
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        if task['category'] != 'tasks' and task['category'] != 'backups':
+            raise HPOneViewUnknownType(MSG_UNKNOWN_OBJECT_TYPE)
+
+        if task['type'] == 'TaskResourceV2':
+            resource_uri = task['associatedResource']['resourceUri']
+
+            if resource_uri and resource_uri.startswith("/rest/appliance/support-dumps/"):
+                # Specific for support dumps
+                return task, resource_uri
+
+        elif task['type'] == 'BACKUP':
+            task = await self._connection.get(task['taskUri'])
+            resource_uri = task['uri']
+        else:
+            raise HPOneViewInvalidResource(MSG_TASK_TYPE_UNRECONIZED % task['type'])
+
+        entity = {}
+
+        if resource_uri:
+            entity = await self._connection.get(resource_uri)
+
+        return task, entity
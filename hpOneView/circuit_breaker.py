@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*
+
+"""
+circuit_breaker.py
+~~~~~~~~~~~~~~~~~~
+
+This module implements the circuit breakers that fail fast the requests to an unavailable appliance.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import http.client
+import logging
+import socket
+import threading
+import time
+
+from hpOneView.exceptions import HPOneViewCircuitOpen
+
+logger = logging.getLogger(__name__)
+
+# States of a circuit breaker
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Number of consecutive failed requests that opens a circuit breaker
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Seconds a circuit breaker stays open before a request is let through to probe the appliance
+DEFAULT_RESET_TIMEOUT = 30
+
+# Statuses of the responses of an unavailable appliance
+FAILURE_STATUSES = (502, 503, 504)
+
+MSG_CIRCUIT_OPEN = 'The requests to %s are failing fast after %d consecutive failures. Next attempt in %.1f seconds.'
+MSG_CIRCUIT_PROBING = 'The requests to %s are failing fast while a request probes the appliance.'
+
+
+class CircuitBreaker(object):
+    """
+    Thread-safe circuit breaker of the requests to an appliance, or to some of its endpoints.
+
+    The breaker opens after failure_threshold consecutive failed requests. While it is open, the requests fail fast
+    with HPOneViewCircuitOpen instead of being sent. After reset_timeout seconds, it becomes half-open and a single
+    request is let through to probe the appliance: the breaker closes when it succeeds, and opens again when it fails.
+
+    Args:
+        name: Name of the breaker, like the appliance host.
+        failure_threshold: Number of consecutive failed requests that opens the breaker.
+        reset_timeout: Seconds the breaker stays open before a request probes the appliance.
+        on_state_change: Function called with the name, the previous state and the new state of the breaker when it
+            changes, outside of its lock.
+    """
+
+    def __init__(self, name, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 on_state_change=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._on_state_change = on_state_change
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self):
+        return self._state
+
+    def before_request(self):
+        """
+        Checks if a request can be sent.
+
+        Raises:
+            HPOneViewCircuitOpen: When the breaker is open, or half-open with a probe in flight.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+
+            if self._state == OPEN:
+                retry_in = self._opened_at + self.reset_timeout - time.time()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise HPOneViewCircuitOpen(MSG_CIRCUIT_OPEN % (self.name, self._failures, retry_in))
+                transition = self.__set_state(HALF_OPEN)
+            elif self._probing:
+                self.rejected += 1
+                raise HPOneViewCircuitOpen(MSG_CIRCUIT_PROBING % self.name)
+            else:
+                transition = None
+            self._probing = True
+
+        self.__notify(transition)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            transition = self.__set_state(CLOSED) if self._state != CLOSED else None
+        self.__notify(transition)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._opened_at = time.time()
+                transition = self.__set_state(OPEN)
+            else:
+                transition = None
+        self.__notify(transition)
+
+    def record_ignored(self):
+        """
+        Records a request whose outcome says nothing about the availability of the appliance, like one stopped by its
+        deadline, so another request can probe the appliance.
+        """
+        with self._lock:
+            self._probing = False
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: The state, the number of consecutive failures and the number of requests rejected.
+        """
+        with self._lock:
+            return dict(state=self._state, consecutive_failures=self._failures, rejected=self.rejected)
+
+    def __set_state(self, state):
+        transition = (self._state, state)
+        self._state = state
+        return transition
+
+    def __notify(self, transition):
+        if transition is None:
+            return
+
+        previous_state, state = transition
+        logger.warning('Circuit breaker of %s changed from %s to %s' % (self.name, previous_state, state))
+        if self._on_state_change is not None:
+            try:
+                self._on_state_change(self.name, previous_state, state)
+            except Exception:
+                logger.exception('Circuit breaker state change callback failed')
+
+
+class CircuitBreakers(object):
+    """
+    Circuit breakers of the requests to an appliance: one for the appliance, and optionally one for each URI prefix.
+
+    A request is governed by the breaker of the longest prefix of its URI, or by the breaker of the appliance. The
+    requests that fail with a connection error or a timeout, or that are answered with one of the failure_statuses,
+    are failures. The other responses, including the errors like 404 Not Found, are successes.
+
+    Args:
+        host: Appliance hostname or IP address.
+        failure_threshold: Number of consecutive failed requests that opens a breaker.
+        reset_timeout: Seconds a breaker stays open before a request probes the appliance.
+        prefixes: URI prefixes with their own breaker, e.g. ['/rest/server-profiles'].
+        on_state_change: Function called with the name, the previous state and the new state of a breaker when it
+            changes. The name of a breaker is the host, followed by its prefix, if any.
+        failure_statuses: HTTP statuses that are failures.
+    """
+
+    def __init__(self, host, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 prefixes=None, on_state_change=None, failure_statuses=FAILURE_STATUSES):
+        def create(name):
+            return CircuitBreaker(name, failure_threshold, reset_timeout, on_state_change)
+
+        self.failure_statuses = tuple(failure_statuses)
+        self._host_breaker = create(host)
+        # The longest prefixes are checked first
+        self._prefix_breakers = [(prefix, create(host + prefix))
+                                 for prefix in sorted(prefixes or [], key=len, reverse=True)]
+
+    def get(self, uri):
+        """
+        Gets the breaker that governs the requests to a URI.
+
+        Returns:
+            CircuitBreaker
+        """
+        for prefix, breaker in self._prefix_breakers:
+            if uri.startswith(prefix):
+                return breaker
+        return self._host_breaker
+
+    def before_request(self, uri):
+        """
+        Checks if a request can be sent. See CircuitBreaker.before_request.
+        """
+        self.get(uri).before_request()
+
+    def record(self, uri, response=None, error=None):
+        """
+        Records the outcome of a request.
+
+        Args:
+            uri: Request URI.
+            response: Response of the request, if any.
+            error: Exception raised by the request, if any.
+        """
+        breaker = self.get(uri)
+        if error is not None:
+            if isinstance(error, (http.client.HTTPException, socket.error)):
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+        elif response is not None and response.status in self.failure_statuses:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: The counters of each breaker, by name. See CircuitBreaker.get_stats.
+        """
+        breakers = [self._host_breaker] + [breaker for _, breaker in self._prefix_breakers]
+        return dict((breaker.name, breaker.get_stats()) for breaker in breakers)
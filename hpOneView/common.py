@@ -89,6 +89,7 @@ uri = {
     # ------------------------------------
     'activeSessions': '/rest/active-user-sessions',
     'loginSessions': '/rest/login-sessions',
+    'sessions': '/rest/sessions',
     'users': '/rest/users',
     'userRole': '/rest/users/role',
     'changePassword': '/rest/users/changePassword',
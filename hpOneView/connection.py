@@ -41,19 +41,161 @@ standard_library.install_aliases()
 ###
 
 import http.client
-import json
 import logging
 import shutil  # for shutil.copyfileobj()
-import mmap  # so we can upload the iso without having to load it in memory
 import os
+import socket
 import ssl
+import threading
 import time
 
+from collections import deque
+from errno import ECONNABORTED, ECONNRESET, EPIPE
+from hpOneView.circuit_breaker import CircuitBreakers, DEFAULT_FAILURE_THRESHOLD, DEFAULT_RESET_TIMEOUT
 from hpOneView.common import uri, get_members, get_member, make_eula_dict, make_initial_password_change_dict
+from hpOneView.deadline import get_current_deadline
 from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_codec import create_json_codec
+from hpOneView.json_stream import CollectionStream
+from hpOneView.request_metrics import MetricsCollector, RequestMetrics, DEFAULT_LATENCY_BUCKETS
+from hpOneView.response_cache import ResponseCache, DEFAULT_CACHE_MAX_ENTRIES
+from hpOneView.retry import RetryPolicy
+from hpOneView.single_flight import SingleFlight
+from hpOneView.throttle import RequestThrottle
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for the connection to the appliance to be established
+DEFAULT_CONNECT_TIMEOUT = 30
+
+# Seconds to wait for each read of a response, so a half-open connection does not block forever
+DEFAULT_READ_TIMEOUT = 300
+
+# Maximum number of idle keep-alive connections kept for each appliance
+DEFAULT_POOL_MAX_CONNECTIONS = 10
+
+# Seconds an idle connection is kept before being discarded
+DEFAULT_POOL_IDLE_TIMEOUT = 15
+
+# Boundary of the multipart/form-data uploads
+MULTIPART_BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
+
+# Number of bytes of a file sent at a time on uploads
+UPLOAD_CHUNK_SIZE = 1048576
+
+MSG_FILE_CHANGED_DURING_UPLOAD = 'The file %s was truncated during the upload'
+
+# Number of bytes of a response read at a time on downloads
+DOWNLOAD_CHUNK_SIZE = 65536
+
+# Number of bytes of a file requested by each ranged request of a parallel download
+DEFAULT_DOWNLOAD_SEGMENT_SIZE = 33554432
+
+# Number of times a download is resumed from the last received byte after a failure
+DEFAULT_DOWNLOAD_MAX_RETRIES = 3
+
+MSG_RANGE_NOT_HONORED = 'The appliance did not honor the range starting at byte %d of %s'
+
+# Errors after which a ranged download can be resumed
+RESUMABLE_DOWNLOAD_ERRORS = (http.client.HTTPException, socket.error)
+
+# Errors raised when sending a request on a pooled connection closed by the appliance while idle
+STALE_CONNECTION_ERRORS = (http.client.CannotSendRequest, socket.error)
+
+# Socket error numbers raised when a pooled connection was closed by the appliance before it sent any response bytes
+STALE_CONNECTION_ERROR_NUMBERS = (ECONNRESET, ECONNABORTED, EPIPE)
+
+
+class ConnectionPool(object):
+    """
+    Thread-safe pool of idle keep-alive connections to a single appliance.
+
+    Connections are reused in LIFO order, so the most recently used socket, the one least likely to have been
+    closed by the appliance, is handed out first. Connections idle for longer than idle_timeout are evicted.
+
+    Args:
+        max_connections: Maximum number of idle connections kept. Use 0 to disable the pooling.
+        idle_timeout: Seconds an idle connection is kept before being discarded.
+    """
+
+    def __init__(self, max_connections=DEFAULT_POOL_MAX_CONNECTIONS, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        self._max_connections = max_connections
+        self._idle_timeout = idle_timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Gets an idle connection from the pool.
+
+        Returns:
+            HTTPSConnection: A previously used connection, or None when no idle connection is available.
+        """
+        expired = []
+        conn = None
+        now = time.time()
+        with self._lock:
+            while self._idle:
+                candidate, released_at = self._idle.pop()
+                if now - released_at > self._idle_timeout:
+                    # The remaining connections are older than this one
+                    expired.append(candidate)
+                    expired.extend(c for c, _ in self._idle)
+                    self._idle.clear()
+                elif getattr(candidate, 'sock', None) is None:
+                    expired.append(candidate)
+                else:
+                    conn = candidate
+                    break
+
+        for stale in expired:
+            stale.close()
+
+        return conn
+
+    def release(self, conn):
+        """
+        Returns a connection to the pool. The connection is closed when the pool is full.
+
+        Args:
+            conn: A connection whose last response was completely read.
+        """
+        with self._lock:
+            if len(self._idle) < self._max_connections:
+                self._idle.append((conn, time.time()))
+                return
+        conn.close()
+
+    def clear(self):
+        """
+        Closes all idle connections.
+        """
+        with self._lock:
+            idle = [c for c, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def __len__(self):
+        return len(self._idle)
+
+
+class _CountingWriter(object):
+    """
+    Proxy of a stream that adds the number of bytes written to the bytes_received of the request metrics.
+    """
+
+    def __init__(self, stream, metrics):
+        self._stream = stream
+        self._metrics = metrics
+
+    def write(self, chunk):
+        self._metrics.bytes_received += len(chunk)
+        return self._stream.write(chunk)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
 
 class connection(object):
     def __init__(self, applianceIp, api_version=300):
@@ -75,6 +217,25 @@ class connection(object):
         self._numTotalRecords = 0
         self._numDisplayedRecords = 0
         self._validateVersion = False
+        self._ssl_context = None
+        self._connection_pool = ConnectionPool()
+        self._max_page_workers = 1
+        self._response_cache = None
+        self._download_workers = 1
+        self._download_segment_size = DEFAULT_DOWNLOAD_SEGMENT_SIZE
+        self._download_max_retries = DEFAULT_DOWNLOAD_MAX_RETRIES
+        self._retry_policy = RetryPolicy()
+        self._connect_timeout = DEFAULT_CONNECT_TIMEOUT
+        self._read_timeout = DEFAULT_READ_TIMEOUT
+        self._pre_request_hooks = []
+        self._post_request_hooks = []
+        self._metrics_collector = None
+        self._json_codec = create_json_codec()
+        self._single_flight = None
+        self._request_throttle = None
+        self._circuit_breakers = None
+        self._session_cache = None
+        self._login_lock = threading.Lock()
 
     def validateVersion(self):
         version = self.get(uri['version'])
@@ -90,10 +251,288 @@ class connection(object):
         self._proxyHost = proxyHost
         self._proxyPort = proxyPort
         self._doProxy = True
+        self._connection_pool.clear()
 
     def set_trusted_ssl_bundle(self, sslBundle):
         self._sslTrustAll = False
         self._sslTrustedBundle = sslBundle
+        self._ssl_context = None
+        self._connection_pool.clear()
+
+    def set_connection_pool(self, max_connections=DEFAULT_POOL_MAX_CONNECTIONS, idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT):
+        """
+        Configures the pool of keep-alive connections to the appliance. Idle connections are closed.
+
+        Args:
+            max_connections: Maximum number of idle connections kept. Use 0 to open a new connection for each request.
+            idle_timeout: Seconds an idle connection is kept before being discarded.
+        """
+        self._connection_pool.clear()
+        self._connection_pool = ConnectionPool(max_connections, idle_timeout)
+
+    def set_max_page_workers(self, max_workers):
+        """
+        Sets the default number of pages of a collection requested concurrently by ResourceClient.get_all.
+
+        Args:
+            max_workers: Maximum number of concurrent page requests. Use 1 to follow the pages sequentially.
+        """
+        self._max_page_workers = int(max_workers)
+
+    def get_max_page_workers(self):
+        """
+        Gets the default number of pages of a collection requested concurrently by ResourceClient.get_all.
+
+        Returns:
+            int
+        """
+        return self._max_page_workers
+
+    def set_download_options(self, max_workers=1, segment_size=DEFAULT_DOWNLOAD_SEGMENT_SIZE,
+                             max_retries=DEFAULT_DOWNLOAD_MAX_RETRIES):
+        """
+        Configures how download_to_stream fetches files from the appliance.
+
+        Args:
+            max_workers: Maximum number of segments of a file requested concurrently with HTTP Range requests. Use 1
+                to download in a single stream. Parallel downloads require a seekable stream.
+            segment_size: Number of bytes requested by each ranged request.
+            max_retries: Number of times a download is resumed from the last received byte after a failure, when the
+                appliance accepts ranges.
+        """
+        self._download_workers = int(max_workers)
+        self._download_segment_size = int(segment_size)
+        self._download_max_retries = int(max_retries)
+
+    def set_timeouts(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT):
+        """
+        Sets the socket timeouts of the requests. When a Deadline is active, the timeouts are limited to its
+        remaining time.
+
+        Args:
+            connect_timeout: Seconds to wait for the connection to be established. Use None to wait forever.
+            read_timeout: Seconds to wait for each read of a response. Use None to wait forever.
+        """
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+
+    def add_request_hooks(self, pre_request=None, post_request=None):
+        """
+        Registers functions called with the RequestMetrics of each request made to the appliance, including each
+        retry, upload and download. Exceptions raised by the hooks are logged and ignored.
+
+        Args:
+            pre_request: Function called before the request is sent.
+            post_request: Function called after the response body was read, or after the request failed.
+        """
+        if pre_request is not None:
+            self._pre_request_hooks.append(pre_request)
+        if post_request is not None:
+            self._post_request_hooks.append(post_request)
+
+    def remove_request_hooks(self, pre_request=None, post_request=None):
+        """
+        Unregisters functions registered with add_request_hooks.
+        """
+        if pre_request in self._pre_request_hooks:
+            self._pre_request_hooks.remove(pre_request)
+        if post_request in self._post_request_hooks:
+            self._post_request_hooks.remove(post_request)
+
+    def enable_metrics(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        Enables the in-process collector of request and task wait metrics, replacing the current one.
+
+        Args:
+            buckets: Upper bounds, in seconds, of the buckets of the latency histograms.
+
+        Returns:
+            MetricsCollector: The collector, whose metrics can be dumped with to_dict or to_prometheus.
+        """
+        self.disable_metrics()
+        self._metrics_collector = MetricsCollector(buckets)
+        self.add_request_hooks(post_request=self._metrics_collector)
+        return self._metrics_collector
+
+    def disable_metrics(self):
+        """
+        Disables the collector of metrics, discarding the collected metrics.
+        """
+        if self._metrics_collector is not None:
+            self.remove_request_hooks(post_request=self._metrics_collector)
+            self._metrics_collector = None
+
+    def get_metrics_collector(self):
+        """
+        Gets the collector of request and task wait metrics.
+
+        Returns:
+            MetricsCollector: The collector, or None when the metrics are disabled.
+        """
+        return self._metrics_collector
+
+    def set_retry_policy(self, retry_policy):
+        """
+        Sets the policy that decides when a failed request is sent again.
+
+        Args:
+            retry_policy (RetryPolicy): The policy. Use RetryPolicy(max_attempts=1) to disable the retries.
+        """
+        self._retry_policy = retry_policy
+
+    def get_retry_policy(self):
+        """
+        Gets the policy that decides when a failed request is sent again.
+
+        Returns:
+            RetryPolicy
+        """
+        return self._retry_policy
+
+    def set_json_codec(self, json_codec):
+        """
+        Sets the codec of the JSON request and response bodies.
+
+        Args:
+            json_codec (JsonCodec): The codec. See hpOneView.json_codec.create_json_codec.
+        """
+        self._json_codec = json_codec
+
+    def get_json_codec(self):
+        """
+        Gets the codec of the JSON request and response bodies.
+
+        Returns:
+            JsonCodec
+        """
+        return self._json_codec
+
+    def set_request_coalescing(self, enabled=True):
+        """
+        Enables or disables the coalescing of identical concurrent GET requests.
+
+        While a GET request for a URI is in flight, the identical requests made by other threads wait for it and get a
+        copy of its response, instead of being sent to the appliance. Useful when many threads share the client.
+
+        Args:
+            enabled: Indicates if the requests are coalesced.
+        """
+        self._single_flight = SingleFlight() if enabled else None
+
+    def get_request_coalescer(self):
+        """
+        Gets the coalescer of the GET requests, whose get_stats method reports the number of coalesced requests.
+
+        Returns:
+            SingleFlight: The coalescer, or None when the coalescing is disabled.
+        """
+        return self._single_flight
+
+    def set_request_limits(self, limits):
+        """
+        Sets client-side limits of the rate and of the concurrency of the requests sent to the appliance, shared by all
+        the resource clients that use this connection.
+
+        Every limit matching a request applies to it. A request waits until all of them allow it to start, or raises
+        HPOneViewTimeout when the active Deadline would expire first.
+
+        Args:
+            limits: List of RequestLimit, or of dicts with its arguments: the URI prefix, the HTTP methods, the rate and
+                burst in requests per second, and the maximum number of requests in flight, e.g.
+                [{'max_in_flight': 16}, {'prefix': '/rest/server-profiles', 'methods': ['POST'], 'rate': 1}].
+                Use None to remove the limits.
+        """
+        self._request_throttle = RequestThrottle(limits) if limits else None
+
+    def get_request_throttle(self):
+        """
+        Gets the limits of the requests, whose get_stats method reports the requests delayed by each limit.
+
+        Returns:
+            RequestThrottle: The limits, or None when the requests are not limited.
+        """
+        return self._request_throttle
+
+    def set_circuit_breaker(self, enabled=True, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                            reset_timeout=DEFAULT_RESET_TIMEOUT, prefixes=None, on_state_change=None):
+        """
+        Enables or disables the circuit breaker of the appliance.
+
+        After failure_threshold consecutive requests failed with a connection error, a timeout, or a 502, 503 or 504
+        status, the breaker opens and the requests raise HPOneViewCircuitOpen without being sent. After reset_timeout
+        seconds, a single request is sent to probe the appliance, and the breaker closes when it succeeds.
+
+        Args:
+            enabled: Indicates if the circuit breaker is enabled.
+            failure_threshold: Number of consecutive failed requests that opens the breaker.
+            reset_timeout: Seconds the breaker stays open before a request probes the appliance.
+            prefixes: URI prefixes with their own breaker, so a failing endpoint does not open the breaker of the
+                whole appliance, e.g. ['/rest/firmware-drivers'].
+            on_state_change: Function called with the name, the previous state and the new state of a breaker when
+                it changes, e.g. from 'closed' to 'open'.
+        """
+        self._circuit_breakers = CircuitBreakers(self._host, failure_threshold, reset_timeout, prefixes,
+                                                 on_state_change) if enabled else None
+
+    def get_circuit_breakers(self):
+        """
+        Gets the circuit breakers of the appliance, whose get_stats method reports their states.
+
+        Returns:
+            CircuitBreakers: The circuit breakers, or None when they are disabled.
+        """
+        return self._circuit_breakers
+
+    def set_response_cache(self, ttls=None, default_ttl=0, max_entries=DEFAULT_CACHE_MAX_ENTRIES, revalidate=False):
+        """
+        Enables the cache of GET responses. The cached responses of a resource are invalidated when a POST, PUT,
+        PATCH or DELETE request is made to it through this connection.
+
+        Args:
+            ttls: Dict with the TTL in seconds for each URI prefix, e.g. {'/rest/server-hardware-types': 600}.
+            default_ttl: TTL in seconds for the URIs that do not match any prefix. Use 0 to cache only the URIs
+                that match a prefix.
+            max_entries: Maximum number of responses kept. The least recently used responses are evicted first.
+            revalidate: Keeps the responses with an eTag to request them again with If-None-Match. When the
+                resource was not modified, the appliance answers with an empty 304 response and the kept body is used.
+        """
+        self._response_cache = ResponseCache(ttls, default_ttl, max_entries, revalidate)
+
+    def disable_response_cache(self):
+        """
+        Disables the cache of GET responses, discarding the cached responses.
+        """
+        self._response_cache = None
+
+    def get_response_cache(self):
+        """
+        Gets the cache of GET responses.
+
+        Returns:
+            ResponseCache: The cache, or None when it is disabled.
+        """
+        return self._response_cache
+
+    def set_session_cache(self, session_cache):
+        """
+        Sets the cache of the login sessions, so the login reuses the session of a previous process while it is valid.
+
+        With the cache, a request answered with 401 Unauthorized, like after the session expired, logs in again with
+        the credentials of the last login and is sent again once.
+
+        Args:
+            session_cache (SessionCache): The cache. Use None to disable it.
+        """
+        self._session_cache = session_cache
+
+    def get_session_cache(self):
+        """
+        Gets the cache of the login sessions.
+
+        Returns:
+            SessionCache: The cache, or None when it is disabled.
+        """
+        return self._session_cache
 
     def get_session(self):
         return self._session
@@ -119,112 +558,485 @@ class connection(object):
         if custom_headers:
             http_headers.update(custom_headers)
 
-        bConnected = False
-        conn = None
-        while bConnected is False:
+        def send():
+            limits, queue_time = self.__admit_request(method, path)
+            metrics = self.__start_request_metrics(method, path, body, queue_time, limits)
+            try:
+                resp, response_body = self.__do_http_attempt(method, path, body, http_headers, metrics)
+            except Exception as error:
+                self.__release_request(limits, path, error=error)
+                self.__finish_request_metrics(metrics, error=error)
+                raise
+            self.__release_request(limits, path, resp)
+            self.__finish_request_metrics(metrics, resp)
+            return resp, response_body
+
+        resp, response_body = self._retry_policy.execute(method, path, send, deadline=get_current_deadline())
+        if resp.status == 401 and self.__can_login_again(path):
+            self.__login_again(http_headers.get('auth'))
+            http_headers['auth'] = self._headers['auth']
+            resp, response_body = self._retry_policy.execute(method, path, send, deadline=get_current_deadline())
+        return resp, response_body
+
+    def __can_login_again(self, path):
+        return self._session_cache is not None and self._cred is not None and \
+            path not in (uri['loginSessions'], uri['sessions'])
+
+    def __login_again(self, expired_session_id):
+        with self._login_lock:
+            # Another thread might have logged in again while this one was waiting
+            if self._headers.get('auth') == expired_session_id:
+                logger.info('The session expired. Logging in again...')
+                self.__create_session(self._cred)
+
+    def __do_http_attempt(self, method, path, body, http_headers, metrics=None):
+        conn, resp = self.__open_response(method, path, body, http_headers, metrics)
+        tempbytes = ''
+        try:
+            tempbytes = resp.read()
+            if metrics is not None:
+                metrics.bytes_received = len(tempbytes)
+        except UnicodeDecodeError:
+            self.__release_connection(conn, resp)
+            return resp, tempbytes
+        except Exception:
+            conn.close()
+            raise
+        if tempbytes:
+            body = self.__decode_body(tempbytes)
+        self.__release_connection(conn, resp)
+        return resp, body
+
+    def __decode_body(self, data):
+        """
+        Decodes a response body straight from its bytes.
+
+        Returns:
+            The decoded JSON document, the text when the body is not JSON, or the bytes when it is binary data.
+        """
+        try:
+            return self._json_codec.loads(data)
+        except ValueError:
+            pass
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:  # Might be binary data
+            return data
+
+    def __open_response(self, method, path, body, http_headers, metrics=None):
+        """
+        Sends the request using a pooled connection when one is available. A pooled connection closed by the
+        appliance while idle is transparently replaced by a new one.
+
+        Returns:
+            tuple: The connection and the response, whose body was not read yet.
+        """
+        deadline = get_current_deadline()
+        if deadline is not None:
+            deadline.check()
+
+        conn = self._connection_pool.acquire()
+        if conn is not None:
+            sent = False
             try:
-                conn = self.get_connection()
                 conn.request(method, path, body, http_headers)
-                resp = conn.getresponse()
-                tempbytes = ''
-                try:
-                    tempbytes = resp.read()
-                    tempbody = tempbytes.decode('utf-8')
-                except UnicodeDecodeError:  # Might be binary data
-                    tempbody = tempbytes
-                    conn.close()
-                    bConnected = True
-                    return resp, tempbody
-                if tempbody:
-                    try:
-                        body = json.loads(tempbody)
-                    except ValueError:
-                        body = tempbody
+                sent = True
+                return conn, self.__get_response(conn, metrics)
+            except Exception as error:
                 conn.close()
-                bConnected = True
-            except http.client.BadStatusLine:
-                logger.warning('Bad Status Line. Trying again...')
-                if conn:
-                    conn.close()
-                time.sleep(1)
-                continue
-        return resp, body
+                # Only a request that the appliance did not start to process can be sent again, whatever its method.
+                # The errors after the request was sent, like a read timeout, are left to the retry policy.
+                if not self.__is_stale_connection_error(error, sent):
+                    raise
+                logger.debug('Pooled connection was closed by the appliance. Reconnecting...')
+
+        conn = self.get_connection()
+        try:
+            if metrics is not None:
+                # Connects before sending the request, to measure the handshake apart from the request
+                connect_start = time.time()
+                conn.connect()
+                metrics.tls_handshake_time = time.time() - connect_start
+            return conn, self.__send_request(conn, method, path, body, http_headers, metrics)
+        except Exception:
+            conn.close()
+            raise
+
+    def __send_request(self, conn, method, path, body, http_headers, metrics):
+        conn.request(method, path, body, http_headers)
+        return self.__get_response(conn, metrics)
+
+    def __get_response(self, conn, metrics):
+        self.__set_read_timeout(conn)
+        resp = conn.getresponse()
+        if metrics is not None:
+            metrics.time_to_first_byte = metrics.elapsed()
+        return resp
+
+    @staticmethod
+    def __is_stale_connection_error(error, sent):
+        """
+        Checks if an error of a pooled connection means that it was closed by the appliance while idle: the request
+        could not be sent, or the appliance closed the socket before sending any response bytes.
+        """
+        if isinstance(error, socket.timeout):
+            return False
+        if not sent:
+            return isinstance(error, STALE_CONNECTION_ERRORS)
+        if isinstance(error, http.client.BadStatusLine):
+            # Includes RemoteDisconnected, raised when the socket is closed before the status line
+            return True
+        return isinstance(error, socket.error) and error.errno in STALE_CONNECTION_ERROR_NUMBERS
+
+    def __admit_request(self, method, path):
+        """
+        Waits for the request limits and checks the circuit breaker of a request, when they are set.
+
+        Returns:
+            tuple: The request limits acquired, to be passed to __release_request once the response headers were
+            received or the request failed, and the seconds waited for them, or None when the requests are not limited.
+
+        Raises:
+            HPOneViewCircuitOpen: When the circuit breaker of the request is open.
+            HPOneViewTimeout: When the deadline of the operation expires while waiting for the request limits.
+        """
+        throttle = self._request_throttle
+        limits, queue_time = throttle.acquire(method, path, get_current_deadline()) if throttle else ([], None)
+        if self._circuit_breakers is not None:
+            try:
+                self._circuit_breakers.before_request(path)
+            except Exception:
+                RequestThrottle.release(limits)
+                raise
+        return limits, queue_time
+
+    def __release_request(self, limits, path, resp=None, error=None):
+        """
+        Releases the request limits of a request and records its outcome in its circuit breaker.
+        """
+        RequestThrottle.release(limits)
+        if self._circuit_breakers is not None:
+            self._circuit_breakers.record(path, resp, error)
+
+    def __start_request_metrics(self, method, path, body, queue_time=None, limits=None, bytes_sent=None):
+        """
+        Starts measuring a request and calls the pre-request hooks.
+
+        Returns:
+            RequestMetrics: The measurements, to be passed to __finish_request_metrics when the request finishes, or
+            None when there are no request hooks.
+        """
+        if not self._pre_request_hooks and not self._post_request_hooks:
+            return None
+
+        if bytes_sent is None:
+            bytes_sent = len(body if isinstance(body, bytes) else body.encode('utf-8')) if body else 0
+        metrics = RequestMetrics(method, path, bytes_sent)
+        metrics.queue_time = queue_time
+        metrics.request_limits = limits or []
+        self.__call_hooks(self._pre_request_hooks, metrics)
+        return metrics
+
+    def __finish_request_metrics(self, metrics, resp=None, error=None):
+        if metrics is None:
+            return
+
+        metrics.total_time = metrics.elapsed()
+        metrics.status = resp.status if resp is not None else None
+        metrics.error = error
+        self.__call_hooks(self._post_request_hooks, metrics)
+
+    @staticmethod
+    def __call_hooks(hooks, metrics):
+        for hook in list(hooks):
+            try:
+                hook(metrics)
+            except Exception:
+                logger.exception('Request hook %r failed' % hook)
+
+    def __get_socket_timeout(self, timeout):
+        deadline = get_current_deadline()
+        if deadline is None:
+            return timeout
+
+        deadline.check()
+        timeout = deadline.clip(timeout)
+        # A timeout of 0 would make the socket non-blocking
+        return None if timeout is None else max(timeout, 0.001)
+
+    def __set_read_timeout(self, conn):
+        sock = getattr(conn, 'sock', None)
+        if sock is not None:
+            sock.settimeout(self.__get_socket_timeout(self._read_timeout))
+
+    def __release_connection(self, conn, resp):
+        if resp.will_close:
+            conn.close()
+        else:
+            self._connection_pool.release(conn)
 
     def download_to_stream(self, stream_writer, url, body='', method='GET', custom_headers=None):
+        """
+        Downloads the body of a response to a stream.
+
+        When the appliance advertises Accept-Ranges: bytes, a failed download is resumed from the last received byte
+        with a Range request. When more than one download worker is configured with set_download_options and the
+        stream is seekable, the file is split in segments, fetched concurrently into a preallocated stream. Otherwise,
+        the body is copied in a single stream.
+
+        Args:
+            stream_writer: Stream that receives the body.
+            url: URI of the request.
+            body: Body of the request.
+            method: HTTP method.
+            custom_headers: Allows set specific HTTP headers.
+
+        Returns:
+            bool: Indicates if the body was successfully downloaded.
+        """
         http_headers = self._headers.copy()
         if custom_headers:
             http_headers.update(custom_headers)
 
-        chunk_size = 4096
-        conn = None
+        # The request limits are held until the body was downloaded, as the segments and the resumed ranges are
+        # requested under them
+        limits, queue_time = self.__admit_request(method, url)
+        metrics = self.__start_request_metrics(method, url, body, queue_time, limits)
+        if metrics is not None:
+            stream_writer = _CountingWriter(stream_writer, metrics)
 
-        successful_connected = False
-        while not successful_connected:
-            try:
-                conn = self.get_connection()
-                conn.request(method, url, body, http_headers)
-                resp = conn.getresponse()
+        resp = None
+        try:
+            if method == 'GET' and not body and self._download_workers > 1 and self.__is_seekable(stream_writer):
+                resp = self.__download_segments(stream_writer, url, http_headers, metrics)
+            else:
+                conn, resp = self.__open_download_response(method, url, body, http_headers, metrics)
+                self.__download_response(stream_writer, url, http_headers, conn, resp, method)
+        except Exception as error:
+            self.__release_request(limits, url, resp, error)
+            self.__finish_request_metrics(metrics, resp, error)
+            raise
 
-                if resp.status >= 400:
-                    self.__handle_download_error(resp, conn)
+        self.__release_request(limits, url, resp)
+        self.__finish_request_metrics(metrics, resp)
+        return True
 
-                tempbytes = True
-                while tempbytes:
-                    tempbytes = resp.read(chunk_size)
-                    if tempbytes:  # filter out keep-alive new chunks
-                        stream_writer.write(tempbytes)
+    def __open_download_response(self, method, url, body, http_headers, metrics=None):
+        def send():
+            conn, resp = self.__open_response(method, url, body, http_headers, metrics)
+            return resp, conn
 
-                conn.close()
-                successful_connected = True
-            except http.client.BadStatusLine:
-                logger.warning('Bad Status Line. Trying again...')
-                if conn:
-                    conn.close()
-                time.sleep(1)
-                continue
+        resp, conn = self._retry_policy.execute(method, url, send, release=lambda resp, conn: conn.close(),
+                                                deadline=get_current_deadline())
 
-        return successful_connected
+        if resp.status >= 400:
+            self.__handle_download_error(resp, conn)
+        return conn, resp
 
-    def __handle_download_error(self, resp, conn):
+    def __download_response(self, stream_writer, url, http_headers, conn, resp, method):
+        def write(offset, chunk):
+            stream_writer.write(chunk)
+
+        if method == 'GET' and self.__accepts_ranges(resp):
+            self.__download_range(url, http_headers, write, 0, None, conn, resp)
+        else:
+            self.__copy_response(resp, write, 0)
+            self.__release_connection(conn, resp)
+
+    def __download_segments(self, stream_writer, url, http_headers, metrics=None):
+        """
+        Returns:
+            The response of the first request.
+        """
+        segment_size = self._download_segment_size
+        probe_headers = http_headers.copy()
+        probe_headers['Range'] = 'bytes=0-%d' % (segment_size - 1)
+        conn, resp = self.__open_download_response('GET', url, '', probe_headers, metrics)
+
+        total = self.__get_content_range(resp)[2] if resp.status == 206 else None
+        if total is None:
+            if resp.status == 206:
+                # The size of the file is unknown, so it is requested again without a range
+                conn.close()
+                conn, resp = self.__open_download_response('GET', url, '', http_headers)
+            logger.debug('Ranges are not supported by %s. Downloading in a single stream.' % url)
+            self.__download_response(stream_writer, url, http_headers, conn, resp, 'GET')
+            return resp
+
+        base = stream_writer.tell()
+        lock = threading.Lock()
+
+        def write_at(offset, chunk):
+            with lock:
+                stream_writer.seek(base + offset)
+                stream_writer.write(chunk)
+
+        deadline = get_current_deadline()
+
+        def download_segment(segment):
+            if deadline is None:
+                return self.__download_range(url, http_headers, write_at, segment[0], segment[1])
+            # The deadline of the operation also covers the segments downloaded by the pool threads
+            with deadline:
+                return self.__download_range(url, http_headers, write_at, segment[0], segment[1])
+
+        # Preallocates the file, so the segments can be written in any order
+        stream_writer.truncate(base + total)
+
+        segments = [(start, min(start + segment_size, total) - 1) for start in range(segment_size, total, segment_size)]
+        pool = None
+        pending = None
         try:
-            tempbytes = resp.read()
-            tempbody = tempbytes.decode('utf-8')
+            if segments:
+                from multiprocessing.pool import ThreadPool  # Imported on first use, as it slows down the startup
+                pool = ThreadPool(min(self._download_workers - 1, len(segments)))
+                pending = pool.map_async(download_segment, segments)
+
+            # The first segment is read from the response of the probe request
+            self.__download_range(url, http_headers, write_at, 0, min(segment_size, total) - 1, conn, resp)
+
+            if pending is not None:
+                pending.get()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        stream_writer.seek(base + total)
+        return resp
+
+    def __download_range(self, url, http_headers, write_at, start, end, conn=None, resp=None):
+        """
+        Copies a range of bytes of the file to the stream, resuming from the last received byte after a failure.
+
+        Args:
+            write_at: Function that writes a chunk at an offset of the file.
+            start: First byte of the range.
+            end: Last byte of the range, or None to read until the end of the file.
+            conn: Connection of a response already opened for the range.
+            resp: Response already opened for the range.
+
+        Returns:
+            int: The offset after the last byte written.
+        """
+        offset = start
+        failures = 0
+        while True:
             try:
-                body = json.loads(tempbody)
-            except ValueError:
-                body = tempbody
-        except UnicodeDecodeError:  # Might be binary data
-            body = tempbytes
+                if resp is None:
+                    conn, resp = self.__open_range_response(url, http_headers, offset, end)
+                if end is None:
+                    end = self.__get_last_byte(resp, offset)
+
+                offset = self.__copy_response(resp, write_at, offset)
+                if end is not None and offset <= end:
+                    raise http.client.IncompleteRead(b'', end + 1 - offset)
+
+                self.__release_connection(conn, resp)
+                return offset
+            except RESUMABLE_DOWNLOAD_ERRORS as error:
+                if conn is not None:
+                    conn.close()
+                failures += 1
+                if failures > self._download_max_retries:
+                    raise
+                delay = self._retry_policy.get_backoff(failures)
+                logger.warning('Download of %s failed at byte %d (%s). Resuming in %.2f seconds.' %
+                               (url, offset, repr(error), delay))
+                conn, resp = None, None
+                time.sleep(delay)
+
+    def __open_range_response(self, url, http_headers, start, end):
+        range_headers = http_headers.copy()
+        range_headers['Range'] = 'bytes=%d-%s' % (start, '' if end is None else end)
+        conn, resp = self.__open_download_response('GET', url, '', range_headers)
+
+        if resp.status != 206 or self.__get_content_range(resp)[0] != start:
             conn.close()
+            raise HPOneViewException(MSG_RANGE_NOT_HONORED % (start, url))
+
+        return conn, resp
+
+    @staticmethod
+    def __copy_response(resp, write_at, offset):
+        while True:
+            chunk = resp.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:  # filter out keep-alive new chunks
+                return offset
+            write_at(offset, chunk)
+            offset += len(chunk)
+
+    @staticmethod
+    def __is_seekable(stream):
+        seekable = getattr(stream, 'seekable', None)
+        return callable(seekable) and seekable() is True
+
+    @staticmethod
+    def __accepts_ranges(resp):
+        try:
+            return resp.getheader('Accept-Ranges').strip().lower() == 'bytes'
+        except AttributeError:
+            return False
+
+    @staticmethod
+    def __get_content_range(resp):
+        """
+        Parses the Content-Range header, e.g. 'bytes 0-1023/4096'.
+
+        Returns:
+            tuple: The first byte, the last byte and the size of the file. The size is None when it is unknown.
+        """
+        content_range = resp.getheader('Content-Range')
+        try:
+            unit, byte_range = content_range.strip().split(' ', 1)
+            byte_range, total = byte_range.split('/', 1)
+            first, last = byte_range.split('-', 1)
+            if unit.lower() != 'bytes':
+                return None, None, None
+            return int(first), int(last), None if total.strip() == '*' else int(total)
+        except (AttributeError, TypeError, ValueError):
+            return None, None, None
+
+    def __get_last_byte(self, resp, offset):
+        if resp.status == 206:
+            return self.__get_content_range(resp)[1]
+        try:
+            return offset + int(resp.getheader('Content-Length')) - 1
+        except (TypeError, ValueError):
+            return None
+
+    def __handle_download_error(self, resp, conn):
+        body = self.__decode_body(resp.read())
         if not body:
             body = "Error " + str(resp.status)
 
         conn.close()
         raise HPOneViewException(body)
 
-    def get_connection(self):
-        context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-        if self._sslTrustAll is False:
-            context.verify_mode = ssl.CERT_REQUIRED
-            context.load_verify_locations(self._sslTrustedBundle)
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context)
+    def __get_ssl_context(self):
+        if self._ssl_context is None:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
+            if self._sslTrustAll is False:
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.load_verify_locations(self._sslTrustedBundle)
             else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context)
-                conn.set_tunnel(self._host, 443)
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    def get_connection(self):
+        context = self.__get_ssl_context()
+        timeout = self.__get_socket_timeout(self._connect_timeout)
+        if self._doProxy is False:
+            conn = http.client.HTTPSConnection(self._host,
+                                               context=context,
+                                               timeout=timeout)
         else:
-            context.verify_mode = ssl.CERT_NONE
-            if self._doProxy is False:
-                conn = http.client.HTTPSConnection(self._host,
-                                                   context=context)
-            else:
-                conn = http.client.HTTPSConnection(self._proxyHost,
-                                                   self._proxyPort,
-                                                   context=context)
-                conn.set_tunnel(self._host, 443)
+            conn = http.client.HTTPSConnection(self._proxyHost,
+                                               self._proxyPort,
+                                               context=context,
+                                               timeout=timeout)
+            conn.set_tunnel(self._host, 443)
         return conn
 
     def _open(self, name, mode):
@@ -232,36 +1044,32 @@ class connection(object):
 
     def encode_multipart_formdata(self, fields, files, baseName, verbose=False):
         """
-        Fields is a sequence of (name, value) elements for regular form fields.
-        Files is a sequence of (name, filename, value) elements for data
-        to be uploaded as files
+        Writes the multipart/form-data body that post_multipart streams to a <files>.b64 file, e.g. to send it with
+        another client.
+
+        Args:
+            fields: Not used.
+            files: Path of the file to encode.
+            baseName: File name sent to the appliance.
+            verbose: Prints the encoding progress.
 
-        Returns: (content_type, body) ready for httplib.HTTP instance
+        Returns:
+            str: The content type of the body.
         """
-        BOUNDARY = '----------ThIs_Is_tHe_bouNdaRY_$'
-        CRLF = '\r\n'
-        content_type = 'multipart/form-data; boundary=%s' % BOUNDARY
+        content_type, preamble, epilogue = self.__make_multipart_envelope(baseName)
         if verbose is True:
             print(('Encoding ' + baseName + ' for upload...'))
         fin = self._open(files, 'rb')
         fout = self._open(files + '.b64', 'wb')
-        fout.write(bytearray('--' + BOUNDARY + CRLF, 'utf-8'))
-        fout.write(bytearray('Content-Disposition: form-data'
-                             '; name="file"; filename="' +
-                             baseName + '"' + CRLF, "utf-8"))
-        fout.write(bytearray('Content-Type: application/octet-stream' + CRLF,
-                             'utf-8'))
-        fout.write(bytearray(CRLF, 'utf-8'))
+        fout.write(preamble)
         shutil.copyfileobj(fin, fout)
-        fout.write(bytearray(CRLF, 'utf-8'))
-        fout.write(bytearray('--' + BOUNDARY + '--' + CRLF, 'utf-8'))
-        fout.write(bytearray(CRLF, 'utf-8'))
+        fout.write(epilogue)
         fout.close()
         fin.close()
         return content_type
 
-    def post_multipart_with_response_handling(self, uri, file_path, baseName):
-        resp, body = self.post_multipart(uri, None, file_path, baseName)
+    def post_multipart_with_response_handling(self, uri, file_path, baseName, progress_callback=None):
+        resp, body = self.post_multipart(uri, None, file_path, baseName, progress_callback=progress_callback)
 
         if resp.status == 202:
             task = self.__get_task_from_response(resp, body)
@@ -272,61 +1080,146 @@ class connection(object):
 
         return None, body
 
-    def post_multipart(self, uri, fields, files, baseName, verbose=False):
-        content_type = self.encode_multipart_formdata(fields, files, baseName,
-                                                      verbose)
-        inputfile = self._open(files + '.b64', 'rb')
-        mappedfile = mmap.mmap(inputfile.fileno(), 0, access=mmap.ACCESS_READ)
+    def post_multipart(self, uri, fields, files, baseName, verbose=False, progress_callback=None):
+        """
+        Uploads a file in a multipart/form-data request.
+
+        The file is streamed between the multipart preamble and epilogue, without an encoded copy of it, in chunks of
+        UPLOAD_CHUNK_SIZE bytes. When the socket supports it, each chunk is sent with sendfile.
+
+        Args:
+            uri: URI of the request.
+            fields: Not used.
+            files: Path of the file to upload.
+            baseName: File name sent to the appliance.
+            verbose: Prints the upload progress.
+            progress_callback: Function called after each chunk with the number of bytes sent and the total size
+                of the request body.
+
+        Returns:
+            tuple: The response and its body.
+        """
+        content_type, preamble, epilogue = self.__make_multipart_envelope(baseName)
+        file_size = os.path.getsize(files)
+        total_size = len(preamble) + file_size + len(epilogue)
+
         if verbose is True:
             print(('Uploading ' + files + '...'))
-        conn = self.get_connection()
-        # conn.set_debuglevel(1)
-        conn.connect()
-        conn.putrequest('POST', uri)
-        conn.putheader('uploadfilename', baseName)
-        conn.putheader('auth', self._headers['auth'])
-        conn.putheader('Content-Type', content_type)
-        totalSize = os.path.getsize(files + '.b64')
-        conn.putheader('Content-Length', totalSize)
-        conn.putheader('X-API-Version', self._apiVersion)
-        conn.endheaders()
-
-        while mappedfile.tell() < mappedfile.size():
-            # Send 1MB at a time
-            # NOTE: Be careful raising this value as the read chunk
-            # is stored in RAM
-            readSize = 1048576
-            conn.send(mappedfile.read(readSize))
+
+        def report_progress(bytes_sent):
             if verbose is True:
-                print('%d bytes sent... \r' % mappedfile.tell())
-        mappedfile.close()
-        inputfile.close()
-        os.remove(files + '.b64')
-        response = conn.getresponse()
-        body = response.read().decode('utf-8')
+                print('%d bytes sent... \r' % bytes_sent)
+            if progress_callback:
+                progress_callback(bytes_sent, total_size)
 
-        if body:
-            try:
-                body = json.loads(body)
-            except ValueError:
-                body = response.read().decode('utf-8')
+        limits, queue_time = self.__admit_request('POST', uri)
+        metrics = self.__start_request_metrics('POST', uri, None, queue_time, limits, bytes_sent=total_size)
+        try:
+            response, body = self.__send_multipart(uri, files, baseName, (content_type, preamble, epilogue),
+                                                   file_size, report_progress, metrics)
+        except Exception as error:
+            self.__release_request(limits, uri, error=error)
+            self.__finish_request_metrics(metrics, error=error)
+            raise
+        self.__release_request(limits, uri, response)
+        self.__finish_request_metrics(metrics, response)
 
-        conn.close()
+        self.__invalidate_cached_responses(uri)
 
         if response.status >= 400:
             raise HPOneViewException(body)
 
         return response, body
 
+    def __send_multipart(self, uri, files, baseName, envelope, file_size, report_progress, metrics):
+        content_type, preamble, epilogue = envelope
+        total_size = len(preamble) + file_size + len(epilogue)
+        inputfile = self._open(files, 'rb')
+        conn = self.get_connection()
+        try:
+            connect_start = time.time()
+            conn.connect()
+            if metrics is not None:
+                metrics.tls_handshake_time = time.time() - connect_start
+            self.__set_read_timeout(conn)
+            conn.putrequest('POST', uri)
+            conn.putheader('uploadfilename', baseName)
+            conn.putheader('auth', self._headers['auth'])
+            conn.putheader('Content-Type', content_type)
+            conn.putheader('Content-Length', total_size)
+            conn.putheader('X-API-Version', self._apiVersion)
+            conn.endheaders()
+
+            conn.send(preamble)
+            report_progress(len(preamble))
+            self.__send_file(conn, inputfile, file_size, lambda sent: report_progress(len(preamble) + sent))
+            conn.send(epilogue)
+            report_progress(total_size)
+        except Exception:
+            conn.close()
+            raise
+        finally:
+            inputfile.close()
+
+        response = conn.getresponse()
+        if metrics is not None:
+            metrics.time_to_first_byte = metrics.elapsed()
+        body = response.read()
+        if metrics is not None:
+            metrics.bytes_received = len(body)
+
+        body = self.__decode_body(body) if body else ''
+
+        self.__release_connection(conn, response)
+        return response, body
+
+    def __make_multipart_envelope(self, baseName):
+        content_type = 'multipart/form-data; boundary=%s' % MULTIPART_BOUNDARY
+        preamble = bytearray('--' + MULTIPART_BOUNDARY + '\r\n'
+                             'Content-Disposition: form-data; name="file"; filename="' + baseName + '"\r\n'
+                             'Content-Type: application/octet-stream\r\n'
+                             '\r\n', 'utf-8')
+        epilogue = bytearray('\r\n'
+                             '--' + MULTIPART_BOUNDARY + '--\r\n'
+                             '\r\n', 'utf-8')
+        return content_type, bytes(preamble), bytes(epilogue)
+
+    def __send_file(self, conn, inputfile, file_size, report_progress):
+        # socket.sendfile uses os.sendfile when the socket allows it, and falls back to send otherwise
+        sendfile = getattr(conn.sock, 'sendfile', None)
+
+        offset = 0
+        while offset < file_size:
+            count = min(UPLOAD_CHUNK_SIZE, file_size - offset)
+            if sendfile:
+                sent = sendfile(inputfile, offset, count)
+            else:
+                chunk = inputfile.read(count)
+                conn.send(chunk)
+                sent = len(chunk)
+
+            if not sent:
+                raise HPOneViewException(MSG_FILE_CHANGED_DURING_UPLOAD % inputfile.name)
+
+            offset += sent
+            report_progress(offset)
+
     ###########################################################################
     # Utility functions for making requests - the HTTP verbs
     ###########################################################################
     def get(self, uri):
-        resp, body = self.do_http('GET', uri, '')
-        if resp.status >= 400:
-            raise HPOneViewException(body)
-        if resp.status == 302:
-            body = self.get(resp.getheader('Location'))
+        cache = self._response_cache
+        # A cached page also updates the paging state below
+        body = cache.get(uri) if cache is not None else None
+        if body is None:
+            single_flight = self._single_flight
+            if single_flight is not None:
+                body, coalesced = single_flight.do(uri, lambda: self.__get(uri, cache), get_current_deadline())
+                if coalesced and self._metrics_collector is not None:
+                    self._metrics_collector.record_coalesced_request('GET', uri)
+            else:
+                body = self.__get(uri, cache)
+
         if type(body) is dict:
             if 'nextPageUri' in body:
                 self._nextPage = body['nextPageUri']
@@ -338,6 +1231,83 @@ class connection(object):
                 self._numDisplayedRecords = body['count']
         return body
 
+    def __get(self, uri, cache):
+        if cache is not None:
+            resp, body = self.__do_conditional_get(cache, uri)
+        else:
+            resp, body = self.do_http('GET', uri, '')
+
+        if resp.status >= 400:
+            raise HPOneViewException(body)
+        if resp.status == 302:
+            body = self.get(resp.getheader('Location'))
+        elif cache is not None and resp.status == 200:
+            etag = body.get('eTag') if isinstance(body, dict) else None
+            cache.put(uri, body, etag or resp.getheader('ETag'))
+        return body
+
+    def get_collection_stream(self, uri, custom_headers=None):
+        """
+        Requests a collection page whose members are parsed incrementally, as the body is received.
+
+        Unlike get, the body is not read at once: each member is decoded and yielded as soon as it is received, so only
+        one member is kept in memory instead of the whole page. The response cache is not used. The request limits are
+        released once the response headers were received, so other requests can be sent while iterating the members.
+
+        Args:
+            uri: URI of the collection page.
+            custom_headers: Allows set specific HTTP headers.
+
+        Returns:
+            CollectionStream: Iterable over the members of the page. Its fields dict holds the other attributes of the
+            page, like nextPageUri, once all the members were iterated. The connection is reused when the page is
+            completely read, and closed when the stream is closed before.
+        """
+        http_headers = self._headers.copy()
+        if custom_headers:
+            http_headers.update(custom_headers)
+
+        limits, queue_time = self.__admit_request('GET', uri)
+        metrics = self.__start_request_metrics('GET', uri, '', queue_time, limits)
+        try:
+            conn, resp = self.__open_download_response('GET', uri, '', http_headers, metrics)
+        except Exception as error:
+            self.__release_request(limits, uri, error=error)
+            self.__finish_request_metrics(metrics, error=error)
+            raise
+        # The request limits are released once the response headers were received, as the caller might send other
+        # requests while iterating the members
+        self.__release_request(limits, uri, resp)
+
+        def close(completed, error):
+            if completed:
+                self.__release_connection(conn, resp)
+            else:
+                conn.close()
+            if metrics is not None:
+                metrics.bytes_received = stream.bytes_read
+            self.__finish_request_metrics(metrics, resp, error)
+
+        stream = CollectionStream(resp, self._json_codec, on_close=close)
+        return stream
+
+    def __do_conditional_get(self, cache, uri):
+        """
+        Requests a URI with the eTag of the response kept in the cache, if any. When the appliance reports that the
+        resource was not modified, the kept body is returned with the 304 response.
+        """
+        etag = cache.get_etag(uri)
+        if not etag:
+            return self.do_http('GET', uri, '')
+
+        resp, body = self.do_http('GET', uri, '', custom_headers={'If-None-Match': etag})
+        if resp.status == 304:
+            body = cache.revalidate(uri)
+            if body is None:
+                # The kept response was evicted in the meantime
+                return self.do_http('GET', uri, '')
+        return resp, body
+
     def getNextPage(self):
         body = self.get(self._nextPage)
         return get_members(body)
@@ -433,18 +1403,27 @@ class connection(object):
             task = None
         return task
 
+    def __invalidate_cached_responses(self, uri):
+        if self._response_cache is not None:
+            self._response_cache.invalidate(uri)
+
     def __do_rest_call(self, http_method, uri, body, custom_headers):
-        resp, body = self.do_http(method=http_method,
-                                  path=uri,
-                                  body=json.dumps(body),
-                                  custom_headers=custom_headers)
+        try:
+            resp, body = self.do_http(method=http_method,
+                                      path=uri,
+                                      body=self._json_codec.dumps(body),
+                                      custom_headers=custom_headers)
+        finally:
+            # The resource might have changed even when the request fails
+            self.__invalidate_cached_responses(uri)
+
         if resp.status >= 400:
             raise HPOneViewException(body)
 
         if resp.status == 304:
             if body and not isinstance(body, dict):
                 try:
-                    body = json.loads(body)
+                    body = self._json_codec.loads(body)
                 except Exception:
                     pass
         elif resp.status == 202:
@@ -480,12 +1459,20 @@ class connection(object):
     # Login/Logout to/from appliance
     ###########################################################################
     def login(self, cred, verbose=False):
-        if self._validateVersion is False:
-            self.validateVersion()
-
         self._cred = cred
+        if self._session_cache is not None and self.__resume_session(cred):
+            auth = self._headers['auth']
+        else:
+            if self._validateVersion is False:
+                self.validateVersion()
+            auth = self.__create_session(cred)
+        if verbose is True:
+            print(('Session Key: ' + auth))
+        logger.info('Logged in successfully')
+
+    def __create_session(self, cred):
         try:
-            task, body = self.post(uri['loginSessions'], self._cred)
+            task, body = self.post(uri['loginSessions'], cred)
         except HPOneViewException:
             logger.exception('Login failed')
             raise
@@ -493,9 +1480,33 @@ class connection(object):
         # Add the auth ID to the headers dictionary
         self._headers['auth'] = auth
         self._session = True
-        if verbose is True:
-            print(('Session Key: ' + auth))
-        logger.info('Logged in successfully')
+        if self._session_cache is not None:
+            self._session_cache.put(self._host, self._apiVersion, cred, auth)
+        return auth
+
+    def __resume_session(self, cred):
+        """
+        Resumes the cached session of the credentials, after checking it is still valid with a single GET request.
+
+        Returns:
+            bool: Indicates if the session was resumed.
+        """
+        session_id = self._session_cache.get(self._host, self._apiVersion, cred)
+        if not session_id:
+            return False
+
+        self._headers['auth'] = session_id
+        resp, body = self.do_http('GET', uri['sessions'], '')
+        if resp.status != 200:
+            logger.debug('The cached session is no longer valid. Status: %s' % resp.status)
+            del self._headers['auth']
+            self._session_cache.remove(self._host, self._apiVersion, cred)
+            return False
+
+        logger.debug('Resumed the cached session')
+        self._session = True
+        self._session_cache.put(self._host, self._apiVersion, cred, session_id)
+        return True
 
     def logout(self, verbose=False):
         # resp, body = self.do_http(method, uri['loginSessions'] \
@@ -509,6 +1520,8 @@ class connection(object):
             print('Logged Out')
         del self._headers['auth']
         self._session = False
+        if self._session_cache is not None and self._cred is not None:
+            self._session_cache.remove(self._host, self._apiVersion, self._cred)
         logger.info('Logged out successfully')
         return None
 
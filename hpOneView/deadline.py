@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*
+
+"""
+deadline.py
+~~~~~~~~
+
+This module implements the time budget shared by the requests and task waits of an operation.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+import functools
+import threading
+import time
+
+from hpOneView.exceptions import HPOneViewTimeout
+
+try:
+    from inspect import getfullargspec as get_arg_spec
+except ImportError:  # Python 2
+    from inspect import getargspec as get_arg_spec
+
+MSG_DEADLINE_EXCEEDED = 'The operation exceeded its timeout of %s seconds'
+
+
+def get_current_deadline():
+    """
+    Gets the deadline of the operation being run by the current thread.
+
+    Returns:
+        Deadline: The innermost active deadline, or None when no deadline is active.
+    """
+    stack = getattr(Deadline._active, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def with_deadline(function):
+    """
+    Decorator that runs a function within a Deadline of its timeout argument, so the timeout covers the HTTP requests
+    of the function as well as the wait for its tasks.
+    """
+    spec = get_arg_spec(function)
+    timeout_index = spec.args.index('timeout')
+    defaults = spec.defaults or ()
+    first_default_index = len(spec.args) - len(defaults)
+    default_timeout = defaults[timeout_index - first_default_index] if timeout_index >= first_default_index else None
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if 'timeout' in kwargs:
+            timeout = kwargs['timeout']
+        elif len(args) > timeout_index:
+            timeout = args[timeout_index]
+        else:
+            timeout = default_timeout
+        with Deadline(timeout):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+class Deadline(object):
+    """
+    Time budget of an operation, covering all of its HTTP requests and the wait for its tasks.
+
+    While a deadline is active, used as a context manager, the connection limits the socket timeouts and the retries
+    to the remaining time and raises HPOneViewTimeout when it is exceeded, and the TaskMonitor stops waiting for the
+    tasks when it is reached. A nested deadline never extends the one already active in the thread.
+
+    Args:
+        timeout: Seconds of the budget. Use -1 or None for no limit.
+
+    Examples:
+        >>> with Deadline(600):
+        >>>     profile = oneview_client.server_profiles.create(profile_data)
+    """
+
+    _active = threading.local()
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.expires_at = None if timeout is None or timeout < 0 else time.time() + timeout
+
+    def remaining(self):
+        """
+        Gets the number of seconds left.
+
+        Returns:
+            float: The remaining seconds, never negative, or None when the deadline has no limit.
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self):
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+    def check(self):
+        """
+        Raises HPOneViewTimeout when the deadline was reached.
+        """
+        if self.expired():
+            raise HPOneViewTimeout(MSG_DEADLINE_EXCEEDED % str(self.timeout))
+
+    def clip(self, timeout):
+        """
+        Limits a timeout to the remaining time.
+
+        Args:
+            timeout: Seconds, or None for no limit.
+
+        Returns:
+            The smallest of the timeout and the remaining seconds, or None when both have no limit.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def __enter__(self):
+        stack = getattr(self._active, 'stack', None)
+        if stack is None:
+            stack = self._active.stack = []
+        current = stack[-1] if stack else None
+        if current is not None and current.expires_at is not None and \
+                (self.expires_at is None or current.expires_at < self.expires_at):
+            # The outer deadline is shorter
+            stack.append(current)
+        else:
+            stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._active.stack.pop()
@@ -149,3 +149,25 @@ class HPOneViewResourceNotFound(HPOneViewException):
        msg (str): Exception message.
     """
     pass
+
+
+class HPOneViewCancelledError(HPOneViewException):
+    """
+    OneView Cancelled Error.
+    The exception is raised when the wait for a task is cancelled.
+
+    Attributes:
+       msg (str): Exception message.
+    """
+    pass
+
+
+class HPOneViewCircuitOpen(HPOneViewException):
+    """
+    OneView Circuit Open Error.
+    The exception is raised when a request fails fast because the appliance, or the endpoint, is failing.
+
+    Attributes:
+       msg (str): Exception message.
+    """
+    pass
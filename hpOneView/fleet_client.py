@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+"""
+This module implements a client that runs the same calls across many HPE OneView appliances.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+import logging
+import threading
+
+from collections import OrderedDict
+
+from hpOneView.deadline import Deadline, get_current_deadline
+from hpOneView.oneview_client import OneViewClient
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of appliances called at once, across all the calls of a fleet client
+DEFAULT_FLEET_MAX_WORKERS = 8
+
+# Seconds each appliance has to complete a call
+DEFAULT_FLEET_TIMEOUT = 120
+
+# Key added to the items to identify their appliance
+APPLIANCE_KEY = 'appliance'
+
+
+def tag_item(item, appliance):
+    """
+    Tags an item with its appliance.
+
+    Returns:
+        dict: A copy of the item with the appliance, or a dict with the appliance and the item as 'value' when the item
+        is not a dict.
+    """
+    if isinstance(item, dict):
+        tagged = dict(item)
+        tagged[APPLIANCE_KEY] = appliance
+        return tagged
+    return {APPLIANCE_KEY: appliance, 'value': item}
+
+
+class FleetResult(object):
+    """
+    Results of a call made to many appliances.
+
+    Attributes:
+        results: OrderedDict with the result of each appliance that completed the call.
+        errors: OrderedDict with the exception raised by each appliance that failed the call.
+    """
+
+    def __init__(self, results, errors):
+        self.results = results
+        self.errors = errors
+
+    @property
+    def items(self):
+        """
+        Gets the merged results, tagged with their appliance. The lists are merged item by item, and the empty results,
+        like a resource not found by get_by_name, are skipped.
+
+        Returns:
+            list: The items, in the order of the appliances.
+        """
+        items = []
+        for appliance, result in self.results.items():
+            if isinstance(result, list):
+                items.extend(tag_item(item, appliance) for item in result)
+            elif result is not None:
+                items.append(tag_item(result, appliance))
+        return items
+
+    @property
+    def failed(self):
+        """
+        Indicates if the call failed in any appliance.
+        """
+        return bool(self.errors)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class OneViewFleetClient(object):
+    """
+    Client of many appliances, which runs the same call in all of them concurrently and merges the results.
+
+    The calls of all the appliances share a maximum number of concurrent calls, and each appliance has its own timeout,
+    which covers all the HTTP requests of its call. An appliance that fails or times out does not stop the others: its
+    exception is reported in the errors of the result.
+
+    Args:
+        clients: OrderedDict or dict of OneViewClient by appliance name, or a list of OneViewClient, named by their
+            host.
+        max_workers: Maximum number of appliances called at once.
+        timeout: Seconds each appliance has to complete a call. Use None for no limit.
+
+    Examples:
+        >>> fleet = OneViewFleetClient.from_configs([config_1, config_2])
+        >>> result = fleet.call('server_hardware', 'get_by', 'serialNumber', 'VCGE9KB041')
+        >>> for server in result.items:
+        >>>     print(server['appliance'], server['name'])
+        >>> for appliance, error in result.errors.items():
+        >>>     print(appliance, error)
+    """
+
+    def __init__(self, clients, max_workers=DEFAULT_FLEET_MAX_WORKERS, timeout=DEFAULT_FLEET_TIMEOUT):
+        if isinstance(clients, dict):
+            self.clients = OrderedDict(clients)
+        else:
+            self.clients = OrderedDict((client.connection.get_host(), client) for client in clients)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.login_errors = OrderedDict()
+        self._semaphore = threading.BoundedSemaphore(max_workers)
+
+    @classmethod
+    def from_configs(cls, configs, max_workers=DEFAULT_FLEET_MAX_WORKERS, timeout=DEFAULT_FLEET_TIMEOUT):
+        """
+        Constructs the fleet client, logging in to the appliances concurrently. The appliances that fail to log in are
+        left out of the fleet, and their exceptions are kept in login_errors.
+
+        Args:
+            configs: List of OneViewClient configurations. The appliances are named by their 'ip'.
+            max_workers: Maximum number of appliances called at once.
+            timeout: Seconds each appliance has to complete a call, including the login.
+
+        Returns:
+            OneViewFleetClient:
+        """
+        fleet = cls({}, max_workers, timeout)
+        configs = OrderedDict((config['ip'], config) for config in configs)
+        result = fleet.__run(configs, OneViewClient)
+        fleet.clients = result.results
+        fleet.login_errors = result.errors
+        return fleet
+
+    @property
+    def appliances(self):
+        """
+        Gets the names of the appliances of the fleet.
+
+        Returns:
+            list:
+        """
+        return list(self.clients.keys())
+
+    def map(self, function, appliances=None):
+        """
+        Calls a function with the client of each appliance, concurrently.
+
+        Args:
+            function: Function called with a OneViewClient.
+            appliances: Names of the appliances called. Defaults to all of them.
+
+        Returns:
+            FleetResult: The results and the errors of the appliances.
+        """
+        if appliances is None:
+            clients = self.clients
+        else:
+            clients = OrderedDict((appliance, self.clients[appliance]) for appliance in appliances)
+        return self.__run(clients, function)
+
+    def call(self, resource, method, *args, **kwargs):
+        """
+        Calls the same method of a resource client in each appliance, concurrently.
+
+        Args:
+            resource: Name of the resource client property of OneViewClient, e.g. 'server_hardware'.
+            method: Name of the method, e.g. 'get_all', 'get_by' or 'get_utilization'.
+            *args: Arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            FleetResult: The results and the errors of the appliances.
+        """
+        return self.map(lambda client: getattr(getattr(client, resource), method)(*args, **kwargs))
+
+    def get_all(self, resource, *args, **kwargs):
+        """
+        Gets the resources of all the appliances. See the get_all method of the resource client.
+
+        Returns:
+            FleetResult:
+        """
+        return self.call(resource, 'get_all', *args, **kwargs)
+
+    def get_by(self, resource, field, value):
+        """
+        Gets the resources of all the appliances with a field value. See the get_by method of the resource client.
+
+        Returns:
+            FleetResult:
+        """
+        return self.call(resource, 'get_by', field, value)
+
+    def __run(self, targets, function):
+        results = OrderedDict()
+        errors = OrderedDict()
+        if not targets:
+            return FleetResult(results, errors)
+
+        deadline = get_current_deadline()
+
+        def run(target):
+            appliance, argument = target
+            with self._semaphore:
+                try:
+                    with Deadline(self.timeout):
+                        if deadline is None:
+                            return appliance, function(argument), None
+                        # The deadline of the caller also covers the calls run by the pool threads
+                        with deadline:
+                            return appliance, function(argument), None
+                except Exception as error:
+                    logger.warning('Call to the appliance %s failed: %s' % (appliance, error))
+                    return appliance, None, error
+
+        from multiprocessing.pool import ThreadPool  # Imported on first use, as it slows down the startup
+        pool = ThreadPool(min(self.max_workers, len(targets)))
+        try:
+            outcomes = pool.map(run, list(targets.items()))
+        finally:
+            pool.close()
+            pool.join()
+
+        for appliance, result, error in outcomes:
+            if error is None:
+                results[appliance] = result
+            else:
+                errors[appliance] = error
+        return FleetResult(results, errors)
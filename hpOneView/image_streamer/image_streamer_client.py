@@ -32,21 +32,46 @@ from future import standard_library
 
 standard_library.install_aliases()
 
+import importlib
+import sys
 
 from hpOneView.connection import connection
-from hpOneView.image_streamer.resources.golden_images import GoldenImages
-from hpOneView.image_streamer.resources.plan_scripts import PlanScripts
-from hpOneView.image_streamer.resources.build_plans import BuildPlans
-from hpOneView.image_streamer.resources.os_volumes import OsVolumes
-from hpOneView.image_streamer.resources.deployment_plans import DeploymentPlans
-from hpOneView.image_streamer.resources.artifact_bundles import ArtifactBundles
-from hpOneView.image_streamer.resources.deployment_groups import DeploymentGroups
+
+# Module of each resource client class. The classes are attributes of this module, but on Python 3.7+ their modules
+# are imported on the first access of the class, e.g. by a property of the client, so importing the client stays fast.
+RESOURCE_CLASSES = {
+    'GoldenImages': 'hpOneView.image_streamer.resources.golden_images',
+    'PlanScripts': 'hpOneView.image_streamer.resources.plan_scripts',
+    'BuildPlans': 'hpOneView.image_streamer.resources.build_plans',
+    'OsVolumes': 'hpOneView.image_streamer.resources.os_volumes',
+    'DeploymentPlans': 'hpOneView.image_streamer.resources.deployment_plans',
+    'ArtifactBundles': 'hpOneView.image_streamer.resources.artifact_bundles',
+    'DeploymentGroups': 'hpOneView.image_streamer.resources.deployment_groups',
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        module_name = RESOURCE_CLASSES.get(name)
+        if module_name is None:
+            raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+        value = globals()[name] = getattr(importlib.import_module(module_name), name)
+        return value
+else:
+    for _name, _module_name in RESOURCE_CLASSES.items():
+        globals()[_name] = getattr(importlib.import_module(_module_name), _name)
+
+
+def _get_resource_class(name):
+    # Gets the class from the module, so a class patched on the module is used by the properties of the client
+    return getattr(sys.modules[__name__], name)
 
 
 class ImageStreamerClient(object):
-    def __init__(self, ip, session_id, api_version):
+    def __init__(self, ip, session_id, api_version, circuit_breaker=None):
         self.__connection = connection(ip, api_version)
         self.__connection.set_session_id(session_id)
+        if circuit_breaker:
+            self.__connection.set_circuit_breaker(**circuit_breaker)
         self.__golden_images = None
         self.__plan_scripts = None
         self.__build_plans = None
@@ -74,7 +99,7 @@ class ImageStreamerClient(object):
             GoldenImages:
         """
         if not self.__golden_images:
-            self.__golden_images = GoldenImages(self.__connection)
+            self.__golden_images = _get_resource_class('GoldenImages')(self.__connection)
         return self.__golden_images
 
     @property
@@ -86,7 +111,7 @@ class ImageStreamerClient(object):
             PlanScripts:
         """
         if not self.__plan_scripts:
-            self.__plan_scripts = PlanScripts(self.__connection)
+            self.__plan_scripts = _get_resource_class('PlanScripts')(self.__connection)
         return self.__plan_scripts
 
     @property
@@ -98,7 +123,7 @@ class ImageStreamerClient(object):
             BuildPlans:
         """
         if not self.__build_plans:
-            self.__build_plans = BuildPlans(self.__connection)
+            self.__build_plans = _get_resource_class('BuildPlans')(self.__connection)
         return self.__build_plans
 
     @property
@@ -110,7 +135,7 @@ class ImageStreamerClient(object):
             OsVolumes:
         """
         if not self.__os_volumes:
-            self.__os_volumes = OsVolumes(self.__connection)
+            self.__os_volumes = _get_resource_class('OsVolumes')(self.__connection)
         return self.__os_volumes
 
     @property
@@ -122,7 +147,7 @@ class ImageStreamerClient(object):
             DeploymentPlans:
         """
         if not self.__deployment_plans:
-            self.__deployment_plans = DeploymentPlans(self.__connection)
+            self.__deployment_plans = _get_resource_class('DeploymentPlans')(self.__connection)
         return self.__deployment_plans
 
     @property
@@ -134,7 +159,7 @@ class ImageStreamerClient(object):
             ArtifactBundles:
         """
         if not self.__artifact_bundles:
-            self.__artifact_bundles = ArtifactBundles(self.__connection)
+            self.__artifact_bundles = _get_resource_class('ArtifactBundles')(self.__connection)
         return self.__artifact_bundles
 
     @property
@@ -146,5 +171,5 @@ class ImageStreamerClient(object):
             DeploymentGroups:
         """
         if not self.__deployment_groups:
-            self.__deployment_groups = DeploymentGroups(self.__connection)
+            self.__deployment_groups = _get_resource_class('DeploymentGroups')(self.__connection)
         return self.__deployment_groups
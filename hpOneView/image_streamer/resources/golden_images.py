@@ -88,7 +88,7 @@ class GoldenImages(object):
         data.update(resource)
         return self._client.create(data, timeout=timeout)
 
-    def upload(self, file_path, golden_image_info):
+    def upload(self, file_path, golden_image_info, progress_callback=None):
         """
         Adds a Golden Image resource from the file that is uploaded from a local drive. Only the .zip format file can
         be used for the upload.
@@ -96,6 +96,8 @@ class GoldenImages(object):
         Args:
             file_path (str): File name to upload.
             golden_image_info (dict): Golden Image information.
+            progress_callback: Function called during the upload with the number of bytes sent and the total number
+                of bytes.
 
         Returns:
             dict: Golden Image.
@@ -104,7 +106,7 @@ class GoldenImages(object):
                                                     quote(golden_image_info.get('name', '')),
                                                     quote(golden_image_info.get('description', '')))
 
-        return self._client.upload(file_path, uri)
+        return self._client.upload(file_path, uri, progress_callback=progress_callback)
 
     def download_archive(self, id_or_uri, file_path):
         """
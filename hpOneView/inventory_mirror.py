@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*
+
+"""
+inventory_mirror.py
+~~~~~~~~~~~
+
+This module implements a local SQLite mirror of the appliance inventory, for offline queries.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from past.builtins import basestring
+
+from hpOneView.resources.collection_sync import SyncState
+
+logger = logging.getLogger(__name__)
+
+# OneViewClient properties of the collections mirrored by default
+DEFAULT_MIRRORED_RESOURCES = ('server_hardware', 'server_profiles', 'enclosures', 'interconnects', 'ethernet_networks',
+                              'fc_networks', 'volumes')
+
+# Resource attributes kept in indexed columns, by column
+INDEXED_ATTRIBUTES = (
+    ('uri', 'uri'),
+    ('name', 'name'),
+    ('type', 'type'),
+    ('serial_number', 'serialNumber'),
+    ('state', 'state'),
+    ('status', 'status'),
+    ('modified', 'modified'),
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resources (
+    uri TEXT PRIMARY KEY,
+    collection TEXT NOT NULL,
+    name TEXT,
+    type TEXT,
+    serial_number TEXT,
+    state TEXT,
+    status TEXT,
+    modified TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_collection ON resources (collection);
+CREATE INDEX IF NOT EXISTS resources_name ON resources (name);
+CREATE INDEX IF NOT EXISTS resources_serial_number ON resources (serial_number);
+CREATE INDEX IF NOT EXISTS resources_state ON resources (state);
+CREATE INDEX IF NOT EXISTS resources_status ON resources (status);
+CREATE INDEX IF NOT EXISTS resources_modified ON resources (modified);
+CREATE TABLE IF NOT EXISTS links (
+    uri TEXT NOT NULL,
+    attribute TEXT NOT NULL,
+    target_uri TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS links_uri ON links (uri);
+CREATE INDEX IF NOT EXISTS links_target_uri ON links (target_uri);
+CREATE TABLE IF NOT EXISTS collections (
+    name TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL,
+    count INTEGER NOT NULL,
+    sync_state TEXT
+);
+'''
+
+MSG_NOT_INDEXED = 'The attribute %s is not indexed. Indexed attributes: %s'
+
+
+def get_links(resource):
+    """
+    Gets the URIs of the resources referenced by a resource, like the enclosure of a server hardware, from its
+    attributes ending in 'Uri' or 'Uris'.
+
+    Returns:
+        list: Tuples with the attribute and the referenced URI.
+    """
+    def is_uri(value):
+        return isinstance(value, basestring) and value.startswith('/rest/')
+
+    links = []
+    for attribute, value in resource.items():
+        if attribute.endswith('Uri') and is_uri(value):
+            links.append((attribute, value))
+        elif attribute.endswith('Uris') and isinstance(value, list):
+            links.extend((attribute, item) for item in value if is_uri(item))
+    return links
+
+
+class InventoryMirror(object):
+    """
+    Local SQLite database with the resources of some collections of an appliance, to run read-only queries and joins
+    locally instead of requesting the collections from the appliance.
+
+    Each resource is kept as its raw JSON in the resources table, with indexed columns for its uri, name, type,
+    serial_number, state, status and modified attributes. The URIs it references in its attributes ending in 'Uri' or
+    'Uris', like the locationUri of a server hardware, are kept in the links table, indexed in both directions.
+
+    Args:
+        oneview_client (OneViewClient): Client of the appliance.
+        path: Path of the SQLite database. Use ':memory:' for a database kept in memory.
+        resources: OneViewClient properties of the mirrored collections, e.g. ['server_hardware', 'enclosures'].
+
+    Examples:
+        >>> mirror = InventoryMirror(oneview_client, 'inventory.db')
+        >>> mirror.sync()
+        >>> mirror.query("SELECT s.name, e.name AS enclosure FROM resources s "
+        >>>              "JOIN links l ON l.uri = s.uri AND l.attribute = 'locationUri' "
+        >>>              "JOIN resources e ON e.uri = l.target_uri WHERE s.collection = 'server_hardware'")
+    """
+
+    def __init__(self, oneview_client, path=':memory:', resources=DEFAULT_MIRRORED_RESOURCES):
+        self._oneview_client = oneview_client
+        self.path = path
+        self.resources = list(resources)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock, self._db:
+            self._db.executescript(SCHEMA)
+
+    def sync(self, resources=None, incremental=False):
+        """
+        Updates the mirrored resources of some collections with the ones in the appliance.
+
+        Args:
+            resources: OneViewClient properties of the collections. Defaults to all the mirrored collections.
+            incremental: If set to true, only the resources modified since the previous incremental sync, and the
+                URIs of the collection to detect the deleted resources, are requested, through the sync method of the
+                resources, e.g. ServerHardware.sync. The collections whose resources have no sync method are requested
+                in full. Otherwise, all the resources are requested and replaced.
+
+        Returns:
+            dict: The number of resources synced of each collection: all of them on a full sync, and the changed and
+            deleted ones on an incremental sync.
+        """
+        counts = {}
+        for collection in resources or self.resources:
+            started_at = time.time()
+            resource = getattr(self._oneview_client, collection)
+            if incremental and hasattr(resource, 'sync'):
+                counts[collection] = self.__sync_changes(collection, resource)
+            else:
+                members = resource.get_all()
+                self.replace_collection(collection, members)
+                counts[collection] = len(members)
+            logger.debug('Mirrored %d %s in %.3f seconds' % (counts[collection], collection, time.time() - started_at))
+        return counts
+
+    def replace_collection(self, collection, members):
+        """
+        Replaces the mirrored resources of a collection, in a single transaction.
+
+        Args:
+            collection: OneViewClient property of the collection.
+            members: All the resources of the collection.
+        """
+        with self._lock, self._db:
+            self.__replace(collection, members)
+            self.__update_collection(collection)
+            self.__set_sync_state(collection, None)
+
+    def upsert(self, collection, members):
+        """
+        Inserts or replaces some resources of a collection, in a single transaction.
+
+        Args:
+            collection: OneViewClient property of the collection.
+            members: The resources.
+        """
+        with self._lock, self._db:
+            self.__insert(collection, members)
+            self.__update_collection(collection)
+
+    def delete(self, uris):
+        """
+        Deletes some mirrored resources, in a single transaction.
+
+        Args:
+            uris: URIs of the resources.
+        """
+        with self._lock, self._db:
+            self.__delete(uris)
+
+    def query(self, sql, parameters=()):
+        """
+        Runs a SQL query in the mirror.
+
+        Args:
+            sql: SQL query, using ? placeholders for the parameters.
+            parameters: Parameters of the query.
+
+        Returns:
+            list: The rows, as dicts.
+        """
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, parameters)]
+
+    def get_all(self, collection):
+        """
+        Gets the mirrored resources of a collection.
+
+        Args:
+            collection: OneViewClient property of the collection.
+
+        Returns:
+            list: The resources, sorted by name.
+        """
+        return self.__load('SELECT data FROM resources WHERE collection = ? ORDER BY name', (collection,))
+
+    def get_by(self, collection, field, value):
+        """
+        Gets the mirrored resources of a collection with an indexed attribute value.
+
+        Args:
+            collection: OneViewClient property of the collection.
+            field: Indexed attribute: uri, name, type, serialNumber, state, status or modified.
+            value: Value of the attribute.
+
+        Returns:
+            list: The resources, sorted by name.
+        """
+        columns = dict((attribute, column) for column, attribute in INDEXED_ATTRIBUTES)
+        if field not in columns:
+            raise ValueError(MSG_NOT_INDEXED % (field, ', '.join(sorted(columns))))
+        return self.__load('SELECT data FROM resources WHERE collection = ? AND %s = ? ORDER BY name' % columns[field],
+                           (collection, value))
+
+    def get_by_uri(self, uri):
+        """
+        Gets a mirrored resource.
+
+        Returns:
+            dict: The resource, or None when it is not mirrored.
+        """
+        resources = self.__load('SELECT data FROM resources WHERE uri = ?', (uri,))
+        return resources[0] if resources else None
+
+    def get_referencing(self, uri, collection=None):
+        """
+        Gets the mirrored resources that reference a resource, like the interconnects of an enclosure.
+
+        Args:
+            uri: URI of the referenced resource.
+            collection: OneViewClient property of the collection of the referencing resources. Defaults to all.
+
+        Returns:
+            list: The resources, sorted by name.
+        """
+        sql = 'SELECT DISTINCT r.data, r.name FROM resources r JOIN links l ON l.uri = r.uri WHERE l.target_uri = ?'
+        parameters = (uri,)
+        if collection is not None:
+            sql += ' AND r.collection = ?'
+            parameters += (collection,)
+        return self.__load(sql + ' ORDER BY r.name', parameters)
+
+    def get_synced_collections(self):
+        """
+        Gets the time of the last sync and the number of resources of each mirrored collection.
+
+        Returns:
+            dict: Dicts with the synced_at time and the count, by collection.
+        """
+        rows = self.query('SELECT name, synced_at, count FROM collections')
+        return dict((row['name'], dict(synced_at=row['synced_at'], count=row['count'])) for row in rows)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __load(self, sql, parameters):
+        return [json.loads(row['data']) for row in self.query(sql, parameters)]
+
+    def __insert(self, collection, members):
+        rows = []
+        links = []
+        for member in members:
+            values = [member.get(attribute) for _, attribute in INDEXED_ATTRIBUTES]
+            rows.append(tuple(values) + (collection, json.dumps(member)))
+            links.extend((member['uri'], attribute, target_uri) for attribute, target_uri in get_links(member))
+
+        columns = ', '.join(column for column, _ in INDEXED_ATTRIBUTES)
+        self._db.executemany('DELETE FROM links WHERE uri = ?', [(member['uri'],) for member in members])
+        self._db.executemany('INSERT OR REPLACE INTO resources (%s, collection, data) VALUES (%s)' %
+                             (columns, ', '.join('?' * (len(INDEXED_ATTRIBUTES) + 2))), rows)
+        self._db.executemany('INSERT INTO links (uri, attribute, target_uri) VALUES (?, ?, ?)', links)
+
+    def __replace(self, collection, members):
+        self._db.execute('DELETE FROM links WHERE uri IN (SELECT uri FROM resources WHERE collection = ?)',
+                         (collection,))
+        self._db.execute('DELETE FROM resources WHERE collection = ?', (collection,))
+        self.__insert(collection, members)
+
+    def __delete(self, uris):
+        uris = [(uri,) for uri in uris]
+        self._db.executemany('DELETE FROM links WHERE uri = ?', uris)
+        self._db.executemany('DELETE FROM resources WHERE uri = ?', uris)
+
+    def __update_collection(self, collection):
+        count = self._db.execute('SELECT COUNT(*) FROM resources WHERE collection = ?', (collection,)).fetchone()[0]
+        synced_at = time.time()
+        self._db.execute('INSERT OR IGNORE INTO collections (name, synced_at, count) VALUES (?, ?, ?)',
+                         (collection, synced_at, count))
+        self._db.execute('UPDATE collections SET synced_at = ?, count = ? WHERE name = ?',
+                         (synced_at, count, collection))
+
+    def __set_sync_state(self, collection, state):
+        self._db.execute('UPDATE collections SET sync_state = ? WHERE name = ?',
+                         (json.dumps(state.to_dict()) if state is not None else None, collection))
+
+    def __sync_changes(self, collection, resource):
+        rows = self.query('SELECT sync_state FROM collections WHERE name = ?', (collection,))
+        state = SyncState.from_dict(json.loads(rows[0]['sync_state'])) if rows and rows[0]['sync_state'] else \
+            SyncState()
+
+        result = resource.sync(state=state)
+        with self._lock, self._db:
+            if result.full:
+                self.__replace(collection, result.changed)
+            else:
+                self.__insert(collection, result.changed)
+                self.__delete(result.deleted)
+            self.__update_collection(collection)
+            self.__set_sync_state(collection, result.state)
+        return len(result.changed) + len(result.deleted)
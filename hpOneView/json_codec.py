@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*
+
+"""
+json_codec.py
+~~~~~~~~~~~~~
+
+This module implements the codecs of the JSON request and response bodies.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+
+try:
+    import orjson
+except ImportError:  # The fast codec is optional
+    orjson = None
+
+MSG_UNKNOWN_JSON_CODEC = 'Unknown JSON codec: %s'
+MSG_JSON_CODEC_NOT_INSTALLED = 'The JSON codec %s is not installed'
+
+
+class JsonCodec(object):
+    """
+    Codec of the JSON bodies based on the standard json module.
+
+    Custom codecs can be set on the connection by subclassing it and overriding loads and dumps.
+    """
+    name = 'json'
+
+    def loads(self, data):
+        """
+        Decodes a JSON document.
+
+        Args:
+            data: Document, either as UTF-8 bytes, a bytearray or a string.
+
+        Returns:
+            The decoded object.
+
+        Raises:
+            ValueError: When the document is not valid JSON or not valid UTF-8.
+        """
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """
+        Encodes an object as a JSON document.
+
+        Returns:
+            The document, either as a string or as UTF-8 bytes, ready to be sent as a request body.
+        """
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Codec of the JSON bodies based on orjson, which decodes the responses straight from the received bytes.
+
+    The documents rejected by orjson, like the ones with NaN values, are decoded again with the standard json module,
+    so both codecs accept the same responses.
+    """
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise ValueError(MSG_JSON_CODEC_NOT_INSTALLED % self.name)
+
+    def loads(self, data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return super(OrjsonCodec, self).loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+JSON_CODECS = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def create_json_codec(name=None):
+    """
+    Creates a JSON codec by its name.
+
+    Args:
+        name: 'json' for the standard json module, 'orjson' for orjson, or None for the fastest installed codec.
+
+    Returns:
+        JsonCodec
+
+    Raises:
+        ValueError: When the codec is unknown or not installed.
+    """
+    if name is None:
+        name = OrjsonCodec.name if orjson is not None else JsonCodec.name
+    if name not in JSON_CODECS:
+        raise ValueError(MSG_UNKNOWN_JSON_CODEC % name)
+    return JSON_CODECS[name]()
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*
+
+"""
+json_stream.py
+~~~~~~~~~~~~~~
+
+This module implements the incremental parser of the collection pages returned by the appliance.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import re
+
+from hpOneView.json_codec import JsonCodec
+
+# Number of bytes read from the response at a time
+DEFAULT_STREAM_CHUNK_SIZE = 65536
+
+MSG_INVALID_COLLECTION = 'Invalid collection document: unexpected character at byte %d'
+MSG_TRUNCATED_COLLECTION = 'Invalid collection document: unexpected end of the document'
+MSG_STREAM_ALREADY_READ = 'The collection stream was already read'
+
+_WHITESPACE = frozenset(bytearray(b' \t\r\n'))
+_QUOTE, _BACKSLASH, _COMMA, _COLON = bytearray(b'"\\,:')
+_OPEN_OBJECT, _CLOSE_OBJECT, _OPEN_ARRAY, _CLOSE_ARRAY = bytearray(b'{}[]')
+
+# The values are skipped with regular expressions, rather than byte by byte, until their end is found
+_STRING_DELIMITER = re.compile(b'["\\\\]')
+# Characters of an object or array up to its next bracket, including the complete strings
+_CONTAINER_CONTENT = re.compile(b'[^"{}\\[\\]]*(?:"[^"\\\\]*(?:\\\\.[^"\\\\]*)*"[^"{}\\[\\]]*)*', re.DOTALL)
+_SCALAR_END = re.compile(b'[,}\\]\\s]')
+
+
+class CollectionStream(object):
+    """
+    Incremental parser of a collection page, which yields each item of its 'members' array as soon as it is received.
+
+    Only the item being parsed and one chunk of the body are kept in memory, instead of the whole page. The other
+    attributes of the page, like 'nextPageUri' or 'total', are available in the fields dict once all the members were
+    iterated. Each item is decoded by the JSON codec of the connection.
+
+    The stream can only be iterated once. When the iteration is stopped before the end of the page, the stream must be
+    closed, either explicitly or by using it as a context manager.
+
+    Args:
+        stream: File-like object with the body of the page, like an HTTP response.
+        json_codec (JsonCodec): Codec used to decode the members and the fields.
+        chunk_size: Number of bytes read from the stream at a time.
+        on_close: Function called when the stream is closed, with a bool indicating if the page was completely parsed
+            and the exception that stopped the parsing, if any.
+    """
+
+    def __init__(self, stream, json_codec=None, chunk_size=DEFAULT_STREAM_CHUNK_SIZE, on_close=None):
+        self._stream = stream
+        self._json_codec = json_codec or JsonCodec()
+        self._chunk_size = chunk_size
+        self._on_close = on_close
+        self._buffer = bytearray()
+        self._pos = 0
+        self._started = False
+        self.closed = False
+        self.bytes_read = 0
+        self.fields = {}
+
+    def __iter__(self):
+        if self._started or self.closed:
+            raise ValueError(MSG_STREAM_ALREADY_READ)
+        self._started = True
+        return self.__iter_members()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Stops the parsing. The remaining of the body is not read.
+        """
+        self.__close(False)
+
+    def __close(self, completed, error=None):
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer = bytearray()
+        if self._on_close is not None:
+            self._on_close(completed, error)
+
+    def __iter_members(self):
+        completed = False
+        error = None
+        try:
+            for member in self.__parse():
+                yield member
+                if self.closed:
+                    return
+            completed = True
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.__close(completed, error)
+
+    def __parse(self):
+        self.__expect(_OPEN_OBJECT)
+        if self.__peek() == _CLOSE_OBJECT:
+            self._pos += 1
+        else:
+            while True:
+                key = self.__decode(self.__read_value())
+                self.__expect(_COLON)
+                if key == 'members' and self.__peek() == _OPEN_ARRAY:
+                    for member in self.__parse_members():
+                        yield member
+                else:
+                    self.fields[key] = self.__decode(self.__read_value())
+                if self.__expect(_COMMA, _CLOSE_OBJECT) == _CLOSE_OBJECT:
+                    break
+
+        # Reads the remaining of the body, so the connection can be reused
+        if self.__peek() is not None:
+            raise ValueError(MSG_INVALID_COLLECTION % (self.bytes_read - len(self._buffer) + self._pos))
+
+    def __parse_members(self):
+        self._pos += 1
+        if self.__peek() == _CLOSE_ARRAY:
+            self._pos += 1
+            return
+
+        while True:
+            yield self.__decode(self.__read_value())
+            if self.__expect(_COMMA, _CLOSE_ARRAY) == _CLOSE_ARRAY:
+                return
+
+    def __decode(self, value):
+        return self._json_codec.loads(value)
+
+    def __fill(self):
+        """
+        Reads a chunk of the stream, discarding the bytes before the value being parsed.
+
+        Returns:
+            int: Number of bytes discarded from the start of the buffer, or None at the end of the stream.
+        """
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            return None
+
+        self.bytes_read += len(chunk)
+        shift = self._pos
+        del self._buffer[:shift]
+        self._pos = 0
+        self._buffer += chunk
+        return shift
+
+    def __fill_or_fail(self):
+        shift = self.__fill()
+        if shift is None:
+            raise ValueError(MSG_TRUNCATED_COLLECTION)
+        return shift
+
+    def __peek(self):
+        """
+        Skips the whitespace.
+
+        Returns:
+            int: The next byte, which is not consumed, or None at the end of the stream.
+        """
+        while True:
+            buffer = self._buffer
+            while self._pos < len(buffer):
+                if buffer[self._pos] not in _WHITESPACE:
+                    return buffer[self._pos]
+                self._pos += 1
+            if self.__fill() is None:
+                return None
+
+    def __expect(self, *expected):
+        char = self.__peek()
+        if char is None:
+            raise ValueError(MSG_TRUNCATED_COLLECTION)
+        if char not in expected:
+            raise ValueError(MSG_INVALID_COLLECTION % (self.bytes_read - len(self._buffer) + self._pos))
+        self._pos += 1
+        return char
+
+    def __read_value(self):
+        """
+        Returns:
+            bytearray: The next JSON value, not decoded.
+        """
+        first = self.__peek()
+        if first is None:
+            raise ValueError(MSG_TRUNCATED_COLLECTION)
+
+        if first == _QUOTE:
+            end = self.__scan_string(self._pos + 1)
+        elif first in (_OPEN_OBJECT, _OPEN_ARRAY):
+            end = self.__scan_container(self._pos + 1)
+        else:
+            end = self.__scan_scalar(self._pos)
+
+        value = self._buffer[self._pos:end]
+        self._pos = end
+        return value
+
+    def __scan_string(self, index):
+        """
+        Returns:
+            int: The index after the closing quote of the string whose content starts at index.
+        """
+        while True:
+            match = _STRING_DELIMITER.search(self._buffer, index)
+            if match is None:
+                index = len(self._buffer) - self.__fill_or_fail()
+                continue
+
+            index = match.start()
+            if self._buffer[index] == _QUOTE:
+                return index + 1
+            if index + 1 < len(self._buffer):
+                # Skips the escaped character
+                index += 2
+            else:
+                index -= self.__fill_or_fail()
+
+    def __scan_container(self, index):
+        """
+        Returns:
+            int: The index after the end of the object or array whose content starts at index.
+        """
+        depth = 1
+        while True:
+            index = _CONTAINER_CONTENT.match(self._buffer, index).end()
+            if index == len(self._buffer) or self._buffer[index] == _QUOTE:
+                # The container, or one of its strings, continues in the next chunk
+                index -= self.__fill_or_fail()
+                continue
+
+            char = self._buffer[index]
+            index += 1
+            if char in (_OPEN_OBJECT, _OPEN_ARRAY):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return index
+
+    def __scan_scalar(self, index):
+        """
+        Returns:
+            int: The index after the number, boolean or null starting at index.
+        """
+        while True:
+            match = _SCALAR_END.search(self._buffer, index)
+            if match is not None:
+                return match.start()
+
+            index = len(self._buffer)
+            shift = self.__fill()
+            if shift is None:
+                return index
+            index -= shift
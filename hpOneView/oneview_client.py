@@ -32,75 +32,101 @@ from future import standard_library
 
 standard_library.install_aliases()
 
+import importlib
 import json
 import os
+import sys
 
 from hpOneView.connection import connection
-from hpOneView.image_streamer.image_streamer_client import ImageStreamerClient
-from hpOneView.resources.security.certificate_authority import CertificateAuthority
-from hpOneView.resources.servers.connections import Connections
-from hpOneView.resources.networking.fc_networks import FcNetworks
-from hpOneView.resources.networking.fcoe_networks import FcoeNetworks
-from hpOneView.resources.networking.ethernet_networks import EthernetNetworks
-from hpOneView.resources.networking.connection_templates import ConnectionTemplates
-from hpOneView.resources.networking.fabrics import Fabrics
-from hpOneView.resources.networking.network_sets import NetworkSets
-from hpOneView.resources.data_services.metric_streaming import MetricStreaming
-from hpOneView.resources.networking.switches import Switches
-from hpOneView.resources.networking.switch_types import SwitchTypes
-from hpOneView.resources.activity.tasks import Tasks
-from hpOneView.resources.settings.scopes import Scopes
-from hpOneView.resources.servers.enclosures import Enclosures
-from hpOneView.resources.servers.logical_enclosures import LogicalEnclosures
-from hpOneView.resources.servers.enclosure_groups import EnclosureGroups
-from hpOneView.resources.servers.server_hardware import ServerHardware
-from hpOneView.resources.servers.server_hardware_types import ServerHardwareTypes
-from hpOneView.resources.servers.id_pools_ranges import IdPoolsRanges
-from hpOneView.resources.servers.id_pools_ipv4_ranges import IdPoolsIpv4Ranges
-from hpOneView.resources.servers.id_pools_ipv4_subnets import IdPoolsIpv4Subnets
-from hpOneView.resources.servers.id_pools import IdPools
-from hpOneView.resources.networking.interconnects import Interconnects
-from hpOneView.resources.networking.interconnect_types import InterconnectTypes
-from hpOneView.resources.networking.interconnect_link_topologies import InterconnectLinkTopologies
-from hpOneView.resources.networking.sas_interconnect_types import SasInterconnectTypes
-from hpOneView.resources.networking.internal_link_sets import InternalLinkSets
-from hpOneView.resources.uncategorized.unmanaged_devices import UnmanagedDevices
-from hpOneView.resources.networking.logical_downlinks import LogicalDownlinks
-from hpOneView.resources.facilities.power_devices import PowerDevices
-from hpOneView.resources.facilities.racks import Racks
-from hpOneView.resources.facilities.datacenters import Datacenters
-from hpOneView.resources.fc_sans.managed_sans import ManagedSANs
-from hpOneView.resources.fc_sans.san_managers import SanManagers
-from hpOneView.resources.fc_sans.endpoints import Endpoints
-from hpOneView.resources.networking.logical_interconnects import LogicalInterconnects
-from hpOneView.resources.networking.logical_interconnect_groups import LogicalInterconnectGroups
-from hpOneView.resources.networking.sas_logical_interconnects import SasLogicalInterconnects
-from hpOneView.resources.networking.logical_switch_groups import LogicalSwitchGroups
-from hpOneView.resources.networking.logical_switches import LogicalSwitches
-from hpOneView.resources.networking.sas_interconnects import SasInterconnects
-from hpOneView.resources.servers.server_profiles import ServerProfiles
-from hpOneView.resources.servers.server_profile_templates import ServerProfileTemplate
-from hpOneView.resources.storage.sas_logical_jbods import SasLogicalJbods
-from hpOneView.resources.storage.storage_systems import StorageSystems
-from hpOneView.resources.storage.storage_pools import StoragePools
-from hpOneView.resources.storage.storage_volume_templates import StorageVolumeTemplates
-from hpOneView.resources.storage.storage_volume_attachments import StorageVolumeAttachments
-from hpOneView.resources.storage.drive_enclosures import DriveEnclosures
-from hpOneView.resources.settings.firmware_drivers import FirmwareDrivers
-from hpOneView.resources.settings.firmware_bundles import FirmwareBundles
-from hpOneView.resources.storage.volumes import Volumes
-from hpOneView.resources.storage.sas_logical_jbod_attachments import SasLogicalJbodAttachments
-from hpOneView.resources.networking.uplink_sets import UplinkSets
-from hpOneView.resources.servers.migratable_vc_domains import MigratableVcDomains
-from hpOneView.resources.networking.sas_logical_interconnect_groups import SasLogicalInterconnectGroups
-from hpOneView.resources.search.labels import Labels
-from hpOneView.resources.activity.alerts import Alerts
-from hpOneView.resources.uncategorized.os_deployment_plans import OsDeploymentPlans
-from hpOneView.resources.uncategorized.os_deployment_servers import OsDeploymentServers
-from hpOneView.resources.security.certificate_rabbitmq import CertificateRabbitMQ
+from hpOneView.json_codec import create_json_codec
+from hpOneView.retry import RetryPolicy
+from hpOneView.session_cache import SessionCache
 
 ONEVIEW_CLIENT_INVALID_PROXY = 'Invalid Proxy format'
 
+# Module of each resource client class. The classes are attributes of this module, but on Python 3.7+ their modules
+# are imported on the first access of the class, e.g. by a property of the client, so importing the client stays fast.
+RESOURCE_CLASSES = {
+    'ImageStreamerClient': 'hpOneView.image_streamer.image_streamer_client',
+    'CertificateAuthority': 'hpOneView.resources.security.certificate_authority',
+    'Connections': 'hpOneView.resources.servers.connections',
+    'ConnectionTemplates': 'hpOneView.resources.networking.connection_templates',
+    'FcNetworks': 'hpOneView.resources.networking.fc_networks',
+    'FcoeNetworks': 'hpOneView.resources.networking.fcoe_networks',
+    'EthernetNetworks': 'hpOneView.resources.networking.ethernet_networks',
+    'Fabrics': 'hpOneView.resources.networking.fabrics',
+    'Scopes': 'hpOneView.resources.settings.scopes',
+    'Datacenters': 'hpOneView.resources.facilities.datacenters',
+    'NetworkSets': 'hpOneView.resources.networking.network_sets',
+    'ServerHardware': 'hpOneView.resources.servers.server_hardware',
+    'ServerHardwareTypes': 'hpOneView.resources.servers.server_hardware_types',
+    'IdPoolsRanges': 'hpOneView.resources.servers.id_pools_ranges',
+    'IdPoolsIpv4Ranges': 'hpOneView.resources.servers.id_pools_ipv4_ranges',
+    'IdPoolsIpv4Subnets': 'hpOneView.resources.servers.id_pools_ipv4_subnets',
+    'IdPools': 'hpOneView.resources.servers.id_pools',
+    'Switches': 'hpOneView.resources.networking.switches',
+    'SwitchTypes': 'hpOneView.resources.networking.switch_types',
+    'LogicalSwitchGroups': 'hpOneView.resources.networking.logical_switch_groups',
+    'LogicalSwitches': 'hpOneView.resources.networking.logical_switches',
+    'Tasks': 'hpOneView.resources.activity.tasks',
+    'EnclosureGroups': 'hpOneView.resources.servers.enclosure_groups',
+    'Enclosures': 'hpOneView.resources.servers.enclosures',
+    'LogicalEnclosures': 'hpOneView.resources.servers.logical_enclosures',
+    'MetricStreaming': 'hpOneView.resources.data_services.metric_streaming',
+    'Interconnects': 'hpOneView.resources.networking.interconnects',
+    'InterconnectTypes': 'hpOneView.resources.networking.interconnect_types',
+    'InterconnectLinkTopologies': 'hpOneView.resources.networking.interconnect_link_topologies',
+    'SasInterconnectTypes': 'hpOneView.resources.networking.sas_interconnect_types',
+    'InternalLinkSets': 'hpOneView.resources.networking.internal_link_sets',
+    'LogicalInterconnectGroups': 'hpOneView.resources.networking.logical_interconnect_groups',
+    'LogicalInterconnects': 'hpOneView.resources.networking.logical_interconnects',
+    'SasLogicalInterconnects': 'hpOneView.resources.networking.sas_logical_interconnects',
+    'LogicalDownlinks': 'hpOneView.resources.networking.logical_downlinks',
+    'PowerDevices': 'hpOneView.resources.facilities.power_devices',
+    'UnmanagedDevices': 'hpOneView.resources.uncategorized.unmanaged_devices',
+    'Racks': 'hpOneView.resources.facilities.racks',
+    'SanManagers': 'hpOneView.resources.fc_sans.san_managers',
+    'Endpoints': 'hpOneView.resources.fc_sans.endpoints',
+    'ServerProfiles': 'hpOneView.resources.servers.server_profiles',
+    'ServerProfileTemplate': 'hpOneView.resources.servers.server_profile_templates',
+    'StorageSystems': 'hpOneView.resources.storage.storage_systems',
+    'StoragePools': 'hpOneView.resources.storage.storage_pools',
+    'StorageVolumeTemplates': 'hpOneView.resources.storage.storage_volume_templates',
+    'StorageVolumeAttachments': 'hpOneView.resources.storage.storage_volume_attachments',
+    'FirmwareDrivers': 'hpOneView.resources.settings.firmware_drivers',
+    'FirmwareBundles': 'hpOneView.resources.settings.firmware_bundles',
+    'UplinkSets': 'hpOneView.resources.networking.uplink_sets',
+    'Volumes': 'hpOneView.resources.storage.volumes',
+    'SasLogicalJbodAttachments': 'hpOneView.resources.storage.sas_logical_jbod_attachments',
+    'ManagedSANs': 'hpOneView.resources.fc_sans.managed_sans',
+    'MigratableVcDomains': 'hpOneView.resources.servers.migratable_vc_domains',
+    'SasInterconnects': 'hpOneView.resources.networking.sas_interconnects',
+    'SasLogicalInterconnectGroups': 'hpOneView.resources.networking.sas_logical_interconnect_groups',
+    'DriveEnclosures': 'hpOneView.resources.storage.drive_enclosures',
+    'SasLogicalJbods': 'hpOneView.resources.storage.sas_logical_jbods',
+    'Labels': 'hpOneView.resources.search.labels',
+    'Alerts': 'hpOneView.resources.activity.alerts',
+    'OsDeploymentPlans': 'hpOneView.resources.uncategorized.os_deployment_plans',
+    'OsDeploymentServers': 'hpOneView.resources.uncategorized.os_deployment_servers',
+    'CertificateRabbitMQ': 'hpOneView.resources.security.certificate_rabbitmq',
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        module_name = RESOURCE_CLASSES.get(name)
+        if module_name is None:
+            raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+        value = globals()[name] = getattr(importlib.import_module(module_name), name)
+        return value
+else:
+    for _name, _module_name in RESOURCE_CLASSES.items():
+        globals()[_name] = getattr(importlib.import_module(_module_name), _name)
+
+
+def _get_resource_class(name):
+    # Gets the class from the module, so a class patched on the module is used by the properties of the client
+    return getattr(sys.modules[__name__], name)
+
 
 class OneViewClient(object):
     DEFAULT_API_VERSION = 300
@@ -109,6 +135,29 @@ class OneViewClient(object):
         self.__connection = connection(config["ip"], config.get('api_version', self.DEFAULT_API_VERSION))
         self.__image_streamer_ip = config.get("image_streamer_ip")
         self.__set_proxy(config)
+        if config.get('max_page_workers'):
+            self.__connection.set_max_page_workers(config['max_page_workers'])
+        if config.get('response_cache'):
+            self.__connection.set_response_cache(**config['response_cache'])
+        if config.get('download'):
+            self.__connection.set_download_options(**config['download'])
+        if config.get('timeouts'):
+            self.__connection.set_timeouts(**config['timeouts'])
+        if config.get('retry_policy'):
+            self.__connection.set_retry_policy(RetryPolicy(**config['retry_policy']))
+        if config.get('request_limits'):
+            self.__connection.set_request_limits(config['request_limits'])
+        if config.get('coalesce_requests'):
+            self.__connection.set_request_coalescing()
+        if config.get('json_codec'):
+            self.__connection.set_json_codec(create_json_codec(config['json_codec']))
+        self.__circuit_breaker = config.get('circuit_breaker')
+        if self.__circuit_breaker:
+            self.__connection.set_circuit_breaker(**self.__circuit_breaker)
+        if config.get('session_cache'):
+            session_cache = config['session_cache']
+            self.__connection.set_session_cache(SessionCache(**session_cache) if isinstance(session_cache, dict)
+                                                else SessionCache())
         self.__connection.login(config["credentials"])
         self.__certificate_authority = None
         self.__connections = None
@@ -256,14 +305,16 @@ class OneViewClient(object):
 
     def create_image_streamer_client(self):
         """
-        Create the Image Streamer API Client.
+        Create the Image Streamer API Client. When the circuit breaker is configured, the Image Streamer gets its own
+        breaker, so a failing Image Streamer does not fail fast the requests to OneView, and vice versa.
 
         Returns:
             ImageStreamerClient:
         """
-        image_streamer = ImageStreamerClient(self.__image_streamer_ip,
-                                             self.__connection.get_session_id(),
-                                             self.__connection._apiVersion)
+        image_streamer = _get_resource_class('ImageStreamerClient')(self.__image_streamer_ip,
+                                                                    self.__connection.get_session_id(),
+                                                                    self.__connection._apiVersion,
+                                                                    circuit_breaker=self.__circuit_breaker)
 
         return image_streamer
 
@@ -276,7 +327,7 @@ class OneViewClient(object):
             CertificateAuthority:
         """
         if not self.__certificate_authority:
-            self.__certificate_authority = CertificateAuthority(self.__connection)
+            self.__certificate_authority = _get_resource_class('CertificateAuthority')(self.__connection)
         return self.__certificate_authority
 
     @property
@@ -288,7 +339,7 @@ class OneViewClient(object):
             Connections:
         """
         if not self.__connections:
-            self.__connections = Connections(
+            self.__connections = _get_resource_class('Connections')(
                 self.__connection)
         return self.__connections
 
@@ -301,7 +352,7 @@ class OneViewClient(object):
             ConnectionTemplates:
         """
         if not self.__connection_templates:
-            self.__connection_templates = ConnectionTemplates(
+            self.__connection_templates = _get_resource_class('ConnectionTemplates')(
                 self.__connection)
         return self.__connection_templates
 
@@ -314,7 +365,7 @@ class OneViewClient(object):
             FcNetworks:
         """
         if not self.__fc_networks:
-            self.__fc_networks = FcNetworks(self.__connection)
+            self.__fc_networks = _get_resource_class('FcNetworks')(self.__connection)
         return self.__fc_networks
 
     @property
@@ -326,7 +377,7 @@ class OneViewClient(object):
             FcoeNetworks:
         """
         if not self.__fcoe_networks:
-            self.__fcoe_networks = FcoeNetworks(self.__connection)
+            self.__fcoe_networks = _get_resource_class('FcoeNetworks')(self.__connection)
         return self.__fcoe_networks
 
     @property
@@ -338,7 +389,7 @@ class OneViewClient(object):
             EthernetNetworks:
         """
         if not self.__ethernet_networks:
-            self.__ethernet_networks = EthernetNetworks(self.__connection)
+            self.__ethernet_networks = _get_resource_class('EthernetNetworks')(self.__connection)
         return self.__ethernet_networks
 
     @property
@@ -350,7 +401,7 @@ class OneViewClient(object):
             Fabrics:
         """
         if not self.__fabrics:
-            self.__fabrics = Fabrics(self.__connection)
+            self.__fabrics = _get_resource_class('Fabrics')(self.__connection)
         return self.__fabrics
 
     @property
@@ -362,7 +413,7 @@ class OneViewClient(object):
             Scopes:
         """
         if not self.__scopes:
-            self.__scopes = Scopes(self.__connection)
+            self.__scopes = _get_resource_class('Scopes')(self.__connection)
         return self.__scopes
 
     @property
@@ -374,7 +425,7 @@ class OneViewClient(object):
             Datacenters:
         """
         if not self.__datacenters:
-            self.__datacenters = Datacenters(self.__connection)
+            self.__datacenters = _get_resource_class('Datacenters')(self.__connection)
         return self.__datacenters
 
     @property
@@ -386,7 +437,7 @@ class OneViewClient(object):
             NetworkSets:
         """
         if not self.__network_sets:
-            self.__network_sets = NetworkSets(self.__connection)
+            self.__network_sets = _get_resource_class('NetworkSets')(self.__connection)
         return self.__network_sets
 
     @property
@@ -398,7 +449,7 @@ class OneViewClient(object):
             ServerHardware:
         """
         if not self.__server_hardware:
-            self.__server_hardware = ServerHardware(self.__connection)
+            self.__server_hardware = _get_resource_class('ServerHardware')(self.__connection)
         return self.__server_hardware
 
     @property
@@ -410,7 +461,7 @@ class OneViewClient(object):
             ServerHardwareTypes:
         """
         if not self.__server_hardware_types:
-            self.__server_hardware_types = ServerHardwareTypes(
+            self.__server_hardware_types = _get_resource_class('ServerHardwareTypes')(
                 self.__connection)
         return self.__server_hardware_types
 
@@ -423,7 +474,7 @@ class OneViewClient(object):
             IdPoolsRanges:
         """
         if not self.__id_pools_vsn_ranges:
-            self.__id_pools_vsn_ranges = IdPoolsRanges('vsn', self.__connection)
+            self.__id_pools_vsn_ranges = _get_resource_class('IdPoolsRanges')('vsn', self.__connection)
         return self.__id_pools_vsn_ranges
 
     @property
@@ -435,7 +486,7 @@ class OneViewClient(object):
             IdPoolsRanges:
         """
         if not self.__id_pools_vmac_ranges:
-            self.__id_pools_vmac_ranges = IdPoolsRanges('vmac', self.__connection)
+            self.__id_pools_vmac_ranges = _get_resource_class('IdPoolsRanges')('vmac', self.__connection)
         return self.__id_pools_vmac_ranges
 
     @property
@@ -447,7 +498,7 @@ class OneViewClient(object):
             IdPoolsRanges:
         """
         if not self.__id_pools_vwwn_ranges:
-            self.__id_pools_vwwn_ranges = IdPoolsRanges('vwwn', self.__connection)
+            self.__id_pools_vwwn_ranges = _get_resource_class('IdPoolsRanges')('vwwn', self.__connection)
         return self.__id_pools_vwwn_ranges
 
     @property
@@ -459,7 +510,7 @@ class OneViewClient(object):
             IdPoolsIpv4Ranges:
         """
         if not self.__id_pools_ipv4_ranges:
-            self.__id_pools_ipv4_ranges = IdPoolsIpv4Ranges(self.__connection)
+            self.__id_pools_ipv4_ranges = _get_resource_class('IdPoolsIpv4Ranges')(self.__connection)
         return self.__id_pools_ipv4_ranges
 
     @property
@@ -471,7 +522,7 @@ class OneViewClient(object):
             IdPoolsIpv4Subnets:
         """
         if not self.__id_pools_ipv4_subnets:
-            self.__id_pools_ipv4_subnets = IdPoolsIpv4Subnets(self.__connection)
+            self.__id_pools_ipv4_subnets = _get_resource_class('IdPoolsIpv4Subnets')(self.__connection)
         return self.__id_pools_ipv4_subnets
 
     @property
@@ -483,7 +534,7 @@ class OneViewClient(object):
             IdPools:
         """
         if not self.__id_pools:
-            self.__id_pools = IdPools(self.__connection)
+            self.__id_pools = _get_resource_class('IdPools')(self.__connection)
         return self.__id_pools
 
     @property
@@ -495,7 +546,7 @@ class OneViewClient(object):
             Switches:
         """
         if not self.__switches:
-            self.__switches = Switches(self.__connection)
+            self.__switches = _get_resource_class('Switches')(self.__connection)
         return self.__switches
 
     @property
@@ -507,7 +558,7 @@ class OneViewClient(object):
             SwitchTypes:
         """
         if not self.__switch_types:
-            self.__switch_types = SwitchTypes(self.__connection)
+            self.__switch_types = _get_resource_class('SwitchTypes')(self.__connection)
         return self.__switch_types
 
     @property
@@ -519,7 +570,7 @@ class OneViewClient(object):
             LogicalSwitchGroups:
         """
         if not self.__logical_switch_groups:
-            self.__logical_switch_groups = LogicalSwitchGroups(self.__connection)
+            self.__logical_switch_groups = _get_resource_class('LogicalSwitchGroups')(self.__connection)
         return self.__logical_switch_groups
 
     @property
@@ -531,7 +582,7 @@ class OneViewClient(object):
             LogicalSwitches:
         """
         if not self.__logical_switches:
-            self.__logical_switches = LogicalSwitches(self.__connection)
+            self.__logical_switches = _get_resource_class('LogicalSwitches')(self.__connection)
         return self.__logical_switches
 
     @property
@@ -543,7 +594,7 @@ class OneViewClient(object):
             Tasks:
         """
         if not self.__tasks:
-            self.__tasks = Tasks(self.__connection)
+            self.__tasks = _get_resource_class('Tasks')(self.__connection)
         return self.__tasks
 
     @property
@@ -555,7 +606,7 @@ class OneViewClient(object):
             EnclosureGroups:
         """
         if not self.__enclosure_groups:
-            self.__enclosure_groups = EnclosureGroups(self.__connection)
+            self.__enclosure_groups = _get_resource_class('EnclosureGroups')(self.__connection)
         return self.__enclosure_groups
 
     @property
@@ -567,7 +618,7 @@ class OneViewClient(object):
             Enclosures:
         """
         if not self.__enclosures:
-            self.__enclosures = Enclosures(self.__connection)
+            self.__enclosures = _get_resource_class('Enclosures')(self.__connection)
         return self.__enclosures
 
     @property
@@ -579,7 +630,7 @@ class OneViewClient(object):
             LogicalEnclosures:
         """
         if not self.__logical_enclosures:
-            self.__logical_enclosures = LogicalEnclosures(self.__connection)
+            self.__logical_enclosures = _get_resource_class('LogicalEnclosures')(self.__connection)
         return self.__logical_enclosures
 
     @property
@@ -591,7 +642,7 @@ class OneViewClient(object):
             MetricStreaming:
         """
         if not self.__metric_streaming:
-            self.__metric_streaming = MetricStreaming(self.__connection)
+            self.__metric_streaming = _get_resource_class('MetricStreaming')(self.__connection)
         return self.__metric_streaming
 
     @property
@@ -603,7 +654,7 @@ class OneViewClient(object):
             Interconnects:
         """
         if not self.__interconnects:
-            self.__interconnects = Interconnects(self.__connection)
+            self.__interconnects = _get_resource_class('Interconnects')(self.__connection)
         return self.__interconnects
 
     @property
@@ -615,7 +666,7 @@ class OneViewClient(object):
             InterconnectTypes:
         """
         if not self.__interconnect_types:
-            self.__interconnect_types = InterconnectTypes(self.__connection)
+            self.__interconnect_types = _get_resource_class('InterconnectTypes')(self.__connection)
         return self.__interconnect_types
 
     @property
@@ -627,7 +678,7 @@ class OneViewClient(object):
             InterconnectLinkTopologies:
         """
         if not self.__interconnect_link_topologies:
-            self.__interconnect_link_topologies = InterconnectLinkTopologies(self.__connection)
+            self.__interconnect_link_topologies = _get_resource_class('InterconnectLinkTopologies')(self.__connection)
         return self.__interconnect_link_topologies
 
     @property
@@ -639,7 +690,7 @@ class OneViewClient(object):
             SasInterconnectTypes:
         """
         if not self.__sas_interconnect_types:
-            self.__sas_interconnect_types = SasInterconnectTypes(self.__connection)
+            self.__sas_interconnect_types = _get_resource_class('SasInterconnectTypes')(self.__connection)
         return self.__sas_interconnect_types
 
     @property
@@ -651,7 +702,7 @@ class OneViewClient(object):
             InternalLinkSets:
         """
         if not self.__internal_link_sets:
-            self.__internal_link_sets = InternalLinkSets(self.__connection)
+            self.__internal_link_sets = _get_resource_class('InternalLinkSets')(self.__connection)
         return self.__internal_link_sets
 
     @property
@@ -663,7 +714,7 @@ class OneViewClient(object):
             LogicalInterconnectGroups:
         """
         if not self.__logical_interconnect_groups:
-            self.__logical_interconnect_groups = LogicalInterconnectGroups(
+            self.__logical_interconnect_groups = _get_resource_class('LogicalInterconnectGroups')(
                 self.__connection)
         return self.__logical_interconnect_groups
 
@@ -676,7 +727,7 @@ class OneViewClient(object):
             LogicalInterconnects:
         """
         if not self.__logical_interconnects:
-            self.__logical_interconnects = LogicalInterconnects(
+            self.__logical_interconnects = _get_resource_class('LogicalInterconnects')(
                 self.__connection)
         return self.__logical_interconnects
 
@@ -689,7 +740,7 @@ class OneViewClient(object):
             SasLogicalInterconnects:
         """
         if not self.__sas_logical_interconnects:
-            self.__sas_logical_interconnects = SasLogicalInterconnects(self.__connection)
+            self.__sas_logical_interconnects = _get_resource_class('SasLogicalInterconnects')(self.__connection)
         return self.__sas_logical_interconnects
 
     @property
@@ -701,7 +752,7 @@ class OneViewClient(object):
             LogicalDownlinks:
         """
         if not self.__logical_downlinks:
-            self.__logical_downlinks = LogicalDownlinks(
+            self.__logical_downlinks = _get_resource_class('LogicalDownlinks')(
                 self.__connection)
         return self.__logical_downlinks
 
@@ -714,7 +765,7 @@ class OneViewClient(object):
             PowerDevices:
         """
         if not self.__power_devices:
-            self.__power_devices = PowerDevices(self.__connection)
+            self.__power_devices = _get_resource_class('PowerDevices')(self.__connection)
         return self.__power_devices
 
     @property
@@ -726,7 +777,7 @@ class OneViewClient(object):
             UnmanagedDevices:
         """
         if not self.__unmanaged_devices:
-            self.__unmanaged_devices = UnmanagedDevices(self.__connection)
+            self.__unmanaged_devices = _get_resource_class('UnmanagedDevices')(self.__connection)
         return self.__unmanaged_devices
 
     @property
@@ -738,7 +789,7 @@ class OneViewClient(object):
             Racks:
         """
         if not self.__racks:
-            self.__racks = Racks(self.__connection)
+            self.__racks = _get_resource_class('Racks')(self.__connection)
         return self.__racks
 
     @property
@@ -750,7 +801,7 @@ class OneViewClient(object):
             SanManagers:
         """
         if not self.__san_managers:
-            self.__san_managers = SanManagers(self.__connection)
+            self.__san_managers = _get_resource_class('SanManagers')(self.__connection)
         return self.__san_managers
 
     @property
@@ -762,7 +813,7 @@ class OneViewClient(object):
             Endpoints:
         """
         if not self.__endpoints:
-            self.__endpoints = Endpoints(self.__connection)
+            self.__endpoints = _get_resource_class('Endpoints')(self.__connection)
         return self.__endpoints
 
     @property
@@ -774,7 +825,7 @@ class OneViewClient(object):
             ServerProfiles:
         """
         if not self.__server_profiles:
-            self.__server_profiles = ServerProfiles(self.__connection)
+            self.__server_profiles = _get_resource_class('ServerProfiles')(self.__connection)
         return self.__server_profiles
 
     @property
@@ -786,7 +837,7 @@ class OneViewClient(object):
             ServerProfileTemplate:
         """
         if not self.__server_profile_templates:
-            self.__server_profile_templates = ServerProfileTemplate(self.__connection)
+            self.__server_profile_templates = _get_resource_class('ServerProfileTemplate')(self.__connection)
         return self.__server_profile_templates
 
     @property
@@ -798,7 +849,7 @@ class OneViewClient(object):
             StorageSystems:
         """
         if not self.__storage_systems:
-            self.__storage_systems = StorageSystems(self.__connection)
+            self.__storage_systems = _get_resource_class('StorageSystems')(self.__connection)
         return self.__storage_systems
 
     @property
@@ -810,7 +861,7 @@ class OneViewClient(object):
             StoragePools:
         """
         if not self.__storage_pools:
-            self.__storage_pools = StoragePools(self.__connection)
+            self.__storage_pools = _get_resource_class('StoragePools')(self.__connection)
         return self.__storage_pools
 
     @property
@@ -822,7 +873,7 @@ class OneViewClient(object):
             StorageVolumeTemplates:
         """
         if not self.__storage_volume_templates:
-            self.__storage_volume_templates = StorageVolumeTemplates(self.__connection)
+            self.__storage_volume_templates = _get_resource_class('StorageVolumeTemplates')(self.__connection)
         return self.__storage_volume_templates
 
     @property
@@ -834,7 +885,7 @@ class OneViewClient(object):
             StorageVolumeAttachments:
         """
         if not self.__storage_volume_attachments:
-            self.__storage_volume_attachments = StorageVolumeAttachments(self.__connection)
+            self.__storage_volume_attachments = _get_resource_class('StorageVolumeAttachments')(self.__connection)
         return self.__storage_volume_attachments
 
     @property
@@ -846,7 +897,7 @@ class OneViewClient(object):
             FirmwareDrivers:
         """
         if not self.__firmware_drivers:
-            self.__firmware_drivers = FirmwareDrivers(self.__connection)
+            self.__firmware_drivers = _get_resource_class('FirmwareDrivers')(self.__connection)
         return self.__firmware_drivers
 
     @property
@@ -858,7 +909,7 @@ class OneViewClient(object):
             FirmwareBundles:
         """
         if not self.__firmware_bundles:
-            self.__firmware_bundles = FirmwareBundles(self.__connection)
+            self.__firmware_bundles = _get_resource_class('FirmwareBundles')(self.__connection)
         return self.__firmware_bundles
 
     @property
@@ -870,7 +921,7 @@ class OneViewClient(object):
             UplinkSets:
         """
         if not self.__uplink_sets:
-            self.__uplink_sets = UplinkSets(self.__connection)
+            self.__uplink_sets = _get_resource_class('UplinkSets')(self.__connection)
         return self.__uplink_sets
 
     @property
@@ -882,7 +933,7 @@ class OneViewClient(object):
             Volumes:
         """
         if not self.__volumes:
-            self.__volumes = Volumes(self.__connection)
+            self.__volumes = _get_resource_class('Volumes')(self.__connection)
         return self.__volumes
 
     @property
@@ -894,7 +945,7 @@ class OneViewClient(object):
             SasLogicalJbodAttachments:
         """
         if not self.__sas_logical_jbod_attachments:
-            self.__sas_logical_jbod_attachments = SasLogicalJbodAttachments(self.__connection)
+            self.__sas_logical_jbod_attachments = _get_resource_class('SasLogicalJbodAttachments')(self.__connection)
         return self.__sas_logical_jbod_attachments
 
     @property
@@ -906,7 +957,7 @@ class OneViewClient(object):
             ManagedSANs:
         """
         if not self.__managed_sans:
-            self.__managed_sans = ManagedSANs(self.__connection)
+            self.__managed_sans = _get_resource_class('ManagedSANs')(self.__connection)
         return self.__managed_sans
 
     @property
@@ -918,7 +969,7 @@ class OneViewClient(object):
             MigratableVcDomains:
         """
         if not self.__migratable_vc_domains:
-            self.__migratable_vc_domains = MigratableVcDomains(self.__connection)
+            self.__migratable_vc_domains = _get_resource_class('MigratableVcDomains')(self.__connection)
         return self.__migratable_vc_domains
 
     @property
@@ -930,7 +981,7 @@ class OneViewClient(object):
             SasInterconnects:
         """
         if not self.__sas_interconnects:
-            self.__sas_interconnects = SasInterconnects(self.__connection)
+            self.__sas_interconnects = _get_resource_class('SasInterconnects')(self.__connection)
         return self.__sas_interconnects
 
     @property
@@ -942,7 +993,8 @@ class OneViewClient(object):
             SasLogicalInterconnectGroups:
         """
         if not self.__sas_logical_interconnect_groups:
-            self.__sas_logical_interconnect_groups = SasLogicalInterconnectGroups(self.__connection)
+            self.__sas_logical_interconnect_groups = _get_resource_class('SasLogicalInterconnectGroups')(
+                self.__connection)
         return self.__sas_logical_interconnect_groups
 
     @property
@@ -954,7 +1006,7 @@ class OneViewClient(object):
             DriveEnclosures:
         """
         if not self.__drive_enclures:
-            self.__drive_enclures = DriveEnclosures(self.__connection)
+            self.__drive_enclures = _get_resource_class('DriveEnclosures')(self.__connection)
         return self.__drive_enclures
 
     @property
@@ -966,7 +1018,7 @@ class OneViewClient(object):
             SasLogicalJbod:
         """
         if not self.__sas_logical_jbods:
-            self.__sas_logical_jbods = SasLogicalJbods(self.__connection)
+            self.__sas_logical_jbods = _get_resource_class('SasLogicalJbods')(self.__connection)
         return self.__sas_logical_jbods
 
     @property
@@ -978,7 +1030,7 @@ class OneViewClient(object):
             Labels:
         """
         if not self.__labels:
-            self.__labels = Labels(self.__connection)
+            self.__labels = _get_resource_class('Labels')(self.__connection)
         return self.__labels
 
     @property
@@ -990,7 +1042,7 @@ class OneViewClient(object):
             Alerts:
         """
         if not self.__alerts:
-            self.__alerts = Alerts(self.__connection)
+            self.__alerts = _get_resource_class('Alerts')(self.__connection)
         return self.__alerts
 
     @property
@@ -1002,7 +1054,7 @@ class OneViewClient(object):
             OsDeploymentPlans:
         """
         if not self.__os_deployment_plans:
-            self.__os_deployment_plans = OsDeploymentPlans(self.__connection)
+            self.__os_deployment_plans = _get_resource_class('OsDeploymentPlans')(self.__connection)
         return self.__os_deployment_plans
 
     @property
@@ -1014,7 +1066,7 @@ class OneViewClient(object):
             OsDeploymentServers:
         """
         if not self.__os_deployment_servers:
-            self.__os_deployment_servers = OsDeploymentServers(self.__connection)
+            self.__os_deployment_servers = _get_resource_class('OsDeploymentServers')(self.__connection)
         return self.__os_deployment_servers
 
     @property
@@ -1026,5 +1078,5 @@ class OneViewClient(object):
             CertificateRabbitMQ:
         """
         if not self.__certificate_rabbitmq:
-            self.__certificate_rabbitmq = CertificateRabbitMQ(self.__connection)
+            self.__certificate_rabbitmq = _get_resource_class('CertificateRabbitMQ')(self.__connection)
         return self.__certificate_rabbitmq
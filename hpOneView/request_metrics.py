@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*
+
+"""
+request_metrics.py
+~~~~~~~~~~~~~~~~~~
+
+This module implements the instrumentation of the requests made to the appliance and of the task waits.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+
+import re
+import threading
+import time
+
+from bisect import bisect_left
+
+# Upper bounds, in seconds, of the buckets of the latency histograms
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+# Prefix of the names of the metrics in the Prometheus text format
+PROMETHEUS_PREFIX = 'hponeview_'
+
+# Path segments with a digit and at least 8 characters, like UUIDs and serial numbers, or only digits, are IDs
+ID_SEGMENT_PATTERN = re.compile(r'^(?=.*\d)[^/]{8,}$|^\d+$')
+
+
+def get_uri_template(uri):
+    """
+    Gets the endpoint of a URI, without the query string and with the resource IDs replaced by {id}, e.g.
+    /rest/enclosures/09USE133E5H4/configuration becomes /rest/enclosures/{id}/configuration.
+    """
+    path = uri.split('?', 1)[0]
+    return '/'.join('{id}' if ID_SEGMENT_PATTERN.match(segment) else segment for segment in path.split('/'))
+
+
+class RequestMetrics(object):
+    """
+    Measurements of a request made to the appliance, passed to the request hooks of the connection.
+
+    The pre-request hooks receive it before the request is sent, when only the method, the URI and the bytes sent are
+    known. The post-request hooks receive it after the response body was read, or after the request failed.
+
+    Attributes:
+        method: HTTP method.
+        uri: Request URI.
+        uri_template: URI with the resource IDs replaced by {id}. See get_uri_template.
+        bytes_sent: Number of bytes of the request body.
+        bytes_received: Number of bytes of the response body.
+        status: HTTP status of the response, or None when no response was received.
+        error: Exception raised by the request, if any.
+        tls_handshake_time: Seconds to open the connection, including the TLS handshake, or None when a pooled
+            connection was reused.
+        time_to_first_byte: Seconds until the response headers were received.
+        total_time: Seconds until the response body was read.
+        queue_time: Seconds waited for the request limits of the connection before the request was started, or None
+            when the requests are not limited.
+        request_limits: Request limits applied to the request.
+    """
+
+    def __init__(self, method, uri, bytes_sent=0):
+        self.method = method
+        self.uri = uri
+        self.uri_template = get_uri_template(uri)
+        self.bytes_sent = bytes_sent
+        self.bytes_received = 0
+        self.status = None
+        self.error = None
+        self.tls_handshake_time = None
+        self.time_to_first_byte = None
+        self.total_time = None
+        self.queue_time = None
+        self.request_limits = []
+        self.started_at = time.time()
+
+    def elapsed(self):
+        return time.time() - self.started_at
+
+
+class Histogram(object):
+    """
+    Cumulative histogram of observed values, in the Prometheus style.
+
+    Args:
+        buckets: Sorted upper bounds of the buckets. A +Inf bucket is always added.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_cumulative_counts(self):
+        """
+        Returns:
+            list: Pairs of the upper bound of each bucket, ending with float('inf'), and the number of values lower
+            than or equal to it.
+        """
+        total = 0
+        cumulative = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return cumulative
+
+    def to_dict(self):
+        return dict(count=self.count, sum=self.sum, buckets=self.get_cumulative_counts())
+
+
+class MetricsCollector(object):
+    """
+    Thread-safe in-process collector of the request and task wait metrics, with counters and latency histograms by
+    endpoint.
+
+    It is registered as a post-request hook by connection.enable_metrics, and the TaskMonitor records the task waits
+    in it. The metrics can be dumped with to_dict or to_prometheus.
+
+    Args:
+        buckets: Upper bounds, in seconds, of the buckets of the latency histograms.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._task_waits = {}
+        self._coalesced_requests = {}
+        self._tls_handshakes = Histogram(self._buckets)
+
+    def __call__(self, metrics):
+        self.record_request(metrics)
+
+    def record_request(self, metrics):
+        """
+        Records a finished request.
+
+        Args:
+            metrics (RequestMetrics): Measurements of the request.
+        """
+        status = str(metrics.status) if metrics.status is not None else 'error'
+        with self._lock:
+            stats = self._endpoints.get((metrics.method, metrics.uri_template))
+            if stats is None:
+                stats = self._endpoints[(metrics.method, metrics.uri_template)] = dict(
+                    statuses={}, bytes_sent=0, bytes_received=0, duration=Histogram(self._buckets),
+                    time_to_first_byte=Histogram(self._buckets), queue_time=Histogram(self._buckets))
+
+            stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            stats['bytes_sent'] += metrics.bytes_sent or 0
+            stats['bytes_received'] += metrics.bytes_received or 0
+            if metrics.total_time is not None:
+                stats['duration'].observe(metrics.total_time)
+            if metrics.time_to_first_byte is not None:
+                stats['time_to_first_byte'].observe(metrics.time_to_first_byte)
+            if metrics.queue_time is not None:
+                stats['queue_time'].observe(metrics.queue_time)
+            if metrics.tls_handshake_time is not None:
+                self._tls_handshakes.observe(metrics.tls_handshake_time)
+
+    def record_task_wait(self, task, seconds):
+        """
+        Records the time spent waiting for a task.
+
+        Args:
+            task (dict): The task, as last retrieved.
+            seconds: Seconds spent waiting.
+        """
+        key = (str(task.get('name', '')), str(task.get('taskState', '')))
+        with self._lock:
+            histogram = self._task_waits.get(key)
+            if histogram is None:
+                histogram = self._task_waits[key] = Histogram(self._buckets)
+            histogram.observe(seconds)
+
+    def record_coalesced_request(self, method, uri):
+        """
+        Records a request that was not sent, because it waited for an identical request in flight.
+
+        Args:
+            method: HTTP method.
+            uri: Request URI.
+        """
+        key = (method, get_uri_template(uri))
+        with self._lock:
+            self._coalesced_requests[key] = self._coalesced_requests.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._task_waits.clear()
+            self._coalesced_requests.clear()
+            self._tls_handshakes = Histogram(self._buckets)
+
+    def to_dict(self):
+        """
+        Dumps the metrics.
+
+        Returns:
+            dict: The metrics of each endpoint, by 'METHOD /uri/template', the TLS handshake histogram, the task
+            wait histograms, by 'name taskState', and the number of coalesced requests, by 'METHOD /uri/template'.
+        """
+        with self._lock:
+            requests = {}
+            for (method, uri_template), stats in self._endpoints.items():
+                requests['%s %s' % (method, uri_template)] = dict(
+                    count=sum(stats['statuses'].values()),
+                    statuses=dict(stats['statuses']),
+                    bytes_sent=stats['bytes_sent'],
+                    bytes_received=stats['bytes_received'],
+                    duration=stats['duration'].to_dict(),
+                    time_to_first_byte=stats['time_to_first_byte'].to_dict(),
+                    queue_time=stats['queue_time'].to_dict())
+            task_waits = dict(('%s %s' % key, histogram.to_dict()) for key, histogram in self._task_waits.items())
+            coalesced_requests = dict(('%s %s' % key, count) for key, count in self._coalesced_requests.items())
+            return dict(requests=requests, tls_handshake=self._tls_handshakes.to_dict(), task_waits=task_waits,
+                        coalesced_requests=coalesced_requests)
+
+    def to_prometheus(self):
+        """
+        Dumps the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, one sample by line.
+        """
+        lines = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+
+            self.__add_header(lines, 'requests_total', 'counter', 'Number of requests made to the appliance.')
+            for (method, uri_template), stats in endpoints:
+                for status, count in sorted(stats['statuses'].items()):
+                    labels = dict(method=method, endpoint=uri_template, status=status)
+                    lines.append(self.__format_sample('requests_total', labels, count))
+
+            for name, key, help_text in (('request_bytes_sent_total', 'bytes_sent', 'Bytes of the request bodies.'),
+                                         ('request_bytes_received_total', 'bytes_received',
+                                          'Bytes of the response bodies.')):
+                self.__add_header(lines, name, 'counter', help_text)
+                for (method, uri_template), stats in endpoints:
+                    lines.append(self.__format_sample(name, dict(method=method, endpoint=uri_template), stats[key]))
+
+            for name, key, help_text in (('request_duration_seconds', 'duration', 'Total time of the requests.'),
+                                         ('request_time_to_first_byte_seconds', 'time_to_first_byte',
+                                          'Time until the response headers were received.'),
+                                         ('request_queue_seconds', 'queue_time',
+                                          'Time waited for the request limits before the requests were started.')):
+                self.__add_header(lines, name, 'histogram', help_text)
+                for (method, uri_template), stats in endpoints:
+                    self.__add_histogram(lines, name, dict(method=method, endpoint=uri_template), stats[key])
+
+            self.__add_header(lines, 'tls_handshake_seconds', 'histogram',
+                              'Time to open the connections, including the TLS handshake.')
+            self.__add_histogram(lines, 'tls_handshake_seconds', {}, self._tls_handshakes)
+
+            self.__add_header(lines, 'task_wait_seconds', 'histogram', 'Time spent waiting for the tasks.')
+            for (name, state), histogram in sorted(self._task_waits.items()):
+                self.__add_histogram(lines, 'task_wait_seconds', dict(name=name, state=state), histogram)
+
+            self.__add_header(lines, 'coalesced_requests_total', 'counter',
+                              'Number of requests that waited for an identical request in flight.')
+            for (method, uri_template), count in sorted(self._coalesced_requests.items()):
+                lines.append(self.__format_sample('coalesced_requests_total',
+                                                  dict(method=method, endpoint=uri_template), count))
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __add_header(lines, name, metric_type, help_text):
+        lines.append('# HELP %s%s %s' % (PROMETHEUS_PREFIX, name, help_text))
+        lines.append('# TYPE %s%s %s' % (PROMETHEUS_PREFIX, name, metric_type))
+
+    def __add_histogram(self, lines, name, labels, histogram):
+        for bound, count in histogram.get_cumulative_counts():
+            bucket_labels = dict(labels, le='+Inf' if bound == float('inf') else repr(float(bound)))
+            lines.append(self.__format_sample(name + '_bucket', bucket_labels, count))
+        lines.append(self.__format_sample(name + '_sum', labels, histogram.sum))
+        lines.append(self.__format_sample(name + '_count', labels, histogram.count))
+
+    @staticmethod
+    def __format_sample(name, labels, value):
+        label_text = ','.join('%s="%s"' % (key, MetricsCollector.__escape(labels[key])) for key in sorted(labels))
+        return '%s%s%s %s' % (PROMETHEUS_PREFIX, name, '{%s}' % label_text if label_text else '', value)
+
+    @staticmethod
+    def __escape(label_value):
+        return str(label_value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
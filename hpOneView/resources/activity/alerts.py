@@ -88,6 +88,20 @@ class Alerts(object):
         """
         return self._client.get_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view)
 
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', read_ahead=False):
+        """
+        Lazily gets the alerts, one page at a time. The arguments are the same as get_all.
+
+        Args:
+            read_ahead:
+                If set to true, the next page is requested on a background thread while the current page is consumed.
+
+        Returns:
+            generator: Yields the alerts.
+        """
+        return self._client.iter_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                     read_ahead=read_ahead)
+
     def get_by(self, field, value):
         """
         Gets all alerts that match the filter.
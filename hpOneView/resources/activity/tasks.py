@@ -96,3 +96,17 @@ class Tasks(object):
         """
         return self._client.get_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
                                     fields=fields)
+
+    def iter_all(self, start=0, count=-1, fields='', filter='', query='', sort='', view='', read_ahead=False):
+        """
+        Lazily gets the tasks, one page at a time. The arguments are the same as get_all.
+
+        Args:
+            read_ahead:
+                If set to true, the next page is requested on a background thread while the current page is consumed.
+
+        Returns:
+            generator: Yields the tasks.
+        """
+        return self._client.iter_all(start=start, count=count, filter=filter, query=query, sort=sort, view=view,
+                                     fields=fields, read_ahead=read_ahead)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Filter of the members modified at or after a time. The members modified exactly at the high-water mark are requested
+# again, as other members might have been modified in the same millisecond after the previous sync.
+MODIFIED_FILTER = "\"modified>='{0}'\""
+
+MODIFIED_SORT = 'modified:ascending'
+
+
+class SyncState(object):
+    """
+    State of the incremental sync of a collection, kept between the syncs.
+
+    Attributes:
+        modified: High-water mark: the greatest 'modified' value of the members synced, or None before the first sync.
+        uris_at_mark: URIs of the members synced whose 'modified' value is the high-water mark.
+        uris: URIs of the members of the collection, used to detect the deleted members.
+    """
+
+    def __init__(self, modified=None, uris_at_mark=None, uris=None):
+        self.modified = modified
+        self.uris_at_mark = set(uris_at_mark or [])
+        self.uris = set(uris or [])
+
+    def to_dict(self):
+        """
+        Gets the state as a dict that can be serialized to JSON, e.g. to be kept between processes.
+
+        Returns:
+            dict:
+        """
+        return dict(modified=self.modified, uris_at_mark=sorted(self.uris_at_mark), uris=sorted(self.uris))
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state.get('modified'), state.get('uris_at_mark'), state.get('uris'))
+
+    def update(self, members):
+        """
+        Selects the members changed since the previous sync and moves the high-water mark past them.
+
+        Args:
+            members: Members requested with the modified filter, or all the members on a full sync.
+
+        Returns:
+            list: The members changed since the previous sync.
+        """
+        changed = [member for member in members
+                   if member.get('modified') != self.modified or member['uri'] not in self.uris_at_mark]
+
+        for member in changed:
+            modified = member.get('modified')
+            if modified is None:
+                continue
+            if self.modified is None or modified > self.modified:
+                self.modified = modified
+                self.uris_at_mark = set()
+            if modified == self.modified:
+                self.uris_at_mark.add(member['uri'])
+        return changed
+
+
+class SyncResult(object):
+    """
+    Changes of a collection since the previous sync.
+
+    Attributes:
+        created: Members added since the previous sync.
+        updated: Members modified since the previous sync.
+        deleted: URIs of the members removed since the previous sync.
+        full: Indicates if all the members were requested, like on the first sync.
+        state (SyncState): State of the sync, to be passed to the next one.
+    """
+
+    def __init__(self, created, updated, deleted, full, state):
+        self.created = created
+        self.updated = updated
+        self.deleted = deleted
+        self.full = full
+        self.state = state
+
+    @property
+    def changed(self):
+        """
+        Gets the members added or modified since the previous sync.
+
+        Returns:
+            list:
+        """
+        return self.created + self.updated
+
+    def __bool__(self):
+        return bool(self.created or self.updated or self.deleted)
+
+    __nonzero__ = __bool__
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Projection of the members requested on each check, enough to detect the changes of a collection
+WATCH_FIELDS = 'uri,eTag,modified'
+
+DEFAULT_WATCH_INTERVAL = 30
+
+# Types of the events of a watched collection
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+class WatchEvent(object):
+    """
+    Change of a member of a watched collection.
+
+    Attributes:
+        type: CREATED, UPDATED or DELETED.
+        uri: URI of the member.
+        member: The uri, eTag and modified values of the member, or None when it was deleted.
+        previous: The values of the member on the previous check, or None when it was created.
+    """
+
+    def __init__(self, type, uri, member=None, previous=None):
+        self.type = type
+        self.uri = uri
+        self.member = member
+        self.previous = previous
+
+    def __repr__(self):
+        return 'WatchEvent(%s, %s)' % (self.type, self.uri)
+
+
+class CollectionWatch(object):
+    """
+    Watch of a collection, checked periodically by a CollectionWatchScheduler.
+
+    Each check requests the members of the collection with a 'fields=uri,eTag,modified' projection and compares them
+    with the previous check: the members whose eTag, or 'modified' value when they have no eTag, differs are updated.
+    The first check only takes the snapshot of the collection. The events are passed to the callbacks in the thread
+    of the scheduler, so the callbacks should hand over any long processing.
+
+    Args:
+        resource_client: ResourceClient of the collection.
+        filter (list or str): Filter of the watched members.
+        interval: Seconds between two checks.
+        callbacks: Functions called with each WatchEvent.
+        on_error: Function called with the exception raised by a check run by the scheduler.
+    """
+
+    def __init__(self, resource_client, filter='', interval=DEFAULT_WATCH_INTERVAL, callbacks=None, on_error=None):
+        self.filter = filter
+        self.interval = interval
+        self.on_error = on_error
+        self.scheduler = None
+        self._resource_client = resource_client
+        self._callbacks = list(callbacks or [])
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @property
+    def uri(self):
+        return self._resource_client._uri
+
+    @property
+    def snapshot(self):
+        """
+        Gets the members found by the last check.
+
+        Returns:
+            dict: The uri, eTag and modified values of the members, by URI, or None before the first check.
+        """
+        return self._snapshot
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def check(self):
+        """
+        Requests the members of the collection and passes the changes since the previous check to the callbacks.
+
+        Returns:
+            list: The WatchEvents of the check.
+        """
+        with self._lock:
+            members = self._resource_client.get_all(filter=self.filter, fields=WATCH_FIELDS)
+            snapshot = dict((member['uri'], member) for member in members)
+            previous_snapshot, self._snapshot = self._snapshot, snapshot
+
+            if previous_snapshot is None:
+                return []
+            events = self.__diff(previous_snapshot, snapshot)
+
+        if events:
+            logger.debug('Watched %s: %d changes' % (self.uri, len(events)))
+        for event in events:
+            self.__notify(event)
+        return events
+
+    def stop(self):
+        """
+        Stops the periodic checks of the collection.
+        """
+        if self.scheduler is not None:
+            self.scheduler.remove(self)
+
+    @staticmethod
+    def get_version(member):
+        return member.get('eTag') or member.get('modified')
+
+    def __diff(self, previous_snapshot, snapshot):
+        events = []
+        for uri, member in snapshot.items():
+            previous = previous_snapshot.get(uri)
+            if previous is None:
+                events.append(WatchEvent(CREATED, uri, member))
+            elif self.get_version(member) != self.get_version(previous):
+                events.append(WatchEvent(UPDATED, uri, member, previous))
+        for uri, previous in previous_snapshot.items():
+            if uri not in snapshot:
+                events.append(WatchEvent(DELETED, uri, previous=previous))
+        return sorted(events, key=lambda event: event.uri)
+
+    def __notify(self, event):
+        for callback in list(self._callbacks):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception('Collection watch callback failed')
+
+
+class CollectionWatchScheduler(object):
+    """
+    Thread-safe scheduler that checks many watched collections, each one at its own interval, from a single daemon
+    thread. The thread is started when the first collection is added.
+
+    The checks are run one at a time: a slow collection delays the checks of the others, but the appliance receives
+    a single watch request at a time.
+    """
+
+    def __init__(self):
+        self._queue = []
+        self._entries = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    @property
+    def watches(self):
+        """
+        Returns:
+            list: The CollectionWatches being checked.
+        """
+        with self._condition:
+            return list(self._entries)
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    def add(self, watch, delay=None):
+        """
+        Checks a collection periodically.
+
+        Args:
+            watch (CollectionWatch): Watch of the collection.
+            delay: Seconds before the first check. Defaults to the interval of the watch.
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError('The collection watch scheduler was stopped')
+            watch.scheduler = self
+            self.__schedule(watch, time.time() + (watch.interval if delay is None else delay))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name='hpOneView-collection-watch')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, watch):
+        """
+        Stops the checks of a collection. A check in progress is completed.
+        """
+        with self._condition:
+            self._entries.pop(watch, None)
+            self._condition.notify()
+
+    def run_pending(self, now=None):
+        """
+        Checks the collections whose check is due.
+
+        Args:
+            now: Current time, in seconds since the epoch.
+
+        Returns:
+            int: Number of collections checked.
+        """
+        now = time.time() if now is None else now
+        due = []
+        with self._condition:
+            while self._queue and self._queue[0][0] <= now:
+                _, sequence, watch = heapq.heappop(self._queue)
+                if self._entries.get(watch) == sequence:
+                    due.append((sequence, watch))
+
+        for sequence, watch in due:
+            self.__check(watch)
+            with self._condition:
+                if self._entries.get(watch) == sequence:
+                    self.__schedule(watch, now + watch.interval)
+        return len(due)
+
+    def stop(self, timeout=None):
+        """
+        Stops the checks of all the collections and waits for the thread of the scheduler.
+
+        Args:
+            timeout: Maximum number of seconds to wait for a check in progress.
+        """
+        with self._condition:
+            self._stopped = True
+            self._entries.clear()
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def __schedule(self, watch, due):
+        # The entries of the removed or rescheduled watches are left in the queue and skipped
+        sequence = next(self._counter)
+        self._entries[watch] = sequence
+        heapq.heappush(self._queue, (due, sequence, watch))
+
+    def __get_wait(self, now):
+        while self._queue and self._entries.get(self._queue[0][2]) != self._queue[0][1]:
+            heapq.heappop(self._queue)
+        if not self._queue:
+            return None
+        return self._queue[0][0] - now
+
+    def __run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    wait = self.__get_wait(time.time())
+                    if wait is not None and wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                if self._stopped:
+                    return
+            self.run_pending()
+
+    @staticmethod
+    def __check(watch):
+        try:
+            watch.check()
+        except Exception as error:
+            logger.exception('Check of the watched collection %s failed' % watch.uri)
+            if watch.on_error is not None:
+                try:
+                    watch.on_error(error)
+                except Exception:
+                    logger.exception('Collection watch error callback failed')
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler():
+    """
+    Gets the scheduler shared by the watches created without a scheduler.
+
+    Returns:
+        CollectionWatchScheduler
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None or _default_scheduler.stopped:
+            _default_scheduler = CollectionWatchScheduler()
+        return _default_scheduler
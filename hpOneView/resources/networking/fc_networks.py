@@ -76,6 +76,23 @@ class FcNetworks(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort)
 
+    def sync(self, filter='', state=None, detect_deletions=True):
+        """
+        Gets the Fibre Channel networks changed and deleted since the previous sync. See ResourceClient.sync.
+
+        Args:
+            filter (list or str):
+                Filter of the synced Fibre Channel networks. The state of the sync is kept for each filter.
+            state (SyncState):
+                State of a previous sync. Defaults to the state kept for the filter.
+            detect_deletions:
+                If set to false, the deleted Fibre Channel networks are not requested.
+
+        Returns:
+            SyncResult: The created, updated and deleted Fibre Channel networks, and the state of the sync.
+        """
+        return self._client.sync(filter=filter, state=state, detect_deletions=detect_deletions)
+
     def delete(self, resource, force=False, timeout=-1):
         """
         Deletes a Fibre Channel network.
@@ -34,8 +34,12 @@ standard_library.install_aliases()
 import logging
 import os
 
+from itertools import chain
 from urllib.parse import quote
-from hpOneView.resources.task_monitor import TaskMonitor
+from hpOneView.deadline import get_current_deadline, with_deadline
+from hpOneView.resources.collection_sync import SyncState, SyncResult, MODIFIED_FILTER, MODIFIED_SORT
+from hpOneView.resources.collection_watch import CollectionWatch, DEFAULT_WATCH_INTERVAL, get_default_scheduler
+from hpOneView.resources.task_monitor import TaskMonitor, TaskFuture
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewException
 from hpOneView.exceptions import HPOneViewValueError
 
@@ -95,8 +99,9 @@ class ResourceClient(object):
         self._connection = con
         self._uri = uri
         self._task_monitor = TaskMonitor(con)
+        self._sync_states = {}
 
-    def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+    def get_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None, max_workers=None):
         """
         Gets all items according with the given arguments.
 
@@ -135,40 +140,88 @@ class ResourceClient(object):
                 Name of the fields.
             uri:
                 A specific URI (optional)
+            max_workers:
+                Maximum number of pages requested concurrently. When greater than 1, the 'total' reported by the
+                first page is used to request the remaining pages in parallel. Defaults to the connection setting,
+                see connection.set_max_page_workers.
 
         Returns:
             list: A list of items matching the specified filter.
         """
-        if filter:
-            filter = self.__make_query_filter(filter)
+        build_page_uri = self.__make_page_uri_builder(filter, query, sort, view, fields, uri)
+        uri = build_page_uri(start, count)
 
-        if query:
-            query = "&query=" + quote(query)
+        logger.debug('Getting all resources with uri: {0}'.format(uri))
 
-        if sort:
-            sort = "&sort=" + quote(sort)
+        max_workers = max_workers or self._connection.get_max_page_workers()
+        if max_workers > 1:
+            result = self.__do_parallel_requests_to_getall(uri, build_page_uri, start, count, max_workers)
+        else:
+            result = self.__do_requests_to_getall(uri, count)
 
-        if view:
-            view = "&view=" + quote(view)
+        return result
 
-        if fields:
-            fields = "&fields=" + quote(fields)
+    def iter_pages(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None,
+                   read_ahead=False):
+        """
+        Lazily gets the items according with the given arguments, one page at a time.
 
-        path = uri if uri else self._uri
-        self.__validate_resource_uri(path)
+        Only the page being consumed is kept in memory: the next page is requested when the previous one was
+        consumed, following the 'nextPageUri'. The arguments are the same as get_all.
 
-        symbol = '?' if '?' not in path else '&'
+        Args:
+            start:
+                The first item to return, using 0-based indexing.
+            count:
+                The number of resources to return. A count of -1 requests all items (default).
+            filter (list or str):
+                A general filter/query string to narrow the list of items returned.
+            query:
+                A single query parameter can do what would take multiple parameters or multiple GET requests using
+                filter.
+            sort:
+                The sort order of the returned data set.
+            view:
+                Returns a specific subset of the attributes of the resource or collection.
+            fields:
+                Name of the fields.
+            uri:
+                A specific URI (optional)
+            read_ahead:
+                If set to true, the next page is requested on a background thread while the current page is consumed.
 
-        uri = "{0}{1}start={2}&count={3}{4}{5}{6}{7}{8}".format(path, symbol, start, count, filter, query, sort,
-                                                                view, fields)
+        Returns:
+            generator: Yields a list with the members of each page.
+        """
+        build_page_uri = self.__make_page_uri_builder(filter, query, sort, view, fields, uri)
+        return self.__iter_pages(build_page_uri(start, count), count, read_ahead)
 
-        logger.debug('Getting all resources with uri: {0}'.format(uri))
+    def iter_all(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None,
+                 read_ahead=False, stream=False):
+        """
+        Lazily gets all items according with the given arguments.
 
-        result = self.__do_requests_to_getall(uri, count)
+        Works like get_all, but the items are yielded as the pages are retrieved instead of returned in a single
+        list. See iter_pages for the description of the other arguments.
 
-        return result
+        Args:
+            stream:
+                If set to true, the members of each page are parsed incrementally and yielded as soon as they are
+                received, so only one item is kept in memory instead of the whole page. Recommended for collections
+                with large pages, like alerts or the index resources. The read_ahead argument is ignored.
 
-    def delete_all(self, filter, force=False, timeout=-1):
+        Returns:
+            generator: Yields the items matching the specified filter.
+        """
+        if stream:
+            build_page_uri = self.__make_page_uri_builder(filter, query, sort, view, fields, uri)
+            return self.__iter_streamed_members(build_page_uri(start, count), count)
+
+        return chain.from_iterable(self.iter_pages(start, count, filter=filter, query=query, sort=sort, view=view,
+                                                   fields=fields, uri=uri, read_ahead=read_ahead))
+
+    @with_deadline
+    def delete_all(self, filter, force=False, timeout=-1, wait=True):
         """
         Deletes all resources from the appliance that match the provided filter.
 
@@ -181,6 +234,8 @@ class ResourceClient(object):
             timeout:
                 Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             bool: Indicates if the resources were successfully deleted.
@@ -193,11 +248,15 @@ class ResourceClient(object):
         if not task:
             # 204 NO CONTENT
             # Successful return from a synchronous delete operation.
-            return True
+            return self.__completed(True, wait)
+
+        if not wait:
+            return self._task_monitor.submit(task, timeout)
 
         return self._task_monitor.wait_for_task(task, timeout=timeout)
 
-    def delete(self, resource, force=False, timeout=-1, custom_headers=None):
+    @with_deadline
+    def delete(self, resource, force=False, timeout=-1, custom_headers=None, wait=True):
 
         if not resource:
             logger.exception(RESOURCE_CLIENT_RESOURCE_WAS_NOT_PROVIDED)
@@ -223,11 +282,12 @@ class ResourceClient(object):
         if not task:
             # 204 NO CONTENT
             # Successful return from a synchronous delete operation.
-            return True
+            return self.__completed(True, wait)
 
-        task = self._task_monitor.wait_for_task(task, timeout=timeout)
+        if not wait:
+            return self._task_monitor.submit(task, timeout)
 
-        return task
+        return self._task_monitor.wait_for_task(task, timeout=timeout)
 
     def get_schema(self):
         logger.debug('Get schema (uri = %s, resource = %s)' %
@@ -272,7 +332,8 @@ class ResourceClient(object):
         response = self._connection.get(uri)
         return self.__get_members(response)
 
-    def update_with_zero_body(self, uri, timeout=-1, custom_headers=None):
+    @with_deadline
+    def update_with_zero_body(self, uri, timeout=-1, custom_headers=None, wait=True):
         """
         Makes a PUT request to update a resource when no request body is required.
 
@@ -284,15 +345,18 @@ class ResourceClient(object):
                 in OneView; it just stops waiting for its completion.
             custom_headers:
                 Allows set specific HTTP headers.
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             Updated resource.
         """
         logger.debug('Update with zero length body (uri = %s)' % uri)
 
-        return self.__do_put(uri, None, timeout, custom_headers)
+        return self.__do_put(uri, None, timeout, custom_headers, wait)
 
-    def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}):
+    @with_deadline
+    def update(self, resource, uri=None, force=False, timeout=-1, custom_headers=None, default_values={}, wait=True):
         """
         Makes a PUT request to update a resource when a request body is required.
 
@@ -318,6 +382,8 @@ class ResourceClient(object):
                         '200': {"type": "logical-switch-group"},
                         '300': {"type": "logical-switch-groupV300"}
                     }
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             Updated resource.
@@ -337,9 +403,10 @@ class ResourceClient(object):
 
         resource = self.merge_default_values(resource, default_values)
 
-        return self.__do_put(uri, resource, timeout, custom_headers)
+        return self.__do_put(uri, resource, timeout, custom_headers, wait)
 
-    def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None):
+    @with_deadline
+    def create_with_zero_body(self, uri=None, timeout=-1, custom_headers=None, wait=True):
         """
         Makes a POST request to create a resource when no request body is required.
 
@@ -351,6 +418,8 @@ class ResourceClient(object):
                 in OneView; it just stops waiting for its completion.
             custom_headers:
                 Allows set specific HTTP headers.
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             Created resource.
@@ -360,9 +429,10 @@ class ResourceClient(object):
 
         logger.debug('Create with zero body (uri = %s)' % uri)
 
-        return self.__do_post(uri, {}, timeout, custom_headers)
+        return self.__do_post(uri, {}, timeout, custom_headers, wait)
 
-    def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}):
+    @with_deadline
+    def create(self, resource, uri=None, timeout=-1, custom_headers=None, default_values={}, wait=True):
         """
         Makes a POST request to create a resource when a request body is required.
 
@@ -385,6 +455,8 @@ class ResourceClient(object):
                         '200': {"type": "logical-switch-group"},
                         '300': {"type": "logical-switch-groupV300"}
                     }
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             Created resource.
@@ -401,9 +473,10 @@ class ResourceClient(object):
 
         resource = self.merge_default_values(resource, default_values)
 
-        return self.__do_post(uri, resource, timeout, custom_headers)
+        return self.__do_post(uri, resource, timeout, custom_headers, wait)
 
-    def upload(self, file_path, uri=None, timeout=-1):
+    @with_deadline
+    def upload(self, file_path, uri=None, timeout=-1, wait=True, progress_callback=None):
         """
         Makes a multipart request.
 
@@ -415,6 +488,10 @@ class ResourceClient(object):
             timeout:
                 Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
+            progress_callback:
+                Function called during the upload with the number of bytes sent and the total number of bytes.
 
         Returns:
             dict: Response body.
@@ -423,14 +500,16 @@ class ResourceClient(object):
             uri = self._uri
 
         upload_file_name = os.path.basename(file_path)
-        task, entity = self._connection.post_multipart_with_response_handling(uri, file_path, upload_file_name)
+        task, entity = self._connection.post_multipart_with_response_handling(uri, file_path, upload_file_name,
+                                                                              progress_callback=progress_callback)
 
         if not task:
-            return entity
+            return self.__completed(entity, wait)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__wait_for_task(task, timeout, wait)
 
-    def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None):
+    @with_deadline
+    def patch(self, id_or_uri, operation, path, value, timeout=-1, custom_headers=None, wait=True):
         """
         Uses the PATCH to update a resource.
 
@@ -443,6 +522,7 @@ class ResourceClient(object):
             value: Value
             timeout: Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait: If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             Updated resource.
@@ -452,9 +532,11 @@ class ResourceClient(object):
         return self.patch_request(id_or_uri=id_or_uri,
                                   body=patch_request_body,
                                   timeout=timeout,
-                                  custom_headers=custom_headers)
+                                  custom_headers=custom_headers,
+                                  wait=wait)
 
-    def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None):
+    @with_deadline
+    def patch_request(self, id_or_uri, body, timeout=-1, custom_headers=None, wait=True):
         """
         Uses the PATCH to update a resource.
 
@@ -465,6 +547,7 @@ class ResourceClient(object):
             body: Patch request body
             timeout: Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait: If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             Updated resource.
@@ -480,9 +563,9 @@ class ResourceClient(object):
         task, entity = self._connection.patch(uri, body, custom_headers=custom_headers_copy)
 
         if not task:
-            return entity
+            return self.__completed(entity, wait)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__wait_for_task(task, timeout, wait)
 
     def get_by(self, field, value, uri=None):
         """
@@ -535,6 +618,84 @@ class ResourceClient(object):
         else:
             return result[0]
 
+    def sync(self, filter='', state=None, detect_deletions=True):
+        """
+        Gets the changes of the collection since the previous sync.
+
+        The first sync requests all the members and keeps the high-water mark of their 'modified' values. The next
+        syncs request only the members modified since the mark, using a filter. The deleted members are detected by
+        comparing the URIs of the collection, requested with a 'fields=uri' projection, with the ones of the previous
+        sync. The collections whose members have no 'modified' value are requested in full on each sync, and all their
+        members are reported as updated.
+
+        Args:
+            filter (list or str):
+                Filter of the synced members. The state of the sync is kept by the client for each filter.
+            state (SyncState):
+                State of a previous sync, e.g. kept between processes with SyncState.to_dict. Defaults to the
+                state kept by the client for the filter.
+            detect_deletions:
+                If set to false, the deleted members are not requested, saving a request on each incremental sync.
+
+        Returns:
+            SyncResult: The created, updated and deleted members, and the state of the sync.
+        """
+        if state is None:
+            state = self._sync_states.setdefault(str(filter), SyncState())
+        filters = list(filter) if isinstance(filter, list) else [filter] if filter else []
+        previous_uris = set(state.uris)
+
+        if state.modified is None:
+            full = True
+            members = self.get_all(filter=filters or '')
+        else:
+            full = False
+            members = self.get_all(filter=filters + [MODIFIED_FILTER.format(state.modified)], sort=MODIFIED_SORT)
+            # Workaround when the OneView filter does not work, it will filter again
+            members = [member for member in members if member.get('modified', '') >= state.modified]
+
+        changed = state.update(members)
+        if full:
+            current_uris = set(member['uri'] for member in members)
+        elif detect_deletions:
+            current_uris = set(member['uri'] for member in self.get_all(filter=filters or '', fields='uri'))
+            current_uris.update(member['uri'] for member in changed)
+        else:
+            current_uris = previous_uris | set(member['uri'] for member in changed)
+        state.uris = current_uris
+
+        created = [member for member in changed if member['uri'] not in previous_uris]
+        updated = [member for member in changed if member['uri'] in previous_uris]
+        deleted = sorted(previous_uris - current_uris)
+        logger.debug('Synced %s: %d created, %d updated, %d deleted' %
+                     (self._uri, len(created), len(updated), len(deleted)))
+        return SyncResult(created, updated, deleted, full, state)
+
+    def watch(self, callback=None, interval=DEFAULT_WATCH_INTERVAL, filter='', scheduler=None, on_error=None):
+        """
+        Checks the collection periodically and passes its changes to a callback.
+
+        The snapshot of the collection is taken before returning, requesting its members with a
+        'fields=uri,eTag,modified' projection. Then, the scheduler requests the projection again every interval seconds
+        and passes a WatchEvent to the callbacks for each member created, updated or deleted since the previous check.
+
+        Args:
+            callback: Function called with each WatchEvent, in the thread of the scheduler. More callbacks can be
+                registered with the add_callback method of the returned watch.
+            interval: Seconds between two checks.
+            filter (list or str): Filter of the watched members.
+            scheduler (CollectionWatchScheduler): Scheduler that checks the collection. Defaults to a scheduler shared
+                by all the watches.
+            on_error: Function called with the exception raised by a periodic check.
+
+        Returns:
+            CollectionWatch: The watch, whose stop method ends the checks.
+        """
+        watch = CollectionWatch(self, filter, interval, [callback] if callback else None, on_error)
+        watch.check()
+        (scheduler or get_default_scheduler()).add(watch)
+        return watch
+
     def get_utilization(self, id_or_uri, fields=None, filter=None, refresh=False, view=None):
         """
         Retrieves historical utilization data for the specified resource, metrics, and time span.
@@ -625,7 +786,8 @@ class ResourceClient(object):
 
         return self._connection.get(uri)
 
-    def create_report(self, uri, timeout=-1):
+    @with_deadline
+    def create_report(self, uri, timeout=-1, wait=True):
         """
         Creates a report and returns the output.
 
@@ -634,6 +796,8 @@ class ResourceClient(object):
             timeout:
                 Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            wait:
+                If set to false, returns a TaskFuture immediately instead of waiting for the task completion.
 
         Returns:
             list:
@@ -644,6 +808,9 @@ class ResourceClient(object):
         if not task:
             raise HPOneViewException(RESOURCE_CLIENT_TASK_EXPECTED)
 
+        if not wait:
+            return self._task_monitor.submit(task, timeout, handler=lambda completed_task: completed_task['taskOutput'])
+
         task = self._task_monitor.get_completed_task(task, timeout)
 
         return task['taskOutput']
@@ -659,6 +826,15 @@ class ResourceClient(object):
         else:
             return self._uri + "/" + id_or_uri
 
+    def build_query_uri(self, start=0, count=-1, filter='', query='', sort='', view='', fields='', uri=None):
+        """
+        Builds the URI of a request to the collection, with the same query parameters used by get_all.
+
+        Returns:
+            str: Collection URI with the query parameters.
+        """
+        return self.__make_page_uri_builder(filter, query, sort, view, fields, uri)(start, count)
+
     def build_subresource_uri(self, resource_id_or_uri=None, subresource_id_or_uri=None, subresource_path=''):
         if subresource_id_or_uri and "/" in subresource_id_or_uri:
             return subresource_id_or_uri
@@ -695,6 +871,33 @@ class ResourceClient(object):
             logger.exception('Get by uri : unrecognized uri: (%s)' % path)
             raise HPOneViewUnknownType(UNRECOGNIZED_URI)
 
+    def __make_page_uri_builder(self, filter, query, sort, view, fields, uri):
+        if filter:
+            filter = self.__make_query_filter(filter)
+
+        if query:
+            query = "&query=" + quote(query)
+
+        if sort:
+            sort = "&sort=" + quote(sort)
+
+        if view:
+            view = "&view=" + quote(view)
+
+        if fields:
+            fields = "&fields=" + quote(fields)
+
+        path = uri if uri else self._uri
+        self.__validate_resource_uri(path)
+
+        symbol = '?' if '?' not in path else '&'
+
+        def build_page_uri(page_start, page_count):
+            return "{0}{1}start={2}&count={3}{4}{5}{6}{7}{8}".format(path, symbol, page_start, page_count, filter,
+                                                                     query, sort, view, fields)
+
+        return build_page_uri
+
     def __make_query_filter(self, filters):
         if isinstance(filters, list):
             formated_filter = "&filter=".join(quote(f) for f in filters)
@@ -709,24 +912,33 @@ class ResourceClient(object):
         else:
             return []
 
-    def __do_post(self, uri, resource, timeout, custom_headers):
+    def __do_post(self, uri, resource, timeout, custom_headers, wait=True):
         task, entity = self._connection.post(uri, resource, custom_headers=custom_headers)
 
         if not task:
-            return entity
+            return self.__completed(entity, wait)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__wait_for_task(task, timeout, wait)
 
-    def __do_put(self, uri, resource, timeout, custom_headers):
+    def __do_put(self, uri, resource, timeout, custom_headers, wait=True):
         task, body = self._connection.put(uri, resource, custom_headers=custom_headers)
 
         if not task:
-            return body
+            return self.__completed(body, wait)
 
-        return self._task_monitor.wait_for_task(task, timeout)
+        return self.__wait_for_task(task, timeout, wait)
 
-    def __do_requests_to_getall(self, uri, requested_count):
-        items = []
+    def __wait_for_task(self, task, timeout, wait):
+        if wait:
+            return self._task_monitor.wait_for_task(task, timeout)
+
+        return self._task_monitor.submit(task, timeout)
+
+    def __completed(self, result, wait):
+        return result if wait else TaskFuture.from_result(result)
+
+    def __do_requests_to_getall(self, uri, requested_count, items=None):
+        items = items if items is not None else []
 
         while uri:
             logger.debug('Making HTTP request to get all resources. Uri: {0}'.format(uri))
@@ -735,17 +947,128 @@ class ResourceClient(object):
             items += members
 
             logger.debug("Response getAll: nextPageUri = {0}, members list length: {1}".format(uri, str(len(members))))
-            uri = self.__get_next_page(response, items, requested_count)
+            uri = self.__get_next_page(response, len(items), requested_count)
 
         logger.debug('Total # of members found = {0}'.format(str(len(items))))
         return items
 
-    def __get_next_page(self, response, items, requested_count):
+    def __iter_pages(self, uri, requested_count, read_ahead):
+        if read_ahead:
+            from multiprocessing.pool import ThreadPool  # Imported on first use, as it slows down the startup
+            pool = ThreadPool(1)
+        else:
+            pool = None
+        items_count = 0
+        try:
+            logger.debug('Making HTTP request to iterate over resources. Uri: {0}'.format(uri))
+            response = self._connection.get(uri)
+            while response is not None:
+                members = self.__get_members(response)
+                items_count += len(members)
+                uri = self.__get_next_page(response, items_count, requested_count)
+
+                pending = pool.apply_async(self.__get_under_deadline, (uri, get_current_deadline())) \
+                    if pool and uri else None
+
+                if members:
+                    yield members
+
+                if not uri:
+                    response = None
+                elif pending:
+                    response = pending.get()
+                else:
+                    logger.debug('Making HTTP request to iterate over resources. Uri: {0}'.format(uri))
+                    response = self._connection.get(uri)
+        finally:
+            if pool:
+                pool.terminate()
+                pool.join()
+
+    def __get_under_deadline(self, uri, deadline):
+        if deadline is None:
+            return self._connection.get(uri)
+        # The deadline of the caller also covers the page read ahead by the pool thread
+        with deadline:
+            return self._connection.get(uri)
+
+    def __iter_streamed_members(self, uri, requested_count):
+        items_count = 0
+        while uri:
+            logger.debug('Making HTTP request to stream resources. Uri: {0}'.format(uri))
+            with self._connection.get_collection_stream(uri) as page:
+                for member in page:
+                    items_count += 1
+                    yield member
+            uri = self.__get_next_page(page.fields, items_count, requested_count)
+
+    def __do_parallel_requests_to_getall(self, uri, build_page_uri, start, requested_count, max_workers):
+        logger.debug('Making HTTP request to get the first page. Uri: {0}'.format(uri))
+        response = self._connection.get(uri)
+        items = self.__get_members(response)
+        page_size = len(items)
+        total = response.get('total')
+        next_page_uri = self.__get_next_page(response, len(items), requested_count)
+
+        if not next_page_uri or not page_size or total is None:
+            return self.__do_requests_to_getall(next_page_uri, requested_count, items)
+
+        # The same windows the sequential requests would cover, stopping once the requested count is reached
+        windows = []
+        page_start = start + page_size
+        collected = page_size
+        while page_start < total and (requested_count == -1 or collected < requested_count):
+            windows.append((build_page_uri(page_start, page_size), page_size))
+            page_start += page_size
+            collected += page_size
+
+        if not windows:
+            return items
+
+        logger.debug('Requesting {0} pages of {1} members using {2} workers'.format(len(windows), page_size,
+                                                                                    max_workers))
+
+        deadline = get_current_deadline()
+
+        def get_page_window(window):
+            if deadline is None:
+                return self.__get_page_window(window)
+            # The deadline of the caller also covers the pages requested by the pool threads
+            with deadline:
+                return self.__get_page_window(window)
+
+        from multiprocessing.pool import ThreadPool  # Imported on first use, as it slows down the startup
+        pool = ThreadPool(min(max_workers, len(windows)))
+        try:
+            pages = pool.map(get_page_window, windows)
+        finally:
+            pool.close()
+            pool.join()
+
+        for page in pages:
+            items += page
+
+        logger.debug('Total # of members found = {0}'.format(str(len(items))))
+        return items
+
+    def __get_page_window(self, window):
+        uri, size = window
+        items = []
+
+        # A window is completed by following nextPageUri when the appliance returns a smaller page than requested
+        while uri:
+            response = self._connection.get(uri)
+            items += self.__get_members(response)
+            uri = self.__get_next_page(response, len(items), size)
+
+        return items[:size]
+
+    def __get_next_page(self, response, items_count, requested_count):
         next_page_is_empty = response.get('nextPageUri') is None
         has_different_next_page = not response.get('uri') == response.get('nextPageUri')
         has_next_page = not next_page_is_empty and has_different_next_page
 
-        if len(items) >= requested_count and requested_count != -1:
+        if items_count >= requested_count and requested_count != -1:
             return None
 
         return response.get('nextPageUri') if has_next_page else None
@@ -69,6 +69,23 @@ class Enclosures(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort)
 
+    def sync(self, filter='', state=None, detect_deletions=True):
+        """
+        Gets the enclosures changed and deleted since the previous sync. See ResourceClient.sync.
+
+        Args:
+            filter (list or str):
+                Filter of the synced enclosures. The state of the sync is kept for each filter.
+            state (SyncState):
+                State of a previous sync. Defaults to the state kept for the filter.
+            detect_deletions:
+                If set to false, the deleted enclosures are not requested.
+
+        Returns:
+            SyncResult: The created, updated and deleted enclosures, and the state of the sync.
+        """
+        return self._client.sync(filter=filter, state=state, detect_deletions=detect_deletions)
+
     def get_by(self, field, value):
         """
         Gets all Enclosures that match the filter.
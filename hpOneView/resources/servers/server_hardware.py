@@ -156,6 +156,36 @@ class ServerHardware(object):
         """
         return self._client.get_all(start, count, filter=filter, sort=sort)
 
+    def sync(self, filter='', state=None, detect_deletions=True):
+        """
+        Gets the server hardware changed and deleted since the previous sync. See ResourceClient.sync.
+
+        Args:
+            filter (list or str):
+                Filter of the synced server hardware. The state of the sync is kept for each filter.
+            state (SyncState):
+                State of a previous sync. Defaults to the state kept for the filter.
+            detect_deletions:
+                If set to false, the deleted server hardware is not requested.
+
+        Returns:
+            SyncResult: The created, updated and deleted server hardware, and the state of the sync.
+        """
+        return self._client.sync(filter=filter, state=state, detect_deletions=detect_deletions)
+
+    def iter_all(self, start=0, count=-1, filter='', sort='', read_ahead=False):
+        """
+        Lazily gets the server hardware resources, one page at a time. The arguments are the same as get_all.
+
+        Args:
+            read_ahead:
+                If set to true, the next page is requested on a background thread while the current page is consumed.
+
+        Returns:
+            generator: Yields the server hardware resources.
+        """
+        return self._client.iter_all(start, count, filter=filter, sort=sort, read_ahead=read_ahead)
+
     def add(self, information, timeout=-1):
         """
         Adds a rackmount server for management by the appliance. This API initiates the asynchronous addition of
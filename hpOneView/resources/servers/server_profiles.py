@@ -175,6 +175,23 @@ class ServerProfiles(object):
         """
         return self._client.get_all(start=start, count=count, filter=filter, sort=sort)
 
+    def sync(self, filter='', state=None, detect_deletions=True):
+        """
+        Gets the server profiles changed and deleted since the previous sync. See ResourceClient.sync.
+
+        Args:
+            filter (list or str):
+                Filter of the synced server profiles. The state of the sync is kept for each filter.
+            state (SyncState):
+                State of a previous sync. Defaults to the state kept for the filter.
+            detect_deletions:
+                If set to false, the deleted server profiles are not requested.
+
+        Returns:
+            SyncResult: The created, updated and deleted server profiles, and the state of the sync.
+        """
+        return self._client.sync(filter=filter, state=state, detect_deletions=detect_deletions)
+
     def get(self, id_or_uri):
         """
         Retrieves a server profile managed by the appliance by ID or by URI.
@@ -45,7 +45,7 @@ class FirmwareBundles(object):
         self._connection = con
         self._client = ResourceClient(con, self.URI)
 
-    def upload(self, file_path, timeout=-1):
+    def upload(self, file_path, timeout=-1, progress_callback=None):
         """
         Upload an SPP ISO image file or a hotfix file to the appliance.
         The API supports upload of one hotfix at a time into the system.
@@ -55,8 +55,10 @@ class FirmwareBundles(object):
             file_path: Full path to firmware.
             timeout: Timeout in seconds. Wait for task completion by default. The timeout does not abort the operation
                 in OneView; it just stops waiting for its completion.
+            progress_callback: Function called during the upload with the number of bytes sent and the total number
+                of bytes.
 
         Returns:
           dict: Information about the updated firmware bundle.
         """
-        return self._client.upload(file_path, timeout=timeout)
+        return self._client.upload(file_path, timeout=timeout, progress_callback=progress_callback)
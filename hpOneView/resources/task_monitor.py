@@ -32,10 +32,16 @@ standard_library.install_aliases()
 
 
 import logging
+import threading
 import time
 
-from errno import ECONNABORTED, ETIMEDOUT, ENOEXEC, EINVAL, ENETUNREACH, ECONNRESET, ENETDOWN, ECONNREFUSED
+from datetime import datetime
+from urllib.parse import quote
+from weakref import WeakKeyDictionary
+from hpOneView.deadline import get_current_deadline
 from hpOneView.exceptions import HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError, HPOneViewUnknownType
+from hpOneView.exceptions import HPOneViewException, HPOneViewCancelledError
+from hpOneView.retry import RetryPolicy
 
 TASK_PENDING_STATES = ['New', 'Starting', 'Pending', 'Running', 'Suspended', 'Stopping']
 TASK_ERROR_STATES = ['Error', 'Warning', 'Terminated', 'Killed']
@@ -46,19 +52,208 @@ MSG_TASK_TYPE_UNRECONIZED = "Task type: '%s' resource is not a recognized versio
 MSG_UNKNOWN_EXCEPTION = 'Unknown Exception'
 MSG_TIMEOUT = 'Waited %s seconds for task to complete, aborting'
 MSG_INVALID_TASK = 'Invalid task was provided'
+MSG_CANCELLED = 'The wait for the task was cancelled'
+MSG_RESULT_TIMEOUT = 'Task result not available after %s seconds'
+
+TASKS_URI = '/rest/tasks'
 
 UNLIMITED_TIMEOUT = -1
 
+TASK_TIMESTAMP_FORMATS = ['%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%SZ']
+
+# Names of the tasks that delete a resource, which have no associated resource to return
+TASK_DELETED_NAMES = ['Delete',
+                      'Remove',
+                      'Delete server hardware type',
+                      'Remove SAN manager']
+
 logger = logging.getLogger(__name__)
 
 
+def check_task_errors(task):
+    """
+    Raises an HPOneViewTaskError when a completed task has failed. Tasks completed with warnings are not failures.
+
+    Args:
+        task: task dict
+    """
+    if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
+        msg = None
+        error_code = None
+        if 'taskErrors' in task and len(task['taskErrors']) > 0:
+            err = task['taskErrors'][0]
+            if 'message' in err:
+                msg = err['message']
+
+            error_code = err.get('errorCode')
+
+        if msg:
+            raise HPOneViewTaskError(msg, error_code)
+        elif 'taskStatus' in task and task['taskStatus']:
+            raise HPOneViewTaskError(task['taskStatus'], error_code)
+        else:
+            raise HPOneViewTaskError(MSG_UNKNOWN_EXCEPTION, error_code)
+
+
+class TaskPollingScheduler(object):
+    """
+    Estimates when a running task should be checked again.
+
+    The remaining time of a task is estimated, in order of preference, from the progress rate observed between two
+    checks of the computedPercentComplete, from the expectedDuration reported by the task, or from the average
+    duration of previous tasks of the same type. The task is checked again after half of the estimated remaining
+    time, within the min_interval and max_interval limits. When no estimate is available, the interval increases by
+    one second on each check, up to backoff_limit, which is also used when a task takes longer than estimated.
+
+    Args:
+        min_interval: Minimum number of seconds between two checks of a task.
+        max_interval: Maximum number of seconds between two checks of a task.
+        backoff_limit: Maximum number of seconds between two checks of a task without an estimate.
+        history_weight: Weight of the last observed duration in the average duration of a task type.
+    """
+
+    def __init__(self, min_interval=1, max_interval=60, backoff_limit=10, history_weight=0.3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_limit = backoff_limit
+        self.history_weight = history_weight
+        self._durations = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_task_type(task):
+        """
+        Gets the key used to group the durations of similar tasks.
+
+        Args:
+            task: task dict
+
+        Returns:
+            tuple: The category of the associated resource and the task name.
+        """
+        associated_resource = task.get('associatedResource') or {}
+        return associated_resource.get('resourceCategory'), task.get('name')
+
+    def start(self):
+        """
+        Creates the polling state of a task.
+
+        Returns:
+            dict: Polling state to be passed to next_interval and record.
+        """
+        return dict(started=time.time(), attempts=0, last_percent=None, last_time=None)
+
+    def next_interval(self, task, state):
+        """
+        Gets the number of seconds to wait before checking the task again.
+
+        Args:
+            task: The last retrieved task dict.
+            state: Polling state of the task, created by start.
+
+        Returns:
+            int: Seconds to wait.
+        """
+        state['attempts'] += 1
+        now = time.time()
+
+        remaining = self.__estimate_remaining(task, state, now)
+
+        percent = task.get('computedPercentComplete')
+        if percent is not None and percent != state['last_percent']:
+            state['last_percent'] = percent
+            state['last_time'] = now
+
+        if remaining is None or remaining <= 0:
+            return max(self.min_interval, min(state['attempts'], self.backoff_limit))
+
+        return int(max(self.min_interval, min(remaining / 2.0, self.max_interval)))
+
+    def record(self, task, state):
+        """
+        Records the duration of a completed task.
+
+        Args:
+            task: The completed task dict.
+            state: Polling state of the task, created by start.
+        """
+        if not task.get('name'):
+            return
+
+        duration = self.__get_duration(task)
+        if duration is None:
+            duration = time.time() - state['started']
+
+        task_type = self.get_task_type(task)
+        with self._lock:
+            average = self._durations.get(task_type)
+            if average is None:
+                self._durations[task_type] = duration
+            else:
+                self._durations[task_type] = average + self.history_weight * (duration - average)
+
+    def get_average_duration(self, task):
+        """
+        Gets the average duration observed for the tasks of the same type.
+
+        Args:
+            task: task dict
+
+        Returns:
+            float: Duration in seconds, or None when no task of the same type was recorded.
+        """
+        with self._lock:
+            return self._durations.get(self.get_task_type(task))
+
+    def __estimate_remaining(self, task, state, now):
+        percent = task.get('computedPercentComplete')
+
+        if percent is not None and state['last_percent'] is not None and percent > state['last_percent']:
+            rate = (percent - state['last_percent']) / (now - state['last_time'] or 1)
+            return (100 - percent) / rate
+
+        expected_duration = task.get('expectedDuration')
+        if expected_duration:
+            if percent:
+                return expected_duration * (100 - percent) / 100.0
+            return expected_duration - (now - state['started'])
+
+        average_duration = self.get_average_duration(task)
+        if average_duration is not None:
+            return average_duration - (now - state['started'])
+
+        return None
+
+    def __get_duration(self, task):
+        created = self.__parse_timestamp(task.get('created'))
+        modified = self.__parse_timestamp(task.get('modified'))
+        if created and modified and modified >= created:
+            delta = modified - created
+            return delta.days * 86400 + delta.seconds + delta.microseconds / 1000000.0
+        return None
+
+    @staticmethod
+    def __parse_timestamp(value):
+        for timestamp_format in TASK_TIMESTAMP_FORMATS:
+            try:
+                return datetime.strptime(value, timestamp_format)
+            except (TypeError, ValueError):
+                pass
+        return None
+
+
 class TaskMonitor(object):
     # Seconds to wait when a network failure occurs
     CONNECTION_FAILURE_TIMEOUT = 90
 
-    # Known error numbers when the connection drops
-    CONNECTION_FAILURE_ERROR_NUMBERS = [ENOEXEC, EINVAL, ENETUNREACH, ETIMEDOUT, ECONNRESET,
-                                        ECONNABORTED, ENETUNREACH, ENETDOWN, ECONNREFUSED]
+    # Decides which errors of the task requests are tolerated as network instability, up to the timeout
+    connection_failure_policy = RetryPolicy(max_attempts=None, deadline=CONNECTION_FAILURE_TIMEOUT)
+
+    # Maximum number of tasks retrieved by each request when waiting for several tasks
+    TASKS_BATCH_SIZE = 50
+
+    # Estimates the polling intervals; shared by all the monitors to learn the durations of each task type
+    polling_scheduler = TaskPollingScheduler()
 
     def __init__(self, con):
         self._connection = con
@@ -104,53 +299,231 @@ class TaskMonitor(object):
 
         return self.get(task)
 
+    def wait_for_tasks(self, tasks, timeout=-1):
+        """
+        Wait for the execution of several tasks, polling all of them at once, and return the associated resources.
+
+        A failure in a task does not stop the waiting for the other ones; the exception is returned in its place.
+
+        Args:
+            tasks: list of task dicts
+            timeout: timeout in seconds for all the tasks
+
+        Returns:
+            list: For each task, in the given order, the associated resource when creating or updating, True when
+            deleting, or the exception raised for the task.
+        """
+        results = {}
+        for task, response in self.iter_completed_tasks(tasks, timeout):
+            results[task['uri']] = response
+
+        return [results[task['uri']] for task in tasks]
+
+    def iter_completed_tasks(self, tasks, timeout=-1):
+        """
+        Wait for the execution of several tasks, yielding each one as soon as it finishes.
+
+        The pending tasks are retrieved in batches from the tasks collection, with a single request for up to
+        TASKS_BATCH_SIZE tasks on each polling cycle. When the timeout is reached, an HPOneViewTimeout is yielded for
+        each task still running.
+
+        Args:
+            tasks: list of task dicts
+            timeout: timeout in seconds for all the tasks
+
+        Returns:
+            generator: Yields a tuple with the task and its response: the associated resource, True when deleting, or
+            the exception raised for the task.
+        """
+        if not tasks or not all(tasks):
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        return self.__iter_completed_tasks(tasks, self.__limit_to_deadline(timeout))
+
+    def __iter_completed_tasks(self, tasks, timeout):
+        pending = dict((task['uri'], task) for task in tasks)
+        polling_states = dict((task_uri, self.polling_scheduler.start()) for task_uri in pending)
+        start_time = self.get_current_seconds()
+        wait_started_at = time.time()
+        connection_failure_control = dict(last_success=self.get_current_seconds(), batch_supported=True)
+
+        while pending:
+            tasks, errors = self.get_tasks(list(pending), connection_failure_control)
+
+            for task_uri, error in errors.items():
+                yield pending.pop(task_uri), error
+
+            for task in tasks:
+                if task.get('taskState') in TASK_PENDING_STATES or task['uri'] not in pending:
+                    continue
+
+                del pending[task['uri']]
+                self.polling_scheduler.record(task, polling_states[task['uri']])
+                self.__record_task_wait(task, wait_started_at)
+                try:
+                    response = self.__get_task_response(task)
+                except Exception as error:
+                    response = error
+                yield task, response
+
+            if not pending:
+                break
+
+            if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
+                for task_uri in list(pending):
+                    yield pending.pop(task_uri), HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
+                break
+
+            # the tasks are checked again when the first one is expected to finish
+            running_tasks = dict((task['uri'], task) for task in tasks if task['uri'] in pending)
+            interval = min(self.polling_scheduler.next_interval(running_tasks.get(task_uri, pending[task_uri]),
+                                                                polling_states[task_uri])
+                           for task_uri in pending)
+            logger.debug("Waiting for {0} tasks.".format(len(pending)))
+            time.sleep(interval)
+
+    def get_tasks(self, task_uris, connection_failure_control=None):
+        """
+        Retrieve several tasks, in batches of up to TASKS_BATCH_SIZE tasks by request.
+
+        Args:
+            task_uris: list of task URIs
+            connection_failure_control (dict):
+                A dictionary instance that contains last_success for error tolerance control. When network
+                instability occurs, no task is returned until the CONNECTION_FAILURE_TIMEOUT is reached.
+
+        Returns:
+            tuple: The list of retrieved tasks, and a dict with the exception raised for each task that could not be
+            retrieved, by URI.
+        """
+        if connection_failure_control is None:
+            connection_failure_control = dict(last_success=self.get_current_seconds())
+        connection_failure_control.setdefault('batch_supported', True)
+
+        tasks = []
+        errors = {}
+        try:
+            for index in range(0, len(task_uris), self.TASKS_BATCH_SIZE):
+                tasks += self.__get_tasks_batch(task_uris[index:index + self.TASKS_BATCH_SIZE],
+                                                connection_failure_control, errors)
+            connection_failure_control['last_success'] = self.get_current_seconds()
+        except Exception as error:
+            logger.error('; '.join(str(e) for e in error.args) + ' when waiting for the tasks')
+
+            if self.is_connection_failure_tolerated(error, connection_failure_control):
+                # Consider the tasks running when network instability occurs
+                return [], {}
+            raise error
+
+        return tasks, errors
+
+    def __get_tasks_batch(self, task_uris, connection_failure_control, errors):
+        tasks = []
+        if connection_failure_control['batch_supported']:
+            task_filter = "uri in ({0})".format(",".join("'{0}'".format(task_uri) for task_uri in task_uris))
+            uri = "{0}?filter={1}&count={2}".format(TASKS_URI, quote(task_filter), len(task_uris))
+            try:
+                response = self._connection.get(uri)
+                tasks = [task for task in response.get('members') or [] if task.get('uri') in task_uris]
+            except HPOneViewException:
+                logger.debug('Tasks could not be retrieved in batch, retrieving them one by one')
+                connection_failure_control['batch_supported'] = False
+
+        # Tasks not returned by the collection, for instance, child tasks, are retrieved one by one
+        found = set(task['uri'] for task in tasks)
+        for task_uri in task_uris:
+            if task_uri not in found:
+                try:
+                    tasks.append(self._connection.get(task_uri))
+                except HPOneViewException as error:
+                    errors[task_uri] = error
+        return tasks
+
     def __wait_task_completion(self, task, timeout):
         if not task:
             raise HPOneViewUnknownType(MSG_INVALID_TASK)
 
         logger.debug('Waiting for task completion...')
 
+        timeout = self.__limit_to_deadline(timeout)
+        wait_started_at = time.time()
+
         # gets current cpu second for timeout
         start_time = self.get_current_seconds()
         connection_failure_control = dict(last_success=self.get_current_seconds())
+        polling_state = self.polling_scheduler.start()
 
-        i = 0
         while self.is_task_running(task, connection_failure_control):
-            # wait 1 to 10 seconds
-            # the value increases to avoid flooding server with requests
-            i = i + 1 if i < 10 else 10
+            current_task = connection_failure_control.get('last_task', task)
+
+            # the interval is estimated from the task progress to avoid flooding server with requests
+            interval = self.polling_scheduler.next_interval(current_task, polling_state)
 
-            logger.debug("Waiting for task. Percentage complete: " + str(task.get('computedPercentComplete')))
-            logger.debug("Waiting for task. Task state: " + str(task.get('taskState')))
+            logger.debug("Waiting for task. Percentage complete: " + str(current_task.get('computedPercentComplete')))
+            logger.debug("Waiting for task. Task state: " + str(current_task.get('taskState')))
 
-            time.sleep(i)
+            time.sleep(self.__limit_to_deadline(interval))
             if (timeout != UNLIMITED_TIMEOUT) and (start_time + timeout < self.get_current_seconds()):
                 raise HPOneViewTimeout(MSG_TIMEOUT % str(timeout))
 
+        if 'last_task' in connection_failure_control:
+            self.polling_scheduler.record(connection_failure_control['last_task'], polling_state)
+        self.__record_task_wait(connection_failure_control.get('last_task', task), wait_started_at)
+
+    def __record_task_wait(self, task, wait_started_at):
+        collector = self._connection.get_metrics_collector()
+        if collector is not None:
+            collector.record_task_wait(task, time.time() - wait_started_at)
+
+    @staticmethod
+    def __limit_to_deadline(timeout):
+        """
+        Limits a timeout, in seconds, to the remaining time of the Deadline of the current operation, if any.
+        """
+        deadline = get_current_deadline()
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is None:
+            return timeout
+        return remaining if timeout == UNLIMITED_TIMEOUT else min(timeout, remaining)
+
+    def get_task_response(self, task):
+        """
+        Get the response of a completed task.
+
+        Args:
+            task: completed task dict
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+        """
+        return self.__get_task_response(task)
+
+    def submit(self, task, timeout=-1, handler=None):
+        """
+        Wait for the task execution on the background.
+
+        All the tasks submitted for the same connection are polled together by a single background thread.
+
+        Args:
+            task: task dict
+            timeout: timeout in seconds
+            handler: Function that receives the completed task and returns the result of the future.
+                By default, the associated resource is returned, as in wait_for_task.
+
+        Returns:
+            TaskFuture: Future of the associated resource when creating or updating; True when deleting.
+        """
+        if not task:
+            raise HPOneViewUnknownType(MSG_INVALID_TASK)
+
+        future = TaskFuture(task, handler or self.get_task_response, timeout)
+        TaskPoller.get_instance(self).submit(future, self)
+        return future
+
     def __get_task_response(self, task):
-        deleted_states = ['Delete',
-                          'Remove',
-                          'Delete server hardware type',
-                          'Remove SAN manager']
-
-        if task['taskState'] in TASK_ERROR_STATES and task['taskState'] != 'Warning':
-            msg = None
-            error_code = None
-            if 'taskErrors' in task and len(task['taskErrors']) > 0:
-                err = task['taskErrors'][0]
-                if 'message' in err:
-                    msg = err['message']
-
-                error_code = err.get('errorCode')
-
-            if msg:
-                raise HPOneViewTaskError(msg, error_code)
-            elif 'taskStatus' in task and task['taskStatus']:
-                raise HPOneViewTaskError(task['taskStatus'], error_code)
-            else:
-                raise HPOneViewTaskError(MSG_UNKNOWN_EXCEPTION, error_code)
+        check_task_errors(task)
 
-        if 'name' in task and task['name'] in deleted_states:
+        if 'name' in task and task['name'] in TASK_DELETED_NAMES:
             return True
 
         if 'type' in task and task['type'].startswith('Task'):
@@ -186,6 +559,7 @@ class TaskMonitor(object):
                 if connection_failure_control:
                     # Updates last success
                     connection_failure_control['last_success'] = self.get_current_seconds()
+                    connection_failure_control['last_task'] = task
                 if 'taskState' in task and task['taskState'] in TASK_PENDING_STATES:
                     return True
 
@@ -195,19 +569,28 @@ class TaskMonitor(object):
                 if not connection_failure_control:
                     raise error
 
-                if hasattr(error, 'errno') and error.errno in self.CONNECTION_FAILURE_ERROR_NUMBERS:
-                    last_success = connection_failure_control['last_success']
-                    if last_success + self.CONNECTION_FAILURE_TIMEOUT < self.get_current_seconds():
-                        # Timeout reached
-                        raise error
-                    else:
-                        # Return task is running when network instability occurs
-                        return True
-                else:
-                    raise error
+                if self.is_connection_failure_tolerated(error, connection_failure_control):
+                    # Return task is running when network instability occurs
+                    return True
+                raise error
 
         return False
 
+    def is_connection_failure_tolerated(self, error, connection_failure_control):
+        """
+        Checks if an error of a task request is caused by network instability and the last successful request was
+        made within the CONNECTION_FAILURE_TIMEOUT, according to the connection_failure_policy.
+
+        Args:
+            error: Exception raised by the request.
+            connection_failure_control (dict): A dictionary instance that contains last_success.
+
+        Returns:
+            bool: True when the task should be considered running.
+        """
+        elapsed = self.get_current_seconds() - connection_failure_control['last_success']
+        return self.connection_failure_policy.get_retry_delay('GET', 1, elapsed, error=error) is not None
+
     def get(self, task):
         """
         Retrieve a task by its uri.
@@ -259,3 +642,285 @@ class TaskMonitor(object):
             entity = self._connection.get(resource_uri)
 
         return task, entity
+
+
+class TaskFuture(object):
+    """
+    Result of a task being waited on the background, see TaskMonitor.submit.
+
+    Cancelling a future only stops the wait; the task is not aborted in OneView.
+
+    Args:
+        task: task dict
+        handler: Function that receives the completed task and returns the result.
+        timeout: Timeout in seconds for the task completion.
+    """
+
+    def __init__(self, task, handler=None, timeout=-1):
+        self.task = task
+        self.timeout = timeout
+        self._handler = handler
+        self._start_time = time.time()
+        self._polling_state = None
+        self._result = None
+        self._exception = None
+        self._cancelled = False
+        self._callbacks = []
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Creates a future already completed, for operations that did not return a task.
+
+        Args:
+            result: Result of the future.
+
+        Returns:
+            TaskFuture:
+        """
+        future = cls(None)
+        future.set_result(result)
+        return future
+
+    def done(self):
+        """
+        Returns:
+            bool: True when the task finished or the wait was cancelled.
+        """
+        return self._done.is_set()
+
+    def cancelled(self):
+        """
+        Returns:
+            bool: True when the wait was cancelled.
+        """
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Stops waiting for the task. The task is not aborted in OneView.
+
+        Returns:
+            bool: False when the future is already done; True otherwise.
+        """
+        with self._lock:
+            if self._done.is_set():
+                return False
+            self._cancelled = True
+            self._exception = HPOneViewCancelledError(MSG_CANCELLED)
+        self.__finish()
+        return True
+
+    def result(self, timeout=None):
+        """
+        Waits for the task completion and returns the result.
+
+        Args:
+            timeout: Seconds to wait for the result. By default, waits until the task finishes.
+
+        Returns:
+            Associated resource when creating or updating; True when deleting.
+
+        Raises:
+            HPOneViewTimeout: When the result is not available in time.
+            HPOneViewCancelledError: When the wait was cancelled.
+        """
+        exception = self.exception(timeout)
+        if exception:
+            raise exception
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Waits for the task completion and returns the exception raised for the task.
+
+        Args:
+            timeout: Seconds to wait for the task completion. By default, waits until the task finishes.
+
+        Returns:
+            Exception: The exception raised, or None when the task succeeded.
+        """
+        if not self._done.wait(timeout):
+            raise HPOneViewTimeout(MSG_RESULT_TIMEOUT % str(timeout))
+        return self._exception
+
+    def add_done_callback(self, callback):
+        """
+        Registers a function called with the future as argument when it is done. When the future is already done,
+        the function is called immediately.
+
+        Args:
+            callback: function
+        """
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        self.__run_callback(callback)
+
+    def set_result(self, result):
+        with self._lock:
+            if self._done.is_set():
+                return
+            self._result = result
+        self.__finish()
+
+    def set_exception(self, exception):
+        with self._lock:
+            if self._done.is_set():
+                return
+            self._exception = exception
+        self.__finish()
+
+    def set_completed_task(self, task):
+        """
+        Sets the result from the completed task using the handler.
+
+        Args:
+            task: completed task dict
+        """
+        try:
+            result = self._handler(task) if self._handler else task
+        except Exception as error:
+            self.set_exception(error)
+        else:
+            self.set_result(result)
+
+    def is_expired(self):
+        return self.timeout != UNLIMITED_TIMEOUT and self._start_time + self.timeout < time.time()
+
+    def __finish(self):
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self.__run_callback(callback)
+
+    def __run_callback(self, callback):
+        try:
+            callback(self)
+        except Exception:
+            logger.exception('Exception raised by a task future callback')
+
+
+class TaskPoller(object):
+    """
+    Background thread that polls the tasks of all the futures submitted for a connection.
+
+    The tasks are retrieved in batches, see TaskMonitor.get_tasks. The thread stops when there is no future to drive
+    and is started again on the next submission.
+
+    The poller refers to its connection only while it has futures to drive, through the TaskMonitor of the last
+    submission, so an idle poller does not keep its connection alive in the registry of the pollers.
+    """
+    _instances = WeakKeyDictionary()
+    _instances_lock = threading.Lock()
+
+    def __init__(self):
+        self._task_monitor = None
+        self._futures = {}
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @classmethod
+    def get_instance(cls, task_monitor):
+        """
+        Gets the poller shared by all the task monitors of a connection.
+
+        Args:
+            task_monitor: TaskMonitor
+
+        Returns:
+            TaskPoller:
+        """
+        with cls._instances_lock:
+            poller = cls._instances.get(task_monitor._connection)
+            if poller is None:
+                poller = cls()
+                cls._instances[task_monitor._connection] = poller
+            return poller
+
+    def submit(self, future, task_monitor):
+        """
+        Adds a future to be driven by the poller.
+
+        Args:
+            future: TaskFuture
+            task_monitor: TaskMonitor used to retrieve the tasks.
+        """
+        future._polling_state = task_monitor.polling_scheduler.start()
+        with self._condition:
+            self._task_monitor = task_monitor
+            self._futures.setdefault(future.task['uri'], []).append(future)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.__run, name='TaskPoller')
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def __len__(self):
+        with self._condition:
+            return sum(len(futures) for futures in self._futures.values())
+
+    def __run(self):
+        connection_failure_control = dict(last_success=TaskMonitor.get_current_seconds())
+
+        while True:
+            with self._condition:
+                self.__discard_done_futures()
+                if not self._futures:
+                    self._thread = None
+                    self._task_monitor = None
+                    return
+                task_uris = list(self._futures)
+                task_monitor = self._task_monitor
+
+            try:
+                tasks, errors = task_monitor.get_tasks(task_uris, connection_failure_control)
+            except Exception as error:
+                tasks, errors = [], dict((task_uri, error) for task_uri in task_uris)
+
+            interval = self.__dispatch(task_monitor, tasks, errors)
+            task_monitor = None
+
+            with self._condition:
+                if interval and self._futures:
+                    self._condition.wait(interval)
+
+    def __dispatch(self, task_monitor, tasks, errors):
+        completed = []
+        intervals = []
+
+        with self._condition:
+            for task_uri, error in errors.items():
+                completed += [(future, error) for future in self._futures.pop(task_uri, [])]
+
+            for task in tasks:
+                if task.get('taskState') not in TASK_PENDING_STATES:
+                    completed += [(future, task) for future in self._futures.pop(task['uri'], [])]
+                    continue
+
+                for future in self._futures.get(task['uri'], []):
+                    if future.is_expired():
+                        completed.append((future, HPOneViewTimeout(MSG_TIMEOUT % str(future.timeout))))
+                    else:
+                        intervals.append(task_monitor.polling_scheduler.next_interval(task, future._polling_state))
+
+        for future, outcome in completed:
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                task_monitor.polling_scheduler.record(outcome, future._polling_state)
+                future.set_completed_task(outcome)
+
+        return min(intervals) if intervals else task_monitor.polling_scheduler.min_interval
+
+    def __discard_done_futures(self):
+        for task_uri in list(self._futures):
+            futures = [future for future in self._futures[task_uri] if not future.done()]
+            if futures:
+                self._futures[task_uri] = futures
+            else:
+                del self._futures[task_uri]
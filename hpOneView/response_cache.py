@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*
+
+"""
+response_cache.py
+~~~~~~~~~~~~~~~~~
+
+This module implements the cache of GET responses used by the connection.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import copy
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of responses kept in the cache
+DEFAULT_CACHE_MAX_ENTRIES = 1000
+
+
+def get_resource_path(uri):
+    """
+    Gets the path of a URI, without the query string.
+    """
+    return uri.split('?', 1)[0].rstrip('/')
+
+
+class ResponseCache(object):
+    """
+    Thread-safe cache of the bodies of GET responses, bounded by the number of entries.
+
+    Each URI is cached for the TTL of the longest URI prefix that matches it. URIs without a matching prefix use the
+    default_ttl, and are not cached when it is 0. When the cache is full, the least recently used entry is evicted.
+
+    Cached entries are invalidated when a resource is modified: a change to /rest/enclosures/1 invalidates the
+    responses for that resource, for any of its subresources, and for the collections that contain it, like
+    /rest/enclosures?filter=....
+
+    When revalidate is enabled, the responses with an eTag are also kept after they expire, or when their TTL is 0,
+    so the connection can request them again conditionally, with an If-None-Match header. When the appliance answers
+    with 304 Not Modified, the kept body is served again.
+
+    Args:
+        ttls: Dict with the TTL in seconds for each URI prefix, e.g. {'/rest/server-hardware-types': 600}.
+        default_ttl: TTL in seconds for the URIs that do not match any prefix.
+        max_entries: Maximum number of responses kept.
+        revalidate: Keeps the responses with an eTag for conditional requests.
+    """
+
+    def __init__(self, ttls=None, default_ttl=0, max_entries=DEFAULT_CACHE_MAX_ENTRIES, revalidate=False):
+        # The longest prefixes are checked first
+        self._ttls = sorted((ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._revalidate = revalidate
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def get_ttl(self, uri):
+        """
+        Gets the number of seconds the response of a URI is kept in the cache.
+
+        Args:
+            uri: Request URI.
+
+        Returns:
+            int: TTL in seconds. 0 when the URI is not cached.
+        """
+        for prefix, ttl in self._ttls:
+            if uri.startswith(prefix):
+                return ttl
+        return self._default_ttl
+
+    def get(self, uri):
+        """
+        Gets the cached body of a URI.
+
+        Args:
+            uri: Request URI.
+
+        Returns:
+            A copy of the cached body, or None when the URI is not cached or its entry has expired.
+        """
+        if not self._revalidate and not self.get_ttl(uri):
+            return None
+
+        with self._lock:
+            entry = self._entries.pop(uri, None)
+            if entry is None or entry[1] <= time.time():
+                self.misses += 1
+                if entry is not None and entry[2]:
+                    # Kept for a conditional request
+                    self._entries[uri] = entry
+                return None
+
+            # Moves the entry to the end, as the most recently used
+            self._entries[uri] = entry
+            self.hits += 1
+
+        return copy.deepcopy(entry[0])
+
+    def get_etag(self, uri):
+        """
+        Gets the eTag of the response kept for a URI, to be sent in a conditional request.
+
+        Args:
+            uri: Request URI.
+
+        Returns:
+            The eTag, or None when there is no response to revalidate.
+        """
+        if not self._revalidate:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(uri)
+            return entry[2] if entry else None
+
+    def revalidate(self, uri):
+        """
+        Renews the response kept for a URI, after the appliance reported that it was not modified.
+
+        Args:
+            uri: Request URI.
+
+        Returns:
+            A copy of the kept body, or None when the response is no longer kept.
+        """
+        with self._lock:
+            entry = self._entries.pop(uri, None)
+            if entry is None:
+                return None
+
+            entry = (entry[0], time.time() + self.get_ttl(uri), entry[2])
+            self._entries[uri] = entry
+            self.revalidations += 1
+
+        return copy.deepcopy(entry[0])
+
+    def put(self, uri, body, etag=None):
+        """
+        Caches the body of a URI, when its TTL is greater than 0, or when it can be revalidated by its eTag.
+
+        Args:
+            uri: Request URI.
+            body: Response body.
+            etag: eTag of the response.
+        """
+        ttl = self.get_ttl(uri)
+        etag = etag if self._revalidate else None
+        if (not ttl and not etag) or self._max_entries <= 0:
+            return
+
+        entry = (copy.deepcopy(body), time.time() + ttl, etag)
+        with self._lock:
+            self._entries.pop(uri, None)
+            self._entries[uri] = entry
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uri):
+        """
+        Removes the cached responses affected by a change to a resource.
+
+        Args:
+            uri: URI of the modified resource.
+        """
+        path = get_resource_path(uri)
+        with self._lock:
+            for cached_uri in list(self._entries):
+                cached_path = get_resource_path(cached_uri)
+                if self.__is_same_or_parent(cached_path, path) or self.__is_same_or_parent(path, cached_path):
+                    logger.debug('Invalidating cached response of %s' % cached_uri)
+                    del self._entries[cached_uri]
+
+    def clear(self):
+        """
+        Removes all cached responses.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Gets the cache usage counters.
+
+        Returns:
+            dict: The number of hits, misses, revalidations and cached entries.
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, revalidations=self.revalidations,
+                        entries=len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def __is_same_or_parent(parent, path):
+        return path == parent or path.startswith(parent + '/')
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*
+
+"""
+retry.py
+~~~~~~~~
+
+This module implements the policy that decides when a failed request is sent again.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import http.client
+import logging
+import random
+import socket
+import time
+
+from email.utils import parsedate_tz, mktime_tz
+from errno import ECONNABORTED, ETIMEDOUT, ENOEXEC, EINVAL, ENETUNREACH, ECONNRESET, ENETDOWN, ECONNREFUSED
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of times a request is sent, including the first attempt
+DEFAULT_RETRY_MAX_ATTEMPTS = 5
+
+# Maximum number of seconds spent retrying a request, including the waits
+DEFAULT_RETRY_DEADLINE = 90
+
+# Seconds of the wait before the first retry, doubled after each failed attempt
+DEFAULT_RETRY_BACKOFF_BASE = 0.5
+
+# Maximum number of seconds of a wait between attempts, not counting the Retry-After of the appliance
+DEFAULT_RETRY_BACKOFF_MAX = 30
+
+# Methods that can be sent again without side effects
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Statuses of the responses of an overloaded or restarting appliance
+RETRYABLE_STATUSES = (429, 503)
+
+# Known error numbers when the connection drops
+RETRYABLE_ERROR_NUMBERS = (ENOEXEC, EINVAL, ENETUNREACH, ETIMEDOUT, ECONNRESET, ECONNABORTED, ENETDOWN, ECONNREFUSED)
+
+
+class RetryPolicy(object):
+    """
+    Decides when a failed request is sent again, and how long to wait before sending it.
+
+    The requests that failed with a connection error, or that were answered with one of the retry_statuses, are sent
+    again until max_attempts is reached or the deadline would be exceeded. The wait before each retry is drawn at
+    random between 0 and an exponential backoff ("full jitter"), so that the clients of a restarting appliance do not
+    retry in lockstep. When the appliance answers with a Retry-After header, its wait is used instead.
+
+    Only the retry_methods are retried, since the appliance might have processed a request whose response was lost.
+    Requests of any method are retried when the connection was refused or the appliance answered 429 Too Many
+    Requests, since the request was not processed.
+
+    Args:
+        max_attempts: Maximum number of times a request is sent, including the first attempt. Use None for no limit.
+        deadline: Maximum number of seconds spent retrying a request. Use None for no limit.
+        backoff_base: Seconds of the wait before the first retry, doubled after each failed attempt.
+        backoff_max: Maximum number of seconds of the backoff.
+        retry_methods: HTTP methods that are retried.
+        retry_statuses: HTTP statuses that are retried.
+        retry_error_numbers: Error numbers of the connection errors that are retried.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_RETRY_MAX_ATTEMPTS, deadline=DEFAULT_RETRY_DEADLINE,
+                 backoff_base=DEFAULT_RETRY_BACKOFF_BASE, backoff_max=DEFAULT_RETRY_BACKOFF_MAX,
+                 retry_methods=SAFE_METHODS, retry_statuses=RETRYABLE_STATUSES,
+                 retry_error_numbers=RETRYABLE_ERROR_NUMBERS):
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_methods = tuple(method.upper() for method in retry_methods)
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_error_numbers = tuple(retry_error_numbers)
+
+    def get_backoff(self, attempt):
+        """
+        Gets a random wait, between 0 and the exponential backoff of an attempt.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 1.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def get_retry_after(response):
+        """
+        Gets the wait requested by the appliance in the Retry-After header, either in seconds or as an HTTP date.
+
+        Returns:
+            float: Seconds to wait, or None when the header is missing or invalid.
+        """
+        value = response.getheader('Retry-After')
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            return max(0.0, mktime_tz(parsedate_tz(value)) - time.time())
+        except Exception:
+            return None
+
+    def is_retryable_error(self, error):
+        """
+        Checks if an error was caused by a dropped connection, so the request can be sent again.
+        """
+        if isinstance(error, (http.client.HTTPException, socket.timeout)):
+            return True
+        return isinstance(error, EnvironmentError) and error.errno in self.retry_error_numbers
+
+    def get_retry_delay(self, method, attempt, elapsed, error=None, response=None):
+        """
+        Decides if a request is sent again after a failed attempt.
+
+        Args:
+            method: HTTP method of the request.
+            attempt: Number of the failed attempt, starting at 1.
+            elapsed: Seconds since the first attempt.
+            error: Exception raised by the attempt.
+            response: Response of the attempt, when no exception was raised.
+
+        Returns:
+            float: Seconds to wait before the next attempt, or None when the request must not be sent again.
+        """
+        if self.max_attempts is not None and attempt >= self.max_attempts:
+            return None
+
+        method = method.upper()
+        if error is not None:
+            if not self.is_retryable_error(error):
+                return None
+            refused = isinstance(error, EnvironmentError) and error.errno == ECONNREFUSED
+            if method not in self.retry_methods and not refused:
+                return None
+            delay = self.get_backoff(attempt)
+        else:
+            if response.status not in self.retry_statuses:
+                return None
+            if method not in self.retry_methods and response.status != 429:
+                return None
+            delay = self.get_retry_after(response)
+            if delay is None:
+                delay = self.get_backoff(attempt)
+
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+    @staticmethod
+    def log_retry(method, uri, attempt, reason, delay):
+        logger.warning('Attempt %d of %s %s failed (%s). Retrying in %.2f seconds.' % (attempt, method, uri, reason,
+                                                                                       delay))
+
+    def execute(self, method, uri, send, release=None, deadline=None):
+        """
+        Sends a request until it succeeds or the policy gives up.
+
+        Args:
+            method: HTTP method of the request.
+            uri: URI of the request, for logging.
+            send: Function that makes an attempt, returning a tuple whose first item is the response.
+            release: Function called with the items returned by send, when the response is discarded for a retry.
+            deadline (Deadline): Deadline of the operation. No retry is made past it.
+
+        Returns:
+            The tuple returned by the last attempt.
+        """
+        start = time.time()
+        attempt = 0
+        while True:
+            attempt += 1
+            failure = None
+            try:
+                result = send()
+            except Exception as error:
+                delay = self.get_retry_delay(method, attempt, time.time() - start, error=error)
+                if delay is None:
+                    raise
+                failure = error
+                reason = repr(error)
+            else:
+                response = result[0]
+                delay = self.get_retry_delay(method, attempt, time.time() - start, response=response)
+                if delay is None or (deadline is not None and deadline.clip(delay) < delay):
+                    return result
+                if release is not None:
+                    release(*result)
+                reason = 'status %s' % response.status
+
+            if failure is not None and deadline is not None and deadline.clip(delay) < delay:
+                # The deadline would be exceeded by the wait
+                raise failure
+
+            self.log_retry(method, uri, attempt, reason, delay)
+            time.sleep(delay)
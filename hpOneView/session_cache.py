@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*
+
+"""
+session_cache.py
+~~~~~~~~~~~~~~~~
+
+This module implements the cache of the login sessions, which lets short-lived processes reuse a session.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# File of the cached sessions
+DEFAULT_SESSION_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.hponeview', 'sessions.json')
+
+# Seconds a cached session is reused after it was last validated. The appliance expires the idle sessions after 24 hours
+# by default.
+DEFAULT_SESSION_TTL = 3600
+
+# Permissions of the directory of the cache file, which is accessible only by its owner
+DIRECTORY_MODE = 0o700
+
+
+class SessionCache(object):
+    """
+    Local file that keeps the session IDs of the appliances, so a process can reuse the session of a previous one
+    instead of logging in again.
+
+    A session is identified by the appliance host, the API version, the login domain and the user name. The password is
+    never written. The file is created readable only by its owner, and ignored when other users can read it.
+
+    Args:
+        path: Path of the cache file.
+        ttl: Seconds a cached session is reused after it was stored or last validated.
+    """
+
+    def __init__(self, path=DEFAULT_SESSION_CACHE_PATH, ttl=DEFAULT_SESSION_TTL):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(host, api_version, credentials):
+        """
+        Gets the key that identifies the sessions of a user in an appliance.
+
+        Returns:
+            str: The key.
+        """
+        return '%s@%s/%s@%s' % (credentials.get('userName', ''), credentials.get('authLoginDomain', ''), host,
+                                api_version)
+
+    def get(self, host, api_version, credentials):
+        """
+        Gets the cached session ID of a user in an appliance.
+
+        Returns:
+            str: The session ID, or None when it is not cached or has expired.
+        """
+        entry = self.__read().get(self.get_key(host, api_version, credentials))
+        if not entry or entry.get('expiresAt', 0) <= time.time():
+            return None
+        return entry.get('sessionID')
+
+    def put(self, host, api_version, credentials, session_id):
+        """
+        Stores the session ID of a user in an appliance, or extends its expiry.
+        """
+        key = self.get_key(host, api_version, credentials)
+        with self._lock:
+            sessions = self.__read()
+            sessions[key] = dict(sessionID=session_id, expiresAt=time.time() + self.ttl)
+            self.__write(sessions)
+
+    def remove(self, host, api_version, credentials):
+        """
+        Removes the session ID of a user in an appliance, like after a logout.
+        """
+        key = self.get_key(host, api_version, credentials)
+        with self._lock:
+            sessions = self.__read()
+            if sessions.pop(key, None) is not None:
+                self.__write(sessions)
+
+    def __read(self):
+        try:
+            if os.name == 'posix' and os.stat(self.path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                logger.warning('Ignoring the session cache %s, which is accessible to other users' % self.path)
+                return {}
+            with open(self.path) as cache_file:
+                sessions = json.load(cache_file).get('sessions')
+            if not isinstance(sessions, dict):
+                return {}
+        except (EnvironmentError, ValueError, AttributeError):
+            return {}
+
+        now = time.time()
+        return dict((key, entry) for key, entry in sessions.items()
+                    if isinstance(entry, dict) and entry.get('expiresAt', 0) > now)
+
+    def __write(self, sessions):
+        directory = os.path.dirname(self.path)
+        try:
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory, DIRECTORY_MODE)
+            # Written to a temporary file, which mkstemp creates readable only by its owner, then renamed over the
+            # cache, so the concurrent processes never read a partial file
+            descriptor, temp_path = tempfile.mkstemp(prefix='.sessions', dir=directory or None)
+            try:
+                with os.fdopen(descriptor, 'w') as temp_file:
+                    json.dump(dict(sessions=sessions), temp_file)
+                getattr(os, 'replace', os.rename)(temp_path, self.path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+        except EnvironmentError:
+            logger.warning('Unable to write the session cache %s' % self.path, exc_info=True)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*
+
+"""
+single_flight.py
+~~~~~~~~~~~~~~~~
+
+This module implements the coalescing of identical concurrent requests.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import copy
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Call(object):
+    """
+    Call in flight, whose result is shared with the callers waiting for it.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Thread-safe coalescing of identical concurrent calls.
+
+    While a call for a key is in flight, the later calls for the same key do not run: they wait for the call in
+    flight and get a copy of its result, or raise its exception. A call made after the one in flight has finished
+    runs again, so no result is kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, function, deadline=None):
+        """
+        Runs a function, unless a call for the same key is in flight.
+
+        Args:
+            key: Key of the call, like the request URI.
+            function: Function called without arguments.
+            deadline (Deadline): Deadline of the operation. A caller stops waiting for the call in flight when it
+                expires.
+
+        Returns:
+            tuple: The result of the function, or a deep copy of it when the call was coalesced, and a bool indicating
+            if the call was coalesced.
+
+        Raises:
+            HPOneViewTimeout: When the deadline expires while waiting for the call in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if leader:
+            result = None
+            try:
+                result = function()
+            except Exception as error:
+                call.error = error
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    waiters = call.waiters
+                # The waiters copy a snapshot taken before the leader returns the result, which its caller may modify
+                if waiters and call.error is None:
+                    call.result = copy.deepcopy(result)
+                call.done.set()
+            return result, False
+
+        logger.debug('Waiting for the call in flight for %s' % key)
+        while not call.done.wait(deadline.remaining() if deadline is not None else None):
+            deadline.check()
+
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result), True
+
+    def get_stats(self):
+        """
+        Gets the coalescing counters.
+
+        Returns:
+            dict: The number of calls executed, of calls coalesced, and of calls in flight.
+        """
+        with self._lock:
+            return dict(executed=self.executed, coalesced=self.coalesced, in_flight=len(self._calls))
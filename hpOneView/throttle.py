@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*
+
+"""
+throttle.py
+~~~~~~~~~~~
+
+This module implements the client-side limits of the rate and concurrency of the requests sent to the appliance.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from future import standard_library
+
+standard_library.install_aliases()
+
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import logging
+import threading
+import time
+
+from hpOneView.exceptions import HPOneViewTimeout
+
+logger = logging.getLogger(__name__)
+
+MSG_QUEUE_TIMEOUT = 'The request %s %s exceeded its deadline while waiting for the request limit %s'
+MSG_INVALID_LIMIT = 'A request limit needs a rate or a maximum number of requests in flight'
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket, which allows bursts of up to burst requests and a sustained rate of rate requests per
+    second.
+
+    Args:
+        rate: Number of tokens added per second.
+        burst: Maximum number of tokens kept. Defaults to the rate, or to 1 when the rate is lower.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        Takes a token, reserving a future one when the bucket is empty.
+
+        Args:
+            max_wait: Maximum number of seconds the caller can wait for a token. Use None for no limit.
+
+        Returns:
+            float: Seconds to wait before the token is available, or None when it would exceed max_wait, in which
+            case no token is taken.
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class RequestLimit(object):
+    """
+    Limits of the rate and of the concurrency of the requests matching some HTTP methods and a URI prefix.
+
+    Args:
+        prefix: URI prefix of the limited requests, e.g. '/rest/server-profiles'. Defaults to all the requests.
+        methods: HTTP methods of the limited requests, e.g. ['POST', 'PUT']. Defaults to all the methods.
+        rate: Maximum number of requests started per second. Use None for no limit.
+        burst: Number of requests that can be started at once, above the rate. Defaults to the rate.
+        max_in_flight: Maximum number of concurrent requests. Use None for no limit.
+    """
+
+    def __init__(self, prefix='/', methods=None, rate=None, burst=None, max_in_flight=None):
+        if rate is None and max_in_flight is None:
+            raise ValueError(MSG_INVALID_LIMIT)
+
+        self.prefix = prefix
+        self.methods = tuple(method.upper() for method in methods) if methods else None
+        self.max_in_flight = max_in_flight
+        self._bucket = TokenBucket(rate, burst) if rate is not None else None
+        self._condition = threading.Condition(threading.Lock())
+        self.in_flight = 0
+        self.requests = 0
+        self.delayed = 0
+        self.timeouts = 0
+        self.total_delay = 0.0
+
+    def __str__(self):
+        return '%s %s' % ('|'.join(self.methods) if self.methods else '*', self.prefix)
+
+    def matches(self, method, uri):
+        return uri.startswith(self.prefix) and (self.methods is None or method.upper() in self.methods)
+
+    def acquire(self, method, uri, deadline=None):
+        """
+        Waits until a request can be started.
+
+        Args:
+            method: HTTP method.
+            uri: Request URI.
+            deadline (Deadline): Deadline of the operation.
+
+        Returns:
+            float: Seconds waited.
+
+        Raises:
+            HPOneViewTimeout: When the deadline would expire before the request can be started.
+        """
+        started_at = time.time()
+        try:
+            if self._bucket is not None:
+                wait = self._bucket.reserve(deadline.remaining() if deadline is not None else None)
+                if wait is None:
+                    raise HPOneViewTimeout(MSG_QUEUE_TIMEOUT % (method, uri, self))
+                if wait:
+                    time.sleep(wait)
+
+            if self.max_in_flight is not None:
+                with self._condition:
+                    while self.in_flight >= self.max_in_flight:
+                        remaining = deadline.remaining() if deadline is not None else None
+                        if remaining == 0:
+                            raise HPOneViewTimeout(MSG_QUEUE_TIMEOUT % (method, uri, self))
+                        self._condition.wait(remaining)
+                    self.in_flight += 1
+        except HPOneViewTimeout:
+            with self._condition:
+                self.timeouts += 1
+            raise
+
+        delay = time.time() - started_at
+        with self._condition:
+            self.requests += 1
+            if delay > 0.001:
+                self.delayed += 1
+            self.total_delay += delay
+        return delay
+
+    def release(self):
+        """
+        Releases the slot of a finished request.
+        """
+        if self.max_in_flight is None:
+            return
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: The number of requests started, delayed and timed out while waiting, the total seconds waited, and
+            the number of requests in flight.
+        """
+        with self._condition:
+            return dict(requests=self.requests, delayed=self.delayed, timeouts=self.timeouts,
+                        total_delay=self.total_delay, in_flight=self.in_flight)
+
+
+class RequestThrottle(object):
+    """
+    Governs the requests sent to an appliance with a list of RequestLimit.
+
+    Every limit matching a request applies to it, so a general limit, like the maximum number of concurrent requests
+    to the appliance, can be combined with tighter limits for some requests, like the POSTs of server profiles. The
+    limits are acquired in the order of the list.
+
+    Args:
+        limits: List of RequestLimit, or of dicts with its arguments.
+    """
+
+    def __init__(self, limits):
+        self.limits = [limit if isinstance(limit, RequestLimit) else RequestLimit(**limit) for limit in limits]
+
+    def acquire(self, method, uri, deadline=None):
+        """
+        Waits until a request can be started according to all the limits matching it.
+
+        Args:
+            method: HTTP method.
+            uri: Request URI.
+            deadline (Deadline): Deadline of the operation.
+
+        Returns:
+            tuple: The limits acquired, to be released when the request finishes, and the seconds waited.
+
+        Raises:
+            HPOneViewTimeout: When the deadline would expire before the request can be started.
+        """
+        acquired = []
+        delay = 0.0
+        try:
+            for limit in self.limits:
+                if limit.matches(method, uri):
+                    delay += limit.acquire(method, uri, deadline)
+                    acquired.append(limit)
+        except Exception:
+            self.release(acquired)
+            raise
+
+        if delay > 0.001:
+            logger.debug('Request %s %s waited %.3f seconds for the request limits' % (method, uri, delay))
+        return acquired, delay
+
+    @staticmethod
+    def release(acquired):
+        for limit in acquired:
+            limit.release()
+
+    def get_stats(self):
+        """
+        Gets the counters of each limit.
+
+        Returns:
+            dict: The counters of each limit, by 'METHODS /prefix'. See RequestLimit.get_stats.
+        """
+        return dict((str(limit), limit.get_stats()) for limit in self.limits)
@@ -22,9 +22,16 @@
 ###
 
 
+import sys
+
 from setuptools import find_packages
 from setuptools import setup
 
+EXCLUDED_PACKAGES = ['examples*', 'tests*']
+if sys.version_info < (3, 7):
+    # The asyncio transport uses the syntax of Python 3.7, which the older interpreters cannot byte-compile
+    EXCLUDED_PACKAGES.append('hpOneView.aio')
+
 setup(name='hpOneView',
       version='3.1.0',
       description='HPE OneView Python Library',
@@ -33,6 +40,7 @@ setup(name='hpOneView',
       author='Hewlett Packard Enterprise Development LP',
       author_email='oneview-pythonsdk@hpe.com',
       license='MIT',
-      packages=find_packages(exclude=['examples*', 'tests*']),
+      packages=find_packages(exclude=EXCLUDED_PACKAGES),
       keywords=['oneview', 'hpe'],
-      install_requires=['future>=0.15.2'])
+      install_requires=['future>=0.15.2'],
+      extras_require={'fast-json': ['orjson; python_version >= "3.6"']})
@@ -1,6 +1,17 @@
+import os
 import sys
+import unittest
 
 
 def mock_builtin(method_name='open'):
     package_name = 'builtins' if sys.version_info[:3] >= (3,) else '__builtin__'
     return "%s.%s" % (package_name, method_name)
+
+
+def benchmark(test):
+    """
+    Skips a benchmark unless the ONEVIEWSDK_BENCHMARKS environment variable is set, as its timings are not reliable on
+    a loaded machine.
+    """
+    return unittest.skipUnless(os.environ.get('ONEVIEWSDK_BENCHMARKS'),
+                               'Set ONEVIEWSDK_BENCHMARKS=1 to run the benchmarks')(test)
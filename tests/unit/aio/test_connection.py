@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import io
+import json
+import socket
+import sys
+import unittest
+
+from mock import mock
+
+from hpOneView.deadline import Deadline
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.json_codec import JsonCodec
+from hpOneView.retry import RetryPolicy
+from tests.unit.aio import AsyncTestCase
+
+if sys.version_info >= (3, 7):
+    import asyncio
+    from hpOneView.aio.connection import AsyncConnection
+
+    OPEN_CONNECTION = asyncio.open_connection
+
+
+def response(status, body=b'', headers=None, reason='OK'):
+    headers = headers or {}
+    if 'Transfer-Encoding' not in headers:
+        headers['Content-Length'] = str(len(body))
+    head = ''.join('%s: %s\r\n' % item for item in headers.items())
+    return ('HTTP/1.1 %d %s\r\n%s\r\n' % (status, reason, head)).encode('latin-1') + body
+
+
+class FakeAppliance(object):
+    """
+    Plain TCP server that answers each request with the next canned response. A None response is never sent.
+    """
+
+    def __init__(self, loop, responses, close_after=None):
+        self.loop = loop
+        self.responses = list(responses)
+        self.close_after = close_after or []
+        self.requests = []
+        self.connections = 0
+        self.transports = []
+        self.server = None
+
+    def start(self):
+        self.server = self.loop.run_until_complete(
+            self.loop.create_server(lambda: FakeApplianceProtocol(self), '127.0.0.1', 0))
+        return self.server.sockets[0].getsockname()[1]
+
+    def stop(self):
+        self.server.close()
+        for transport in self.transports:
+            transport.close()
+        self.loop.run_until_complete(self.server.wait_closed())
+
+
+class FakeApplianceProtocol(asyncio.Protocol if sys.version_info >= (3, 7) else object):
+    def __init__(self, appliance):
+        self.appliance = appliance
+        self.buffer = b''
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.appliance.connections += 1
+        self.appliance.transports.append(transport)
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        while b'\r\n\r\n' in self.buffer:
+            head, _, rest = self.buffer.partition(b'\r\n\r\n')
+            lines = head.decode('latin-1').split('\r\n')
+            headers = dict(line.split(': ', 1) for line in lines[1:])
+            length = int(headers.get('Content-Length', 0))
+            if len(rest) < length:
+                return
+            self.buffer = rest[length:]
+            self.appliance.requests.append((lines[0], headers, rest[:length]))
+
+            data = self.appliance.responses.pop(0)
+            if data is not None:
+                self.transport.write(data)
+            if len(self.appliance.requests) in self.appliance.close_after:
+                self.transport.close()
+
+
+class AsyncConnectionTest(AsyncTestCase):
+    def setUp(self):
+        super(AsyncConnectionTest, self).setUp()
+        self.host = '127.0.0.1'
+        self.connection = AsyncConnection(self.host, 300)
+        self.appliance = None
+
+    def tearDown(self):
+        self.connection.close()
+        if self.appliance:
+            self.appliance.stop()
+        self.run_async(asyncio.sleep(0))
+        super(AsyncConnectionTest, self).tearDown()
+
+    def start_appliance(self, *responses, **kwargs):
+        self.appliance = FakeAppliance(self.loop, responses, **kwargs)
+        port = self.appliance.start()
+
+        def open_plain_connection(host, port_, ssl=None):
+            return OPEN_CONNECTION('127.0.0.1', port)
+
+        patcher = mock.patch('hpOneView.aio.connection.asyncio.open_connection', new=open_plain_connection)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_should_return_json_body(self):
+        self.start_appliance(response(200, b'{"name": "resource"}'))
+
+        body = self.run_async(self.connection.get('/rest/resource'))
+
+        self.assertEqual(body, {'name': 'resource'})
+
+    def test_get_should_retry_when_appliance_is_unavailable(self):
+        self.start_appliance(response(503, b'', {'Retry-After': '0'}, reason='Service Unavailable'),
+                             response(200, b'{"name": "resource"}'))
+
+        body = self.run_async(self.connection.get('/rest/resource'))
+
+        self.assertEqual(body, {'name': 'resource'})
+        self.assertEqual(len(self.appliance.requests), 2)
+
+    def test_post_should_not_retry_when_appliance_is_unavailable(self):
+        self.start_appliance(response(503, b'{"errorCode": "UNAVAILABLE"}', reason='Service Unavailable'))
+
+        with self.assertRaises(HPOneViewException):
+            self.run_async(self.connection.post('/rest/resource', {}))
+
+        self.assertEqual(len(self.appliance.requests), 1)
+
+    def test_get_should_send_default_headers(self):
+        self.start_appliance(response(200, b'{}'))
+        self.connection.set_session_id('session-id')
+
+        self.run_async(self.connection.get('/rest/resource'))
+
+        request_line, headers, _ = self.appliance.requests[0]
+        self.assertEqual(request_line, 'GET /rest/resource HTTP/1.1')
+        self.assertEqual(headers['X-API-Version'], '300')
+        self.assertEqual(headers['auth'], 'session-id')
+        self.assertEqual(headers['Host'], self.host)
+
+    def test_should_reuse_connection(self):
+        self.start_appliance(response(200, b'{"id": 1}'), response(200, b'{"id": 2}'))
+
+        first = self.run_async(self.connection.get('/rest/resource/1'))
+        second = self.run_async(self.connection.get('/rest/resource/2'))
+
+        self.assertEqual([first, second], [{'id': 1}, {'id': 2}])
+        self.assertEqual(self.appliance.connections, 1)
+
+    def test_should_not_reuse_connection_when_response_closes_it(self):
+        self.start_appliance(response(200, b'{}', {'Connection': 'close'}), response(200, b'{}'),
+                             close_after=[1])
+
+        self.run_async(self.connection.get('/rest/resource/1'))
+        self.run_async(self.connection.get('/rest/resource/2'))
+
+        self.assertEqual(self.appliance.connections, 2)
+
+    def test_should_reconnect_when_pooled_connection_was_closed(self):
+        self.start_appliance(response(200, b'{"id": 1}'), response(200, b'{"id": 2}'), close_after=[1])
+
+        self.run_async(self.connection.get('/rest/resource/1'))
+        body = self.run_async(self.connection.get('/rest/resource/2'))
+
+        self.assertEqual(body, {'id': 2})
+        self.assertEqual(self.appliance.connections, 2)
+
+    def test_should_read_chunked_body(self):
+        chunked = b'5\r\n{"id"\r\n4\r\n: 1}\r\n0\r\n\r\n'
+        self.start_appliance(response(200, chunked, {'Transfer-Encoding': 'chunked'}), response(200, b'{"id": 2}'))
+
+        first = self.run_async(self.connection.get('/rest/resource/1'))
+        second = self.run_async(self.connection.get('/rest/resource/2'))
+
+        self.assertEqual([first, second], [{'id': 1}, {'id': 2}])
+        self.assertEqual(self.appliance.connections, 1)
+
+    def test_get_should_raise_timeout_when_appliance_does_not_respond(self):
+        self.start_appliance(None)
+        self.connection.set_timeouts(read_timeout=0.05)
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+
+        with self.assertRaises(socket.timeout):
+            self.run_async(self.connection.get('/rest/resource'))
+
+    def test_get_should_limit_read_timeout_to_deadline(self):
+        self.start_appliance(None)
+
+        with self.assertRaises(socket.timeout):
+            with Deadline(0.05):
+                self.run_async(self.connection.get('/rest/resource'))
+
+    def test_post_should_be_sent_once_when_pooled_connection_times_out(self):
+        self.start_appliance(response(200, b'{}'), None)
+        self.run_async(self.connection.get('/rest/resource'))
+        self.connection.set_timeouts(read_timeout=0.05)
+
+        with self.assertRaises(socket.timeout):
+            self.run_async(self.connection.post('/rest/resource', {}))
+
+        self.assertEqual(len(self.appliance.requests), 2)
+        self.assertEqual(self.appliance.connections, 1)
+
+    def test_get_should_raise_timeout_when_connection_is_not_established(self):
+        async def open_connection(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        self.connection.set_timeouts(connect_timeout=0.05)
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+
+        with mock.patch('hpOneView.aio.connection.asyncio.open_connection', new=open_connection):
+            with self.assertRaises(socket.timeout):
+                self.run_async(self.connection.get('/rest/resource'))
+
+    def test_get_should_raise_exception_when_status_is_error(self):
+        self.start_appliance(response(404, b'{"message": "Not found"}', reason='Not Found'))
+
+        try:
+            self.run_async(self.connection.get('/rest/resource'))
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'Not found')
+        else:
+            self.fail('Expected exception was not raised')
+
+    def test_post_should_send_json_body(self):
+        self.start_appliance(response(201, b'{"name": "created"}'))
+
+        task, body = self.run_async(self.connection.post('/rest/resource', {'name': 'created'}))
+
+        _, headers, request_body = self.appliance.requests[0]
+        self.assertEqual(json.loads(request_body.decode('utf-8')), {'name': 'created'})
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertIsNone(task)
+        self.assertEqual(body, {'name': 'created'})
+
+    def test_post_should_send_body_encoded_with_json_codec(self):
+        self.start_appliance(response(201, b'{"name": "created"}'))
+        self.connection.set_json_codec(JsonCodec())
+
+        self.run_async(self.connection.post('/rest/resource', {'name': 'created'}))
+
+        _, _, request_body = self.appliance.requests[0]
+        self.assertEqual(request_body, b'{"name": "created"}')
+
+    def test_post_should_get_task_from_location_header(self):
+        self.start_appliance(response(202, b'', {'Location': '/rest/tasks/1'}),
+                             response(200, b'{"uri": "/rest/tasks/1", "category": "tasks"}'))
+
+        task, _ = self.run_async(self.connection.post('/rest/resource', {'name': 'created'}))
+
+        self.assertEqual(task, {'uri': '/rest/tasks/1', 'category': 'tasks'})
+        self.assertEqual(self.appliance.requests[1][0], 'GET /rest/tasks/1 HTTP/1.1')
+
+    def test_put_should_return_task_from_body(self):
+        task_body = b'{"uri": "/rest/tasks/1", "category": "tasks", "taskState": "Running"}'
+        self.start_appliance(response(200, task_body))
+
+        task, body = self.run_async(self.connection.put('/rest/resource/1', {'name': 'updated'}))
+
+        self.assertEqual(task['uri'], '/rest/tasks/1')
+        self.assertEqual(task, body)
+
+    def test_patch_and_delete_should_use_http_methods(self):
+        self.start_appliance(response(200, b'{}'), response(204))
+
+        self.run_async(self.connection.patch('/rest/resource/1', [], {'Content-Type': 'application/json-patch+json'}))
+        task, _ = self.run_async(self.connection.delete('/rest/resource/1'))
+
+        self.assertEqual(self.appliance.requests[0][0], 'PATCH /rest/resource/1 HTTP/1.1')
+        self.assertEqual(self.appliance.requests[0][1]['Content-Type'], 'application/json-patch+json')
+        self.assertEqual(self.appliance.requests[1][0], 'DELETE /rest/resource/1 HTTP/1.1')
+        self.assertIsNone(task)
+
+    def test_download_to_stream_should_write_content(self):
+        content = b'\x00\x01' * 5000
+        self.start_appliance(response(200, content, {'Content-Type': 'application/octet-stream'}))
+        stream = io.BytesIO()
+
+        result = self.run_async(self.connection.download_to_stream(stream, '/rest/resource/file'))
+
+        self.assertTrue(result)
+        self.assertEqual(stream.getvalue(), content)
+
+    def test_download_to_stream_should_raise_exception_when_status_is_error(self):
+        self.start_appliance(response(500, b'{"message": "Failure"}', reason='Internal Server Error'))
+
+        try:
+            self.run_async(self.connection.download_to_stream(io.BytesIO(), '/rest/resource/file'))
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'Failure')
+        else:
+            self.fail('Expected exception was not raised')
+
+    def test_login_should_set_session_id(self):
+        self.start_appliance(response(200, b'{"minimumVersion": 120, "currentVersion": 300}'),
+                             response(200, b'{"sessionID": "session-id"}'))
+
+        self.run_async(self.connection.login({'userName': 'admin', 'password': 'secret'}))
+
+        self.assertEqual(self.connection.get_session_id(), 'session-id')
+        self.assertEqual(self.appliance.requests[1][0], 'POST /rest/login-sessions HTTP/1.1')
+
+
+if __name__ == '__main__':
+    unittest.main()
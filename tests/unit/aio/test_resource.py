@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import sys
+import unittest
+
+from mock import mock
+
+from hpOneView.exceptions import HPOneViewUnknownType
+from tests.unit.aio import AsyncTestCase
+
+if sys.version_info >= (3, 7):
+    from hpOneView.aio.connection import AsyncConnection
+    from hpOneView.aio.resource import AsyncResourceClient
+    from hpOneView.aio.task_monitor import AsyncTaskMonitor
+
+
+class AsyncResourceClientTest(AsyncTestCase):
+    URI = "/rest/testuri"
+
+    def setUp(self):
+        super(AsyncResourceClientTest, self).setUp()
+        self.connection = AsyncConnection('127.0.0.1', 300)
+        self.resource_client = AsyncResourceClient(self.connection, self.URI)
+        self.task = {"task": "task", "taskState": "Finished"}
+        self.response_body = {"body": "body"}
+
+    def collect(self, async_iterator):
+        items = []
+        async_iterator = async_iterator.__aiter__()
+        while True:
+            try:
+                items.append(self.run_async(async_iterator.__anext__()))
+            except StopAsyncIteration:
+                return items
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_get_all_should_follow_next_page(self, mock_get):
+        mock_get.side_effect = self.async_return(
+            {"nextPageUri": self.URI + "?start=2&count=2", "members": [{"id": "1"}, {"id": "2"}]},
+            {"nextPageUri": None, "members": [{"id": "3"}]})
+
+        result = self.run_async(self.resource_client.get_all(filter="name='name'", sort='name:ascending'))
+
+        self.assertEqual(result, [{"id": "1"}, {"id": "2"}, {"id": "3"}])
+        self.assertEqual(mock_get.call_args_list, [
+            mock.call(self.URI + "?start=0&count=-1&filter=name%3D%27name%27&sort=name%3Aascending"),
+            mock.call(self.URI + "?start=2&count=2")])
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_get_all_should_stop_at_requested_count(self, mock_get):
+        mock_get.side_effect = self.async_return(
+            {"nextPageUri": self.URI + "?start=2&count=1", "members": [{"id": "1"}, {"id": "2"}]})
+
+        result = self.run_async(self.resource_client.get_all(count=2))
+
+        self.assertEqual(result, [{"id": "1"}, {"id": "2"}])
+        mock_get.assert_called_once_with(self.URI + "?start=0&count=2")
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_iter_all_should_yield_items_of_each_page(self, mock_get):
+        mock_get.side_effect = self.async_return(
+            {"nextPageUri": self.URI + "?start=1&count=1", "members": [{"id": "1"}]},
+            {"nextPageUri": None, "members": [{"id": "2"}]})
+
+        items = self.collect(self.resource_client.iter_all())
+
+        self.assertEqual(items, [{"id": "1"}, {"id": "2"}])
+
+    def test_get_all_should_raise_exception_when_uri_is_not_recognized(self):
+        with self.assertRaises(HPOneViewUnknownType):
+            self.run_async(self.resource_client.get_all(uri='/rest/other'))
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_get_should_build_uri_from_id(self, mock_get):
+        mock_get.side_effect = self.async_return(self.response_body)
+
+        result = self.run_async(self.resource_client.get('12345'))
+
+        self.assertEqual(result, self.response_body)
+        mock_get.assert_called_once_with(self.URI + "/12345")
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_get_by_name_should_filter_results(self, mock_get):
+        mock_get.side_effect = self.async_return({"members": [{"name": "other"}, {"name": "Name"}]})
+
+        result = self.run_async(self.resource_client.get_by_name('name'))
+
+        self.assertEqual(result, {"name": "Name"})
+
+    @mock.patch.object(AsyncConnection, 'post', new_callable=mock.Mock)
+    def test_create_should_return_entity_when_there_is_no_task(self, mock_post):
+        mock_post.side_effect = self.async_return((None, self.response_body))
+
+        result = self.run_async(self.resource_client.create({"name": "resource"}))
+
+        self.assertEqual(result, self.response_body)
+        mock_post.assert_called_once_with(self.URI, {"name": "resource"}, custom_headers=None)
+
+    @mock.patch.object(AsyncTaskMonitor, 'wait_for_task', new_callable=mock.Mock)
+    @mock.patch.object(AsyncConnection, 'post', new_callable=mock.Mock)
+    def test_create_should_wait_for_task(self, mock_post, mock_wait4task):
+        mock_post.side_effect = self.async_return((self.task, self.task))
+        mock_wait4task.side_effect = self.async_return(self.response_body)
+
+        result = self.run_async(self.resource_client.create({"name": "resource"}, timeout=60))
+
+        self.assertEqual(result, self.response_body)
+        mock_wait4task.assert_called_once_with(self.task, 60)
+
+    @mock.patch.object(AsyncConnection, 'post', new_callable=mock.Mock)
+    def test_create_should_merge_default_values(self, mock_post):
+        mock_post.side_effect = self.async_return((None, self.response_body))
+        default_values = {"300": {"type": "EthernetNetworkV300"}}
+
+        self.run_async(self.resource_client.create({"name": "resource"}, default_values=default_values))
+
+        mock_post.assert_called_once_with(self.URI, {"name": "resource", "type": "EthernetNetworkV300"},
+                                          custom_headers=None)
+
+    @mock.patch.object(AsyncTaskMonitor, 'wait_for_task', new_callable=mock.Mock)
+    @mock.patch.object(AsyncConnection, 'put', new_callable=mock.Mock)
+    def test_update_should_use_force_and_wait_for_task(self, mock_put, mock_wait4task):
+        mock_put.side_effect = self.async_return((self.task, self.task))
+        mock_wait4task.side_effect = self.async_return(self.response_body)
+        resource = {"uri": self.URI + "/12345", "name": "resource"}
+
+        result = self.run_async(self.resource_client.update(resource, force=True))
+
+        self.assertEqual(result, self.response_body)
+        mock_put.assert_called_once_with(self.URI + "/12345?force=True", resource, custom_headers=None)
+
+    @mock.patch.object(AsyncConnection, 'delete', new_callable=mock.Mock)
+    def test_delete_should_return_true_when_there_is_no_task(self, mock_delete):
+        mock_delete.side_effect = self.async_return((None, {}))
+
+        result = self.run_async(self.resource_client.delete('12345'))
+
+        self.assertTrue(result)
+        mock_delete.assert_called_once_with(self.URI + "/12345", custom_headers=None)
+
+    @mock.patch.object(AsyncTaskMonitor, 'wait_for_task', new_callable=mock.Mock)
+    @mock.patch.object(AsyncConnection, 'delete', new_callable=mock.Mock)
+    def test_delete_should_wait_for_task(self, mock_delete, mock_wait4task):
+        mock_delete.side_effect = self.async_return((self.task, {}))
+        mock_wait4task.side_effect = self.async_return(True)
+
+        result = self.run_async(self.resource_client.delete({"uri": self.URI + "/12345"}, timeout=30))
+
+        self.assertTrue(result)
+        mock_wait4task.assert_called_once_with(self.task, timeout=30)
+
+    def test_delete_should_raise_exception_when_resource_has_no_uri(self):
+        with self.assertRaises(HPOneViewUnknownType):
+            self.run_async(self.resource_client.delete({"name": "resource"}))
+
+    @mock.patch.object(AsyncConnection, 'patch', new_callable=mock.Mock)
+    def test_patch_should_use_json_patch_content_type(self, mock_patch):
+        mock_patch.side_effect = self.async_return((None, self.response_body))
+
+        result = self.run_async(self.resource_client.patch('12345', 'replace', '/name', 'new name'))
+
+        self.assertEqual(result, self.response_body)
+        mock_patch.assert_called_once_with(self.URI + "/12345",
+                                           [{'op': 'replace', 'path': '/name', 'value': 'new name'}],
+                                           custom_headers={'Content-Type': 'application/json-patch+json'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import sys
+import unittest
+from errno import ECONNABORTED
+
+from mock import mock
+
+from hpOneView.exceptions import HPOneViewTaskError, HPOneViewTimeout, HPOneViewUnknownType
+from hpOneView.resources.task_monitor import TaskPollingScheduler, MSG_TIMEOUT
+from tests.unit.aio import AsyncTestCase
+
+if sys.version_info >= (3, 7):
+    from hpOneView.aio.connection import AsyncConnection
+    from hpOneView.aio.task_monitor import AsyncTaskMonitor
+
+
+class AsyncTaskMonitorTest(AsyncTestCase):
+    def setUp(self):
+        super(AsyncTaskMonitorTest, self).setUp()
+        self.connection = AsyncConnection('127.0.0.1')
+        self.task_monitor = AsyncTaskMonitor(self.connection)
+        self.task_monitor.polling_scheduler = TaskPollingScheduler(min_interval=0, backoff_limit=0)
+        self.task = {'uri': '/rest/tasks/1', 'category': 'tasks', 'type': 'TaskResourceV2',
+                     'associatedResource': {'resourceUri': '/rest/resource/1'}}
+
+    def task_in_state(self, state, **kwargs):
+        task = dict(self.task, taskState=state)
+        task.update(kwargs)
+        return task
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_wait_for_task_should_return_associated_resource(self, mock_get):
+        resource = {'uri': '/rest/resource/1'}
+        mock_get.side_effect = self.async_return(self.task_in_state('Running'), self.task_in_state('Completed'),
+                                                 self.task_in_state('Completed'), resource)
+
+        result = self.run_async(self.task_monitor.wait_for_task(self.task))
+
+        self.assertEqual(result, resource)
+        mock_get.assert_called_with('/rest/resource/1')
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_wait_for_task_should_return_true_for_delete_tasks(self, mock_get):
+        mock_get.side_effect = self.async_return(self.task_in_state('Completed', name='Delete'))
+
+        result = self.run_async(self.task_monitor.wait_for_task(self.task))
+
+        self.assertTrue(result)
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_wait_for_task_should_raise_task_error(self, mock_get):
+        mock_get.side_effect = self.async_return(
+            self.task_in_state('Error', taskErrors=[{'message': 'Failure', 'errorCode': 'ERROR'}]))
+
+        try:
+            self.run_async(self.task_monitor.wait_for_task(self.task))
+        except HPOneViewTaskError as e:
+            self.assertEqual(e.msg, 'Failure')
+            self.assertEqual(e.error_code, 'ERROR')
+        else:
+            self.fail('Expected exception was not raised')
+
+    @mock.patch.object(AsyncTaskMonitor, 'get_current_seconds')
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_wait_for_task_should_raise_timeout(self, mock_get, mock_seconds):
+        mock_get.side_effect = self.async_return(self.task_in_state('Running'))
+        mock_seconds.side_effect = [0, 0, 0, 10]
+
+        try:
+            self.run_async(self.task_monitor.wait_for_task(self.task, timeout=5))
+        except HPOneViewTimeout as e:
+            self.assertEqual(e.msg, MSG_TIMEOUT % '5')
+        else:
+            self.fail('Expected exception was not raised')
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_wait_for_task_should_tolerate_connection_failures(self, mock_get):
+        error = OSError(ECONNABORTED, 'Connection aborted')
+        mock_get.side_effect = self.async_return(error, self.task_in_state('Completed', name='Delete'))
+
+        result = self.run_async(self.task_monitor.wait_for_task(self.task))
+
+        self.assertTrue(result)
+
+    @mock.patch.object(AsyncConnection, 'get', new_callable=mock.Mock)
+    def test_get_completed_task_should_return_task(self, mock_get):
+        completed = self.task_in_state('Completed', taskOutput=['output'])
+        mock_get.side_effect = self.async_return(completed)
+
+        result = self.run_async(self.task_monitor.get_completed_task(self.task))
+
+        self.assertEqual(result, completed)
+
+    def test_wait_for_task_should_raise_exception_when_task_is_empty(self):
+        with self.assertRaises(HPOneViewUnknownType):
+            self.run_async(self.task_monitor.wait_for_task(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -120,7 +120,7 @@ class GoldenImagesTest(TestCase):
 
         expected_uri = '/rest/golden-images?name=GoldenImageName&description=Description%20of%20this%20Golden%20Image'
 
-        mock_upload.assert_called_once_with(filepath, expected_uri)
+        mock_upload.assert_called_once_with(filepath, expected_uri, progress_callback=None)
 
     @mock.patch.object(ResourceClient, 'upload')
     def test_upload_without_description(self, mock_upload):
@@ -134,7 +134,7 @@ class GoldenImagesTest(TestCase):
 
         expected_uri = '/rest/golden-images?name=GoldenImageName&description='
 
-        mock_upload.assert_called_once_with(filepath, expected_uri)
+        mock_upload.assert_called_once_with(filepath, expected_uri, progress_callback=None)
 
     @mock.patch.object(ResourceClient, 'upload')
     def test_upload_with_empty_information(self, mock_upload):
@@ -145,7 +145,7 @@ class GoldenImagesTest(TestCase):
 
         expected_uri = '/rest/golden-images?name=&description='
 
-        mock_upload.assert_called_once_with(filepath, expected_uri)
+        mock_upload.assert_called_once_with(filepath, expected_uri, progress_callback=None)
 
     @mock.patch.object(ResourceClient, 'download')
     def test_download_archive_called_once_with_id(self, mock_download):
@@ -23,6 +23,8 @@
 
 from unittest import TestCase
 
+import mock
+
 from hpOneView.image_streamer.image_streamer_client import ImageStreamerClient
 from hpOneView.image_streamer.resources.plan_scripts import PlanScripts
 from hpOneView.image_streamer.resources.golden_images import GoldenImages
@@ -48,6 +50,24 @@ class ImageStreamerClientTest(TestCase):
     def test_connection_has_session(self):
         self.assertEqual(self._client.connection.get_session(), True)
 
+    def test_connection_has_no_circuit_breaker_by_default(self):
+        self.assertIsNone(self._client.connection.get_circuit_breakers())
+
+    def test_connection_has_circuit_breaker(self):
+        client = ImageStreamerClient(self.host, self.session_id, 300, circuit_breaker={'reset_timeout': 60})
+
+        self.assertEqual(client.connection.get_circuit_breakers().get('/rest/build-plans').reset_timeout, 60)
+
+    def test_resource_classes_should_be_attributes_of_module(self):
+        from hpOneView.image_streamer import image_streamer_client
+
+        for name, module_name in image_streamer_client.RESOURCE_CLASSES.items():
+            self.assertEqual(getattr(image_streamer_client, name).__module__, module_name)
+
+    def test_golden_images_should_use_class_patched_on_module(self):
+        with mock.patch('hpOneView.image_streamer.image_streamer_client.GoldenImages') as mock_golden_images:
+            self.assertIs(self._client.golden_images, mock_golden_images.return_value)
+
     def test_golden_images_has_right_type(self):
         self.assertIsInstance(self._client.golden_images, GoldenImages)
 
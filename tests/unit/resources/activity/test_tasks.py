@@ -48,6 +48,13 @@ class TasksTest(TestCase):
                                                 '.resourceCatgory=\'appliance\'"',
                                          query='', sort='name:ascending', start=0, view='day')
 
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all(self, mock_iter_all):
+        self._client.iter_all(fields='name', sort='name:ascending', read_ahead=True)
+
+        mock_iter_all.assert_called_once_with(count=-1, fields='name', filter='', query='', sort='name:ascending',
+                                              start=0, view='', read_ahead=True)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_specific(self, mock_get):
         self._client.get('35323930-4936-4450-5531-303153474820')
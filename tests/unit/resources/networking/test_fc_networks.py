@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.resources.networking.fc_networks import FcNetworks
+from hpOneView.resources.collection_sync import SyncState
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -45,6 +46,14 @@ class FcNetworksTest(unittest.TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        state = SyncState('2017-05-01T10:00:00.000Z')
+
+        self._fc_networks.sync("\"status='OK'\"", state=state, detect_deletions=False)
+
+        mock_sync.assert_called_once_with(filter="\"status='OK'\"", state=state, detect_deletions=False)
+
     @mock.patch.object(ResourceClient, 'create')
     def test_create_should_use_given_values(self, mock_create):
         resource = {
@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.resources.networking.interconnects import Interconnects
+from hpOneView.resources.collection_sync import SyncState
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -98,6 +99,14 @@ class InterconnectsTest(unittest.TestCase):
         self._interconnects.get_all(2, 5, filter, sort)
         mock_get_all.assert_called_once_with(2, 5, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        state = SyncState('2017-05-01T10:00:00.000Z')
+
+        self._interconnects.sync("\"status='OK'\"", state=state, detect_deletions=False)
+
+        mock_sync.assert_called_once_with(filter="\"status='OK'\"", state=state, detect_deletions=False)
+
     @mock.patch.object(ResourceClient, 'patch')
     def test_patch_interconnect_should_return_the_task(self, mock_patch):
         interconnect_id = '5v8f3ec0-52t4-475a-84g4-c4iod72d2c20'
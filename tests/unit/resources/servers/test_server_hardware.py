@@ -27,6 +27,7 @@ import mock
 
 from hpOneView.connection import connection
 from hpOneView.resources.servers.server_hardware import ServerHardware
+from hpOneView.resources.collection_sync import SyncState
 from hpOneView.resources.resource import ResourceClient
 
 
@@ -62,6 +63,23 @@ class ServerHardwareTest(TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        state = SyncState('2017-05-01T10:00:00.000Z')
+
+        self._server_hardware.sync("\"status='OK'\"", state=state, detect_deletions=False)
+
+        mock_sync.assert_called_once_with(filter="\"status='OK'\"", state=state, detect_deletions=False)
+
+    @mock.patch.object(ResourceClient, 'iter_all')
+    def test_iter_all_called_once(self, mock_iter_all):
+        filter = 'name=TestName'
+        sort = 'name:ascending'
+
+        self._server_hardware.iter_all(2, 500, filter, sort, read_ahead=True)
+
+        mock_iter_all.assert_called_once_with(2, 500, filter=filter, sort=sort, read_ahead=True)
+
     @mock.patch.object(ResourceClient, 'get_all')
     def test_get_all_called_once_with_default_values(self, mock_get_all):
         self._server_hardware.get_all()
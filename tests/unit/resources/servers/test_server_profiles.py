@@ -26,6 +26,7 @@ from unittest import TestCase
 import mock
 
 from hpOneView.connection import connection
+from hpOneView.resources.collection_sync import SyncState
 from hpOneView.resources.resource import ResourceClient
 from hpOneView.resources.servers.server_profiles import ServerProfiles
 
@@ -46,6 +47,14 @@ class ServerProfilesTest(TestCase):
         self._resource.get_all(start=2, count=500, filter=query_filter, sort=sort)
         mock_get_all.assert_called_once_with(start=2, count=500, filter=query_filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        state = SyncState('2017-05-01T10:00:00.000Z')
+
+        self._resource.sync("\"status='OK'\"", state=state, detect_deletions=False)
+
+        mock_sync.assert_called_once_with(filter="\"status='OK'\"", state=state, detect_deletions=False)
+
     @mock.patch.object(ResourceClient, 'get')
     def test_get_by_id(self, mock_get):
         id = "6fee02f3-b7c7-42bd-a528-04341e16bad6"
@@ -26,6 +26,7 @@ import unittest
 import mock
 
 from hpOneView.connection import connection
+from hpOneView.resources.collection_sync import SyncState
 from hpOneView.resources.resource import ResourceClient
 from hpOneView.resources.storage.volumes import INVALID_VOLUME_URI
 from hpOneView.resources.storage.volumes import Volumes
@@ -46,6 +47,14 @@ class VolumesTest(unittest.TestCase):
 
         mock_get_all.assert_called_once_with(2, 500, filter=filter, sort=sort)
 
+    @mock.patch.object(ResourceClient, 'sync')
+    def test_sync_called_once(self, mock_sync):
+        state = SyncState('2017-05-01T10:00:00.000Z')
+
+        self._volumes.sync("\"status='OK'\"", state=state, detect_deletions=False)
+
+        mock_sync.assert_called_once_with(filter="\"status='OK'\"", state=state, detect_deletions=False)
+
     @mock.patch.object(ResourceClient, 'get_by')
     def test_get_by_called_once(self, mock_get_by):
         self._volumes.get_by('name', 'Test Volume')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import unittest
+
+from hpOneView.resources.collection_sync import SyncState, SyncResult
+
+
+class SyncStateTest(unittest.TestCase):
+    def test_update_should_move_high_water_mark(self):
+        state = SyncState()
+
+        changed = state.update([{'uri': '/rest/a/1', 'modified': '2017-05-01T10:00:00.000Z'},
+                                {'uri': '/rest/a/2', 'modified': '2017-05-02T10:00:00.000Z'},
+                                {'uri': '/rest/a/3', 'modified': '2017-05-02T10:00:00.000Z'}])
+
+        self.assertEqual(len(changed), 3)
+        self.assertEqual(state.modified, '2017-05-02T10:00:00.000Z')
+        self.assertEqual(state.uris_at_mark, set(['/rest/a/2', '/rest/a/3']))
+
+    def test_update_should_skip_members_already_synced_at_high_water_mark(self):
+        state = SyncState('2017-05-02T10:00:00.000Z', ['/rest/a/2'])
+        member = {'uri': '/rest/a/4', 'modified': '2017-05-02T10:00:00.000Z'}
+
+        changed = state.update([{'uri': '/rest/a/2', 'modified': '2017-05-02T10:00:00.000Z'}, member])
+
+        self.assertEqual(changed, [member])
+        self.assertEqual(state.uris_at_mark, set(['/rest/a/2', '/rest/a/4']))
+
+    def test_update_should_include_members_without_modified(self):
+        state = SyncState()
+
+        changed = state.update([{'uri': '/rest/a/1'}])
+
+        self.assertEqual(changed, [{'uri': '/rest/a/1'}])
+        self.assertIsNone(state.modified)
+
+    def test_should_serialize_to_json(self):
+        state = SyncState('2017-05-02T10:00:00.000Z', ['/rest/a/2'], ['/rest/a/1', '/rest/a/2'])
+
+        restored = SyncState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+        self.assertEqual(restored.to_dict(), state.to_dict())
+
+
+class SyncResultTest(unittest.TestCase):
+    def test_changed_should_include_created_and_updated(self):
+        result = SyncResult([{'uri': '/rest/a/1'}], [{'uri': '/rest/a/2'}], [], False, SyncState())
+
+        self.assertEqual(result.changed, [{'uri': '/rest/a/1'}, {'uri': '/rest/a/2'}])
+        self.assertTrue(result)
+
+    def test_should_be_false_without_changes(self):
+        self.assertFalse(SyncResult([], [], [], False, SyncState()))
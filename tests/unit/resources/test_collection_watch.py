@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import threading
+import unittest
+
+import mock
+
+from hpOneView.resources.collection_watch import CollectionWatch, CollectionWatchScheduler, WatchEvent, \
+    get_default_scheduler, CREATED, UPDATED, DELETED
+
+
+class CollectionWatchTest(unittest.TestCase):
+    def setUp(self):
+        self.resource_client = mock.Mock(_uri='/rest/testuri')
+        self.callback = mock.Mock()
+        self.watch = CollectionWatch(self.resource_client, callbacks=[self.callback])
+
+    def test_first_check_should_only_take_snapshot(self):
+        self.resource_client.get_all.return_value = [{'uri': '/rest/testuri/1', 'eTag': '1'}]
+
+        events = self.watch.check()
+
+        self.resource_client.get_all.assert_called_once_with(filter='', fields='uri,eTag,modified')
+        self.assertEqual(events, [])
+        self.assertEqual(self.watch.snapshot, {'/rest/testuri/1': {'uri': '/rest/testuri/1', 'eTag': '1'}})
+        self.callback.assert_not_called()
+
+    def test_check_should_emit_changes_since_previous_check(self):
+        self.resource_client.get_all.side_effect = [
+            [{'uri': '/rest/testuri/1', 'eTag': '1'}, {'uri': '/rest/testuri/2', 'eTag': '1'},
+             {'uri': '/rest/testuri/3', 'eTag': '1'}],
+            [{'uri': '/rest/testuri/1', 'eTag': '1'}, {'uri': '/rest/testuri/2', 'eTag': '2'},
+             {'uri': '/rest/testuri/4', 'eTag': '1'}]]
+        self.watch.check()
+
+        events = self.watch.check()
+
+        self.assertEqual([(event.type, event.uri) for event in events],
+                         [(UPDATED, '/rest/testuri/2'), (DELETED, '/rest/testuri/3'), (CREATED, '/rest/testuri/4')])
+        self.assertEqual(events[0].previous, {'uri': '/rest/testuri/2', 'eTag': '1'})
+        self.assertEqual(events[0].member, {'uri': '/rest/testuri/2', 'eTag': '2'})
+        self.assertIsNone(events[1].member)
+        self.assertEqual(self.callback.call_args_list, [mock.call(event) for event in events])
+
+    def test_check_should_compare_modified_when_members_have_no_etag(self):
+        self.resource_client.get_all.side_effect = [
+            [{'uri': '/rest/testuri/1', 'modified': '2017-05-01T10:00:00.000Z'}],
+            [{'uri': '/rest/testuri/1', 'modified': '2017-05-02T10:00:00.000Z'}]]
+        self.watch.check()
+
+        events = self.watch.check()
+
+        self.assertEqual([(event.type, event.uri) for event in events], [(UPDATED, '/rest/testuri/1')])
+
+    def test_check_should_notify_other_callbacks_when_a_callback_fails(self):
+        self.resource_client.get_all.side_effect = [[], [{'uri': '/rest/testuri/1'}]]
+        failing_callback = mock.Mock(side_effect=ValueError())
+        watch = CollectionWatch(self.resource_client, callbacks=[failing_callback])
+        watch.add_callback(self.callback)
+        watch.check()
+
+        watch.check()
+
+        failing_callback.assert_called_once()
+        self.callback.assert_called_once()
+
+    def test_remove_callback(self):
+        self.resource_client.get_all.side_effect = [[], [{'uri': '/rest/testuri/1'}]]
+        self.watch.check()
+        self.watch.remove_callback(self.callback)
+
+        self.watch.check()
+
+        self.callback.assert_not_called()
+
+    def test_stop_should_remove_watch_from_scheduler(self):
+        self.watch.scheduler = mock.Mock()
+
+        self.watch.stop()
+
+        self.watch.scheduler.remove.assert_called_once_with(self.watch)
+
+    def test_event_repr(self):
+        self.assertEqual(repr(WatchEvent(CREATED, '/rest/testuri/1')), 'WatchEvent(created, /rest/testuri/1)')
+
+
+class CollectionWatchSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = CollectionWatchScheduler()
+
+    def tearDown(self):
+        self.scheduler.stop(timeout=5)
+
+    def create_watch(self, interval, side_effect=None):
+        watch = mock.Mock(interval=interval, on_error=None, uri='/rest/testuri')
+        watch.check.side_effect = side_effect
+        return watch
+
+    @mock.patch('hpOneView.resources.collection_watch.time.time')
+    def test_run_pending_should_check_each_watch_at_its_interval(self, mock_time):
+        mock_time.return_value = 1000
+        fast_watch = self.create_watch(10)
+        slow_watch = self.create_watch(30)
+        self.scheduler.add(fast_watch)
+        self.scheduler.add(slow_watch)
+
+        self.assertEqual(self.scheduler.run_pending(now=1005), 0)
+        self.assertEqual(self.scheduler.run_pending(now=1010), 1)
+        self.assertEqual(self.scheduler.run_pending(now=1020), 1)
+        self.assertEqual(self.scheduler.run_pending(now=1030), 2)
+
+        self.assertEqual(fast_watch.check.call_count, 3)
+        self.assertEqual(slow_watch.check.call_count, 1)
+        self.assertEqual(fast_watch.scheduler, self.scheduler)
+
+    @mock.patch('hpOneView.resources.collection_watch.time.time')
+    def test_run_pending_should_skip_removed_watch(self, mock_time):
+        mock_time.return_value = 1000
+        watch = self.create_watch(10)
+        self.scheduler.add(watch, delay=0)
+        self.scheduler.remove(watch)
+
+        self.assertEqual(self.scheduler.run_pending(now=1000), 0)
+        self.assertEqual(self.scheduler.watches, [])
+        watch.check.assert_not_called()
+
+    @mock.patch('hpOneView.resources.collection_watch.time.time')
+    def test_run_pending_should_keep_checking_after_error(self, mock_time):
+        mock_time.return_value = 1000
+        error = ValueError()
+        watch = self.create_watch(10, side_effect=error)
+        watch.on_error = mock.Mock()
+        self.scheduler.add(watch)
+
+        self.scheduler.run_pending(now=1010)
+        self.scheduler.run_pending(now=1020)
+
+        self.assertEqual(watch.check.call_count, 2)
+        watch.on_error.assert_called_with(error)
+
+    def test_should_check_watches_from_its_thread(self):
+        checked = threading.Event()
+        watch = self.create_watch(0.01, side_effect=lambda: checked.set())
+
+        self.scheduler.add(watch)
+
+        self.assertTrue(checked.wait(5))
+
+    def test_stop_should_remove_all_watches(self):
+        self.scheduler.add(self.create_watch(10))
+
+        self.scheduler.stop(timeout=5)
+
+        self.assertTrue(self.scheduler.stopped)
+        self.assertEqual(self.scheduler.watches, [])
+        self.assertRaises(RuntimeError, self.scheduler.add, self.create_watch(10))
+
+    def test_default_scheduler_should_be_shared_until_stopped(self):
+        scheduler = get_default_scheduler()
+        self.assertIs(get_default_scheduler(), scheduler)
+
+        scheduler.stop()
+
+        self.assertIsNot(get_default_scheduler(), scheduler)
@@ -28,7 +28,10 @@ from mock import call
 from tests.test_utils import mock_builtin
 
 from hpOneView.connection import connection
+from hpOneView.deadline import Deadline, get_current_deadline
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewException, HPOneViewValueError
+from hpOneView.json_stream import CollectionStream
+from hpOneView.resources.collection_sync import SyncState
 from hpOneView.resources.resource import merge_resources, merge_default_values
 from hpOneView.resources.resource import ResourceClient, RESOURCE_CLIENT_INVALID_ID, UNRECOGNIZED_URI, TaskMonitor, \
     RESOURCE_CLIENT_TASK_EXPECTED, RESOURCE_ID_OR_URI_REQUIRED
@@ -245,6 +248,276 @@ class ResourceClientTest(unittest.TestCase):
         self.assertSequenceEqual(result, members)
         mock_get.assert_called_once_with(uri)
 
+    @mock.patch.object(connection, 'get')
+    def test_get_all_with_workers_should_request_remaining_pages_by_window(self, mock_get):
+        pages = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=3&count=3', 'total': 8,
+                                               'members': [{'id': '1'}, {'id': '2'}, {'id': '3'}]},
+            '/rest/testuri?start=3&count=3': {'nextPageUri': '/rest/testuri?start=6&count=3', 'total': 8,
+                                              'members': [{'id': '4'}, {'id': '5'}, {'id': '6'}]},
+            '/rest/testuri?start=6&count=3': {'nextPageUri': None, 'total': 8,
+                                              'members': [{'id': '7'}, {'id': '8'}]}}
+        mock_get.side_effect = lambda uri: pages[uri]
+
+        result = self.resource_client.get_all(max_workers=4)
+
+        expected_items = [{'id': str(i)} for i in range(1, 9)]
+        self.assertSequenceEqual(result, expected_items)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_with_workers_should_use_connection_default(self, mock_get):
+        pages = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 4,
+                                               'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=2': {'nextPageUri': None, 'total': 4,
+                                              'members': [{'id': '3'}, {'id': '4'}]}}
+        mock_get.side_effect = lambda uri: pages[uri]
+        self.connection.set_max_page_workers(2)
+
+        result = self.resource_client.get_all()
+
+        self.assertSequenceEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_with_workers_should_request_pages_under_deadline_of_caller(self, mock_get):
+        pages = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 6,
+                                               'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=2': {'nextPageUri': None, 'total': 6, 'members': [{'id': '3'}, {'id': '4'}]},
+            '/rest/testuri?start=4&count=2': {'nextPageUri': None, 'total': 6, 'members': [{'id': '5'}, {'id': '6'}]}}
+        deadlines = []
+
+        def get(uri):
+            deadlines.append(get_current_deadline())
+            return pages[uri]
+
+        mock_get.side_effect = get
+
+        with Deadline(30):
+            self.resource_client.get_all(max_workers=2)
+
+        self.assertEqual(len(deadlines), 3)
+        self.assertEqual(set(deadline.timeout for deadline in deadlines), set([30]))
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_with_workers_should_stop_windows_when_requested_count_reached(self, mock_get):
+        pages = {
+            '/rest/testuri?start=0&count=5': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 10,
+                                              'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=2': {'nextPageUri': '/rest/testuri?start=4&count=2', 'total': 10,
+                                              'members': [{'id': '3'}, {'id': '4'}]},
+            '/rest/testuri?start=4&count=2': {'nextPageUri': '/rest/testuri?start=6&count=2', 'total': 10,
+                                              'members': [{'id': '5'}, {'id': '6'}]}}
+        mock_get.side_effect = lambda uri: pages[uri]
+
+        result = self.resource_client.get_all(count=5, max_workers=4)
+
+        self.assertEqual(len(result), 6)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_with_workers_should_complete_window_when_page_is_smaller(self, mock_get):
+        pages = {
+            '/rest/testuri?start=0&count=-1': {'nextPageUri': '/rest/testuri?start=2&count=2', 'total': 4,
+                                               'members': [{'id': '1'}, {'id': '2'}]},
+            '/rest/testuri?start=2&count=2': {'nextPageUri': '/rest/testuri?start=3&count=1', 'total': 4,
+                                              'members': [{'id': '3'}]},
+            '/rest/testuri?start=3&count=1': {'nextPageUri': None, 'total': 4,
+                                              'members': [{'id': '4'}]}}
+        mock_get.side_effect = lambda uri: pages[uri]
+
+        result = self.resource_client.get_all(max_workers=2)
+
+        self.assertSequenceEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}, {'id': '4'}])
+
+    @mock.patch.object(connection, 'get')
+    def test_get_all_with_workers_should_follow_pages_when_total_is_missing(self, mock_get):
+        mock_get.side_effect = [
+            {'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+            {'nextPageUri': None, 'members': [{'id': '2'}]}]
+
+        result = self.resource_client.get_all(max_workers=2)
+
+        self.assertSequenceEqual(result, [{'id': '1'}, {'id': '2'}])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_pages_should_request_pages_lazily(self, mock_get):
+        mock_get.side_effect = [
+            {'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]},
+            {'nextPageUri': None, 'members': [{'id': '3'}]}]
+
+        pages = self.resource_client.iter_pages(filter="name='name'")
+
+        mock_get.assert_not_called()
+        self.assertEqual(next(pages), [{'id': '1'}, {'id': '2'}])
+        mock_get.assert_called_once_with("/rest/testuri?start=0&count=-1&filter=name%3D%27name%27")
+        self.assertEqual(next(pages), [{'id': '3'}])
+        self.assertRaises(StopIteration, next, pages)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_pages_should_stop_when_requested_count_reached(self, mock_get):
+        mock_get.return_value = {'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]}
+
+        pages = list(self.resource_client.iter_pages(count=2))
+
+        self.assertEqual(pages, [[{'id': '1'}, {'id': '2'}]])
+        mock_get.assert_called_once_with('/rest/testuri?start=0&count=2')
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_pages_with_read_ahead(self, mock_get):
+        mock_get.side_effect = [
+            {'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+            {'nextPageUri': '/rest/testuri?start=2&count=1', 'members': [{'id': '2'}]},
+            {'nextPageUri': None, 'members': [{'id': '3'}]}]
+
+        pages = list(self.resource_client.iter_pages(read_ahead=True))
+
+        self.assertEqual(pages, [[{'id': '1'}], [{'id': '2'}], [{'id': '3'}]])
+        self.assertEqual(mock_get.call_args_list, [call('/rest/testuri?start=0&count=-1'),
+                                                   call('/rest/testuri?start=1&count=1'),
+                                                   call('/rest/testuri?start=2&count=1')])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_pages_with_read_ahead_should_request_pages_under_deadline_of_caller(self, mock_get):
+        responses = [{'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+                     {'nextPageUri': None, 'members': [{'id': '2'}]}]
+        deadlines = []
+        mock_get.side_effect = lambda uri: deadlines.append(get_current_deadline()) or responses.pop(0)
+
+        with Deadline(30):
+            list(self.resource_client.iter_pages(read_ahead=True))
+
+        self.assertEqual([deadline.timeout for deadline in deadlines], [30, 30])
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_pages_with_read_ahead_should_raise_page_error(self, mock_get):
+        mock_get.side_effect = [
+            {'nextPageUri': '/rest/testuri?start=1&count=1', 'members': [{'id': '1'}]},
+            HPOneViewException('Failed')]
+
+        pages = self.resource_client.iter_pages(read_ahead=True)
+
+        next(pages)
+        self.assertRaises(HPOneViewException, next, pages)
+
+    def test_iter_pages_with_different_resource_uri_should_fail(self):
+        self.assertRaises(HPOneViewUnknownType, self.resource_client.iter_pages, uri='/rest/other/resource')
+
+    @mock.patch.object(connection, 'get')
+    def test_iter_all_should_yield_members_of_all_pages(self, mock_get):
+        mock_get.side_effect = [
+            {'nextPageUri': '/rest/testuri?start=2&count=2', 'members': [{'id': '1'}, {'id': '2'}]},
+            {'nextPageUri': None, 'members': [{'id': '3'}]}]
+
+        result = list(self.resource_client.iter_all())
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}])
+
+    @mock.patch.object(connection, 'get_collection_stream')
+    def test_iter_all_with_stream_should_yield_members_of_all_pages(self, mock_get_collection_stream):
+        mock_get_collection_stream.side_effect = [
+            CollectionStream(io.BytesIO(b'{"members": [{"id": "1"}, {"id": "2"}], '
+                                        b'"nextPageUri": "/rest/testuri?start=2&count=2"}')),
+            CollectionStream(io.BytesIO(b'{"members": [{"id": "3"}], "nextPageUri": null}'))]
+
+        result = list(self.resource_client.iter_all(stream=True))
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}, {'id': '3'}])
+        mock_get_collection_stream.assert_has_calls([call('/rest/testuri?start=0&count=-1'),
+                                                     call('/rest/testuri?start=2&count=2')])
+
+    @mock.patch.object(connection, 'get_collection_stream')
+    def test_iter_all_with_stream_should_close_page_when_iteration_stops(self, mock_get_collection_stream):
+        page = mock_get_collection_stream.return_value = CollectionStream(
+            io.BytesIO(b'{"members": [{"id": "1"}, {"id": "2"}], "nextPageUri": null}'))
+
+        members = self.resource_client.iter_all(stream=True)
+        next(members)
+        members.close()
+
+        self.assertTrue(page.closed)
+
+    @mock.patch.object(connection, 'get_collection_stream')
+    def test_iter_all_with_stream_should_stop_at_requested_count(self, mock_get_collection_stream):
+        mock_get_collection_stream.return_value = CollectionStream(io.BytesIO(
+            b'{"members": [{"id": "1"}, {"id": "2"}], "nextPageUri": "/rest/testuri?start=2&count=2"}'))
+
+        result = list(self.resource_client.iter_all(count=2, stream=True))
+
+        self.assertEqual(result, [{'id': '1'}, {'id': '2'}])
+        mock_get_collection_stream.assert_called_once_with('/rest/testuri?start=0&count=2')
+
+    @mock.patch.object(connection, 'post')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_create_without_wait_should_return_future(self, mock_submit, mock_post):
+        mock_post.return_value = self.task, {}
+
+        future = self.resource_client.create({"name": "resource"}, timeout=60, wait=False)
+
+        mock_submit.assert_called_once_with(self.task, 60)
+        self.assertEqual(future, mock_submit.return_value)
+
+    @mock.patch.object(connection, 'post')
+    def test_create_without_wait_and_task_should_return_completed_future(self, mock_post):
+        mock_post.return_value = None, self.response_body
+
+        future = self.resource_client.create({"name": "resource"}, wait=False)
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), self.response_body)
+
+    @mock.patch.object(connection, 'put')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_update_without_wait_should_return_future(self, mock_submit, mock_put):
+        mock_put.return_value = self.task, {}
+
+        future = self.resource_client.update({"uri": "/rest/testuri/1"}, wait=False)
+
+        mock_submit.assert_called_once_with(self.task, -1)
+        self.assertEqual(future, mock_submit.return_value)
+
+    @mock.patch.object(connection, 'delete')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_delete_without_wait_should_return_future(self, mock_submit, mock_delete):
+        mock_delete.return_value = self.task, {}
+
+        future = self.resource_client.delete("1", wait=False)
+
+        mock_submit.assert_called_once_with(self.task, -1)
+        self.assertEqual(future, mock_submit.return_value)
+
+    @mock.patch.object(connection, 'patch')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_patch_without_wait_should_return_future(self, mock_submit, mock_patch):
+        mock_patch.return_value = self.task, {}
+
+        future = self.resource_client.patch("1", "replace", "/name", "new name", wait=False)
+
+        mock_submit.assert_called_once_with(self.task, -1)
+        self.assertEqual(future, mock_submit.return_value)
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_upload_without_wait_should_return_future(self, mock_submit, mock_post_multipart):
+        mock_post_multipart.return_value = self.task, {}
+
+        future = self.resource_client.upload("/path/to/file.zip", wait=False)
+
+        mock_submit.assert_called_once_with(self.task, -1)
+        self.assertEqual(future, mock_submit.return_value)
+
+    @mock.patch.object(connection, 'post')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_create_report_without_wait_should_return_future_of_task_output(self, mock_submit, mock_post):
+        mock_post.return_value = self.task, {}
+
+        self.resource_client.create_report("/rest/path/create-report", wait=False)
+
+        handler = mock_submit.call_args[1]['handler']
+        self.assertEqual(handler({"taskOutput": ["output"]}), ["output"])
+
     @mock.patch.object(connection, 'get')
     def test_get_all_should_return_empty_list_when_response_has_no_items(self, mock_get):
         mock_get.return_value = {'nextPageUri': None, 'members': []}
@@ -286,6 +559,16 @@ class ResourceClientTest(unittest.TestCase):
         mock_wait4task.assert_called_with(self.task, timeout=-1)
         self.assertEqual(self.task, delete_task)
 
+    @mock.patch.object(connection, 'delete')
+    @mock.patch.object(TaskMonitor, 'submit')
+    def test_delete_all_without_wait_should_return_future(self, mock_submit, mock_delete):
+        mock_delete.return_value = self.task, self.response_body
+
+        future = self.resource_client.delete_all(filter="name='Exchange Server'", timeout=30, wait=False)
+
+        mock_submit.assert_called_once_with(self.task, 30)
+        self.assertEqual(future, mock_submit.return_value)
+
     @mock.patch.object(connection, 'delete')
     @mock.patch.object(TaskMonitor, 'wait_for_task')
     def test_delete_by_id_called_once(self, mock_wait4task, mock_delete):
@@ -341,6 +624,96 @@ class ResourceClientTest(unittest.TestCase):
         self.assertIsNone(response)
         mock_get_by.assert_called_once_with("name", 'Resource Name,')
 
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_get_all_members_on_first_sync(self, mock_get_all):
+        members = [{'uri': '/rest/testuri/1', 'modified': '2017-05-01T10:00:00.000Z'},
+                   {'uri': '/rest/testuri/2', 'modified': '2017-05-02T10:00:00.000Z'}]
+        mock_get_all.return_value = members
+
+        result = self.resource_client.sync()
+
+        mock_get_all.assert_called_once_with(filter='')
+        self.assertTrue(result.full)
+        self.assertEqual(result.created, members)
+        self.assertEqual(result.state.modified, '2017-05-02T10:00:00.000Z')
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_get_members_modified_since_high_water_mark(self, mock_get_all):
+        state = SyncState('2017-05-02T10:00:00.000Z', ['/rest/testuri/2'], ['/rest/testuri/1', '/rest/testuri/2'])
+        modified = [{'uri': '/rest/testuri/2', 'modified': '2017-05-02T10:00:00.000Z'},
+                    {'uri': '/rest/testuri/1', 'modified': '2017-05-03T10:00:00.000Z'},
+                    {'uri': '/rest/testuri/3', 'modified': '2017-05-03T10:00:00.000Z'}]
+        mock_get_all.side_effect = [modified, [{'uri': '/rest/testuri/1'}, {'uri': '/rest/testuri/3'}]]
+
+        result = self.resource_client.sync(filter="\"status='OK'\"", state=state)
+
+        mock_get_all.assert_has_calls([
+            call(filter=["\"status='OK'\"", "\"modified>='2017-05-02T10:00:00.000Z'\""], sort='modified:ascending'),
+            call(filter=["\"status='OK'\""], fields='uri')])
+        self.assertFalse(result.full)
+        self.assertEqual(result.created, modified[2:])
+        self.assertEqual(result.updated, modified[1:2])
+        self.assertEqual(result.deleted, ['/rest/testuri/2'])
+        self.assertEqual(result.state.modified, '2017-05-03T10:00:00.000Z')
+        self.assertEqual(result.state.uris, set(['/rest/testuri/1', '/rest/testuri/3']))
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_keep_state_for_each_filter(self, mock_get_all):
+        mock_get_all.return_value = [{'uri': '/rest/testuri/1', 'modified': '2017-05-01T10:00:00.000Z'}]
+        self.resource_client.sync()
+
+        mock_get_all.reset_mock()
+        mock_get_all.side_effect = [[], [{'uri': '/rest/testuri/1'}]]
+        result = self.resource_client.sync()
+
+        self.assertFalse(result)
+        self.assertEqual(mock_get_all.call_args_list[0],
+                         call(filter=["\"modified>='2017-05-01T10:00:00.000Z'\""], sort='modified:ascending'))
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_skip_deletions_when_disabled(self, mock_get_all):
+        state = SyncState('2017-05-01T10:00:00.000Z', [], ['/rest/testuri/1'])
+        mock_get_all.return_value = [{'uri': '/rest/testuri/2', 'modified': '2017-05-02T10:00:00.000Z'}]
+
+        result = self.resource_client.sync(state=state, detect_deletions=False)
+
+        self.assertEqual(mock_get_all.call_count, 1)
+        self.assertEqual(result.deleted, [])
+        self.assertEqual(result.state.uris, set(['/rest/testuri/1', '/rest/testuri/2']))
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_sync_should_discard_members_not_matching_modified_filter(self, mock_get_all):
+        state = SyncState('2017-05-02T10:00:00.000Z', [], ['/rest/testuri/1'])
+        mock_get_all.side_effect = [[{'uri': '/rest/testuri/1', 'modified': '2017-05-01T10:00:00.000Z'}],
+                                    [{'uri': '/rest/testuri/1'}]]
+
+        result = self.resource_client.sync(state=state)
+
+        self.assertFalse(result)
+
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_watch_should_take_snapshot_and_add_watch_to_scheduler(self, mock_get_all):
+        mock_get_all.return_value = [{'uri': '/rest/testuri/1', 'eTag': '1'}]
+        scheduler = mock.Mock()
+        callback = mock.Mock()
+
+        watch = self.resource_client.watch(callback, interval=10, filter="\"status='OK'\"", scheduler=scheduler)
+
+        mock_get_all.assert_called_once_with(filter="\"status='OK'\"", fields='uri,eTag,modified')
+        scheduler.add.assert_called_once_with(watch)
+        self.assertEqual(watch.interval, 10)
+        self.assertEqual(list(watch.snapshot), ['/rest/testuri/1'])
+        callback.assert_not_called()
+
+    @mock.patch('hpOneView.resources.resource.get_default_scheduler')
+    @mock.patch.object(ResourceClient, 'get_all')
+    def test_watch_should_use_default_scheduler(self, mock_get_all, mock_get_default_scheduler):
+        mock_get_all.return_value = []
+
+        watch = self.resource_client.watch()
+
+        mock_get_default_scheduler.return_value.add.assert_called_once_with(watch)
+
     @mock.patch.object(connection, 'get')
     def test_get_collection_uri(self, mock_get):
         mock_get.return_value = {"members": [{"key": "value"}, {"key": "value"}]}
@@ -619,6 +992,20 @@ class ResourceClientTest(unittest.TestCase):
         self.resource_client.create(dict_to_create, timeout=-1)
         mock_post.assert_called_once_with(self.URI, dict_to_create, custom_headers=None)
 
+    @mock.patch.object(TaskMonitor, 'wait_for_task')
+    @mock.patch.object(connection, 'post')
+    def test_create_should_run_requests_and_task_wait_within_timeout_deadline(self, mock_post, mock_wait4task):
+        deadlines = []
+        mock_post.side_effect = lambda *args, **kwargs: deadlines.append(get_current_deadline()) or (self.task, {})
+        mock_wait4task.side_effect = lambda *args, **kwargs: deadlines.append(get_current_deadline())
+
+        self.resource_client.create({"resource_name": "a name"}, timeout=60)
+
+        self.assertEqual(len(deadlines), 2)
+        self.assertIs(deadlines[0], deadlines[1])
+        self.assertEqual(deadlines[0].timeout, 60)
+        self.assertIsNone(get_current_deadline())
+
     @mock.patch.object(connection, 'post')
     def test_create_with_api_version_200(self, mock_post):
         dict_to_create = {"resource_name": "a name"}
@@ -998,6 +1385,19 @@ class ResourceClientTest(unittest.TestCase):
         else:
             self.fail("Expected Exception was not raised")
 
+    def test_build_query_uri_should_include_query_parameters(self):
+        result = self.resource_client.build_query_uri(start=10, count=5, filter="name='name'", sort='name:ascending')
+
+        self.assertEqual(result, '/rest/testuri?start=10&count=5&filter=name%3D%27name%27&sort=name%3Aascending')
+
+    def test_build_query_uri_should_validate_uri(self):
+        try:
+            self.resource_client.build_query_uri(uri='/rest/other')
+        except HPOneViewUnknownType as exception:
+            self.assertEqual(UNRECOGNIZED_URI, exception.args[0])
+        else:
+            self.fail("Expected Exception was not raised")
+
     def test_build_uri_with_id_should_work(self):
         input = '09USE7335NW35'
         expected_output = '/rest/testuri/09USE7335NW35'
@@ -1207,7 +1607,8 @@ class ResourceClientTest(unittest.TestCase):
 
         self.resource_client.upload(filepath, uri)
 
-        mock_post_multipart.assert_called_once_with(uri, filepath, 'SPPgen9snap6.2015_0405.81.iso')
+        mock_post_multipart.assert_called_once_with(uri, filepath, 'SPPgen9snap6.2015_0405.81.iso',
+                                                    progress_callback=None)
 
     @mock.patch.object(connection, 'post_multipart_with_response_handling')
     def test_upload_should_call_post_multipart_with_resource_uri_when_not_uri_provided(self, mock_post_multipart):
@@ -1216,7 +1617,18 @@ class ResourceClientTest(unittest.TestCase):
 
         self.resource_client.upload(filepath)
 
-        mock_post_multipart.assert_called_once_with('/rest/testuri', mock.ANY, mock.ANY)
+        mock_post_multipart.assert_called_once_with('/rest/testuri', mock.ANY, mock.ANY, progress_callback=None)
+
+    @mock.patch.object(connection, 'post_multipart_with_response_handling')
+    def test_upload_should_pass_progress_callback(self, mock_post_multipart):
+        filepath = "test/SPPgen9snap6.2015_0405.81.iso"
+        progress_callback = mock.Mock()
+        mock_post_multipart.return_value = None, mock.Mock()
+
+        self.resource_client.upload(filepath, progress_callback=progress_callback)
+
+        mock_post_multipart.assert_called_once_with('/rest/testuri', filepath, 'SPPgen9snap6.2015_0405.81.iso',
+                                                    progress_callback=progress_callback)
 
     @mock.patch.object(connection, 'post_multipart_with_response_handling')
     @mock.patch.object(TaskMonitor, 'wait_for_task')
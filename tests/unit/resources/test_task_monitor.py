@@ -21,14 +21,20 @@
 # THE SOFTWARE.
 ###
 
+import gc
+import time
 import unittest
+import weakref
 from mock import mock, call
 from errno import ETIMEDOUT, ECONNABORTED
 
 from hpOneView.connection import connection
+from hpOneView.deadline import Deadline
 from hpOneView.resources.task_monitor import TaskMonitor, MSG_UNKNOWN_OBJECT_TYPE, MSG_TASK_TYPE_UNRECONIZED, \
     MSG_TIMEOUT, MSG_UNKNOWN_EXCEPTION, MSG_INVALID_TASK
+from hpOneView.resources.task_monitor import TaskPollingScheduler, TaskFuture, TaskPoller, MSG_CANCELLED
 from hpOneView.exceptions import HPOneViewUnknownType, HPOneViewInvalidResource, HPOneViewTimeout, HPOneViewTaskError
+from hpOneView.exceptions import HPOneViewException, HPOneViewCancelledError
 
 ERR_MSG = "Message error"
 
@@ -39,6 +45,7 @@ class TaskMonitorTest(unittest.TestCase):
         self.host = '127.0.0.1'
         self.connection = connection(self.host)
         self.task_monitor = TaskMonitor(self.connection)
+        self.task_monitor.polling_scheduler = TaskPollingScheduler()
 
     @mock.patch.object(connection, 'get')
     def test_get_associated_resource_with_task(self, mock_get):
@@ -242,6 +249,52 @@ class TaskMonitorTest(unittest.TestCase):
         else:
             self.fail()
 
+    @mock.patch.object(TaskMonitor, 'is_task_running')
+    @mock.patch('time.sleep')
+    def test_wait_for_task_should_be_limited_by_deadline(self, mock_sleep, mock_is_running):
+        mock_is_running.return_value = True
+
+        with Deadline(0.1):
+            try:
+                self.task_monitor.wait_for_task({"uri": "uri"}, timeout=600)
+            except HPOneViewTimeout:
+                pass
+            else:
+                self.fail()
+
+        for sleep_call in mock_sleep.call_args_list:
+            self.assertLessEqual(sleep_call[0][0], 0.1)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_associated_resource')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_task_should_poll_according_to_expected_duration(self, mock_get, mock_assoc_res, mock_sleep):
+        running_task = {"uri": "uri", "name": "Update", "taskState": "Running", "expectedDuration": 40,
+                        "computedPercentComplete": 50}
+        completed_task = {"uri": "uri", "name": "Update", "taskState": "Completed", "type": "TaskResourceV2",
+                          "created": "2017-05-01T10:00:00.000Z", "modified": "2017-05-01T10:00:30.000Z"}
+        mock_get.side_effect = [running_task, completed_task, completed_task]
+        mock_assoc_res.return_value = completed_task, {"resource": "resource"}
+
+        self.task_monitor.wait_for_task({"uri": "uri"})
+
+        mock_sleep.assert_called_once_with(10)
+        self.assertEqual(self.task_monitor.polling_scheduler.get_average_duration(completed_task), 30)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_associated_resource')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_task_should_record_task_wait_metrics(self, mock_get, mock_assoc_res, mock_sleep):
+        running_task = {"uri": "uri", "name": "Update", "taskState": "Running"}
+        completed_task = {"uri": "uri", "name": "Update", "taskState": "Completed", "type": "TaskResourceV2"}
+        mock_get.side_effect = [running_task, completed_task, completed_task]
+        mock_assoc_res.return_value = completed_task, {"resource": "resource"}
+        collector = self.connection.enable_metrics()
+
+        self.task_monitor.wait_for_task({"uri": "uri"})
+
+        self.assertEqual(collector.to_dict()['task_waits']['Update Completed']['count'], 1)
+
     @mock.patch.object(TaskMonitor, 'is_task_running')
     @mock.patch.object(TaskMonitor, 'get')
     def test_wait_for_task_with_error_message(self, mock_get, mock_is_running):
@@ -453,3 +506,310 @@ class TaskMonitorTest(unittest.TestCase):
         response = self.task_monitor.get_completed_task(task.copy())
 
         self.assertEqual(task, response)
+
+    @mock.patch.object(TaskMonitor, 'get_associated_resource')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_request_tasks_in_batch(self, mock_get, mock_assoc_res):
+        tasks = [{"uri": "/rest/tasks/1"}, {"uri": "/rest/tasks/2"}]
+        mock_get.return_value = {"members": [
+            {"uri": "/rest/tasks/2", "type": "TaskResourceV2", "taskState": "Completed", "name": "Update"},
+            {"uri": "/rest/tasks/1", "type": "TaskResourceV2", "taskState": "Completed", "name": "Delete"}]}
+        mock_assoc_res.return_value = tasks[1], {"resource": "2"}
+
+        result = self.task_monitor.wait_for_tasks(tasks)
+
+        self.assertEqual(result, [True, {"resource": "2"}])
+        mock_get.assert_called_once_with("/rest/tasks?filter=uri%20in%20%28%27/rest/tasks/1%27%2C%27/rest/tasks/2"
+                                         "%27%29&count=2")
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(connection, 'get')
+    def test_iter_completed_tasks_should_yield_tasks_as_they_finish(self, mock_get, mock_sleep):
+        tasks = [{"uri": "/rest/tasks/1"}, {"uri": "/rest/tasks/2"}]
+        mock_get.side_effect = [
+            {"members": [{"uri": "/rest/tasks/1", "taskState": "Running"},
+                         {"uri": "/rest/tasks/2", "taskState": "Completed", "name": "Delete", "type": "T"}]},
+            {"members": [{"uri": "/rest/tasks/1", "taskState": "Completed", "name": "Remove", "type": "T"}]}]
+
+        completed = [(task['uri'], response) for task, response in self.task_monitor.iter_completed_tasks(tasks)]
+
+        self.assertEqual(completed, [("/rest/tasks/2", True), ("/rest/tasks/1", True)])
+        mock_sleep.assert_called_once_with(1)
+        self.assertIn("%28%27/rest/tasks/1%27%29&count=1", mock_get.call_args_list[1][0][0])
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_return_task_error(self, mock_get):
+        tasks = [{"uri": "/rest/tasks/1"}, {"uri": "/rest/tasks/2"}]
+        mock_get.return_value = {"members": [
+            {"uri": "/rest/tasks/1", "taskState": "Error", "taskErrors": [{"message": ERR_MSG, "errorCode": "Code"}]},
+            {"uri": "/rest/tasks/2", "taskState": "Completed", "name": "Delete", "type": "TaskResourceV2"}]}
+
+        result = self.task_monitor.wait_for_tasks(tasks)
+
+        self.assertIsInstance(result[0], HPOneViewTaskError)
+        self.assertEqual(result[0].msg, ERR_MSG)
+        self.assertEqual(result[0].error_code, "Code")
+        self.assertTrue(result[1])
+
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_retrieve_tasks_one_by_one_when_batch_fails(self, mock_get):
+        tasks = [{"uri": "/rest/tasks/1"}, {"uri": "/rest/tasks/2"}]
+        mock_get.side_effect = [
+            HPOneViewException("Invalid filter"),
+            {"uri": "/rest/tasks/1", "taskState": "Completed", "name": "Delete", "type": "TaskResourceV2"},
+            HPOneViewException("Not found")]
+
+        result = self.task_monitor.wait_for_tasks(tasks)
+
+        self.assertTrue(result[0])
+        self.assertEqual(result[1].msg, "Not found")
+        self.assertEqual(mock_get.call_args_list[1:], [call("/rest/tasks/1"), call("/rest/tasks/2")])
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(TaskMonitor, 'get_current_seconds')
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_return_timeout_for_running_tasks(self, mock_get, mock_seconds, mock_sleep):
+        tasks = [{"uri": "/rest/tasks/1"}, {"uri": "/rest/tasks/2"}]
+        mock_seconds.side_effect = [0, 0, 0, 100, 100]
+        mock_get.return_value = {"members": [
+            {"uri": "/rest/tasks/1", "taskState": "Running"},
+            {"uri": "/rest/tasks/2", "taskState": "Completed", "name": "Delete", "type": "TaskResourceV2"}]}
+
+        result = self.task_monitor.wait_for_tasks(tasks, timeout=10)
+
+        self.assertIsInstance(result[0], HPOneViewTimeout)
+        self.assertEqual(result[0].msg, MSG_TIMEOUT % 10)
+        self.assertTrue(result[1])
+
+    @mock.patch.object(TaskMonitor, 'TASKS_BATCH_SIZE', 1)
+    @mock.patch.object(connection, 'get')
+    def test_wait_for_tasks_should_split_requests_by_batch_size(self, mock_get):
+        tasks = [{"uri": "/rest/tasks/1"}, {"uri": "/rest/tasks/2"}]
+        mock_get.side_effect = [
+            {"members": [{"uri": "/rest/tasks/1", "taskState": "Completed", "name": "Delete", "type": "T"}]},
+            {"members": [{"uri": "/rest/tasks/2", "taskState": "Completed", "name": "Delete", "type": "T"}]}]
+
+        self.assertEqual(self.task_monitor.wait_for_tasks(tasks), [True, True])
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_wait_for_tasks_empty(self):
+        self.assertRaises(HPOneViewUnknownType, self.task_monitor.wait_for_tasks, [])
+
+    @mock.patch.object(connection, 'get')
+    def test_submit_should_return_future_of_associated_resource(self, mock_get):
+        self.task_monitor.polling_scheduler = TaskPollingScheduler(min_interval=0, backoff_limit=0)
+        running_task = {"uri": "/rest/tasks/1", "taskState": "Running"}
+        completed_task = {"uri": "/rest/tasks/1", "taskState": "Completed", "name": "Delete", "type": "T"}
+        mock_get.side_effect = [{"members": [running_task]}, {"members": [completed_task]}]
+
+        future = self.task_monitor.submit({"uri": "/rest/tasks/1"})
+
+        self.assertTrue(future.result(timeout=5))
+        self.assertTrue(future.done())
+        self.assertEqual(mock_get.call_count, 2)
+
+    @mock.patch.object(connection, 'get')
+    def test_submit_should_set_task_error(self, mock_get):
+        mock_get.return_value = {"members": [{"uri": "/rest/tasks/1", "taskState": "Error",
+                                              "taskErrors": [{"message": ERR_MSG}]}]}
+
+        future = self.task_monitor.submit({"uri": "/rest/tasks/1"})
+
+        self.assertRaises(HPOneViewTaskError, future.result, 5)
+        self.assertEqual(future.exception().msg, ERR_MSG)
+
+    @mock.patch.object(connection, 'get')
+    def test_submit_should_use_handler(self, mock_get):
+        mock_get.return_value = {"members": [{"uri": "/rest/tasks/1", "taskState": "Completed",
+                                              "taskOutput": ["output"]}]}
+
+        future = self.task_monitor.submit({"uri": "/rest/tasks/1"}, handler=lambda task: task['taskOutput'])
+
+        self.assertEqual(future.result(timeout=5), ["output"])
+
+    @mock.patch.object(connection, 'get')
+    def test_submit_should_poll_tasks_of_all_futures_together(self, mock_get):
+        poller = TaskPoller.get_instance(self.task_monitor)
+        mock_get.return_value = {"members": [
+            {"uri": "/rest/tasks/1", "taskState": "Completed", "name": "Delete", "type": "T"},
+            {"uri": "/rest/tasks/2", "taskState": "Completed", "name": "Delete", "type": "T"}]}
+
+        with poller._condition:
+            futures = [self.task_monitor.submit({"uri": "/rest/tasks/1"}),
+                       self.task_monitor.submit({"uri": "/rest/tasks/2"})]
+
+        self.assertEqual([future.result(timeout=5) for future in futures], [True, True])
+        mock_get.assert_called_once_with(mock.ANY)
+
+    def test_get_instance_should_return_poller_of_the_connection(self):
+        other_monitor = TaskMonitor(self.connection)
+
+        self.assertIs(TaskPoller.get_instance(self.task_monitor), TaskPoller.get_instance(other_monitor))
+        self.assertIsNot(TaskPoller.get_instance(self.task_monitor),
+                         TaskPoller.get_instance(TaskMonitor(connection(self.host))))
+
+    @mock.patch.object(connection, 'get')
+    def test_idle_poller_should_not_keep_connection_alive(self, mock_get):
+        mock_get.return_value = {"members": [{"uri": "/rest/tasks/1", "taskState": "Completed", "name": "Delete"}]}
+        task_monitor = TaskMonitor(connection(self.host))
+        poller = TaskPoller.get_instance(task_monitor)
+        connection_ref = weakref.ref(task_monitor._connection)
+
+        task_monitor.submit({"uri": "/rest/tasks/1"}).result(timeout=5)
+        for _ in range(500):
+            if poller._thread is None:
+                break
+            time.sleep(0.01)
+        del task_monitor
+        gc.collect()
+
+        self.assertIsNone(connection_ref())
+        self.assertNotIn(poller, list(TaskPoller._instances.values()))
+
+    def test_submit_empty(self):
+        self.assertRaises(HPOneViewUnknownType, self.task_monitor.submit, None)
+
+
+class TaskPollingSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = TaskPollingScheduler(min_interval=1, max_interval=60, backoff_limit=10)
+
+    def test_next_interval_should_increase_without_estimate(self):
+        state = self.scheduler.start()
+
+        intervals = [self.scheduler.next_interval({"name": "Create"}, state) for _ in range(12)]
+
+        self.assertEqual(intervals, [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10])
+
+    @mock.patch('time.time')
+    def test_next_interval_should_use_progress_rate(self, mock_time):
+        mock_time.return_value = 1000
+        state = self.scheduler.start()
+        self.scheduler.next_interval({"computedPercentComplete": 10}, state)
+
+        mock_time.return_value = 1010
+        interval = self.scheduler.next_interval({"computedPercentComplete": 20}, state)
+
+        # 1% per second, 80 seconds remaining
+        self.assertEqual(interval, 40)
+
+    @mock.patch('time.time')
+    def test_next_interval_should_be_limited_to_max_interval(self, mock_time):
+        mock_time.return_value = 1000
+        state = self.scheduler.start()
+
+        interval = self.scheduler.next_interval({"expectedDuration": 3600}, state)
+
+        self.assertEqual(interval, 60)
+
+    @mock.patch('time.time')
+    def test_next_interval_should_be_limited_to_min_interval(self, mock_time):
+        mock_time.return_value = 1000
+        state = self.scheduler.start()
+
+        interval = self.scheduler.next_interval({"expectedDuration": 1}, state)
+
+        self.assertEqual(interval, 1)
+
+    @mock.patch('time.time')
+    def test_next_interval_should_use_history_of_the_task_type(self, mock_time):
+        mock_time.return_value = 1000
+        task = {"name": "Add", "associatedResource": {"resourceCategory": "server-hardware"}}
+        self.scheduler.record(dict(task, created="2017-05-01T10:00:00Z", modified="2017-05-01T10:02:00Z"),
+                              self.scheduler.start())
+
+        interval = self.scheduler.next_interval(task, self.scheduler.start())
+
+        self.assertEqual(interval, 60)
+        self.assertIsNone(self.scheduler.get_average_duration({"name": "Add"}))
+
+    @mock.patch('time.time')
+    def test_record_should_average_durations(self, mock_time):
+        mock_time.return_value = 1000
+        state = self.scheduler.start()
+        mock_time.return_value = 1010
+        self.scheduler.record({"name": "Add"}, state)
+        mock_time.return_value = 1020
+        self.scheduler.record({"name": "Add"}, state)
+
+        self.assertAlmostEqual(self.scheduler.get_average_duration({"name": "Add"}), 13)
+
+    @mock.patch('time.time')
+    def test_next_interval_should_back_off_when_task_is_late(self, mock_time):
+        mock_time.return_value = 1000
+        state = self.scheduler.start()
+        mock_time.return_value = 1100
+
+        interval = self.scheduler.next_interval({"expectedDuration": 30}, state)
+
+        self.assertEqual(interval, 1)
+
+
+class TaskFutureTest(unittest.TestCase):
+    def test_from_result(self):
+        future = TaskFuture.from_result({"name": "resource"})
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), {"name": "resource"})
+
+    def test_result_timeout(self):
+        future = TaskFuture({"uri": "/rest/tasks/1"})
+
+        self.assertRaises(HPOneViewTimeout, future.result, 0.01)
+
+    def test_cancel(self):
+        future = TaskFuture({"uri": "/rest/tasks/1"})
+
+        self.assertTrue(future.cancel())
+
+        self.assertTrue(future.cancelled())
+        self.assertTrue(future.done())
+        try:
+            future.result()
+        except HPOneViewCancelledError as e:
+            self.assertEqual(e.msg, MSG_CANCELLED)
+        else:
+            self.fail()
+
+    def test_cancel_when_done(self):
+        future = TaskFuture.from_result(True)
+
+        self.assertFalse(future.cancel())
+        self.assertFalse(future.cancelled())
+
+    def test_add_done_callback(self):
+        future = TaskFuture({"uri": "/rest/tasks/1"}, handler=lambda task: task['name'])
+        callback = mock.Mock()
+        future.add_done_callback(callback)
+
+        callback.assert_not_called()
+        future.set_completed_task({"name": "completed"})
+
+        callback.assert_called_once_with(future)
+        self.assertEqual(future.result(), "completed")
+
+    def test_add_done_callback_when_done(self):
+        future = TaskFuture.from_result(True)
+        callback = mock.Mock()
+
+        future.add_done_callback(callback)
+
+        callback.assert_called_once_with(future)
+
+    def test_set_completed_task_with_handler_error(self):
+        future = TaskFuture({"uri": "/rest/tasks/1"}, handler=mock.Mock(side_effect=HPOneViewTaskError(ERR_MSG)))
+
+        future.set_completed_task({"name": "completed"})
+
+        self.assertEqual(future.exception().msg, ERR_MSG)
+
+    @mock.patch('time.time')
+    def test_is_expired(self, mock_time):
+        mock_time.return_value = 100
+        future = TaskFuture({"uri": "/rest/tasks/1"}, timeout=10)
+        unlimited_future = TaskFuture({"uri": "/rest/tasks/1"})
+
+        mock_time.return_value = 111
+
+        self.assertTrue(future.is_expired())
+        self.assertFalse(unlimited_future.is_expired())
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import socket
+import unittest
+
+from http.client import BadStatusLine
+from mock import patch, Mock
+
+from hpOneView import circuit_breaker
+from hpOneView.circuit_breaker import CircuitBreaker, CircuitBreakers, CLOSED, OPEN, HALF_OPEN
+from hpOneView.exceptions import HPOneViewCircuitOpen, HPOneViewTimeout
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.on_state_change = Mock()
+        self.breaker = CircuitBreaker('172.16.102.59', failure_threshold=2, reset_timeout=30,
+                                      on_state_change=self.on_state_change)
+
+    def open_breaker(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+    def test_should_be_closed_by_default(self):
+        self.breaker.before_request()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_should_open_after_consecutive_failures(self):
+        self.open_breaker()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.on_state_change.assert_called_once_with('172.16.102.59', CLOSED, OPEN)
+
+    def test_success_should_reset_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    @patch.object(circuit_breaker.time, 'time')
+    def test_should_fail_fast_while_open(self, mock_time):
+        mock_time.return_value = 100.0
+        self.open_breaker()
+
+        mock_time.return_value = 129.0
+        self.assertRaises(HPOneViewCircuitOpen, self.breaker.before_request)
+        self.assertEqual(self.breaker.get_stats(), dict(state=OPEN, consecutive_failures=2, rejected=1))
+
+    @patch.object(circuit_breaker.time, 'time')
+    def test_should_let_single_probe_through_after_reset_timeout(self, mock_time):
+        mock_time.return_value = 100.0
+        self.open_breaker()
+
+        mock_time.return_value = 130.0
+        self.breaker.before_request()
+
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertRaises(HPOneViewCircuitOpen, self.breaker.before_request)
+        self.on_state_change.assert_called_with('172.16.102.59', OPEN, HALF_OPEN)
+
+    @patch.object(circuit_breaker.time, 'time')
+    def test_successful_probe_should_close(self, mock_time):
+        mock_time.return_value = 100.0
+        self.open_breaker()
+        mock_time.return_value = 130.0
+        self.breaker.before_request()
+
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.before_request()
+        self.on_state_change.assert_called_with('172.16.102.59', HALF_OPEN, CLOSED)
+
+    @patch.object(circuit_breaker.time, 'time')
+    def test_failed_probe_should_open_again(self, mock_time):
+        mock_time.return_value = 100.0
+        self.open_breaker()
+        mock_time.return_value = 130.0
+        self.breaker.before_request()
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertRaises(HPOneViewCircuitOpen, self.breaker.before_request)
+
+    @patch.object(circuit_breaker.time, 'time')
+    def test_ignored_probe_should_let_another_probe_through(self, mock_time):
+        mock_time.return_value = 100.0
+        self.open_breaker()
+        mock_time.return_value = 130.0
+        self.breaker.before_request()
+
+        self.breaker.record_ignored()
+
+        self.breaker.before_request()
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+    def test_failing_callback_should_not_break_requests(self):
+        self.on_state_change.side_effect = ValueError('callback error')
+
+        self.open_breaker()
+
+        self.assertEqual(self.breaker.state, OPEN)
+
+
+class CircuitBreakersTest(unittest.TestCase):
+    def setUp(self):
+        self.breakers = CircuitBreakers('172.16.102.59', failure_threshold=1,
+                                        prefixes=['/rest/firmware', '/rest/firmware-drivers'])
+
+    def test_get_should_return_breaker_of_longest_prefix(self):
+        self.assertEqual(self.breakers.get('/rest/firmware-drivers/1').name, '172.16.102.59/rest/firmware-drivers')
+        self.assertEqual(self.breakers.get('/rest/firmware-bundles').name, '172.16.102.59/rest/firmware')
+        self.assertEqual(self.breakers.get('/rest/enclosures').name, '172.16.102.59')
+
+    def test_record_connection_errors_as_failures(self):
+        for error in [BadStatusLine(''), socket.timeout('timed out'), socket.error(111, 'Connection refused')]:
+            breakers = CircuitBreakers('172.16.102.59', failure_threshold=1)
+
+            breakers.record('/rest/enclosures', error=error)
+
+            self.assertEqual(breakers.get('/rest/enclosures').state, OPEN)
+
+    def test_record_unavailable_status_as_failure(self):
+        self.breakers.record('/rest/enclosures', response=Mock(status=503))
+
+        self.assertEqual(self.breakers.get('/rest/enclosures').state, OPEN)
+
+    def test_record_other_status_as_success(self):
+        self.breakers.record('/rest/enclosures', response=Mock(status=404))
+
+        self.assertEqual(self.breakers.get('/rest/enclosures').state, CLOSED)
+
+    def test_record_should_ignore_deadline_errors(self):
+        self.breakers.record('/rest/enclosures', error=HPOneViewTimeout('Deadline exceeded'))
+
+        self.assertEqual(self.breakers.get_stats()['172.16.102.59'],
+                         dict(state=CLOSED, consecutive_failures=0, rejected=0))
+
+    def test_before_request_should_check_breaker_of_uri(self):
+        self.breakers.record('/rest/firmware-drivers', error=BadStatusLine(''))
+
+        self.assertRaises(HPOneViewCircuitOpen, self.breakers.before_request, '/rest/firmware-drivers/1')
+        self.breakers.before_request('/rest/enclosures')
@@ -20,18 +20,28 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 ###
+import errno
+import io
 import json
 import ssl
 import unittest
-import mmap
+import tempfile
+import threading
+import time
 import os
 import shutil
+import socket
 import os.path
 
 from mock import patch, call, Mock, ANY
-from http.client import HTTPSConnection, BadStatusLine
-from hpOneView.connection import connection
-from hpOneView.exceptions import HPOneViewException
+from http.client import HTTPSConnection, BadStatusLine, IncompleteRead
+from hpOneView.connection import connection, ConnectionPool
+from hpOneView.deadline import Deadline
+from hpOneView.exceptions import HPOneViewException, HPOneViewTimeout, HPOneViewCircuitOpen
+from hpOneView.json_codec import JsonCodec
+from hpOneView.response_cache import ResponseCache
+from hpOneView.retry import RetryPolicy
+from hpOneView.session_cache import SessionCache
 
 
 class ConnectionTest(unittest.TestCase):
@@ -61,8 +71,14 @@ class ConnectionTest(unittest.TestCase):
         self.request_body = {"request body": "content"}
         self.response_body = {"response body": "content",
                               "message": "An error occurred."}
-        self.dumped_request_body = json.dumps(self.request_body.copy())
+        self.dumped_request_body = self.connection.get_json_codec().dumps(self.request_body.copy())
+        self.dumped_empty_body = self.connection.get_json_codec().dumps({})
         self.expected_response_body = self.response_body.copy()
+        self.multipart_preamble = (b'------------ThIs_Is_tHe_bouNdaRY_$\r\n'
+                                   b'Content-Disposition: form-data; name="file"; filename="archive.zip"\r\n'
+                                   b'Content-Type: application/octet-stream\r\n'
+                                   b'\r\n')
+        self.multipart_epilogue = b'\r\n------------ThIs_Is_tHe_bouNdaRY_$--\r\n\r\n'
 
     def __make_http_response(self, status):
         mock_response = Mock(status=status)
@@ -71,29 +87,27 @@ class ConnectionTest(unittest.TestCase):
             mock_response.getheader.return_value = '/task/uri'
         return mock_response
 
-    def __create_fake_mapped_file(self):
-        mock_mapped_file = Mock()
-        mock_mapped_file.tell.side_effect = [0, 1048576, 2097152, 2621440]  # 0, 1MB, 2MB 2.5MB
-        mock_mapped_file.size.return_value = 2621440  # 2.5MB
-        mock_mapped_file.read.side_effect = ['data chunck 1', 'data chunck 2', 'data chunck 3']
-        return mock_mapped_file
+    def __create_fake_file(self):
+        mock_file = Mock()
+        mock_file.name = '/a/path/filename.zip'
+        mock_file.read.side_effect = [b'1' * 1048576, b'2' * 1048576, b'3' * 524288]  # 1MB, 1MB, 0.5MB
+        return mock_file
 
     def __prepare_connection_to_post_multipart(self, response_status=200):
         fake_connection = Mock()
         fake_connection.getresponse.return_value.read.return_value = json.dumps(self.response_body).encode('utf-8')
         fake_connection.getresponse.return_value.status = response_status
+        # Without a socket, the file is sent with conn.send
+        fake_connection.sock = None
 
         self.connection.get_connection = Mock()
         self.connection.get_connection.return_value = fake_connection
 
         self.connection._open = Mock()
+        self.connection._open.return_value = self.__create_fake_file()
 
         self.connection._headers['auth'] = 'LTIxNjUzMjc0OTUzzHoF7eEkZLEUWVA-fuOZP4VGA3U8e67E'
 
-        encode_multipart = "multipart/form-data; boundary=----------ThIs_Is_tHe_bouNdaRY_$"
-        self.connection.encode_multipart_formdata = Mock()
-        self.connection.encode_multipart_formdata.return_value = encode_multipart
-
     def test_default_headers(self):
         self.assertEqual(self.default_headers, self.connection._headers)
 
@@ -405,7 +419,7 @@ class ConnectionTest(unittest.TestCase):
 
         self.connection.delete('/path')
 
-        mock_request.assert_called_once_with('DELETE', '/path', json.dumps({}), self.default_headers)
+        mock_request.assert_called_once_with('DELETE', '/path', self.dumped_empty_body, self.default_headers)
 
     @patch.object(HTTPSConnection, 'request')
     @patch.object(HTTPSConnection, 'getresponse')
@@ -415,7 +429,7 @@ class ConnectionTest(unittest.TestCase):
 
         self.connection.delete('/path')
 
-        expected_calls = [call('DELETE', '/path', json.dumps({}), self.default_headers),
+        expected_calls = [call('DELETE', '/path', self.dumped_empty_body, self.default_headers),
                           call('GET', '/task/uri', '', self.default_headers)]
         self.assertEqual(expected_calls, mock_request.call_args_list)
 
@@ -604,13 +618,146 @@ class ConnectionTest(unittest.TestCase):
         else:
             self.fail()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
+    def __make_download_server(self, content, accept_ranges=True, truncate=None):
+        """
+        Makes a get_connection side effect serving the content. The first len(truncate) responses are cut at the
+        given number of bytes.
+        """
+        requests = []
+        truncate = list(truncate or [])
+
+        def get_connection():
+            conn = Mock()
+
+            def request(method, path, body, headers):
+                requests.append(headers.copy())
+                response_headers = {}
+                range_header = headers.get('Range') if accept_ranges else None
+                if range_header:
+                    first, last = range_header[len('bytes='):].split('-')
+                    first = int(first)
+                    last = min(int(last), len(content) - 1) if last else len(content) - 1
+                    data = content[first:last + 1]
+                    response_headers['Content-Range'] = 'bytes %d-%d/%d' % (first, last, len(content))
+                    conn.getresponse.return_value.status = 206
+                else:
+                    data = content
+                    conn.getresponse.return_value.status = 200
+                response_headers['Content-Length'] = str(len(data))
+                if accept_ranges:
+                    response_headers['Accept-Ranges'] = 'bytes'
+                if truncate:
+                    data = data[:truncate.pop(0)]
+
+                response = conn.getresponse.return_value
+                response.will_close = True
+                response.read.side_effect = io.BytesIO(data).read
+                response.getheader.side_effect = lambda name, default=None: response_headers.get(name, default)
+
+            conn.request.side_effect = request
+            return conn
+
+        return get_connection, requests
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_resume_from_last_byte(self, mock_get_conn, mock_sleep):
+        content = b'0123456789' * 5
+        mock_get_conn.side_effect, requests = self.__make_download_server(content, truncate=[12])
+        stream = io.BytesIO()
+
+        result = self.connection.download_to_stream(stream, '/rest/download.zip')
+
+        self.assertTrue(result)
+        self.assertEqual(stream.getvalue(), content)
+        self.assertNotIn('Range', requests[0])
+        self.assertEqual(requests[1]['Range'], 'bytes=12-49')
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_raise_when_retries_are_exhausted(self, mock_get_conn, mock_sleep):
+        content = b'0123456789' * 5
+        mock_get_conn.side_effect, requests = self.__make_download_server(content, truncate=[10, 0, 0, 0])
+
+        self.assertRaises(IncompleteRead, self.connection.download_to_stream, io.BytesIO(), '/rest/download.zip')
+        self.assertEqual(len(requests), 4)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_raise_when_range_is_not_honored(self, mock_get_conn, mock_sleep):
+        content = b'0123456789' * 5
+        get_connection, requests = self.__make_download_server(content, truncate=[10])
+
+        def get_connection_ignoring_ranges():
+            conn = get_connection()
+            request = conn.request.side_effect
+            conn.request.side_effect = lambda method, path, body, headers: request(
+                method, path, body, dict((k, v) for k, v in headers.items() if k != 'Range'))
+            return conn
+
+        mock_get_conn.side_effect = get_connection_ignoring_ranges
+
+        try:
+            self.connection.download_to_stream(io.BytesIO(), '/rest/download.zip')
+        except HPOneViewException as e:
+            self.assertEqual(e.msg, 'The appliance did not honor the range starting at byte 10 of /rest/download.zip')
+        else:
+            self.fail()
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_not_resume_without_accept_ranges(self, mock_get_conn, mock_sleep):
+        content = b'0123456789' * 5
+        mock_get_conn.side_effect, requests = self.__make_download_server(content, accept_ranges=False, truncate=[12])
+        stream = io.BytesIO()
+
+        self.connection.download_to_stream(stream, '/rest/download.zip')
+
+        self.assertEqual(stream.getvalue(), content[:12])
+        self.assertEqual(len(requests), 1)
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_fetch_segments_in_parallel(self, mock_get_conn, mock_sleep):
+        content = b'0123456789' * 5 + b'end'
+        mock_get_conn.side_effect, requests = self.__make_download_server(content, truncate=[10])
+        self.connection.set_download_options(max_workers=3, segment_size=16)
+        stream = io.BytesIO()
+        stream.write(b'head')
+
+        result = self.connection.download_to_stream(stream, '/rest/download.zip')
+
+        self.assertTrue(result)
+        self.assertEqual(stream.getvalue(), b'head' + content)
+        self.assertEqual(stream.tell(), len(b'head' + content))
+        self.assertEqual(sorted(r['Range'] for r in requests),
+                         ['bytes=0-15', 'bytes=10-15', 'bytes=16-31', 'bytes=32-47', 'bytes=48-52'])
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_use_single_stream_when_ranges_are_not_supported(self, mock_get_conn,
+                                                                                       mock_sleep):
+        content = b'0123456789' * 5
+        mock_get_conn.side_effect, requests = self.__make_download_server(content, accept_ranges=False)
+        self.connection.set_download_options(max_workers=3, segment_size=16)
+        stream = io.BytesIO()
+
+        self.connection.download_to_stream(stream, '/rest/download.zip')
+
+        self.assertEqual(stream.getvalue(), content)
+        self.assertEqual(len(requests), 1)
+
+    def test_set_download_options(self):
+        self.connection.set_download_options(max_workers=4, segment_size=1024, max_retries=5)
+
+        self.assertEqual(self.connection._download_workers, 4)
+        self.assertEqual(self.connection._download_segment_size, 1024)
+        self.assertEqual(self.connection._download_max_retries, 5)
+
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_put_request(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_put_request(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
@@ -620,13 +767,9 @@ class ConnectionTest(unittest.TestCase):
         internal_conn = self.connection.get_connection.return_value
         internal_conn.putrequest.assert_called_once_with('POST', '/rest/resources/')
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_put_headers(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_put_headers(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
         mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
@@ -638,39 +781,35 @@ class ConnectionTest(unittest.TestCase):
             call('uploadfilename', 'archive.zip'),
             call('auth', 'LTIxNjUzMjc0OTUzzHoF7eEkZLEUWVA-fuOZP4VGA3U8e67E'),
             call('Content-Type', 'multipart/form-data; boundary=----------ThIs_Is_tHe_bouNdaRY_$'),
-            call('Content-Length', 2621440),
+            call('Content-Length', 2621440 + len(self.multipart_preamble) + len(self.multipart_epilogue)),
             call('X-API-Version', 300)]
 
         internal_conn = self.connection.get_connection.return_value
         internal_conn.putheader.assert_has_calls(expected_putheader_calls)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_read_file_in_chunks_of_1mb(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_read_file_in_chunks_of_1mb(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        expected_mmap_read_calls = [
+        expected_read_calls = [
             call(1048576),
             call(1048576),
-            call(1048576)]
+            call(524288)]
 
-        mock_mmap.return_value.read.assert_has_calls(expected_mmap_read_calls)
+        self.connection._open.assert_called_once_with('/a/path/filename.zip', 'rb')
+        self.connection._open.return_value.read.assert_has_calls(expected_read_calls)
+        self.connection._open.return_value.close.assert_called_once_with()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_send_file_in_chuncks_of_1mb(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_send_envelope_and_file_in_chuncks_of_1mb(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
@@ -678,36 +817,119 @@ class ConnectionTest(unittest.TestCase):
                                        baseName="archive.zip")
 
         expected_conn_send_calls = [
-            call('data chunck 1'),
-            call('data chunck 2'),
-            call('data chunck 3')]
+            call(self.multipart_preamble),
+            call(b'1' * 1048576),
+            call(b'2' * 1048576),
+            call(b'3' * 524288),
+            call(self.multipart_epilogue)]
 
         internal_conn = self.connection.get_connection.return_value
-        internal_conn.send.assert_has_calls(expected_conn_send_calls)
+        self.assertEqual(internal_conn.send.call_args_list, expected_conn_send_calls)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_remove_temp_encoded_file(self, mock_rm, mock_path_size, mock_copy, mock_mmap):
+    def test_post_multipart_should_use_sendfile_when_socket_supports_it(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
+        internal_conn = self.connection.get_connection.return_value
+        internal_conn.sock = Mock()
+        internal_conn.sock.sendfile.side_effect = lambda file, offset, count: count
 
         self.connection.post_multipart(uri='/rest/resources/',
                                        fields=None,
                                        files="/a/path/filename.zip",
                                        baseName="archive.zip")
 
-        mock_rm.assert_called_once_with('/a/path/filename.zip.b64')
+        fake_file = self.connection._open.return_value
+        self.assertEqual(internal_conn.sock.sendfile.call_args_list, [
+            call(fake_file, 0, 1048576),
+            call(fake_file, 1048576, 1048576),
+            call(fake_file, 2097152, 524288)])
+        self.assertEqual(internal_conn.send.call_args_list, [call(self.multipart_preamble),
+                                                             call(self.multipart_epilogue)])
+        fake_file.read.assert_not_called()
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_report_progress(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        mock_path_size.return_value = 2621440  # 2.5 MB
+        progress_callback = Mock()
+
+        self.connection.post_multipart(uri='/rest/resources/',
+                                       fields=None,
+                                       files="/a/path/filename.zip",
+                                       baseName="archive.zip",
+                                       progress_callback=progress_callback)
+
+        preamble_size = len(self.multipart_preamble)
+        total_size = preamble_size + 2621440 + len(self.multipart_epilogue)
+        self.assertEqual(progress_callback.call_args_list, [
+            call(preamble_size, total_size),
+            call(preamble_size + 1048576, total_size),
+            call(preamble_size + 2097152, total_size),
+            call(preamble_size + 2621440, total_size),
+            call(total_size, total_size)])
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_call_request_hooks(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        mock_path_size.return_value = 2621440  # 2.5 MB
+        post_request = Mock()
+        self.connection.add_request_hooks(post_request=post_request)
+
+        self.connection.post_multipart(uri='/rest/resources/',
+                                       fields=None,
+                                       files="/a/path/filename.zip",
+                                       baseName="archive.zip")
+
+        metrics = post_request.call_args[0][0]
+        self.assertEqual(metrics.method, 'POST')
+        self.assertEqual(metrics.status, 200)
+        self.assertEqual(metrics.bytes_sent, len(self.multipart_preamble) + 2621440 + len(self.multipart_epilogue))
+        self.assertEqual(metrics.bytes_received, len(json.dumps(self.response_body)))
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_raise_exception_when_file_is_truncated(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        mock_path_size.return_value = 3145728  # 3 MB
+        self.connection._open.return_value.read.side_effect = [b'1' * 1048576, b'']
+
+        self.assertRaises(HPOneViewException, self.connection.post_multipart, uri='/rest/resources/', fields=None,
+                          files="/a/path/filename.zip", baseName="archive.zip")
+
+        self.connection.get_connection.return_value.close.assert_called_once_with()
+        self.connection._open.return_value.close.assert_called_once_with()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
     @patch.object(os, 'remove')
-    def test_post_multipart_should_raise_exception_when_response_status_400(self, mock_rm, mock_path_size, mock_copy,
-                                                                            mock_mmap):
+    def test_post_multipart_should_not_create_temp_encoded_file(self, mock_rm, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        mock_path_size.return_value = 2621440  # 2.5 MB
+
+        self.connection.post_multipart(uri='/rest/resources/',
+                                       fields=None,
+                                       files="/a/path/filename.zip",
+                                       baseName="archive.zip")
+
+        self.connection._open.assert_called_once_with('/a/path/filename.zip', 'rb')
+        mock_rm.assert_not_called()
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_return_text_body_when_response_is_not_json(self, mock_path_size):
+        self.__prepare_connection_to_post_multipart()
+        response = self.connection.get_connection.return_value.getresponse.return_value
+        response.read.side_effect = [b'Upload accepted', b'']
+        mock_path_size.return_value = 2621440  # 2.5 MB
+
+        _, body = self.connection.post_multipart(uri='/rest/resources/', fields=None, files="/a/path/filename.zip",
+                                                 baseName="archive.zip")
+
+        self.assertEqual(body, 'Upload accepted')
+        response.read.assert_called_once_with()
+
+    @patch.object(os.path, 'getsize')
+    def test_post_multipart_should_raise_exception_when_response_status_400(self, mock_path_size):
         self.__prepare_connection_to_post_multipart(response_status=400)
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         try:
             self.connection.post_multipart(uri='/rest/resources/',
@@ -719,14 +941,10 @@ class ConnectionTest(unittest.TestCase):
         else:
             self.fail()
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
-    def test_post_multipart_should_return_response_and_body_when_response_status_200(self, mock_rm, mock_path_size,
-                                                                                     mock_copy, mock_mmap):
+    def test_post_multipart_should_return_response_and_body_when_response_status_200(self, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
 
         response, body = self.connection.post_multipart(uri='/rest/resources/',
                                                         fields=None,
@@ -736,15 +954,11 @@ class ConnectionTest(unittest.TestCase):
         self.assertEqual(body, self.expected_response_body)
         self.assertEqual(response.status, 200)
 
-    @patch.object(mmap, 'mmap')
-    @patch.object(shutil, 'copyfileobj')
     @patch.object(os.path, 'getsize')
-    @patch.object(os, 'remove')
     @patch.object(json, 'loads')
-    def test_post_multipart_should_handle_json_load_exception(self, mock_json_loads, mock_rm, mock_path_size, mock_copy,
-                                                              mock_mmap):
+    def test_post_multipart_should_handle_json_load_exception(self, mock_json_loads, mock_path_size):
         self.__prepare_connection_to_post_multipart()
-        mock_mmap.return_value = self.__create_fake_mapped_file()
+        mock_path_size.return_value = 2621440  # 2.5 MB
         mock_json_loads.side_effect = ValueError("Invalid JSON")
 
         response, body = self.connection.post_multipart(uri='/rest/resources/',
@@ -755,6 +969,24 @@ class ConnectionTest(unittest.TestCase):
         self.assertTrue(body)
         self.assertEqual(response.status, 200)
 
+    def test_post_multipart_should_stream_file_content(self):
+        fake_connection = Mock()
+        fake_connection.sock = None
+        fake_connection.getresponse.return_value = self.__make_http_response(200)
+        self.connection.get_connection = Mock(return_value=fake_connection)
+        self.connection._headers['auth'] = 'session'
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        file_path = os.path.join(temp_dir, 'archive.zip')
+        with open(file_path, 'wb') as file:
+            file.write(b'file content')
+
+        self.connection.post_multipart('/rest/resources/', None, file_path, 'archive.zip')
+
+        sent = b''.join(c[0][0] for c in fake_connection.send.call_args_list)
+        self.assertEqual(sent, self.multipart_preamble + b'file content' + self.multipart_epilogue)
+        self.assertEqual(os.listdir(temp_dir), ['archive.zip'])
+
     @patch.object(connection, 'post_multipart')
     def test_post_multipart_with_response_handling_when_status_202_without_task(self, mock_post_multipart):
         mock_response = Mock(status=202)
@@ -847,17 +1079,344 @@ class ConnectionTest(unittest.TestCase):
         mock_response.status = 200
 
         with patch('time.sleep'):
-            resp, body = self.connection.do_http('POST', '/rest/test', 'body')
+            resp, body = self.connection.do_http('GET', '/rest/test', '')
 
         self.assertEqual(body, 'response data')
 
-        mock_conn.request.assert_called_with('POST', '/rest/test', 'body',
+        mock_conn.request.assert_called_with('GET', '/rest/test', '',
                                              {'Content-Type': 'application/json',
                                               'X-API-Version': 300,
                                               'Accept': 'application/json'})
 
         mock_conn.close.assert_has_calls([call(), call()])
 
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_retry_unsafe_method_with_bad_status_line(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        mock_conn.getresponse.side_effect = [BadStatusLine(0), Mock()]
+
+        with patch('time.sleep') as mock_sleep:
+            self.assertRaises(BadStatusLine, self.connection.do_http, 'POST', '/rest/test', 'body')
+
+        mock_sleep.assert_not_called()
+        self.assertEqual(mock_conn.request.call_count, 1)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_retry_too_many_requests_after_the_requested_wait(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value = Mock()
+        busy_response = Mock(status=429)
+        busy_response.read.return_value = b''
+        busy_response.getheader.side_effect = lambda name, default=None: {'Retry-After': '7'}.get(name, default)
+        mock_response = Mock(status=200)
+        mock_response.read.return_value = b'{"name": "resource"}'
+        mock_conn.getresponse.side_effect = [busy_response, mock_response]
+
+        with patch('time.sleep') as mock_sleep:
+            resp, body = self.connection.do_http('POST', '/rest/test', 'body')
+
+        self.assertEqual(body, {'name': 'resource'})
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_set_retry_policy(self):
+        retry_policy = RetryPolicy(max_attempts=1)
+
+        self.connection.set_retry_policy(retry_policy)
+
+        self.assertIs(self.connection.get_retry_policy(), retry_policy)
+
+    @patch.object(connection, 'get_connection')
+    def test_get_collection_stream_should_yield_members_and_release_connection(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        mock_conn.getresponse.return_value.read.side_effect = io.BytesIO(
+            b'{"members": [{"id": 1}, {"id": 2}], "nextPageUri": null, "total": 2}').read
+
+        page = self.connection.get_collection_stream('/rest/alerts')
+
+        self.assertEqual(list(page), [{'id': 1}, {'id': 2}])
+        self.assertEqual(page.fields, {'nextPageUri': None, 'total': 2})
+        self.assertEqual(len(self.connection._connection_pool), 1)
+        mock_conn.close.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_get_collection_stream_should_close_connection_when_closed_early(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        mock_conn.getresponse.return_value.read.side_effect = io.BytesIO(
+            b'{"members": [{"id": 1}, {"id": 2}], "nextPageUri": null}').read
+
+        with self.connection.get_collection_stream('/rest/alerts') as page:
+            next(iter(page))
+
+        self.assertEqual(len(self.connection._connection_pool), 0)
+        mock_conn.close.assert_called_once_with()
+
+    @patch.object(connection, 'get_connection')
+    def test_get_collection_stream_should_raise_exception_when_status_is_error(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=404, will_close=False)
+        mock_conn.getresponse.return_value.read.return_value = b'{"errorCode": "RESOURCE_NOT_FOUND"}'
+
+        try:
+            self.connection.get_collection_stream('/rest/alerts')
+        except HPOneViewException as e:
+            self.assertEqual(e.oneview_response, {'errorCode': 'RESOURCE_NOT_FOUND'})
+        else:
+            self.fail('Expected exception was not raised')
+
+    @patch.object(connection, 'get_connection')
+    def test_get_collection_stream_should_record_metrics(self, mock_get_connection):
+        body = b'{"members": [{"id": 1}], "nextPageUri": null}'
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.side_effect = io.BytesIO(body).read
+        post_request = Mock()
+        self.connection.add_request_hooks(post_request=post_request)
+
+        list(self.connection.get_collection_stream('/rest/alerts'))
+
+        metrics = post_request.call_args[0][0]
+        self.assertEqual(metrics.status, 200)
+        self.assertEqual(metrics.bytes_received, len(body))
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_acquire_and_release_request_limits(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.set_request_limits([{'prefix': '/rest/server-profiles', 'methods': ['POST'],
+                                             'max_in_flight': 1}])
+        throttle = self.connection.get_request_throttle()
+
+        self.connection.do_http('POST', '/rest/server-profiles', '{}')
+
+        self.assertEqual(throttle.get_stats()['POST /rest/server-profiles']['requests'], 1)
+        self.assertEqual(throttle.get_stats()['POST /rest/server-profiles']['in_flight'], 0)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_release_request_limits_when_request_fails(self, mock_get_connection):
+        mock_get_connection.return_value.request.side_effect = HPOneViewException('error')
+        self.connection.set_request_limits([{'max_in_flight': 1}])
+
+        self.assertRaises(HPOneViewException, self.connection.do_http, 'POST', '/rest/server-profiles', '{}')
+
+        self.assertEqual(self.connection.get_request_throttle().get_stats()['* /']['in_flight'], 0)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_record_queue_time(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.set_request_limits([{'max_in_flight': 4}])
+        collector = self.connection.enable_metrics()
+
+        self.connection.do_http('GET', '/rest/enclosures', '')
+
+        self.assertEqual(collector.to_dict()['requests']['GET /rest/enclosures']['queue_time']['count'], 1)
+
+    @patch.object(connection, 'get_connection')
+    def test_get_collection_stream_should_release_request_limits_when_headers_are_received(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        mock_conn.getresponse.return_value.read.side_effect = io.BytesIO(b'{"members": [{"id": 1}]}').read
+        self.connection.set_request_limits([{'max_in_flight': 1}])
+        throttle = self.connection.get_request_throttle()
+
+        page = self.connection.get_collection_stream('/rest/alerts')
+
+        self.assertEqual(throttle.get_stats()['* /']['in_flight'], 0)
+        self.assertEqual(list(page), [{'id': 1}])
+
+    @patch.object(connection, 'get_connection')
+    def test_get_collection_stream_should_allow_requests_while_iterating(self, mock_get_connection):
+        stream_response = Mock(status=200, will_close=True)
+        stream_response.read.side_effect = io.BytesIO(b'{"members": [{"id": 1}, {"id": 2}]}').read
+        member_response = Mock(status=200, will_close=True)
+        member_response.read.return_value = b'{}'
+        mock_get_connection.return_value.getresponse.side_effect = [stream_response, member_response, member_response]
+        self.connection.set_request_limits([{'max_in_flight': 1}])
+
+        with Deadline(1):
+            for member in self.connection.get_collection_stream('/rest/alerts'):
+                self.connection.do_http('GET', '/rest/alerts/%d' % member['id'], '')
+
+        self.assertEqual(self.connection.get_request_throttle().get_stats()['* /']['requests'], 3)
+
+    @patch.object(connection, 'get_connection')
+    def test_request_limits_should_apply_without_request_hooks(self, mock_get_connection):
+        mock_get_connection.return_value.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_get_connection.return_value.getresponse.return_value.read.return_value = b'{}'
+        self.connection.set_request_limits([{'max_in_flight': 1}])
+        self.connection.disable_metrics()
+
+        self.connection.do_http('GET', '/rest/enclosures', '')
+
+        self.assertEqual(self.connection.get_request_throttle().get_stats()['* /']['requests'], 1)
+
+    def test_set_request_limits_should_remove_limits(self):
+        self.connection.set_request_limits([{'max_in_flight': 1}])
+
+        self.connection.set_request_limits(None)
+
+        self.assertIsNone(self.connection.get_request_throttle())
+
+    def test_circuit_breaker_should_be_disabled_by_default(self):
+        self.assertIsNone(self.connection.get_circuit_breakers())
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_fail_fast_when_circuit_breaker_opens(self, mock_get_connection):
+        mock_get_connection.return_value.getresponse.side_effect = BadStatusLine('')
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+        self.connection.set_circuit_breaker(failure_threshold=2)
+
+        for _ in range(2):
+            self.assertRaises(BadStatusLine, self.connection.do_http, 'GET', '/rest/enclosures', '')
+        self.assertRaises(HPOneViewCircuitOpen, self.connection.do_http, 'GET', '/rest/enclosures', '')
+
+        self.assertEqual(mock_get_connection.return_value.request.call_count, 2)
+        self.assertEqual(self.connection.get_circuit_breakers().get_stats()[self.host]['state'], 'open')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_count_unavailable_status_as_circuit_breaker_failure(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=503, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        mock_conn.getresponse.return_value.getheader.return_value = None
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+        self.connection.set_circuit_breaker(failure_threshold=1)
+
+        self.connection.do_http('GET', '/rest/enclosures', '')
+
+        self.assertRaises(HPOneViewCircuitOpen, self.connection.do_http, 'GET', '/rest/enclosures', '')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_count_client_error_as_circuit_breaker_failure(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=404, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.set_circuit_breaker(failure_threshold=1)
+
+        for _ in range(2):
+            self.connection.do_http('GET', '/rest/enclosures/1', '')
+
+        self.assertEqual(self.connection.get_circuit_breakers().get_stats()[self.host]['state'], 'closed')
+
+    @patch.object(connection, 'get_connection')
+    def test_circuit_breaker_should_release_request_limits_when_open(self, mock_get_connection):
+        mock_get_connection.return_value.getresponse.side_effect = BadStatusLine('')
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+        self.connection.set_request_limits([{'max_in_flight': 1}])
+        self.connection.set_circuit_breaker(failure_threshold=1)
+        self.assertRaises(BadStatusLine, self.connection.do_http, 'GET', '/rest/enclosures', '')
+
+        self.assertRaises(HPOneViewCircuitOpen, self.connection.do_http, 'GET', '/rest/enclosures', '')
+
+        self.assertEqual(self.connection.get_request_throttle().get_stats()['* /']['in_flight'], 0)
+
+    @patch.object(connection, 'get_connection')
+    def test_circuit_breaker_of_prefix_should_not_open_breaker_of_host(self, mock_get_connection):
+        mock_get_connection.return_value.getresponse.side_effect = BadStatusLine('')
+        self.connection.set_retry_policy(RetryPolicy(max_attempts=1))
+        self.connection.set_circuit_breaker(failure_threshold=1, prefixes=['/rest/firmware-drivers'])
+
+        self.assertRaises(BadStatusLine, self.connection.do_http, 'GET', '/rest/firmware-drivers', '')
+
+        stats = self.connection.get_circuit_breakers().get_stats()
+        self.assertEqual(stats[self.host + '/rest/firmware-drivers']['state'], 'open')
+        self.assertEqual(stats[self.host]['state'], 'closed')
+
+    def test_set_circuit_breaker_should_disable_breaker(self):
+        self.connection.set_circuit_breaker()
+
+        self.connection.set_circuit_breaker(enabled=False)
+
+        self.assertIsNone(self.connection.get_circuit_breakers())
+
+    def test_request_coalescing_should_be_disabled_by_default(self):
+        self.assertIsNone(self.connection.get_request_coalescer())
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_coalesce_identical_concurrent_requests(self, mock_do_http):
+        started = threading.Event()
+        release = threading.Event()
+
+        def do_http(method, path, body):
+            started.set()
+            release.wait(5)
+            return Mock(status=200), {'name': 'enclosure group'}
+
+        mock_do_http.side_effect = do_http
+        collector = self.connection.enable_metrics()
+        self.connection.set_request_coalescing()
+        results = []
+
+        def get():
+            results.append(self.connection.get('/rest/enclosure-groups/1'))
+
+        threads = [threading.Thread(target=get) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        for _ in range(500):
+            if self.connection.get_request_coalescer().get_stats()['coalesced'] == 2:
+                break
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [{'name': 'enclosure group'}] * 3)
+        mock_do_http.assert_called_once_with('GET', '/rest/enclosure-groups/1', '')
+        self.assertEqual(collector.to_dict()['coalesced_requests'], {'GET /rest/enclosure-groups/{id}': 2})
+
+    def test_set_request_coalescing_should_disable_coalescing(self):
+        self.connection.set_request_coalescing()
+
+        self.connection.set_request_coalescing(False)
+
+        self.assertIsNone(self.connection.get_request_coalescer())
+
+    def test_set_json_codec(self):
+        json_codec = JsonCodec()
+
+        self.connection.set_json_codec(json_codec)
+
+        self.assertIs(self.connection.get_json_codec(), json_codec)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_decode_body_with_json_codec(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{"name": "resource"}'
+        json_codec = Mock(wraps=JsonCodec())
+        self.connection.set_json_codec(json_codec)
+
+        _, body = self.connection.do_http('GET', '/rest/test', None)
+
+        self.assertEqual(body, {'name': 'resource'})
+        json_codec.loads.assert_called_once_with(b'{"name": "resource"}')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_return_binary_body(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'\xff\xfe'
+
+        _, body = self.connection.do_http('GET', '/rest/test', None)
+
+        self.assertEqual(body, b'\xff\xfe')
+
+    @patch.object(connection, 'do_http')
+    def test_post_should_encode_body_with_json_codec(self, mock_do_http):
+        mock_do_http.return_value = Mock(status=200), {}
+        self.connection.set_json_codec(JsonCodec())
+
+        self.connection.post('/path', self.request_body)
+
+        mock_do_http.assert_called_once_with(method='POST', path='/path', body=json.dumps(self.request_body),
+                                             custom_headers=None)
+
     @patch.object(connection, 'get')
     @patch.object(connection, 'post')
     def test_login(self, mock_post, mock_get):
@@ -877,6 +1436,95 @@ class ConnectionTest(unittest.TestCase):
 
         self.assertRaises(HPOneViewException, self.connection.login, {})
 
+    @patch.object(connection, 'get')
+    @patch.object(connection, 'post')
+    def test_login_should_store_session_in_session_cache(self, mock_post, mock_get):
+        mock_get.side_effect = [{'minimumVersion': 300, 'currentVersion': 400}]
+        mock_post.return_value = {'cat': 'task'}, {'sessionID': '123'}
+        session_cache = Mock(spec=SessionCache)
+        session_cache.get.return_value = None
+        self.connection.set_session_cache(session_cache)
+
+        self.connection.login({'userName': 'administrator'})
+
+        session_cache.put.assert_called_once_with(self.host, 300, {'userName': 'administrator'}, '123')
+
+    @patch.object(connection, 'do_http')
+    @patch.object(connection, 'post')
+    def test_login_should_resume_cached_session(self, mock_post, mock_do_http):
+        mock_do_http.return_value = Mock(status=200), {'sessionID': '123'}
+        session_cache = Mock(spec=SessionCache)
+        session_cache.get.return_value = '123'
+        self.connection.set_session_cache(session_cache)
+
+        self.connection.login({'userName': 'administrator'})
+
+        mock_do_http.assert_called_once_with('GET', '/rest/sessions', '')
+        mock_post.assert_not_called()
+        self.assertEqual(self.connection.get_session_id(), '123')
+        self.assertEqual(self.connection.get_session(), True)
+        session_cache.put.assert_called_once_with(self.host, 300, {'userName': 'administrator'}, '123')
+
+    @patch.object(connection, 'get')
+    @patch.object(connection, 'do_http')
+    @patch.object(connection, 'post')
+    def test_login_should_create_session_when_cached_session_is_invalid(self, mock_post, mock_do_http, mock_get):
+        mock_do_http.return_value = Mock(status=401), {'errorCode': 'AUTHORIZATION'}
+        mock_get.side_effect = [{'minimumVersion': 300, 'currentVersion': 400}]
+        mock_post.return_value = {'cat': 'task'}, {'sessionID': '456'}
+        session_cache = Mock(spec=SessionCache)
+        session_cache.get.return_value = '123'
+        self.connection.set_session_cache(session_cache)
+
+        self.connection.login({'userName': 'administrator'})
+
+        session_cache.remove.assert_called_once_with(self.host, 300, {'userName': 'administrator'})
+        self.assertEqual(self.connection.get_session_id(), '456')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_login_again_when_session_expired(self, mock_get_connection):
+        unauthorized = Mock(status=401, will_close=True)
+        unauthorized.read.return_value = b'{"errorCode": "AUTHORIZATION"}'
+        login = Mock(status=200, will_close=True)
+        login.read.return_value = b'{"sessionID": "456"}'
+        ok = Mock(status=200, will_close=True)
+        ok.read.return_value = b'{"name": "enclosure"}'
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.side_effect = [unauthorized, login, ok]
+        self.connection.set_session_cache(Mock(spec=SessionCache))
+        self.connection._cred = {'userName': 'administrator'}
+        self.connection.set_session_id('123')
+
+        resp, body = self.connection.do_http('GET', '/rest/enclosures/1', '')
+
+        self.assertEqual(body, {'name': 'enclosure'})
+        self.assertEqual(self.connection.get_session_id(), '456')
+        self.assertEqual(mock_conn.request.call_args_list[2][0][3]['auth'], '456')
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_not_login_again_without_session_cache(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=401, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection._cred = {'userName': 'administrator'}
+        self.connection.set_session_id('123')
+
+        resp, body = self.connection.do_http('GET', '/rest/enclosures/1', '')
+
+        self.assertEqual(resp.status, 401)
+        self.assertEqual(mock_conn.request.call_count, 1)
+
+    @patch.object(connection, 'delete')
+    def test_logout_should_remove_session_from_session_cache(self, mock_delete):
+        session_cache = Mock(spec=SessionCache)
+        self.connection.set_session_cache(session_cache)
+        self.connection._cred = {'userName': 'administrator'}
+        self.connection.set_session_id('123')
+
+        self.connection.logout()
+
+        session_cache.remove.assert_called_once_with(self.host, 300, {'userName': 'administrator'})
+
     @patch.object(connection, 'get')
     def test_validate_version_exceeding_minimum(self, mock_get):
         self.connection._apiVersion = 300
@@ -905,14 +1553,14 @@ class ConnectionTest(unittest.TestCase):
                                     call('/a/path/filename.zip.b64', 'wb')])
 
         mock_out.write.assert_has_calls(
-            [call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n')),
-             call(bytearray(
-                 b'Content-Disposition: form-data; name="file"; filename="filename.zip"\r\n')),
-             call(bytearray(b'Content-Type: application/octet-stream\r\n')),
-             call(bytearray(b'\r\n')),
-             call(bytearray(b'\r\n')),
-             call(bytearray(b'------------ThIs_Is_tHe_bouNdaRY_$--\r\n')),
-             call(bytearray(b'\r\n'))])
+            [call(b'------------ThIs_Is_tHe_bouNdaRY_$\r\n'
+                  b'Content-Disposition: form-data; name="file"; filename="filename.zip"\r\n'
+                  b'Content-Type: application/octet-stream\r\n'
+                  b'\r\n'),
+             call(b'\r\n'
+                  b'------------ThIs_Is_tHe_bouNdaRY_$--\r\n'
+                  b'\r\n')])
+        mock_copyfileobj.assert_called_once_with(mock_in, mock_out)
 
         mock_in.close.assert_called_once()
         mock_out.close.assert_called_once()
@@ -958,6 +1606,428 @@ class ConnectionTest(unittest.TestCase):
         self.assertEqual(conn.port, 443)
         self.assertEqual(conn._context.protocol, ssl.PROTOCOL_TLSv1_2)
 
+    def test_get_connection_should_set_connect_timeout(self):
+        self.connection.set_timeouts(connect_timeout=10, read_timeout=60)
+
+        conn = self.connection.get_connection()
+
+        self.assertEqual(conn.timeout, 10)
+
+    def test_get_connection_should_limit_connect_timeout_to_deadline(self):
+        with Deadline(5):
+            conn = self.connection.get_connection()
+
+        self.assertLessEqual(conn.timeout, 5)
+        self.assertGreater(conn.timeout, 0)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_set_read_timeout(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.set_timeouts(read_timeout=60)
+
+        self.connection.do_http('GET', '/rest/test', '')
+
+        mock_conn.sock.settimeout.assert_called_once_with(60)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_raise_timeout_when_deadline_is_exceeded(self, mock_get_connection):
+        deadline = Deadline(10)
+        deadline.expires_at -= 20
+
+        with deadline:
+            self.assertRaises(HPOneViewTimeout, self.connection.do_http, 'GET', '/rest/test', '')
+
+        mock_get_connection.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_call_request_hooks(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=201, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{"name": "resource"}'
+        calls = []
+        self.connection.add_request_hooks(pre_request=lambda metrics: calls.append(('pre', metrics.status)),
+                                          post_request=lambda metrics: calls.append(('post', metrics)))
+
+        self.connection.do_http('POST', '/rest/enclosures/09USE133E5H4/configuration', '{"a": 1}')
+
+        self.assertEqual(calls[0], ('pre', None))
+        metrics = calls[1][1]
+        self.assertEqual(metrics.method, 'POST')
+        self.assertEqual(metrics.uri_template, '/rest/enclosures/{id}/configuration')
+        self.assertEqual(metrics.status, 201)
+        self.assertEqual(metrics.bytes_sent, 8)
+        self.assertEqual(metrics.bytes_received, 20)
+        self.assertIsNotNone(metrics.tls_handshake_time)
+        self.assertIsNotNone(metrics.time_to_first_byte)
+        self.assertGreaterEqual(metrics.total_time, metrics.time_to_first_byte)
+        mock_conn.connect.assert_called_once_with()
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_report_failed_request_to_hooks(self, mock_get_connection):
+        mock_get_connection.return_value.getresponse.side_effect = ValueError('error')
+        post_request = Mock()
+        self.connection.add_request_hooks(post_request=post_request)
+
+        self.assertRaises(ValueError, self.connection.do_http, 'GET', '/rest/test', '')
+
+        metrics = post_request.call_args[0][0]
+        self.assertIsNone(metrics.status)
+        self.assertIsInstance(metrics.error, ValueError)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_ignore_failing_hooks(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+        self.connection.add_request_hooks(pre_request=Mock(side_effect=ValueError('error')))
+
+        resp, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {})
+
+    @patch.object(connection, 'get_connection')
+    def test_enable_metrics_should_collect_requests(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+
+        collector = self.connection.enable_metrics()
+        self.connection.get('/rest/server-hardware-types')
+
+        self.assertIs(self.connection.get_metrics_collector(), collector)
+        self.assertEqual(collector.to_dict()['requests']['GET /rest/server-hardware-types']['count'], 1)
+
+    def test_disable_metrics_should_remove_collector(self):
+        self.connection.enable_metrics()
+
+        self.connection.disable_metrics()
+
+        self.assertIsNone(self.connection.get_metrics_collector())
+        self.assertEqual(self.connection._post_request_hooks, [])
+
+    @patch('time.sleep')
+    @patch.object(connection, 'get_connection')
+    def test_download_to_stream_should_count_bytes_received(self, mock_get_conn, mock_sleep):
+        content = b'0123456789' * 5
+        mock_get_conn.side_effect, requests = self.__make_download_server(content, truncate=[12])
+        post_request = Mock()
+        self.connection.add_request_hooks(post_request=post_request)
+
+        self.connection.download_to_stream(io.BytesIO(), '/rest/download.zip')
+
+        post_request.assert_called_once()
+        self.assertEqual(post_request.call_args[0][0].bytes_received, len(content))
+
+    def test_get_connection_should_reuse_ssl_context(self):
+        conn1 = self.connection.get_connection()
+        conn2 = self.connection.get_connection()
+
+        self.assertIs(conn1._context, conn2._context)
+
+    @patch.object(ssl.SSLContext, 'load_verify_locations')
+    def test_set_trusted_ssl_bundle_should_reset_ssl_context(self, mock_lvl):
+        context = self.connection.get_connection()._context
+
+        self.connection.set_trusted_ssl_bundle(None)
+
+        self.assertIsNot(context, self.connection.get_connection()._context)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_reuse_keep_alive_connection(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+
+        self.connection.do_http('GET', '/rest/test', '')
+        self.connection.do_http('GET', '/rest/test', '')
+
+        mock_get_connection.assert_called_once_with()
+        self.assertEqual(mock_conn.request.call_count, 2)
+        mock_conn.close.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_close_connection_when_response_will_close(self, mock_get_connection):
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=True)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+
+        self.connection.do_http('GET', '/rest/test', '')
+        self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(mock_get_connection.call_count, 2)
+        self.assertEqual(mock_conn.close.call_count, 2)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_reconnect_when_pooled_connection_is_stale(self, mock_get_connection):
+        stale_conn = Mock()
+        stale_conn.getresponse.side_effect = BadStatusLine(0)
+        self.connection._connection_pool.release(stale_conn)
+
+        new_conn = mock_get_connection.return_value
+        new_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        new_conn.getresponse.return_value.read.return_value = b'{"name": "value"}'
+
+        with patch('time.sleep') as mock_sleep:
+            resp, body = self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(body, {"name": "value"})
+        stale_conn.close.assert_called_once_with()
+        mock_sleep.assert_not_called()
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_reconnect_when_pooled_connection_is_reset_before_the_response(self, mock_get_connection):
+        stale_conn = Mock()
+        stale_conn.getresponse.side_effect = socket.error(errno.ECONNRESET, 'Connection reset by peer')
+        self.connection._connection_pool.release(stale_conn)
+
+        new_conn = mock_get_connection.return_value
+        new_conn.getresponse.return_value = Mock(status=202, will_close=False)
+        new_conn.getresponse.return_value.read.return_value = b'{}'
+
+        self.connection.do_http('POST', '/rest/server-profiles', '{}')
+
+        stale_conn.close.assert_called_once_with()
+        new_conn.request.assert_called_once_with('POST', '/rest/server-profiles', '{}', ANY)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_reconnect_when_request_cannot_be_sent_on_pooled_connection(self, mock_get_connection):
+        stale_conn = Mock()
+        stale_conn.request.side_effect = socket.error(errno.EPIPE, 'Broken pipe')
+        self.connection._connection_pool.release(stale_conn)
+
+        new_conn = mock_get_connection.return_value
+        new_conn.getresponse.return_value = Mock(status=202, will_close=False)
+        new_conn.getresponse.return_value.read.return_value = b'{}'
+
+        self.connection.do_http('POST', '/rest/server-profiles', '{}')
+
+        stale_conn.getresponse.assert_not_called()
+        new_conn.request.assert_called_once_with('POST', '/rest/server-profiles', '{}', ANY)
+
+    @patch.object(connection, 'get_connection')
+    def test_do_http_should_send_post_once_when_pooled_connection_times_out(self, mock_get_connection):
+        pooled_conn = Mock()
+        pooled_conn.getresponse.side_effect = socket.timeout('timed out')
+        self.connection._connection_pool.release(pooled_conn)
+
+        with patch('time.sleep'):
+            self.assertRaises(socket.timeout, self.connection.do_http, 'POST', '/rest/server-profiles', '{}')
+
+        pooled_conn.request.assert_called_once_with('POST', '/rest/server-profiles', '{}', ANY)
+        pooled_conn.close.assert_called_once_with()
+        mock_get_connection.assert_not_called()
+
+    def test_set_proxy_should_close_pooled_connections(self):
+        pooled_conn = Mock()
+        self.connection._connection_pool.release(pooled_conn)
+
+        self.connection.set_proxy('10.0.0.1', 3128)
+
+        pooled_conn.close.assert_called_once_with()
+        self.assertEqual(len(self.connection._connection_pool), 0)
+
+    @patch.object(connection, 'get_connection')
+    def test_set_connection_pool_with_zero_connections_should_disable_reuse(self, mock_get_connection):
+        self.connection.set_connection_pool(max_connections=0)
+        mock_conn = mock_get_connection.return_value
+        mock_conn.getresponse.return_value = Mock(status=200, will_close=False)
+        mock_conn.getresponse.return_value.read.return_value = b'{}'
+
+        self.connection.do_http('GET', '/rest/test', '')
+        self.connection.do_http('GET', '/rest/test', '')
+
+        self.assertEqual(mock_get_connection.call_count, 2)
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_use_cached_response(self, mock_do_http):
+        self.connection.set_response_cache(ttls={'/rest/server-hardware-types': 600})
+        mock_do_http.return_value = (Mock(status=200), {"name": "SY 480 Gen9"})
+
+        first = self.connection.get('/rest/server-hardware-types/1')
+        second = self.connection.get('/rest/server-hardware-types/1')
+
+        self.assertEqual(first, second)
+        mock_do_http.assert_called_once_with('GET', '/rest/server-hardware-types/1', '')
+        self.assertEqual(self.connection.get_response_cache().get_stats(),
+                         dict(hits=1, misses=1, revalidations=0, entries=1))
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_update_paging_from_cached_response(self, mock_do_http):
+        self.connection.set_response_cache(ttls={'/rest/server-hardware-types': 600})
+        first_uri = '/rest/server-hardware-types?start=0&count=1'
+        next_uri = '/rest/server-hardware-types?start=1&count=1'
+        pages = {
+            first_uri: {'members': [{'name': 'SY 480 Gen9'}], 'total': 2, 'count': 1, 'nextPageUri': next_uri},
+            next_uri: {'members': [{'name': 'SY 660 Gen9'}], 'total': 2, 'count': 1, 'nextPageUri': None,
+                       'prevPageUri': first_uri},
+        }
+        mock_do_http.side_effect = lambda method, uri, body: (Mock(status=200), pages[uri])
+        self.connection.get(first_uri)
+        self.connection.getNextPage()
+
+        self.connection.get(first_uri)
+
+        self.assertEqual(mock_do_http.call_count, 2)
+        self.assertEqual(self.connection.getNextPage(), [{'name': 'SY 660 Gen9'}])
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_not_cache_uris_without_ttl(self, mock_do_http):
+        self.connection.set_response_cache(ttls={'/rest/server-hardware-types': 600})
+        mock_do_http.return_value = (Mock(status=200), {"name": "profile"})
+
+        self.connection.get('/rest/server-profiles/1')
+        self.connection.get('/rest/server-profiles/1')
+
+        self.assertEqual(mock_do_http.call_count, 2)
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_not_cache_responses_when_cache_is_disabled(self, mock_do_http):
+        self.connection.set_response_cache(default_ttl=600)
+        self.connection.disable_response_cache()
+        mock_do_http.return_value = (Mock(status=200), {"name": "resource"})
+
+        self.connection.get('/rest/resource/1')
+        self.connection.get('/rest/resource/1')
+
+        self.assertEqual(mock_do_http.call_count, 2)
+        self.assertIsNone(self.connection.get_response_cache())
+
+    @patch.object(connection, 'do_http')
+    def test_put_should_invalidate_cached_responses_of_resource(self, mock_do_http):
+        self.connection.set_response_cache(default_ttl=600)
+        mock_do_http.return_value = (Mock(status=200), {"name": "resource"})
+        self.connection.get('/rest/resource/1')
+        self.connection.get('/rest/resource?filter=name')
+
+        self.connection.put('/rest/resource/1?force=True', {"name": "resource"})
+        self.connection.get('/rest/resource/1')
+        self.connection.get('/rest/resource?filter=name')
+
+        self.assertEqual(mock_do_http.call_count, 5)
+
+    @patch.object(connection, 'do_http')
+    def test_failed_delete_should_invalidate_cached_responses_of_resource(self, mock_do_http):
+        self.connection.set_response_cache(default_ttl=600)
+        mock_do_http.return_value = (Mock(status=200), {"name": "resource"})
+        self.connection.get('/rest/resource/1')
+
+        mock_do_http.side_effect = BadStatusLine(0)
+        self.assertRaises(BadStatusLine, self.connection.delete, '/rest/resource/1')
+
+        self.assertEqual(len(self.connection.get_response_cache()), 0)
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_send_etag_of_kept_response(self, mock_do_http):
+        self.connection.set_response_cache(revalidate=True)
+        mock_do_http.side_effect = [(Mock(status=200), {"name": "profile", "eTag": "1"}),
+                                    (Mock(status=304), '')]
+
+        self.connection.get('/rest/server-profiles/1')
+        body = self.connection.get('/rest/server-profiles/1')
+
+        self.assertEqual(body, {"name": "profile", "eTag": "1"})
+        mock_do_http.assert_called_with('GET', '/rest/server-profiles/1', '', custom_headers={'If-None-Match': '1'})
+        self.assertEqual(self.connection.get_response_cache().revalidations, 1)
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_keep_new_response_when_resource_was_modified(self, mock_do_http):
+        self.connection.set_response_cache(revalidate=True)
+        mock_do_http.side_effect = [(Mock(status=200), {"name": "profile", "eTag": "1"}),
+                                    (Mock(status=200), {"name": "changed", "eTag": "2"}),
+                                    (Mock(status=304), '')]
+
+        self.connection.get('/rest/server-profiles/1')
+        modified = self.connection.get('/rest/server-profiles/1')
+        not_modified = self.connection.get('/rest/server-profiles/1')
+
+        self.assertEqual(modified, {"name": "changed", "eTag": "2"})
+        self.assertEqual(not_modified, modified)
+        mock_do_http.assert_called_with('GET', '/rest/server-profiles/1', '', custom_headers={'If-None-Match': '2'})
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_use_etag_header_when_body_has_no_etag(self, mock_do_http):
+        self.connection.set_response_cache(revalidate=True)
+        response = Mock(status=200)
+        response.getheader.return_value = 'W/"etag"'
+        mock_do_http.side_effect = [(response, {"members": []}), (Mock(status=304), '')]
+
+        self.connection.get('/rest/server-profiles')
+        body = self.connection.get('/rest/server-profiles')
+
+        self.assertEqual(body, {"members": []})
+        response.getheader.assert_called_once_with('ETag')
+        mock_do_http.assert_called_with('GET', '/rest/server-profiles', '',
+                                        custom_headers={'If-None-Match': 'W/"etag"'})
+
+    @patch.object(connection, 'do_http')
+    def test_get_should_request_again_when_kept_response_was_evicted(self, mock_do_http):
+        self.connection.set_response_cache(revalidate=True)
+        mock_do_http.side_effect = [(Mock(status=200), {"name": "profile", "eTag": "1"}),
+                                    (Mock(status=304), ''),
+                                    (Mock(status=200), {"name": "profile", "eTag": "1"})]
+        self.connection.get('/rest/server-profiles/1')
+
+        with patch.object(ResponseCache, 'revalidate', return_value=None):
+            body = self.connection.get('/rest/server-profiles/1')
+
+        self.assertEqual(body, {"name": "profile", "eTag": "1"})
+        mock_do_http.assert_called_with('GET', '/rest/server-profiles/1', '')
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(max_connections=2, idle_timeout=15)
+
+    def test_acquire_should_return_none_when_empty(self):
+        self.assertIsNone(self.pool.acquire())
+
+    def test_acquire_should_return_most_recently_released_connection(self):
+        conn1, conn2 = Mock(), Mock()
+        self.pool.release(conn1)
+        self.pool.release(conn2)
+
+        self.assertIs(self.pool.acquire(), conn2)
+        self.assertIs(self.pool.acquire(), conn1)
+
+    def test_release_should_close_connection_when_pool_is_full(self):
+        conns = [Mock(), Mock(), Mock()]
+        for conn in conns:
+            self.pool.release(conn)
+
+        conns[2].close.assert_called_once_with()
+        self.assertEqual(len(self.pool), 2)
+
+    @patch('time.time')
+    def test_acquire_should_evict_idle_connections(self, mock_time):
+        conn1, conn2 = Mock(), Mock()
+        mock_time.return_value = 100
+        self.pool.release(conn1)
+        self.pool.release(conn2)
+
+        mock_time.return_value = 116
+
+        self.assertIsNone(self.pool.acquire())
+        conn1.close.assert_called_once_with()
+        conn2.close.assert_called_once_with()
+
+    def test_acquire_should_discard_closed_connections(self):
+        closed_conn = Mock(sock=None)
+        self.pool.release(closed_conn)
+
+        self.assertIsNone(self.pool.acquire())
+        closed_conn.close.assert_called_once_with()
+
+    def test_clear_should_close_idle_connections(self):
+        conn = Mock()
+        self.pool.release(conn)
+
+        self.pool.clear()
+
+        conn.close.assert_called_once_with()
+        self.assertEqual(len(self.pool), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
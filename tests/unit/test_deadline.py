@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import threading
+import unittest
+
+from mock import patch
+
+from hpOneView.deadline import Deadline, get_current_deadline, with_deadline
+from hpOneView.exceptions import HPOneViewTimeout
+
+
+class DeadlineTest(unittest.TestCase):
+    @patch('time.time')
+    def test_remaining_should_count_down_from_timeout(self, mock_time):
+        mock_time.return_value = 100.0
+        deadline = Deadline(30)
+        mock_time.return_value = 110.0
+
+        self.assertEqual(deadline.remaining(), 20.0)
+        self.assertFalse(deadline.expired())
+
+    @patch('time.time')
+    def test_remaining_should_not_be_negative(self, mock_time):
+        mock_time.return_value = 100.0
+        deadline = Deadline(30)
+        mock_time.return_value = 140.0
+
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertTrue(deadline.expired())
+
+    def test_unlimited_deadline(self):
+        for timeout in (None, -1):
+            deadline = Deadline(timeout)
+
+            self.assertIsNone(deadline.remaining())
+            self.assertFalse(deadline.expired())
+            self.assertEqual(deadline.clip(10), 10)
+            self.assertIsNone(deadline.clip(None))
+
+    @patch('time.time')
+    def test_clip_should_limit_timeout_to_remaining_time(self, mock_time):
+        mock_time.return_value = 100.0
+        deadline = Deadline(30)
+
+        self.assertEqual(deadline.clip(10), 10)
+        self.assertEqual(deadline.clip(60), 30)
+        self.assertEqual(deadline.clip(None), 30)
+
+    @patch('time.time')
+    def test_check_should_raise_timeout_when_expired(self, mock_time):
+        mock_time.return_value = 100.0
+        deadline = Deadline(30)
+        mock_time.return_value = 131.0
+
+        try:
+            deadline.check()
+        except HPOneViewTimeout as e:
+            self.assertEqual(e.msg, 'The operation exceeded its timeout of 30 seconds')
+        else:
+            self.fail()
+
+    def test_context_manager_should_set_current_deadline(self):
+        deadline = Deadline(30)
+
+        self.assertIsNone(get_current_deadline())
+        with deadline:
+            self.assertIs(get_current_deadline(), deadline)
+        self.assertIsNone(get_current_deadline())
+
+    def test_nested_deadline_should_not_extend_current_deadline(self):
+        outer = Deadline(30)
+        with outer:
+            with Deadline(60):
+                self.assertIs(get_current_deadline(), outer)
+            with Deadline(-1):
+                self.assertIs(get_current_deadline(), outer)
+            inner = Deadline(10)
+            with inner:
+                self.assertIs(get_current_deadline(), inner)
+            self.assertIs(get_current_deadline(), outer)
+
+    def test_current_deadline_should_be_local_to_thread(self):
+        deadlines = []
+        thread = threading.Thread(target=lambda: deadlines.append(get_current_deadline()))
+
+        with Deadline(30):
+            thread.start()
+            thread.join()
+
+        self.assertEqual(deadlines, [None])
+
+    def test_with_deadline_should_use_timeout_argument(self):
+        @with_deadline
+        def operation(resource, timeout=-1):
+            return get_current_deadline()
+
+        self.assertEqual(operation({}).timeout, -1)
+        self.assertEqual(operation({}, 30).timeout, 30)
+        self.assertEqual(operation({}, timeout=60).timeout, 60)
+        self.assertIsNone(get_current_deadline())
@@ -32,6 +32,8 @@ from hpOneView.exceptions import HPOneViewUnknownType
 from hpOneView.exceptions import HPOneViewTaskError
 from hpOneView.exceptions import HPOneViewResourceNotFound
 from hpOneView.exceptions import HPOneViewValueError
+from hpOneView.exceptions import HPOneViewCancelledError
+from hpOneView.exceptions import HPOneViewCircuitOpen
 
 
 class ExceptionsTest(unittest.TestCase):
@@ -119,6 +121,21 @@ class ExceptionsTest(unittest.TestCase):
         self.assertEqual(exception.oneview_response, None)
         self.assertEqual(exception.args[0], "The given data is empty!")
 
+    def test_oneview_cancelled_error_inheritance(self):
+        exception = HPOneViewCancelledError("The wait was cancelled!")
+
+        self.assertIsInstance(exception, HPOneViewException)
+        self.assertEqual(exception.msg, "The wait was cancelled!")
+        self.assertEqual(exception.oneview_response, None)
+        self.assertEqual(exception.args[0], "The wait was cancelled!")
+
+    def test_oneview_circuit_open_inheritance(self):
+        exception = HPOneViewCircuitOpen("The requests are failing fast!")
+
+        self.assertIsInstance(exception, HPOneViewException)
+        self.assertEqual(exception.msg, "The requests are failing fast!")
+        self.assertEqual(exception.oneview_response, None)
+
     @mock.patch.object(traceback, 'print_exception')
     @mock.patch.object(logging, 'error')
     def test_should_log_message(self, mock_logging_error, mock_traceback):
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import threading
+import time
+import unittest
+
+from collections import OrderedDict
+
+from mock import patch, Mock
+
+from hpOneView import fleet_client
+from hpOneView.deadline import Deadline, get_current_deadline
+from hpOneView.exceptions import HPOneViewException
+from hpOneView.fleet_client import OneViewFleetClient, FleetResult, tag_item
+
+
+def make_client(host):
+    client = Mock()
+    client.connection.get_host.return_value = host
+    return client
+
+
+class TagItemTest(unittest.TestCase):
+    def test_should_tag_copy_of_dict(self):
+        item = {'name': 'server'}
+
+        tagged = tag_item(item, '172.16.102.59')
+
+        self.assertEqual(tagged, {'name': 'server', 'appliance': '172.16.102.59'})
+        self.assertEqual(item, {'name': 'server'})
+
+    def test_should_wrap_other_values(self):
+        self.assertEqual(tag_item('value', '172.16.102.59'), {'appliance': '172.16.102.59', 'value': 'value'})
+
+
+class FleetResultTest(unittest.TestCase):
+    def test_items_should_merge_lists_and_skip_empty_results(self):
+        result = FleetResult(OrderedDict([('a', [{'id': 1}, {'id': 2}]), ('b', None), ('c', {'id': 3})]),
+                             OrderedDict())
+
+        self.assertEqual(result.items, [{'id': 1, 'appliance': 'a'}, {'id': 2, 'appliance': 'a'},
+                                        {'id': 3, 'appliance': 'c'}])
+        self.assertEqual(len(result), 3)
+        self.assertFalse(result.failed)
+
+
+class OneViewFleetClientTest(unittest.TestCase):
+    def setUp(self):
+        self.clients = [make_client('172.16.102.59'), make_client('172.16.102.60')]
+        self.fleet = OneViewFleetClient(self.clients, max_workers=2, timeout=30)
+
+    def test_should_name_clients_by_host(self):
+        self.assertEqual(self.fleet.appliances, ['172.16.102.59', '172.16.102.60'])
+
+    def test_call_should_merge_results_tagged_with_appliance(self):
+        self.clients[0].server_hardware.get_by.return_value = [{'name': 'server-1'}]
+        self.clients[1].server_hardware.get_by.return_value = []
+
+        result = self.fleet.call('server_hardware', 'get_by', 'serialNumber', 'VCGE9KB041')
+
+        self.assertEqual(result.items, [{'name': 'server-1', 'appliance': '172.16.102.59'}])
+        self.clients[1].server_hardware.get_by.assert_called_once_with('serialNumber', 'VCGE9KB041')
+
+    def test_get_all_should_pass_arguments(self):
+        self.fleet.get_all('alerts', filter="severity='Critical'")
+
+        for client in self.clients:
+            client.alerts.get_all.assert_called_once_with(filter="severity='Critical'")
+
+    def test_get_by_should_call_all_appliances(self):
+        self.fleet.get_by('server_hardware', 'serialNumber', 'VCGE9KB041')
+
+        for client in self.clients:
+            client.server_hardware.get_by.assert_called_once_with('serialNumber', 'VCGE9KB041')
+
+    def test_call_should_report_partial_failures(self):
+        error = HPOneViewException('Appliance unavailable')
+        self.clients[0].enclosures.get_utilization.side_effect = error
+        self.clients[1].enclosures.get_utilization.return_value = {'metricList': []}
+
+        result = self.fleet.call('enclosures', 'get_utilization', '/rest/enclosures/1')
+
+        self.assertTrue(result.failed)
+        self.assertEqual(dict(result.errors), {'172.16.102.59': error})
+        self.assertEqual(result.items, [{'metricList': [], 'appliance': '172.16.102.60'}])
+
+    def test_map_should_call_selected_appliances(self):
+        result = self.fleet.map(lambda client: client.connection.get_host(), appliances=['172.16.102.60'])
+
+        self.assertEqual(dict(result.results), {'172.16.102.60': '172.16.102.60'})
+
+    def test_map_should_run_appliances_concurrently(self):
+        barrier = threading.Event()
+        started = []
+
+        def function(client):
+            started.append(client)
+            if len(started) == 2:
+                barrier.set()
+            return barrier.wait(5)
+
+        result = self.fleet.map(function)
+
+        self.assertEqual(list(result.results.values()), [True, True])
+
+    def test_map_should_limit_concurrent_calls(self):
+        fleet = OneViewFleetClient([make_client(str(i)) for i in range(6)], max_workers=2)
+        lock = threading.Lock()
+        counters = dict(running=0, max_running=0)
+
+        def function(client):
+            with lock:
+                counters['running'] += 1
+                counters['max_running'] = max(counters['max_running'], counters['running'])
+            time.sleep(0.01)
+            with lock:
+                counters['running'] -= 1
+
+        fleet.map(function)
+
+        self.assertEqual(counters['max_running'], 2)
+
+    def test_map_should_run_each_appliance_within_timeout(self):
+        result = self.fleet.map(lambda client: get_current_deadline().timeout)
+
+        self.assertEqual(list(result.results.values()), [30, 30])
+
+    def test_map_should_keep_deadline_of_caller(self):
+        with Deadline(5):
+            result = self.fleet.map(lambda client: get_current_deadline().timeout)
+
+        self.assertEqual(list(result.results.values()), [5, 5])
+
+    @patch.object(fleet_client, 'OneViewClient')
+    def test_from_configs_should_report_login_errors(self, mock_client):
+        error = HPOneViewException('Invalid credentials')
+        client = make_client('172.16.102.59')
+        mock_client.side_effect = lambda config: client if config['ip'] == '172.16.102.59' else self.fail_login(error)
+
+        fleet = OneViewFleetClient.from_configs([{'ip': '172.16.102.59'}, {'ip': '172.16.102.60'}], timeout=10)
+
+        self.assertEqual(fleet.appliances, ['172.16.102.59'])
+        self.assertIs(fleet.clients['172.16.102.59'], client)
+        self.assertEqual(dict(fleet.login_errors), {'172.16.102.60': error})
+
+    @staticmethod
+    def fail_login(error):
+        raise error
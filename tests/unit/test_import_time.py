@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import ast
+import importlib
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import hpOneView
+
+from tests.test_utils import benchmark
+
+IMPORT_SCRIPT = '''
+import json
+import sys
+import time
+
+started_at = time.time()
+import %s
+elapsed = time.time() - started_at
+print(json.dumps(dict(elapsed=elapsed, modules=[name for name in sys.modules if name.startswith('hpOneView')])))
+'''
+
+# Prints a description of each name exported by the package, in the order of the script arguments
+DESCRIBE_SCRIPT = '''
+import json
+import sys
+
+import hpOneView
+from tests.unit.test_import_time import describe
+
+print(json.dumps([describe(getattr(hpOneView, name)) for name in sys.argv[1:]]))
+'''
+
+LEGACY_MODULES = ['servers', 'activity', 'networking', 'security', 'settings', 'search', 'metrics', 'storage', 'fcsans',
+                  'facilities', 'uncategorized']
+
+
+def run_script(script, lazy, *args):
+    env = dict(os.environ)
+    env.pop('ONEVIEWSDK_LAZY_IMPORT', None)
+    if lazy:
+        env['ONEVIEWSDK_LAZY_IMPORT'] = '1'
+    output = subprocess.check_output([sys.executable, '-c', script] + list(args), env=env)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def import_module(module='hpOneView.oneview_client', lazy=False):
+    """
+    Imports a module in a new interpreter.
+
+    Returns:
+        tuple: The seconds spent importing the module, and the hpOneView modules imported.
+    """
+    result = run_script(IMPORT_SCRIPT % module, lazy)
+    return result['elapsed'], result['modules']
+
+
+def get_defined_names(module_name):
+    """
+    Gets the public names defined by the top-level statements of a module of the package, leaving out the names it
+    imports from other modules.
+    """
+    with open(os.path.join(os.path.dirname(hpOneView.__file__), module_name + '.py')) as module_file:
+        statements = list(ast.parse(module_file.read()).body)
+    names = set()
+    while statements:
+        statement = statements.pop()
+        if isinstance(statement, (ast.FunctionDef, ast.ClassDef)):
+            names.add(statement.name)
+        elif isinstance(statement, ast.Assign):
+            for target in statement.targets:
+                names.update(node.id for node in ast.walk(target) if isinstance(node, ast.Name))
+        else:
+            # The statements of the conditional blocks, like the ones for each version of Python
+            for field in ('body', 'orelse', 'finalbody', 'handlers'):
+                statements.extend(getattr(statement, field, []))
+    return set(name for name in names if not name.startswith('_'))
+
+
+def describe(value):
+    """
+    Describes a value, so the values of two interpreters can be compared.
+    """
+    if hasattr(value, '__qualname__'):
+        return '%s %s.%s' % (type(value).__name__, value.__module__, value.__qualname__)
+    return '%s %r' % (type(value).__name__, value)
+
+
+class ImportTest(unittest.TestCase):
+    @unittest.skipIf(sys.version_info < (3, 7), 'The resource clients are imported lazily on Python 3.7 or later')
+    def test_client_should_not_import_resource_modules(self):
+        _, modules = import_module()
+
+        self.assertIn('hpOneView.oneview_client', modules)
+        self.assertEqual([name for name in modules if name.startswith('hpOneView.resources')], [])
+        self.assertNotIn('hpOneView.image_streamer.image_streamer_client', modules)
+
+    def test_fleet_client_should_not_import_thread_pool(self):
+        script = IMPORT_SCRIPT % 'hpOneView.fleet_client'
+        script += '\nprint(json.dumps("multiprocessing.pool" in sys.modules))'
+
+        self.assertFalse(run_script(script, lazy=False))
+
+    def test_eager_import_should_import_legacy_modules(self):
+        _, modules = import_module('hpOneView')
+
+        for name in LEGACY_MODULES:
+            self.assertIn('hpOneView.' + name, modules)
+
+    def test_legacy_names_should_be_exported_by_eager_import(self):
+        for module_name in hpOneView.LEGACY_MODULES:
+            module = importlib.import_module('hpOneView.' + module_name)
+            for name in hpOneView.LEGACY_NAMES[module_name]:
+                self.assertTrue(hasattr(module, name), '%s.%s' % (module_name, name))
+                self.assertIn(name, vars(hpOneView))
+
+    def test_legacy_names_should_list_all_names_defined_by_legacy_modules(self):
+        for module_name in hpOneView.LEGACY_MODULES:
+            self.assertEqual(sorted(hpOneView.LEGACY_NAMES[module_name]), sorted(get_defined_names(module_name)),
+                             module_name)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'The lazy import needs Python 3.7 or later')
+    def test_lazy_import_should_not_import_legacy_modules(self):
+        _, modules = import_module('hpOneView', lazy=True)
+
+        for name in LEGACY_MODULES:
+            self.assertNotIn('hpOneView.' + name, modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'The lazy import needs Python 3.7 or later')
+    def test_lazy_import_should_import_only_module_of_accessed_name(self):
+        script = IMPORT_SCRIPT % 'hpOneView; hpOneView.fcsans'
+
+        modules = run_script(script, lazy=True)['modules']
+
+        self.assertIn('hpOneView.fcsans', modules)
+        self.assertNotIn('hpOneView.servers', modules)
+        self.assertNotIn('hpOneView.storage', modules)
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'The lazy import needs Python 3.7 or later')
+    def test_lazy_import_should_export_same_objects_as_eager_import(self):
+        names = sorted(set(name for names in hpOneView.LEGACY_NAMES.values() for name in names))
+
+        lazy_values = run_script(DESCRIBE_SCRIPT, True, *names)
+
+        self.assertEqual(dict(zip(names, lazy_values)), dict((name, describe(getattr(hpOneView, name)))
+                                                             for name in names))
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'The lazy import needs Python 3.7 or later')
+    def test_lazy_import_should_export_classes_named_after_loaded_modules(self):
+        # The submodules bound to the package by the import system must not hide the legacy classes
+        script = IMPORT_SCRIPT % 'hpOneView.oneview_client, hpOneView.activity, hpOneView.settings, hpOneView.servers'
+        script += '\nprint(json.dumps([isinstance(getattr(hpOneView, name), type) for name in ' \
+                  '["connection", "activity", "settings", "servers"]]))'
+
+        self.assertEqual(run_script(script, lazy=True), [True, True, True, True])
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'The lazy import needs Python 3.7 or later')
+    def test_lazy_star_import_should_export_legacy_names(self):
+        script = IMPORT_SCRIPT % 'hpOneView'
+        script += '\nfrom hpOneView import *\nprint(json.dumps([make_server_dict.__module__, activity.__name__]))'
+
+        self.assertEqual(run_script(script, lazy=True), ['hpOneView.common', 'activity'])
+
+
+@benchmark
+@unittest.skipIf(sys.version_info < (3, 7), 'The lazy import needs Python 3.7 or later')
+class ImportTimeBenchmarkTest(unittest.TestCase):
+    """
+    Compares the time to import the package with and without the lazy import.
+    """
+    REPEAT = 5
+
+    def test_lazy_import_should_be_faster(self):
+        eager_time = min(import_module('hpOneView')[0] for _ in range(self.REPEAT))
+        lazy_time = min(import_module('hpOneView', lazy=True)[0] for _ in range(self.REPEAT))
+
+        self.assertLess(lazy_time, eager_time)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+
+from hpOneView.inventory_mirror import InventoryMirror, get_links
+from hpOneView.resources.collection_sync import SyncState, SyncResult
+
+ENCLOSURE = {'uri': '/rest/enclosures/1', 'name': 'Encl1', 'type': 'EnclosureV300', 'serialNumber': 'SN-E1',
+             'state': 'Configured', 'status': 'OK', 'modified': '2017-05-01T10:00:00.000Z'}
+SERVERS = [
+    {'uri': '/rest/server-hardware/1', 'name': 'Encl1, bay 1', 'serialNumber': 'SN-1', 'state': 'ProfileApplied',
+     'status': 'OK', 'modified': '2017-05-01T10:00:00.000Z', 'locationUri': '/rest/enclosures/1',
+     'serverProfileUri': '/rest/server-profiles/1'},
+    {'uri': '/rest/server-hardware/2', 'name': 'Encl1, bay 2', 'serialNumber': 'SN-2', 'state': 'NoProfileApplied',
+     'status': 'Critical', 'modified': '2017-05-02T10:00:00.000Z', 'locationUri': '/rest/enclosures/1',
+     'serverProfileUri': None},
+]
+
+
+class GetLinksTest(unittest.TestCase):
+    def test_should_get_uri_attributes(self):
+        links = get_links({'uri': '/rest/interconnects/1', 'enclosureUri': '/rest/enclosures/1',
+                           'portUris': ['/rest/ports/1', '/rest/ports/2'], 'serverProfileUri': None,
+                           'iconUri': 'https://icon'})
+
+        self.assertEqual(sorted(links), [('enclosureUri', '/rest/enclosures/1'), ('portUris', '/rest/ports/1'),
+                                         ('portUris', '/rest/ports/2')])
+
+
+class InventoryMirrorTest(unittest.TestCase):
+    def setUp(self):
+        self.oneview_client = Mock()
+        self.oneview_client.server_hardware.get_all.return_value = SERVERS
+        self.oneview_client.enclosures.get_all.return_value = [ENCLOSURE]
+        self.mirror = InventoryMirror(self.oneview_client, resources=['server_hardware', 'enclosures'])
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_sync_should_mirror_collections(self):
+        counts = self.mirror.sync()
+
+        self.assertEqual(counts, {'server_hardware': 2, 'enclosures': 1})
+        self.assertEqual(self.mirror.get_all('server_hardware'), SERVERS)
+        self.assertEqual(self.mirror.get_all('enclosures'), [ENCLOSURE])
+        self.assertEqual(self.mirror.get_synced_collections()['server_hardware']['count'], 2)
+
+    def test_sync_should_replace_removed_resources(self):
+        self.mirror.sync()
+        self.oneview_client.server_hardware.get_all.return_value = SERVERS[:1]
+
+        self.mirror.sync(['server_hardware'])
+
+        self.assertEqual(self.mirror.get_all('server_hardware'), SERVERS[:1])
+        self.assertEqual(self.mirror.query('SELECT COUNT(*) AS count FROM links')[0]['count'], 2)
+        self.oneview_client.enclosures.get_all.assert_called_once_with()
+
+    def test_get_by_should_use_indexed_attributes(self):
+        self.mirror.sync()
+
+        self.assertEqual(self.mirror.get_by('server_hardware', 'serialNumber', 'SN-2'), SERVERS[1:])
+        self.assertEqual(self.mirror.get_by('server_hardware', 'status', 'OK'), SERVERS[:1])
+
+    def test_get_by_should_reject_attribute_not_indexed(self):
+        self.assertRaises(ValueError, self.mirror.get_by, 'server_hardware', 'model', 'SY 480 Gen9')
+
+    def test_get_by_uri(self):
+        self.mirror.sync()
+
+        self.assertEqual(self.mirror.get_by_uri('/rest/enclosures/1'), ENCLOSURE)
+        self.assertIsNone(self.mirror.get_by_uri('/rest/enclosures/2'))
+
+    def test_get_referencing_should_follow_links(self):
+        self.mirror.sync()
+
+        self.assertEqual(self.mirror.get_referencing('/rest/enclosures/1', 'server_hardware'), SERVERS)
+        self.assertEqual(self.mirror.get_referencing('/rest/server-profiles/1'), SERVERS[:1])
+
+    def test_query_should_join_collections(self):
+        self.mirror.sync()
+
+        rows = self.mirror.query(
+            "SELECT s.serial_number, e.name AS enclosure FROM resources s "
+            "JOIN links l ON l.uri = s.uri AND l.attribute = 'locationUri' "
+            "JOIN resources e ON e.uri = l.target_uri "
+            "WHERE s.collection = 'server_hardware' AND s.status = ?", ('Critical',))
+
+        self.assertEqual(rows, [{'serial_number': 'SN-2', 'enclosure': 'Encl1'}])
+
+    def test_upsert_should_replace_resources_and_links(self):
+        self.mirror.sync()
+        moved = dict(SERVERS[0], locationUri='/rest/enclosures/2', status='Warning')
+
+        self.mirror.upsert('server_hardware', [moved])
+
+        self.assertEqual(self.mirror.get_by_uri(moved['uri']), moved)
+        self.assertEqual(self.mirror.get_referencing('/rest/enclosures/2'), [moved])
+        self.assertEqual(self.mirror.get_referencing('/rest/enclosures/1'), SERVERS[1:])
+
+    def test_delete_should_remove_resources_and_links(self):
+        self.mirror.sync()
+
+        self.mirror.delete(['/rest/server-hardware/1'])
+
+        self.assertEqual(self.mirror.get_all('server_hardware'), SERVERS[1:])
+        self.assertEqual(self.mirror.get_referencing('/rest/server-profiles/1'), [])
+
+    def test_incremental_sync_should_apply_changes(self):
+        client = self.oneview_client.server_hardware
+        client.sync.return_value = SyncResult(SERVERS, [], [], True, SyncState('2017-05-02T10:00:00.000Z'))
+        self.mirror.sync(['server_hardware'], incremental=True)
+
+        updated = dict(SERVERS[1], status='OK')
+        created = {'uri': '/rest/server-hardware/3', 'name': 'Encl1, bay 3', 'locationUri': '/rest/enclosures/1'}
+        client.sync.return_value = SyncResult([created], [updated], ['/rest/server-hardware/1'], False,
+                                              SyncState('2017-05-03T10:00:00.000Z'))
+        counts = self.mirror.sync(['server_hardware'], incremental=True)
+
+        self.assertEqual(counts, {'server_hardware': 3})
+        self.assertEqual(self.mirror.get_all('server_hardware'), [updated, created])
+        self.assertEqual(self.mirror.get_referencing('/rest/server-profiles/1'), [])
+        self.assertEqual(client.sync.call_args[1]['state'].modified, '2017-05-02T10:00:00.000Z')
+        self.assertEqual(self.mirror.get_synced_collections()['server_hardware']['count'], 2)
+
+    def test_incremental_sync_should_request_all_resources_without_sync_method(self):
+        self.oneview_client.storage_pools = Mock(spec=['get_all'])
+        self.oneview_client.storage_pools.get_all.return_value = [{'uri': '/rest/storage-pools/1', 'name': 'Pool1'}]
+
+        counts = self.mirror.sync(['storage_pools'], incremental=True)
+
+        self.assertEqual(counts, {'storage_pools': 1})
+        self.assertEqual(self.mirror.get_all('storage_pools'), [{'uri': '/rest/storage-pools/1', 'name': 'Pool1'}])
+
+    def test_full_sync_should_reset_incremental_sync(self):
+        client = self.oneview_client.server_hardware
+        client.sync.return_value = SyncResult(SERVERS, [], [], True, SyncState('2017-05-02T10:00:00.000Z'))
+        self.mirror.sync(['server_hardware'], incremental=True)
+
+        self.mirror.sync(['server_hardware'])
+        self.mirror.sync(['server_hardware'], incremental=True)
+
+        self.assertIsNone(client.sync.call_args[1]['state'].modified)
+
+
+class InventoryMirrorFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'inventory.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_mirror_should_persist_in_file(self):
+        oneview_client = Mock()
+        oneview_client.enclosures.get_all.return_value = [ENCLOSURE]
+        with InventoryMirror(oneview_client, self.path, resources=['enclosures']) as mirror:
+            mirror.sync()
+
+        with InventoryMirror(Mock(), self.path) as mirror:
+            self.assertEqual(mirror.get_all('enclosures'), [ENCLOSURE])
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import timeit
+import unittest
+
+from mock import patch
+
+from hpOneView import json_codec
+from hpOneView.json_codec import JsonCodec, OrjsonCodec, create_json_codec
+from tests.test_utils import benchmark
+
+
+def make_server_profile(index):
+    profile_uri = '/rest/server-profiles/%08d-0a1b-4c2d-9e3f-%012d' % (index, index)
+    return {
+        'type': 'ServerProfileV6',
+        'uri': profile_uri,
+        'name': 'Profile %d' % index,
+        'description': 'Server profile of the blade in bay %d' % (index % 12 + 1),
+        'serialNumber': 'VCGL%06d' % index,
+        'serverHardwareUri': '/rest/server-hardware/30303437-3034-4D32-3230-3133%08d' % index,
+        'serverHardwareTypeUri': '/rest/server-hardware-types/B4B5F8A1-26E2-4C1C-9E42-A4D2E7F9F7E3',
+        'enclosureGroupUri': '/rest/enclosure-groups/9b8f7ec0-52b3-475e-84f4-c4eac51c2c20',
+        'enclosureBay': index % 12 + 1,
+        'affinity': 'Bay',
+        'status': 'OK',
+        'state': 'Normal',
+        'inProgress': False,
+        'eTag': '1508427284466/%d' % index,
+        'created': '2017-10-19T15:34:44.466Z',
+        'modified': '2017-10-19T15:42:13.104Z',
+        'bios': {'manageBios': True, 'overriddenSettings': [{'id': 'PowerProfile', 'value': 'MaxPerf'},
+                                                            {'id': 'ProcHyperthreading', 'value': 'Enabled'}]},
+        'boot': {'manageBoot': True, 'order': ['HardDisk', 'PXE', 'CD']},
+        'connections': [{
+            'id': port,
+            'name': 'Connection %d' % port,
+            'functionType': 'Ethernet',
+            'networkUri': '/rest/ethernet-networks/%08d-1111-2222-3333-444444444444' % port,
+            'portId': 'Mezz 3:%d-a' % port,
+            'requestedMbps': '2500',
+            'allocatedMbps': 2500,
+            'mac': '16:2E:5A:00:%02X:%02X' % (index % 256, port),
+            'boot': {'priority': 'NotBootable'},
+        } for port in range(1, 5)],
+        'localStorage': {'controllers': [{'deviceSlot': 'Embedded', 'mode': 'RAID', 'initialize': False,
+                                          'logicalDrives': [{'name': 'Boot', 'raidLevel': 'RAID1',
+                                                             'bootable': True, 'numPhysicalDrives': 2}]}]},
+    }
+
+
+def make_alert(index):
+    return {
+        'type': 'AlertResourceV3',
+        'uri': '/rest/alerts/%d' % index,
+        'category': 'alerts',
+        'severity': ['OK', 'Warning', 'Critical'][index % 3],
+        'alertState': 'Active',
+        'description': u'The power supply in bay %d reported a failure: Überspannung.' % (index % 6 + 1),
+        'correctiveAction': 'Reseat the power supply. If the problem persists, replace it.',
+        'healthCategory': 'Power',
+        'associatedResource': {'resourceName': 'Encl%d' % (index % 10),
+                               'resourceUri': '/rest/enclosures/09SGH102X6J%d' % (index % 10),
+                               'resourceCategory': 'enclosures'},
+        'changeLog': [],
+        'created': '2017-10-19T15:34:44.466Z',
+        'modified': '2017-10-19T15:42:13.104Z',
+    }
+
+
+def make_page(category, members):
+    return json.dumps({
+        'type': '%sCollection' % category,
+        'category': category,
+        'uri': '/rest/%s?start=0&count=%d' % (category, len(members)),
+        'nextPageUri': None,
+        'prevPageUri': None,
+        'start': 0,
+        'count': len(members),
+        'total': len(members),
+        'members': members,
+    }).encode('utf-8')
+
+
+class JsonCodecTest(unittest.TestCase):
+    def setUp(self):
+        self.codec = JsonCodec()
+
+    def test_loads_should_decode_bytes(self):
+        self.assertEqual(self.codec.loads(b'{"name": "\xc3\x9cber"}'), {'name': u'\xdcber'})
+
+    def test_loads_should_decode_string(self):
+        self.assertEqual(self.codec.loads('{"count": 1}'), {'count': 1})
+
+    def test_loads_should_raise_value_error_when_body_is_not_json(self):
+        self.assertRaises(ValueError, self.codec.loads, b'response data')
+
+    def test_loads_should_raise_value_error_when_body_is_binary(self):
+        self.assertRaises(ValueError, self.codec.loads, b'\xff\xfe')
+
+    def test_dumps(self):
+        self.assertEqual(self.codec.dumps({'name': 'resource'}), '{"name": "resource"}')
+
+
+@unittest.skipUnless(json_codec.orjson, 'orjson is not installed')
+class OrjsonCodecTest(unittest.TestCase):
+    def setUp(self):
+        self.codec = OrjsonCodec()
+
+    def test_loads_should_decode_bytes(self):
+        self.assertEqual(self.codec.loads(b'{"name": "\xc3\x9cber"}'), {'name': u'\xdcber'})
+
+    def test_loads_should_fall_back_to_json_module(self):
+        self.assertEqual(self.codec.loads(b'{"value": NaN}')['value'].__class__, float)
+
+    def test_loads_should_raise_value_error_when_body_is_not_json(self):
+        self.assertRaises(ValueError, self.codec.loads, b'response data')
+
+    def test_loads_should_raise_value_error_when_body_is_binary(self):
+        self.assertRaises(ValueError, self.codec.loads, b'\xff\xfe')
+
+    def test_dumps_should_encode_utf_8_bytes(self):
+        body = self.codec.dumps({'name': u'\xdcber', 1: True})
+
+        self.assertEqual(json.loads(body.decode('utf-8')), {'name': u'\xdcber', '1': True})
+
+    def test_loads_should_decode_collection_pages_like_json_module(self):
+        for page in [make_page('server-profiles', [make_server_profile(i) for i in range(20)]),
+                     make_page('alerts', [make_alert(i) for i in range(20)])]:
+            self.assertEqual(self.codec.loads(page), JsonCodec().loads(page))
+
+
+class CreateJsonCodecTest(unittest.TestCase):
+    def test_should_create_json_codec(self):
+        self.assertIsInstance(create_json_codec('json'), JsonCodec)
+
+    @patch.object(json_codec, 'orjson', None)
+    def test_should_default_to_json_codec_when_orjson_is_not_installed(self):
+        self.assertIs(type(create_json_codec()), JsonCodec)
+
+    @unittest.skipUnless(json_codec.orjson, 'orjson is not installed')
+    def test_should_default_to_orjson_codec_when_installed(self):
+        self.assertIsInstance(create_json_codec(), OrjsonCodec)
+
+    @patch.object(json_codec, 'orjson', None)
+    def test_should_raise_exception_when_codec_is_not_installed(self):
+        self.assertRaises(ValueError, create_json_codec, 'orjson')
+
+    def test_should_raise_exception_when_codec_is_unknown(self):
+        self.assertRaises(ValueError, create_json_codec, 'yaml')
+
+
+@benchmark
+@unittest.skipUnless(json_codec.orjson, 'orjson is not installed')
+class JsonCodecBenchmarkTest(unittest.TestCase):
+    """
+    Compares the codecs decoding synthetic collection pages, shaped like the ones returned by the appliance.
+    """
+    REPEAT = 5
+
+    def assert_faster_decoding(self, page):
+        codecs = [JsonCodec(), OrjsonCodec()]
+        json_time, orjson_time = [min(timeit.repeat(lambda: codec.loads(page), number=1, repeat=self.REPEAT))
+                                  for codec in codecs]
+
+        self.assertLess(orjson_time, json_time)
+
+    def test_server_profiles_page(self):
+        self.assert_faster_decoding(make_page('server-profiles', [make_server_profile(i) for i in range(500)]))
+
+    def test_alerts_page(self):
+        self.assert_faster_decoding(make_page('alerts', [make_alert(i) for i in range(2000)]))
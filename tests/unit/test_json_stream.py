@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import io
+import json
+import unittest
+
+from mock import Mock
+
+from hpOneView.json_codec import JsonCodec
+from hpOneView.json_stream import CollectionStream
+
+
+class CollectionStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.members = [
+            {'name': 'quote " and brackets ]}[{', 'path': 'C:\\\\', 'tags': ['a', {'b': None}]},
+            {'name': u'\xdcberspannung', 'value': -1.5e3, 'enabled': True},
+            [],
+            'text',
+            42,
+            None,
+        ]
+        self.page = {'type': 'AlertResourceCollectionV300', 'uri': '/rest/alerts?start=0&count=6',
+                     'members': self.members, 'nextPageUri': '/rest/alerts?start=6&count=6', 'total': 12}
+        self.body = json.dumps(self.page, indent=2).encode('utf-8')
+
+    def make_stream(self, body=None, chunk_size=65536, **kwargs):
+        return CollectionStream(io.BytesIO(self.body if body is None else body), chunk_size=chunk_size, **kwargs)
+
+    def test_should_yield_members(self):
+        stream = self.make_stream()
+
+        self.assertEqual(list(stream), self.members)
+
+    def test_should_keep_fields(self):
+        stream = self.make_stream()
+
+        list(stream)
+
+        self.assertEqual(stream.fields, {'type': 'AlertResourceCollectionV300', 'uri': '/rest/alerts?start=0&count=6',
+                                         'nextPageUri': '/rest/alerts?start=6&count=6', 'total': 12})
+
+    def test_should_parse_across_chunk_boundaries(self):
+        for chunk_size in (1, 2, 3, 7, 64):
+            stream = self.make_stream(chunk_size=chunk_size)
+
+            self.assertEqual(list(stream), self.members)
+            self.assertEqual(stream.fields['total'], 12)
+
+    def test_should_yield_member_before_reading_whole_body(self):
+        stream = self.make_stream(chunk_size=64)
+
+        next(iter(stream))
+
+        self.assertLess(stream.bytes_read, len(self.body))
+
+    def test_should_accept_page_without_members(self):
+        stream = self.make_stream(b'{"members": [], "total": 0}')
+
+        self.assertEqual(list(stream), [])
+        self.assertEqual(stream.fields, {'total': 0})
+
+    def test_should_accept_empty_object(self):
+        stream = self.make_stream(b' { } ')
+
+        self.assertEqual(list(stream), [])
+        self.assertEqual(stream.fields, {})
+
+    def test_should_decode_with_json_codec(self):
+        json_codec = Mock(wraps=JsonCodec())
+
+        list(self.make_stream(b'{"members": [{"id": 1}]}', json_codec=json_codec))
+
+        json_codec.loads.assert_any_call(bytearray(b'{"id": 1}'))
+
+    def test_should_call_on_close_when_completed(self):
+        on_close = Mock()
+
+        list(self.make_stream(on_close=on_close))
+
+        on_close.assert_called_once_with(True, None)
+
+    def test_should_call_on_close_when_closed_early(self):
+        on_close = Mock()
+        stream = self.make_stream(on_close=on_close)
+
+        with stream:
+            next(iter(stream))
+
+        self.assertTrue(stream.closed)
+        on_close.assert_called_once_with(False, None)
+
+    def test_should_stop_when_closed_during_iteration(self):
+        stream = self.make_stream()
+
+        members = iter(stream)
+        next(members)
+        stream.close()
+
+        self.assertEqual(list(members), [])
+
+    def test_should_raise_exception_when_iterated_twice(self):
+        stream = self.make_stream()
+        list(stream)
+
+        self.assertRaises(ValueError, iter, stream)
+
+    def test_should_raise_exception_when_body_is_truncated(self):
+        on_close = Mock()
+        stream = self.make_stream(self.body[:-40], chunk_size=16, on_close=on_close)
+
+        self.assertRaises(ValueError, list, stream)
+        self.assertFalse(on_close.call_args[0][0])
+        self.assertIsInstance(on_close.call_args[0][1], ValueError)
+
+    def test_should_raise_exception_when_body_is_not_an_object(self):
+        self.assertRaises(ValueError, list, self.make_stream(b'[{"id": 1}]'))
+
+    def test_should_raise_exception_when_member_is_invalid(self):
+        self.assertRaises(ValueError, list, self.make_stream(b'{"members": [{"id": 1}, {"id": }]}'))
+
+    def test_should_raise_exception_when_delimiter_is_missing(self):
+        self.assertRaises(ValueError, list, self.make_stream(b'{"members": [{"id": 1} {"id": 2}]}'))
+
+    def test_should_raise_exception_on_trailing_data(self):
+        self.assertRaises(ValueError, list, self.make_stream(b'{"members": []} {}'))
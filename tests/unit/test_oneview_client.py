@@ -26,7 +26,9 @@ import unittest
 import mock
 
 from hpOneView.connection import connection
+from hpOneView.json_codec import JsonCodec
 from hpOneView.oneview_client import OneViewClient
+from hpOneView.session_cache import DEFAULT_SESSION_CACHE_PATH
 from hpOneView.resources.security.certificate_authority import CertificateAuthority
 from hpOneView.resources.data_services.metric_streaming import MetricStreaming
 from hpOneView.resources.facilities.power_devices import PowerDevices
@@ -252,12 +254,193 @@ class OneViewClientTest(unittest.TestCase):
         self.assertEqual(i3s.connection.get_host(), "172.16.102.50")
         self.assertEqual(client.connection.get_host(), "172.16.102.59")
 
+    @mock.patch.object(connection, 'login')
+    def test_max_page_workers_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "max_page_workers": 8,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_max_page_workers(), 8)
+
+    @mock.patch.object(connection, 'login')
+    def test_response_cache_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "response_cache": {"ttls": {"/rest/server-hardware-types": 600}, "max_entries": 100},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_response_cache().get_ttl('/rest/server-hardware-types/1'), 600)
+
+    @mock.patch.object(connection, 'login')
+    def test_download_options_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "download": {"max_workers": 4, "segment_size": 1048576},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection._download_workers, 4)
+        self.assertEqual(client.connection._download_segment_size, 1048576)
+
+    @mock.patch.object(connection, 'login')
+    def test_timeouts_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "timeouts": {"connect_timeout": 10, "read_timeout": 120},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection._connect_timeout, 10)
+        self.assertEqual(client.connection._read_timeout, 120)
+
+    @mock.patch.object(connection, 'login')
+    def test_retry_policy_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "retry_policy": {"max_attempts": 3, "deadline": 30},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_retry_policy().max_attempts, 3)
+        self.assertEqual(client.connection.get_retry_policy().deadline, 30)
+
+    @mock.patch.object(connection, 'login')
+    def test_request_limits_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "request_limits": [{"max_in_flight": 16},
+                                     {"prefix": "/rest/server-profiles", "methods": ["POST"], "rate": 1}],
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        limits = client.connection.get_request_throttle().limits
+        self.assertEqual([str(limit) for limit in limits], ['* /', 'POST /rest/server-profiles'])
+
+    @mock.patch.object(connection, 'login')
+    def test_request_coalescing_should_be_enabled_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "coalesce_requests": True,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertIsNotNone(client.connection.get_request_coalescer())
+
+    @mock.patch.object(connection, 'login')
+    def test_json_codec_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "json_codec": "json",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertIs(type(client.connection.get_json_codec()), JsonCodec)
+
+    @mock.patch.object(connection, 'login')
+    def test_circuit_breaker_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "circuit_breaker": {"failure_threshold": 3, "prefixes": ["/rest/firmware-drivers"]},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        stats = client.connection.get_circuit_breakers().get_stats()
+        self.assertEqual(sorted(stats.keys()), ['172.16.102.59', '172.16.102.59/rest/firmware-drivers'])
+        self.assertEqual(client.connection.get_circuit_breakers().get('/rest/enclosures').failure_threshold, 3)
+
+    @mock.patch.object(connection, 'login')
+    def test_image_streamer_client_should_get_its_own_circuit_breaker(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "image_streamer_ip": "172.16.102.50",
+                  "circuit_breaker": {"failure_threshold": 3},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+        i3s = client.create_image_streamer_client()
+
+        i3s_breakers = i3s.connection.get_circuit_breakers()
+        self.assertIsNot(i3s_breakers, client.connection.get_circuit_breakers())
+        self.assertEqual(list(i3s_breakers.get_stats().keys()), ['172.16.102.50'])
+        self.assertEqual(i3s_breakers.get('/rest/build-plans').failure_threshold, 3)
+
+    @mock.patch.object(connection, 'login')
+    def test_image_streamer_client_should_not_get_circuit_breaker_by_default(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "image_streamer_ip": "172.16.102.50",
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertIsNone(client.create_image_streamer_client().connection.get_circuit_breakers())
+
+    @mock.patch.object(connection, 'login')
+    def test_session_cache_should_be_set_on_connection(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "session_cache": {"path": "/tmp/sessions.json", "ttl": 600},
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_session_cache().path, "/tmp/sessions.json")
+        self.assertEqual(client.connection.get_session_cache().ttl, 600)
+
+    @mock.patch.object(connection, 'login')
+    def test_session_cache_should_use_default_file(self, mock_login):
+        config = {"ip": "172.16.102.59",
+                  "session_cache": True,
+                  "credentials": {
+                      "userName": "administrator",
+                      "password": "password"}}
+
+        client = OneViewClient(config)
+
+        self.assertEqual(client.connection.get_session_cache().path, DEFAULT_SESSION_CACHE_PATH)
+
     def test_fc_networks_has_right_type(self):
         self.assertIsInstance(self._oneview.fc_networks, FcNetworks)
 
     def test_fc_networks_has_value(self):
         self.assertIsNotNone(self._oneview.fc_networks)
 
+    def test_resource_classes_should_be_attributes_of_module(self):
+        from hpOneView import oneview_client
+        from hpOneView.oneview_client import FcNetworks as ModuleFcNetworks
+
+        self.assertIs(ModuleFcNetworks, FcNetworks)
+        for name, module_name in oneview_client.RESOURCE_CLASSES.items():
+            self.assertEqual(getattr(oneview_client, name).__module__, module_name)
+
+    def test_fc_networks_should_use_class_patched_on_module(self):
+        with mock.patch('hpOneView.oneview_client.FcNetworks') as mock_fc_networks:
+            self.assertIs(self._oneview.fc_networks, mock_fc_networks.return_value)
+
     def test_lazy_loading_fc_networks(self):
         fcn = self._oneview.fc_networks
         self.assertEqual(fcn, self._oneview.fc_networks)
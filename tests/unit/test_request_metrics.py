@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+from hpOneView.request_metrics import Histogram, MetricsCollector, RequestMetrics, get_uri_template
+
+
+def make_request_metrics(method, uri, status=200, total_time=0.2, time_to_first_byte=0.1, tls_handshake_time=None,
+                         bytes_sent=0, bytes_received=0):
+    metrics = RequestMetrics(method, uri, bytes_sent)
+    metrics.status = status
+    metrics.total_time = total_time
+    metrics.time_to_first_byte = time_to_first_byte
+    metrics.tls_handshake_time = tls_handshake_time
+    metrics.bytes_received = bytes_received
+    return metrics
+
+
+class GetUriTemplateTest(unittest.TestCase):
+    def test_should_replace_ids(self):
+        self.assertEqual(get_uri_template('/rest/server-profiles/37333036-3831-4753-4831-30305838524E'),
+                         '/rest/server-profiles/{id}')
+        self.assertEqual(get_uri_template('/rest/enclosures/09USE133E5H4/configuration'),
+                         '/rest/enclosures/{id}/configuration')
+        self.assertEqual(get_uri_template('/rest/id-pools/ipv4/ranges/5'), '/rest/id-pools/ipv4/ranges/{id}')
+
+    def test_should_remove_query_string(self):
+        self.assertEqual(get_uri_template('/rest/server-hardware-types?start=0&count=-1'),
+                         '/rest/server-hardware-types')
+
+
+class HistogramTest(unittest.TestCase):
+    def test_observe_should_count_values_in_cumulative_buckets(self):
+        histogram = Histogram(buckets=(0.1, 1))
+
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.get_cumulative_counts(), [(0.1, 2), (1, 3), (float('inf'), 4)])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.collector = MetricsCollector(buckets=(0.1, 1))
+
+    def test_to_dict_should_group_requests_by_endpoint(self):
+        self.collector(make_request_metrics('GET', '/rest/enclosures/09USE133E5H4', bytes_received=100,
+                                            tls_handshake_time=0.05))
+        self.collector(make_request_metrics('GET', '/rest/enclosures/09USE133E5H5', status=404, bytes_received=20))
+        self.collector(make_request_metrics('PUT', '/rest/enclosures/09USE133E5H4', status=None, total_time=1.5,
+                                            time_to_first_byte=None, bytes_sent=50))
+
+        metrics = self.collector.to_dict()
+
+        get_metrics = metrics['requests']['GET /rest/enclosures/{id}']
+        self.assertEqual(get_metrics['count'], 2)
+        self.assertEqual(get_metrics['statuses'], {'200': 1, '404': 1})
+        self.assertEqual(get_metrics['bytes_received'], 120)
+        self.assertEqual(get_metrics['duration']['count'], 2)
+        put_metrics = metrics['requests']['PUT /rest/enclosures/{id}']
+        self.assertEqual(put_metrics['statuses'], {'error': 1})
+        self.assertEqual(put_metrics['bytes_sent'], 50)
+        self.assertEqual(put_metrics['time_to_first_byte']['count'], 0)
+        self.assertEqual(metrics['tls_handshake']['count'], 1)
+
+    def test_to_dict_should_include_queue_time_of_limited_requests(self):
+        limited = make_request_metrics('POST', '/rest/server-profiles')
+        limited.queue_time = 0.2
+        self.collector(limited)
+        self.collector(make_request_metrics('POST', '/rest/server-profiles'))
+
+        queue_time = self.collector.to_dict()['requests']['POST /rest/server-profiles']['queue_time']
+
+        self.assertEqual(queue_time['count'], 1)
+        self.assertEqual(queue_time['sum'], 0.2)
+
+    def test_record_task_wait_should_group_by_name_and_state(self):
+        self.collector.record_task_wait({'name': 'Create', 'taskState': 'Completed'}, 30)
+        self.collector.record_task_wait({'name': 'Create', 'taskState': 'Completed'}, 0.5)
+
+        task_waits = self.collector.to_dict()['task_waits']
+
+        self.assertEqual(task_waits['Create Completed']['count'], 2)
+        self.assertEqual(task_waits['Create Completed']['sum'], 30.5)
+
+    def test_record_coalesced_request_should_group_by_endpoint(self):
+        self.collector.record_coalesced_request('GET', '/rest/enclosure-groups/a3da6cd5-7e12-4c1b-b2b9-5b3ef9b1a8b0')
+        self.collector.record_coalesced_request('GET', '/rest/enclosure-groups/01e2d27d-9b52-4c36-8d45-9e0e1c2b59ff')
+
+        self.assertEqual(self.collector.to_dict()['coalesced_requests'], {'GET /rest/enclosure-groups/{id}': 2})
+
+    def test_to_prometheus_should_include_coalesced_requests(self):
+        self.collector.record_coalesced_request('GET', '/rest/enclosures/09USE133E5H4')
+
+        self.assertIn('hponeview_coalesced_requests_total{endpoint="/rest/enclosures/{id}",method="GET"} 1\n',
+                      self.collector.to_prometheus())
+
+    def test_to_prometheus(self):
+        self.collector(make_request_metrics('GET', '/rest/enclosures/09USE133E5H4', bytes_received=100))
+        self.collector.record_task_wait({'name': 'Create', 'taskState': 'Completed'}, 0.5)
+
+        text = self.collector.to_prometheus()
+
+        self.assertIn('# TYPE hponeview_requests_total counter\n', text)
+        self.assertIn('hponeview_requests_total{endpoint="/rest/enclosures/{id}",method="GET",status="200"} 1\n',
+                      text)
+        self.assertIn('hponeview_request_bytes_received_total{endpoint="/rest/enclosures/{id}",method="GET"} 100\n',
+                      text)
+        self.assertIn('hponeview_request_duration_seconds_bucket{endpoint="/rest/enclosures/{id}",le="0.1",'
+                      'method="GET"} 0\n', text)
+        self.assertIn('hponeview_request_duration_seconds_bucket{endpoint="/rest/enclosures/{id}",le="1.0",'
+                      'method="GET"} 1\n', text)
+        self.assertIn('hponeview_request_duration_seconds_bucket{endpoint="/rest/enclosures/{id}",le="+Inf",'
+                      'method="GET"} 1\n', text)
+        self.assertIn('hponeview_request_duration_seconds_count{endpoint="/rest/enclosures/{id}",method="GET"} 1\n',
+                      text)
+        self.assertIn('hponeview_tls_handshake_seconds_count 0\n', text)
+        self.assertIn('hponeview_task_wait_seconds_sum{name="Create",state="Completed"} 0.5\n', text)
+
+    def test_to_prometheus_should_escape_label_values(self):
+        self.collector.record_task_wait({'name': 'Say "hi"', 'taskState': 'Completed'}, 0.5)
+
+        self.assertIn('name="Say \\"hi\\""', self.collector.to_prometheus())
+
+    def test_clear(self):
+        self.collector(make_request_metrics('GET', '/rest/enclosures'))
+
+        self.collector.clear()
+
+        self.assertEqual(self.collector.to_dict()['requests'], {})
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+
+from mock import patch
+
+from hpOneView.response_cache import ResponseCache
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(ttls={'/rest/server-hardware-types': 600,
+                                         '/rest/server-hardware-types/1': 60},
+                                   max_entries=2)
+
+    def test_get_ttl_should_use_longest_prefix(self):
+        self.assertEqual(self.cache.get_ttl('/rest/server-hardware-types/1'), 60)
+        self.assertEqual(self.cache.get_ttl('/rest/server-hardware-types/2'), 600)
+
+    def test_get_ttl_should_use_default_ttl_when_no_prefix_matches(self):
+        cache = ResponseCache(ttls={'/rest/enclosure-groups': 600}, default_ttl=30)
+
+        self.assertEqual(cache.get_ttl('/rest/server-profiles'), 30)
+
+    def test_get_should_return_cached_body(self):
+        self.cache.put('/rest/server-hardware-types/2', {'name': 'SY 480 Gen9'})
+
+        self.assertEqual(self.cache.get('/rest/server-hardware-types/2'), {'name': 'SY 480 Gen9'})
+
+    def test_get_should_return_copy_of_cached_body(self):
+        self.cache.put('/rest/server-hardware-types/2', {'name': 'SY 480 Gen9'})
+
+        self.cache.get('/rest/server-hardware-types/2')['name'] = 'changed'
+
+        self.assertEqual(self.cache.get('/rest/server-hardware-types/2'), {'name': 'SY 480 Gen9'})
+
+    def test_put_should_not_cache_uri_without_ttl(self):
+        self.cache.put('/rest/server-profiles/1', {'name': 'profile'})
+
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get('/rest/server-profiles/1'))
+
+    @patch('hpOneView.response_cache.time.time')
+    def test_get_should_not_return_expired_body(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.put('/rest/server-hardware-types/1', {'name': 'SY 480 Gen9'})
+
+        mock_time.return_value = 1061
+
+        self.assertIsNone(self.cache.get('/rest/server-hardware-types/1'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_put_should_evict_least_recently_used_entry(self):
+        self.cache.put('/rest/server-hardware-types/1', {'id': 1})
+        self.cache.put('/rest/server-hardware-types/2', {'id': 2})
+        self.cache.get('/rest/server-hardware-types/1')
+
+        self.cache.put('/rest/server-hardware-types/3', {'id': 3})
+
+        self.assertEqual(self.cache.get('/rest/server-hardware-types/1'), {'id': 1})
+        self.assertIsNone(self.cache.get('/rest/server-hardware-types/2'))
+        self.assertEqual(self.cache.get('/rest/server-hardware-types/3'), {'id': 3})
+
+    def test_get_stats_should_count_hits_and_misses(self):
+        self.cache.put('/rest/server-hardware-types/1', {'id': 1})
+        self.cache.get('/rest/server-hardware-types/1')
+        self.cache.get('/rest/server-hardware-types/1')
+        self.cache.get('/rest/server-hardware-types/2')
+
+        self.assertEqual(self.cache.get_stats(), dict(hits=2, misses=1, revalidations=0, entries=1))
+
+    def test_invalidate_should_remove_resource_subresources_and_collections(self):
+        cache = ResponseCache(default_ttl=600)
+        cache.put('/rest/enclosures/1', {})
+        cache.put('/rest/enclosures/1/utilization', {})
+        cache.put('/rest/enclosures?filter=name', {})
+        cache.put('/rest/enclosures/10', {})
+        cache.put('/rest/enclosure-groups', {})
+
+        cache.invalidate('/rest/enclosures/1?force=True')
+
+        self.assertIsNone(cache.get('/rest/enclosures/1'))
+        self.assertIsNone(cache.get('/rest/enclosures/1/utilization'))
+        self.assertIsNone(cache.get('/rest/enclosures?filter=name'))
+        self.assertEqual(cache.get('/rest/enclosures/10'), {})
+        self.assertEqual(cache.get('/rest/enclosure-groups'), {})
+
+    def test_clear_should_remove_all_entries(self):
+        self.cache.put('/rest/server-hardware-types/1', {'id': 1})
+
+        self.cache.clear()
+
+        self.assertEqual(len(self.cache), 0)
+
+
+class RevalidatingResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(ttls={'/rest/server-hardware-types': 600}, revalidate=True)
+
+    def test_put_should_keep_response_with_etag_and_no_ttl(self):
+        self.cache.put('/rest/server-profiles/1', {'name': 'profile'}, etag='1')
+
+        self.assertIsNone(self.cache.get('/rest/server-profiles/1'))
+        self.assertEqual(self.cache.get_etag('/rest/server-profiles/1'), '1')
+
+    def test_put_should_not_keep_response_without_etag_and_ttl(self):
+        self.cache.put('/rest/server-profiles/1', {'name': 'profile'})
+
+        self.assertIsNone(self.cache.get_etag('/rest/server-profiles/1'))
+        self.assertEqual(len(self.cache), 0)
+
+    @patch('hpOneView.response_cache.time.time')
+    def test_get_etag_should_return_etag_of_expired_response(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.put('/rest/server-hardware-types/1', {'name': 'SY 480 Gen9'}, etag='1')
+
+        mock_time.return_value = 1601
+
+        self.assertIsNone(self.cache.get('/rest/server-hardware-types/1'))
+        self.assertEqual(self.cache.get_etag('/rest/server-hardware-types/1'), '1')
+
+    @patch('hpOneView.response_cache.time.time')
+    def test_revalidate_should_renew_expired_response(self, mock_time):
+        mock_time.return_value = 1000
+        self.cache.put('/rest/server-hardware-types/1', {'name': 'SY 480 Gen9'}, etag='1')
+        mock_time.return_value = 1601
+
+        body = self.cache.revalidate('/rest/server-hardware-types/1')
+
+        self.assertEqual(body, {'name': 'SY 480 Gen9'})
+        self.assertEqual(self.cache.get('/rest/server-hardware-types/1'), {'name': 'SY 480 Gen9'})
+        self.assertEqual(self.cache.get_stats(), dict(hits=1, misses=0, revalidations=1, entries=1))
+
+    def test_revalidate_should_return_none_when_response_is_not_kept(self):
+        self.assertIsNone(self.cache.revalidate('/rest/server-profiles/1'))
+
+    def test_get_etag_should_return_none_when_revalidation_is_disabled(self):
+        cache = ResponseCache(default_ttl=600)
+        cache.put('/rest/server-profiles/1', {'name': 'profile'}, etag='1')
+
+        self.assertIsNone(cache.get_etag('/rest/server-profiles/1'))
+
+    def test_invalidate_should_remove_kept_response(self):
+        self.cache.put('/rest/server-profiles/1', {'name': 'profile'}, etag='1')
+
+        self.cache.invalidate('/rest/server-profiles/1')
+
+        self.assertIsNone(self.cache.get_etag('/rest/server-profiles/1'))
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import unittest
+from errno import ECONNREFUSED, ECONNRESET, ENOENT
+from http.client import BadStatusLine
+
+from mock import Mock, patch, call
+
+from hpOneView.deadline import Deadline
+from hpOneView.retry import RetryPolicy
+
+
+def make_response(status, retry_after=None):
+    response = Mock(status=status)
+    response.getheader.side_effect = lambda name, default=None: retry_after if name == 'Retry-After' else default
+    return response
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, deadline=60, backoff_base=1, backoff_max=10)
+
+    @patch('random.uniform')
+    def test_get_backoff_should_use_full_jitter_on_exponential_backoff(self, mock_uniform):
+        mock_uniform.side_effect = lambda low, high: high
+
+        self.assertEqual([self.policy.get_backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 8, 10])
+        mock_uniform.assert_has_calls([call(0, 1), call(0, 2), call(0, 4), call(0, 8), call(0, 10)])
+
+    def test_get_retry_after_should_parse_seconds(self):
+        self.assertEqual(RetryPolicy.get_retry_after(make_response(503, '12')), 12.0)
+
+    @patch('time.time')
+    def test_get_retry_after_should_parse_http_date(self, mock_time):
+        mock_time.return_value = 784111767.0  # Sun, 06 Nov 1994 08:49:27 GMT
+
+        delay = RetryPolicy.get_retry_after(make_response(503, 'Sun, 06 Nov 1994 08:49:37 GMT'))
+
+        self.assertEqual(delay, 10.0)
+
+    def test_get_retry_after_should_return_none_when_header_is_invalid(self):
+        self.assertIsNone(RetryPolicy.get_retry_after(make_response(503)))
+        self.assertIsNone(RetryPolicy.get_retry_after(make_response(503, 'soon')))
+
+    def test_is_retryable_error(self):
+        self.assertTrue(self.policy.is_retryable_error(BadStatusLine(0)))
+        self.assertTrue(self.policy.is_retryable_error(EnvironmentError(ECONNRESET, 'Connection reset')))
+        self.assertFalse(self.policy.is_retryable_error(EnvironmentError(ENOENT, 'No such file')))
+        self.assertFalse(self.policy.is_retryable_error(ValueError('error')))
+
+    def test_get_retry_delay_should_retry_safe_methods_on_connection_errors(self):
+        error = EnvironmentError(ECONNRESET, 'Connection reset')
+
+        self.assertIsNotNone(self.policy.get_retry_delay('GET', 1, 0, error=error))
+        self.assertIsNone(self.policy.get_retry_delay('POST', 1, 0, error=error))
+
+    def test_get_retry_delay_should_retry_any_method_when_connection_is_refused(self):
+        error = EnvironmentError(ECONNREFUSED, 'Connection refused')
+
+        self.assertIsNotNone(self.policy.get_retry_delay('POST', 1, 0, error=error))
+
+    def test_get_retry_delay_should_use_retry_after(self):
+        self.assertEqual(self.policy.get_retry_delay('GET', 1, 0, response=make_response(503, '5')), 5.0)
+
+    def test_get_retry_delay_should_retry_too_many_requests_for_any_method(self):
+        self.assertEqual(self.policy.get_retry_delay('POST', 1, 0, response=make_response(429, '5')), 5.0)
+        self.assertIsNone(self.policy.get_retry_delay('POST', 1, 0, response=make_response(503, '5')))
+
+    def test_get_retry_delay_should_not_retry_other_statuses(self):
+        self.assertIsNone(self.policy.get_retry_delay('GET', 1, 0, response=make_response(500)))
+        self.assertIsNone(self.policy.get_retry_delay('GET', 1, 0, response=make_response(200)))
+
+    def test_get_retry_delay_should_stop_at_max_attempts(self):
+        self.assertIsNotNone(self.policy.get_retry_delay('GET', 2, 0, response=make_response(503)))
+        self.assertIsNone(self.policy.get_retry_delay('GET', 3, 0, response=make_response(503)))
+
+    def test_get_retry_delay_should_stop_at_deadline(self):
+        self.assertIsNone(self.policy.get_retry_delay('GET', 1, 58, response=make_response(503, '5')))
+
+    @patch('time.sleep')
+    def test_execute_should_retry_until_success(self, mock_sleep):
+        ok_response = make_response(200)
+        send = Mock(side_effect=[BadStatusLine(0), (make_response(503, '2'), 'busy'), (ok_response, 'body')])
+        release = Mock()
+
+        result = self.policy.execute('GET', '/rest/resource', send, release)
+
+        self.assertEqual(result, (ok_response, 'body'))
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(release.call_args[0][1], 'busy')
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(mock_sleep.call_args_list[1], call(2.0))
+
+    @patch('time.sleep')
+    def test_execute_should_raise_last_error_when_attempts_are_exhausted(self, mock_sleep):
+        send = Mock(side_effect=BadStatusLine(0))
+
+        self.assertRaises(BadStatusLine, self.policy.execute, 'GET', '/rest/resource', send)
+        self.assertEqual(send.call_count, 3)
+
+    @patch('time.sleep')
+    def test_execute_should_return_last_response_when_attempts_are_exhausted(self, mock_sleep):
+        busy_response = make_response(503)
+        send = Mock(return_value=(busy_response, 'busy'))
+
+        result = self.policy.execute('GET', '/rest/resource', send)
+
+        self.assertEqual(result, (busy_response, 'busy'))
+        self.assertEqual(send.call_count, 3)
+
+    @patch('time.sleep')
+    def test_execute_should_not_wait_past_deadline(self, mock_sleep):
+        busy_response = make_response(503, '30')
+        send = Mock(side_effect=[(busy_response, 'busy'), BadStatusLine(0)])
+
+        result = self.policy.execute('GET', '/rest/resource', send, deadline=Deadline(10))
+
+        self.assertEqual(result, (busy_response, 'busy'))
+        self.assertEqual(send.call_count, 1)
+        mock_sleep.assert_not_called()
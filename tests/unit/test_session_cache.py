@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from mock import patch
+
+from hpOneView import session_cache
+from hpOneView.session_cache import SessionCache
+
+
+class SessionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache', 'sessions.json')
+        self.cache = SessionCache(self.path, ttl=600)
+        self.credentials = {'userName': 'administrator', 'password': 'secret'}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_should_return_none_without_file(self):
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, self.credentials))
+
+    def test_put_should_store_session(self):
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+
+        self.assertEqual(self.cache.get('172.16.102.59', 300, self.credentials), 'session-1')
+        self.assertEqual(SessionCache(self.path).get('172.16.102.59', 300, self.credentials), 'session-1')
+
+    def test_put_should_not_store_password(self):
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+
+        with open(self.path) as cache_file:
+            self.assertNotIn('secret', cache_file.read())
+
+    @unittest.skipUnless(os.name == 'posix', 'POSIX permissions')
+    def test_put_should_restrict_permissions(self):
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(self.path)).st_mode), 0o700)
+
+    @unittest.skipUnless(os.name == 'posix', 'POSIX permissions')
+    def test_get_should_ignore_file_accessible_to_other_users(self):
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+        os.chmod(self.path, 0o644)
+
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, self.credentials))
+
+    def test_get_should_distinguish_appliances_users_and_api_versions(self):
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+
+        self.assertIsNone(self.cache.get('172.16.102.60', 300, self.credentials))
+        self.assertIsNone(self.cache.get('172.16.102.59', 500, self.credentials))
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, {'userName': 'operator'}))
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, dict(self.credentials, authLoginDomain='LOCAL')))
+
+    @patch.object(session_cache.time, 'time')
+    def test_get_should_return_none_after_ttl(self, mock_time):
+        mock_time.return_value = 1000.0
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+
+        mock_time.return_value = 1600.0
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, self.credentials))
+
+    def test_remove_should_keep_other_sessions(self):
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+        self.cache.put('172.16.102.60', 300, self.credentials, 'session-2')
+
+        self.cache.remove('172.16.102.59', 300, self.credentials)
+
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, self.credentials))
+        self.assertEqual(self.cache.get('172.16.102.60', 300, self.credentials), 'session-2')
+
+    def test_get_should_ignore_invalid_file(self):
+        os.makedirs(os.path.dirname(self.path), 0o700)
+        with open(self.path, 'w') as cache_file:
+            cache_file.write('not json')
+        os.chmod(self.path, 0o600)
+
+        self.assertIsNone(self.cache.get('172.16.102.59', 300, self.credentials))
+
+    def test_get_should_ignore_file_without_sessions(self):
+        os.makedirs(os.path.dirname(self.path), 0o700)
+        for content in ({}, {'sessions': None}, {'sessions': []}):
+            with open(self.path, 'w') as cache_file:
+                json.dump(content, cache_file)
+            os.chmod(self.path, 0o600)
+
+            self.assertIsNone(self.cache.get('172.16.102.59', 300, self.credentials))
+            self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+            self.assertEqual(self.cache.get('172.16.102.59', 300, self.credentials), 'session-1')
+
+    def test_put_should_replace_invalid_file(self):
+        os.makedirs(os.path.dirname(self.path), 0o700)
+        with open(self.path, 'w') as cache_file:
+            json.dump([], cache_file)
+        os.chmod(self.path, 0o600)
+
+        self.cache.put('172.16.102.59', 300, self.credentials, 'session-1')
+
+        self.assertEqual(self.cache.get('172.16.102.59', 300, self.credentials), 'session-1')
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import threading
+import time
+import unittest
+
+import mock
+
+from hpOneView.deadline import Deadline
+from hpOneView.exceptions import HPOneViewException, HPOneViewTimeout
+from hpOneView.single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def make_blocking_function(self, result=None, error=None):
+        def function():
+            self.started.set()
+            self.release.wait(5)
+            if error is not None:
+                raise error
+            return result
+
+        return function
+
+    def start_leader(self, function, key='/rest/enclosures/1'):
+        results = []
+
+        def run():
+            try:
+                results.append(self.single_flight.do(key, function))
+            except Exception as error:
+                results.append(error)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.started.wait(5)
+        return thread, results
+
+    def wait_for_waiters(self, count):
+        for _ in range(500):
+            if self.single_flight.get_stats()['coalesced'] >= count:
+                return
+            time.sleep(0.01)
+
+    def test_do_should_return_result(self):
+        result = self.single_flight.do('/rest/enclosures/1', lambda: {'name': 'enclosure'})
+
+        self.assertEqual(result, ({'name': 'enclosure'}, False))
+
+    def test_do_should_share_result_of_call_in_flight(self):
+        result = {'name': 'enclosure'}
+        leader, leader_results = self.start_leader(self.make_blocking_function(result))
+
+        waiter_results = []
+        waiter = threading.Thread(
+            target=lambda: waiter_results.append(self.single_flight.do('/rest/enclosures/1', lambda: 'not called')))
+        waiter.start()
+        self.wait_for_waiters(1)
+        self.release.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertEqual(leader_results, [(result, False)])
+        self.assertEqual(waiter_results, [(result, True)])
+        self.assertIsNot(waiter_results[0][0], result)
+        self.assertEqual(self.single_flight.get_stats(), dict(executed=1, coalesced=1, in_flight=0))
+
+    def test_do_should_copy_result_before_leader_returns_it(self):
+        leader, leader_results = self.start_leader(self.make_blocking_function({'name': 'enclosure'}))
+        waiting = threading.Event()
+        modified = threading.Event()
+
+        def check():
+            waiting.set()
+            modified.wait(5)
+
+        # The waiter copies the result only after the caller of the leader modified it
+        deadline = mock.Mock(remaining=mock.Mock(side_effect=[0, 5]), check=check)
+        waiter_results = []
+        waiter = threading.Thread(target=lambda: waiter_results.append(
+            self.single_flight.do('/rest/enclosures/1', lambda: 'not called', deadline)))
+        waiter.start()
+        waiting.wait(5)
+        self.release.set()
+        leader.join(5)
+        leader_results[0][0]['name'] = 'modified'
+        modified.set()
+        waiter.join(5)
+
+        self.assertEqual(waiter_results, [({'name': 'enclosure'}, True)])
+
+    def test_do_should_raise_error_of_call_in_flight(self):
+        error = HPOneViewException('Not found')
+        leader, leader_results = self.start_leader(self.make_blocking_function(error=error))
+
+        waiter_results = []
+
+        def wait():
+            try:
+                self.single_flight.do('/rest/enclosures/1', lambda: 'not called')
+            except Exception as e:
+                waiter_results.append(e)
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        self.wait_for_waiters(1)
+        self.release.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertEqual(leader_results, [error])
+        self.assertEqual(waiter_results, [error])
+
+    def test_do_should_not_coalesce_different_keys(self):
+        leader, _ = self.start_leader(self.make_blocking_function())
+
+        result = self.single_flight.do('/rest/enclosures/2', lambda: 'enclosure 2')
+        self.release.set()
+        leader.join(5)
+
+        self.assertEqual(result, ('enclosure 2', False))
+
+    def test_do_should_run_again_after_call_finished(self):
+        self.single_flight.do('/rest/enclosures/1', lambda: 1)
+
+        result = self.single_flight.do('/rest/enclosures/1', lambda: 2)
+
+        self.assertEqual(result, (2, False))
+        self.assertEqual(self.single_flight.get_stats(), dict(executed=2, coalesced=0, in_flight=0))
+
+    def test_do_should_raise_timeout_when_deadline_expires_while_waiting(self):
+        leader, _ = self.start_leader(self.make_blocking_function())
+
+        try:
+            self.assertRaises(HPOneViewTimeout, self.single_flight.do, '/rest/enclosures/1', lambda: 'not called',
+                              Deadline(0.05))
+        finally:
+            self.release.set()
+            leader.join(5)
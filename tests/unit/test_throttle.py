@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+###
+# (C) Copyright (2012-2017) Hewlett Packard Enterprise Development LP
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+###
+
+import threading
+import unittest
+
+from mock import patch
+
+from hpOneView import throttle
+from hpOneView.deadline import Deadline
+from hpOneView.exceptions import HPOneViewTimeout
+from hpOneView.throttle import TokenBucket, RequestLimit, RequestThrottle
+
+
+class TokenBucketTest(unittest.TestCase):
+    @patch.object(throttle.time, 'time')
+    def test_reserve_should_allow_burst(self, mock_time):
+        mock_time.return_value = 100.0
+        bucket = TokenBucket(rate=2, burst=3)
+
+        waits = [bucket.reserve() for _ in range(5)]
+
+        self.assertEqual(waits, [0.0, 0.0, 0.0, 0.5, 1.0])
+
+    @patch.object(throttle.time, 'time')
+    def test_reserve_should_refill_tokens_over_time(self, mock_time):
+        mock_time.return_value = 100.0
+        bucket = TokenBucket(rate=2, burst=1)
+        bucket.reserve()
+
+        mock_time.return_value = 100.5
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    @patch.object(throttle.time, 'time')
+    def test_reserve_should_not_take_token_beyond_max_wait(self, mock_time):
+        mock_time.return_value = 100.0
+        bucket = TokenBucket(rate=1)
+        bucket.reserve()
+
+        self.assertIsNone(bucket.reserve(max_wait=0.5))
+        self.assertEqual(bucket.reserve(max_wait=1), 1.0)
+
+    def test_burst_should_default_to_rate(self):
+        self.assertEqual(TokenBucket(rate=5).burst, 5)
+        self.assertEqual(TokenBucket(rate=0.2).burst, 1)
+
+
+class RequestLimitTest(unittest.TestCase):
+    def test_should_require_rate_or_max_in_flight(self):
+        self.assertRaises(ValueError, RequestLimit, prefix='/rest/server-profiles')
+
+    def test_matches_prefix_and_methods(self):
+        limit = RequestLimit(prefix='/rest/server-profiles', methods=['post'], max_in_flight=1)
+
+        self.assertTrue(limit.matches('POST', '/rest/server-profiles'))
+        self.assertTrue(limit.matches('post', '/rest/server-profiles/1'))
+        self.assertFalse(limit.matches('GET', '/rest/server-profiles'))
+        self.assertFalse(limit.matches('POST', '/rest/enclosures'))
+
+    def test_matches_all_requests_by_default(self):
+        limit = RequestLimit(max_in_flight=1)
+
+        self.assertTrue(limit.matches('DELETE', '/rest/enclosures/1'))
+
+    @patch.object(throttle.time, 'sleep')
+    @patch.object(throttle.time, 'time')
+    def test_acquire_should_wait_for_token(self, mock_time, mock_sleep):
+        mock_time.return_value = 100.0
+        limit = RequestLimit(rate=4, burst=1)
+        limit.acquire('GET', '/rest/enclosures')
+
+        limit.acquire('GET', '/rest/enclosures')
+
+        mock_sleep.assert_called_once_with(0.25)
+
+    @patch.object(throttle.time, 'time')
+    def test_acquire_should_raise_timeout_when_token_would_exceed_deadline(self, mock_time):
+        mock_time.return_value = 100.0
+        limit = RequestLimit(rate=0.1, burst=1)
+        limit.acquire('GET', '/rest/enclosures')
+
+        self.assertRaises(HPOneViewTimeout, limit.acquire, 'GET', '/rest/enclosures', Deadline(1))
+        self.assertEqual(limit.get_stats()['timeouts'], 1)
+
+    def test_acquire_should_wait_for_request_in_flight(self):
+        limit = RequestLimit(max_in_flight=1)
+        limit.acquire('POST', '/rest/server-profiles')
+        acquired = threading.Event()
+
+        def acquire():
+            limit.acquire('POST', '/rest/server-profiles')
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+
+        self.assertFalse(acquired.wait(0.05))
+        limit.release()
+        self.assertTrue(acquired.wait(5))
+        thread.join(5)
+
+        stats = limit.get_stats()
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['delayed'], 1)
+        self.assertEqual(stats['in_flight'], 1)
+
+    def test_acquire_should_raise_timeout_when_deadline_expires_while_waiting(self):
+        limit = RequestLimit(max_in_flight=1)
+        limit.acquire('POST', '/rest/server-profiles')
+
+        self.assertRaises(HPOneViewTimeout, limit.acquire, 'POST', '/rest/server-profiles', Deadline(0.05))
+        self.assertEqual(limit.get_stats()['in_flight'], 1)
+
+
+class RequestThrottleTest(unittest.TestCase):
+    def setUp(self):
+        self.throttle = RequestThrottle([
+            {'max_in_flight': 2},
+            {'prefix': '/rest/server-profiles', 'methods': ['POST'], 'max_in_flight': 1},
+        ])
+
+    def test_acquire_should_apply_all_matching_limits(self):
+        limits, _ = self.throttle.acquire('POST', '/rest/server-profiles')
+
+        self.assertEqual(limits, self.throttle.limits)
+
+    def test_acquire_should_skip_limits_not_matching(self):
+        limits, _ = self.throttle.acquire('GET', '/rest/server-profiles')
+
+        self.assertEqual(limits, self.throttle.limits[:1])
+
+    def test_acquire_should_release_limits_when_a_limit_times_out(self):
+        self.throttle.acquire('POST', '/rest/server-profiles')
+
+        self.assertRaises(HPOneViewTimeout, self.throttle.acquire, 'POST', '/rest/server-profiles', Deadline(0.05))
+
+        self.assertEqual(self.throttle.get_stats()['* /']['in_flight'], 1)
+
+    def test_release(self):
+        limits, _ = self.throttle.acquire('POST', '/rest/server-profiles')
+
+        self.throttle.release(limits)
+
+        stats = self.throttle.get_stats()
+        self.assertEqual(stats['* /']['in_flight'], 0)
+        self.assertEqual(stats['POST /rest/server-profiles']['in_flight'], 0)
+        self.assertEqual(stats['POST /rest/server-profiles']['requests'], 1)